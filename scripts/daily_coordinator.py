@@ -19,7 +19,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 try:
     from src.utils.database import FirebaseManager
     from src.config.settings import get_setting
-    from src.data.collector import collect_league_data
+    from src.data.collector import DataCollector
+    from src.utils.deadline import RunDeadline, PRIORITY_CRITICAL, PRIORITY_NORMAL, PRIORITY_LOW
     from src.content.generator import generate_multiple_articles, save_article
     from src.monitoring.health_checker import check_system_health
     from src.monitoring.backup import create_backup
@@ -47,6 +48,71 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+def make_deadline(args: argparse.Namespace) -> Optional[RunDeadline]:
+    """
+    Build the run deadline from the command-line budgets.
+    
+    Args:
+        args: Command-line arguments
+        
+    Returns:
+        RunDeadline, or None when no budget was given
+    """
+    seconds = args.deadline_minutes * 60 if args.deadline_minutes else None
+    cpu_seconds = args.cpu_budget_minutes * 60 if args.cpu_budget_minutes else None
+    if seconds is None and cpu_seconds is None:
+        return None
+    
+    logger.info(f"Run deadline: {args.deadline_minutes or '-'} min wall, {args.cpu_budget_minutes or '-'} min CPU")
+    return RunDeadline(seconds=seconds, cpu_seconds=cpu_seconds)
+
+def log_deferred(deadline: Optional[RunDeadline], stage: str) -> None:
+    """
+    Log how much work the deadline has deferred (each item is logged when deferred).
+    
+    Args:
+        deadline: Run deadline
+        stage: Name of the stage that just finished
+    """
+    if not deadline:
+        return
+    
+    deferred = deadline.deferred()
+    if deferred:
+        kinds = sorted({item['kind'] for item in deferred})
+        logger.warning(f"{stage}: {len(deferred)} items deferred so far by the run deadline ({', '.join(kinds)})")
+
+def collect_league(collector: DataCollector, league_id: str,
+                   priority: int = PRIORITY_NORMAL) -> Dict[str, Any]:
+    """
+    Collect data for a single league, skipping it if a checkpoint shows it is done
+    or the run deadline leaves no time for its priority.
+    
+    Args:
+        collector: Shared data collector
+        league_id: League ID
+        priority: Deadline priority of the league
+        
+    Returns:
+        dict: Refresh results for the league
+    """
+    if collector.deadline and not collector.deadline.allows(f"league:{league_id}", priority):
+        collector.deadline.defer('league', league_id)
+        logger.warning(f"League {league_id} deferred by the run deadline")
+        return {}
+    
+    logger.info(f"Collecting data for league: {league_id}")
+    result = collector.refresh_league_data(league_id)
+    
+    if result and result.get('resumed'):
+        logger.info(f"League {league_id} already completed in a previous run, skipped")
+    elif result and 'matches' in result:
+        logger.info(f"Collected {result['matches'].get('count', 0)} matches for league {league_id}")
+    else:
+        logger.warning(f"No data collected for league {league_id}")
+    
+    return result
+
 def collect_data(args: argparse.Namespace) -> bool:
     """
     Collect data from external sources.
@@ -63,16 +129,17 @@ def collect_data(args: argparse.Namespace) -> bool:
         # Get leagues to collect data for
         league_ids = args.leagues.split(',') if args.leagues else None
         
-        # Collect data for each league
+        # A single collector records checkpoints, so a killed run can be resumed
+        collector = DataCollector()
+        if args.resume or get_setting('collector.checkpoints', True):
+            collector.start_checkpoint(resume=args.resume)
+        collector.set_deadline(args.deadline)
+        
+        # Collect data for each league, most urgent first
         if league_ids:
-            for league_id in league_ids:
-                logger.info(f"Collecting data for league: {league_id}")
-                result = collect_league_data(league_id)
-                
-                if result and 'matches' in result:
-                    logger.info(f"Collected {result['matches'].get('count', 0)} matches for league {league_id}")
-                else:
-                    logger.warning(f"No data collected for league {league_id}")
+            queue = collector.build_collection_queue(league_ids)
+            for item in queue.drain():
+                collect_league(collector, item.league_id)
         else:
             # Collect data for all active leagues
             db = FirebaseManager()
@@ -108,15 +175,20 @@ def collect_data(args: argparse.Namespace) -> bool:
             
             logger.info(f"Collecting data for {len(active_leagues)} active leagues")
             
-            for league_id in active_leagues:
-                logger.info(f"Collecting data for league: {league_id}")
-                result = collect_league_data(league_id)
-                
-                if result and 'matches' in result:
-                    logger.info(f"Collected {result['matches'].get('count', 0)} matches for league {league_id}")
-                else:
-                    logger.warning(f"No data collected for league {league_id}")
+            # With a deadline low-priority leagues are deferred first
+            priorities = {league_id: PRIORITY_NORMAL for league_id in active_leagues}
+            if args.deadline:
+                low_from = get_setting('deadline.low_priority_from', 50)
+                for league_id in active_leagues:
+                    if leagues[league_id].get('priority', 999) >= low_from:
+                        priorities[league_id] = PRIORITY_LOW
+            
+            # Leagues with the soonest kickoffs (and publication windows) go first
+            queue = collector.build_collection_queue(active_leagues)
+            for item in queue.drain():
+                collect_league(collector, item.league_id, priorities[item.league_id])
         
+        log_deferred(args.deadline, "Data collection")
         logger.info("Data collection completed successfully")
         
         # Update system status in Firebase
@@ -158,6 +230,11 @@ def generate_content(args: argparse.Namespace) -> bool:
     """
     logger.info("Starting content generation...")
     
+    if args.deadline and not args.deadline.allows('stage:content', PRIORITY_NORMAL):
+        args.deadline.defer('stage', 'content_generation')
+        logger.warning("Content generation deferred by the run deadline")
+        return True  # Not an error
+    
     try:
         # Get leagues to generate content for
         league_ids = args.leagues.split(',') if args.leagues else None
@@ -285,6 +362,9 @@ def publish_articles(args: argparse.Namespace) -> bool:
                 logger.warning(f"Invalid match datetime for article: {article_id}")
                 continue
         
+        # Soonest kickoff first, so a tight deadline defers the least urgent articles
+        articles_to_publish.sort(key=lambda article: article['match_datetime'])
+        
         # Limit the number of articles to publish
         articles_to_publish = articles_to_publish[:limit]
         
@@ -296,7 +376,13 @@ def publish_articles(args: argparse.Namespace) -> bool:
         
         # Publish articles to WordPress
         published_count = 0
-        for article in articles_to_publish:
+        for index, article in enumerate(articles_to_publish):
+            if args.deadline and not args.deadline.allows('stage:publishing', PRIORITY_CRITICAL):
+                for deferred in articles_to_publish[index:]:
+                    args.deadline.defer('article', deferred['article_id'])
+                log_deferred(args.deadline, "Article publishing")
+                break
+            
             result = publish_article(article)
             
             if result and 'post_id' in result:
@@ -352,6 +438,11 @@ def cleanup_expired_articles(args: argparse.Namespace) -> bool:
     """
     logger.info("Starting cleanup of expired articles...")
     
+    if args.deadline and not args.deadline.allows('stage:cleanup', PRIORITY_LOW):
+        args.deadline.defer('stage', 'cleanup')
+        logger.warning("Expired article cleanup deferred by the run deadline")
+        return True  # Not an error
+    
     try:
         # Get hours after match for deletion
         hours_after_match = get_setting('publishing.hours_after_match', 8)
@@ -421,7 +512,10 @@ def update_health(args: argparse.Namespace) -> bool:
             logger.warning("No health check results")
         
         # Create a daily backup if requested
-        if args.create_backup:
+        if args.create_backup and args.deadline and not args.deadline.allows('stage:backup', PRIORITY_LOW):
+            args.deadline.defer('stage', 'backup')
+            logger.warning("Daily backup deferred by the run deadline")
+        elif args.create_backup:
             backup_result = create_backup(backup_type='daily')
             if backup_result and backup_result.get('success', False):
                 logger.info(f"Created daily backup: {backup_result.get('backup_file', 'unknown')}")
@@ -508,8 +602,15 @@ def main() -> None:
                       help='Continue with the next step even if the current one fails')
     parser.add_argument('--create-backup', action='store_true', 
                       help='Create a daily backup')
+    parser.add_argument('--resume', action='store_true', 
+                      help='Resume an interrupted data collection, skipping completed leagues, stages and fixtures')
+    parser.add_argument('--deadline-minutes', type=float, 
+                      help='Wall-clock budget of the run; low-priority work is deferred as it approaches')
+    parser.add_argument('--cpu-budget-minutes', type=float, 
+                      help='CPU-time budget of the run (e.g. the host\'s daily CPU allowance)')
     
     args = parser.parse_args()
+    args.deadline = make_deadline(args)
     
     # Check if at least one action is specified
     actions = [args.all, args.collect_data, args.generate_content, 
@@ -560,6 +661,11 @@ def main() -> None:
                 logger.error("Health update failed, stopping process")
                 sys.exit(1)
     
+    if args.deadline:
+        report = args.deadline.report()
+        logger.info(f"Run finished in {report['elapsed']}s ({report['cpu']}s CPU), " +
+                    f"{len(report['deferred'])} items deferred")
+    
     # Exit with appropriate status code
     sys.exit(0 if success else 1)
 
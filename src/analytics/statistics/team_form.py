@@ -56,6 +56,12 @@ class TeamFormAnalyzer:
         logger.info(f"Calcolando forma per team_id={team_id}")
         
         try:
+            # Con il campionato la forma viene dalla tabella del campionato, senza query
+            if league_id:
+                team_matches = self._league_form_matches(team_id, league_id)
+                if team_matches:
+                    return self._analyze_form(team_id, team_matches)
+            
             # Ottieni le ultime N partite della squadra
             matches_ref = self.db.get_reference(f"data/matches")
             query_ref = matches_ref.order_by_child("datetime").limit_to_last(self.form_window * 2)
@@ -111,6 +117,35 @@ class TeamFormAnalyzer:
             logger.error(f"Errore nel calcolo della forma per team_id={team_id}: {e}")
             return self._create_empty_form()
     
+    def _league_form_matches(self, team_id: str, league_id: str) -> List[Dict[str, Any]]:
+        """
+        Ultime partite della squadra dalla tabella della forma del campionato.
+        
+        Args:
+            team_id: ID della squadra
+            league_id: ID del campionato
+            
+        Returns:
+            Partite nel formato di _analyze_form, dalla più recente (vuota se
+            la squadra non ha risultati nello storico locale)
+        """
+        from src.data.processors.form_table import get_league_form
+        
+        form_table = get_league_form(self.db, league_id, self.form_window)
+        return [{
+            'match_id': record['match_id'],
+            'date': record['datetime'],
+            'home_team_id': record['home_id'],
+            'away_team_id': record['away_id'],
+            'home_score': record['home_goals'],
+            'away_score': record['away_goals'],
+            'home_team': record['home_name'],
+            'away_team': record['away_name'],
+            'competition_type': 'LEAGUE',
+            'league_id': league_id,
+            'xg': {}
+        } for record in form_table.team_matches(team_id)]
+    
     def _analyze_form(self, team_id: str, matches: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Analizza la forma in base alle partite fornite.
@@ -79,6 +79,12 @@ class XGAnalyzer:
         logger.info(f"Calcolando profilo xG per team_id={team_id}")
         
         try:
+            # Storico xG del processo: nessuna query per squadra
+            from src.data.processors.xg_history import get_xg_history
+            series = get_xg_history(self.db).team(team_id)
+            if series and min(len(series), matches_limit) >= self.min_matches:
+                return self._xg_profile(series, matches_limit)
+            
             # Ottieni le ultime partite della squadra
             matches_ref = self.db.get_reference(f"data/matches")
             query_ref = matches_ref.order_by_child("datetime").limit_to_last(matches_limit * 2)
@@ -146,95 +152,60 @@ class XGAnalyzer:
         Returns:
             Profilo xG completo della squadra
         """
-        # Inizializza accumulatori
-        home_xg = []
-        away_xg = []
-        home_xg_against = []
-        away_xg_against = []
-        home_goals = []
-        away_goals = []
-        home_goals_against = []
-        away_goals_against = []
-        match_details = []
-        
-        now = datetime.now()
-        
-        # Analizza ogni partita
-        for match in matches:
-            # Determina se la squadra era in casa o in trasferta
-            is_home = match['home_team_id'] == team_id
-            
-            # Ottieni xG e gol
-            team_xg = match['xg']['home'] if is_home else match['xg']['away']
-            opponent_xg = match['xg']['away'] if is_home else match['xg']['home']
-            team_goals = match['home_score'] if is_home else match['away_score']
-            opponent_goals = match['away_score'] if is_home else match['home_score']
-            
-            # Calcola il peso in base alla recency
-            match_date = parse_date(match['date'])
-            days_ago = (now - match_date).days if match_date else 30  # Default 30 giorni se manca la data
-            recency_weight = self.recency_factor ** (days_ago / 30)  # decadimento mensile
-            
-            # Aggiungi ai dati separati per casa/trasferta
-            if is_home:
-                home_xg.append((team_xg, recency_weight))
-                home_xg_against.append((opponent_xg, recency_weight))
-                home_goals.append((team_goals, recency_weight))
-                home_goals_against.append((opponent_goals, recency_weight))
-            else:
-                away_xg.append((team_xg, recency_weight))
-                away_xg_against.append((opponent_xg, recency_weight))
-                away_goals.append((team_goals, recency_weight))
-                away_goals_against.append((opponent_goals, recency_weight))
-            
-            # Aggiungi dettagli per questa partita
-            opponent_id = match['away_team_id'] if is_home else match['home_team_id']
-            opponent_name = match['away_team'] if is_home else match['home_team']
-            
-            # Calcola performance rispetto a xG
-            xg_performance = team_goals - team_xg
-            xg_defense_performance = opponent_xg - opponent_goals
+        from src.data.processors.xg_history import series_from_matches
+        return self._xg_profile(series_from_matches(team_id, matches), len(matches))
+    
+    def _xg_profile(self, series: Any, matches_limit: int) -> Dict[str, Any]:
+        """
+        Profilo xG di una squadra dal suo storico in array (TeamXGSeries).
+        
+        Le medie sono ponderate per recency con decadimento mensile
+        (analytics.xg.recency_factor) e calcolate in forma vettoriale.
+        
+        Args:
+            series: Storico xG della squadra
+            matches_limit: Numero massimo di partite da considerare
             
-            match_details.append({
-                'match_id': match['match_id'],
-                'date': match['date'],
-                'opponent_id': opponent_id,
-                'opponent_name': opponent_name,
-                'home_away': 'home' if is_home else 'away',
-                'team_xg': team_xg,
-                'opponent_xg': opponent_xg,
-                'team_goals': team_goals,
-                'opponent_goals': opponent_goals,
-                'xg_performance': xg_performance,
-                'xg_defense_performance': xg_defense_performance,
-                'xg_sources': match.get('xg_sources', []),
-                'weight': recency_weight
-            })
-        
-        # Calcola medie ponderate
-        home_xg_avg = self._weighted_average(home_xg)
-        away_xg_avg = self._weighted_average(away_xg)
-        home_xg_against_avg = self._weighted_average(home_xg_against)
-        away_xg_against_avg = self._weighted_average(away_xg_against)
-        home_goals_avg = self._weighted_average(home_goals)
-        away_goals_avg = self._weighted_average(away_goals)
-        home_goals_against_avg = self._weighted_average(home_goals_against)
-        away_goals_against_avg = self._weighted_average(away_goals_against)
-        
-        # Calcola medie complessive
-        all_xg = home_xg + away_xg
-        all_xg_against = home_xg_against + away_xg_against
-        all_goals = home_goals + away_goals
-        all_goals_against = home_goals_against + away_goals_against
-        
-        overall_xg_avg = self._weighted_average(all_xg)
-        overall_xg_against_avg = self._weighted_average(all_xg_against)
-        overall_goals_avg = self._weighted_average(all_goals)
-        overall_goals_against_avg = self._weighted_average(all_goals_against)
-        
-        # Calcola performance complessiva rispetto a xG
-        attack_performance = overall_goals_avg - overall_xg_avg
-        defense_performance = overall_xg_against_avg - overall_goals_against_avg
+        Returns:
+            Profilo xG completo della squadra
+        """
+        from src.data.processors.xg_history import summarize
+        summary = summarize([series], matches_limit)[0]
+        
+        def split_profile(split: Dict[str, float]) -> Dict[str, float]:
+            return {
+                'xg': split['weighted_xg_for'],
+                'xg_against': split['weighted_xg_against'],
+                'goals': split['weighted_goals_for'],
+                'goals_against': split['weighted_goals_against'],
+                'attack_performance': split['weighted_goals_for'] - split['weighted_xg_for'],
+                'defense_performance': split['weighted_xg_against'] - split['weighted_goals_against']
+            }
+        
+        home, away, overall = (split_profile(summary[split]) for split in ('home', 'away', 'overall'))
+        overall['xg_difference'] = overall['xg'] - overall['xg_against']
+        overall['goal_difference'] = overall['goals'] - overall['goals_against']
+        
+        # Dettagli per partita, dalla più recente
+        window = series.window(matches_limit)
+        match_details = [{
+            'match_id': detail['match_id'],
+            'date': detail.get('datetime', ''),
+            'opponent_id': detail.get('opponent_id', ''),
+            'opponent_name': detail.get('opponent_name', ''),
+            'home_away': 'home' if is_home else 'away',
+            'team_xg': team_xg,
+            'opponent_xg': opponent_xg,
+            'team_goals': team_goals,
+            'opponent_goals': opponent_goals,
+            'xg_performance': team_goals - team_xg,
+            'xg_defense_performance': opponent_xg - opponent_goals,
+            'xg_sources': detail.get('xg_sources', []),
+            'weight': weight
+        } for detail, is_home, team_xg, opponent_xg, team_goals, opponent_goals, weight in zip(
+            series.recent_details(matches_limit), window['is_home'][::-1].tolist(),
+            window['xg_for'][::-1].tolist(), window['xg_against'][::-1].tolist(),
+            window['goals_for'][::-1].tolist(), window['goals_against'][::-1].tolist(), summary['weights'])]
         
         # Calcola le fonti xG utilizzate
         xg_sources_used = set()
@@ -244,38 +215,21 @@ class XGAnalyzer:
         
         # Costruisci il profilo
         return {
-            'team_id': team_id,
-            'matches_analyzed': len(matches),
-            'home_matches': len(home_xg),
-            'away_matches': len(away_xg),
-            'home': {
-                'xg': home_xg_avg,
-                'xg_against': home_xg_against_avg,
-                'goals': home_goals_avg,
-                'goals_against': home_goals_against_avg,
-                'attack_performance': home_goals_avg - home_xg_avg,
-                'defense_performance': home_xg_against_avg - home_goals_against_avg
-            },
-            'away': {
-                'xg': away_xg_avg,
-                'xg_against': away_xg_against_avg,
-                'goals': away_goals_avg,
-                'goals_against': away_goals_against_avg,
-                'attack_performance': away_goals_avg - away_xg_avg,
-                'defense_performance': away_xg_against_avg - away_goals_against_avg
-            },
-            'overall': {
-                'xg': overall_xg_avg,
-                'xg_against': overall_xg_against_avg,
-                'goals': overall_goals_avg,
-                'goals_against': overall_goals_against_avg,
-                'attack_performance': attack_performance,
-                'defense_performance': defense_performance,
-                'xg_difference': overall_xg_avg - overall_xg_against_avg,
-                'goal_difference': overall_goals_avg - overall_goals_against_avg
+            'team_id': series.team_id,
+            'matches_analyzed': summary['overall']['matches'],
+            'home_matches': summary['home']['matches'],
+            'away_matches': summary['away']['matches'],
+            'home': home,
+            'away': away,
+            'overall': overall,
+            'trend': {
+                'rolling_xg': summary['overall']['rolling_xg_for'],
+                'rolling_xg_against': summary['overall']['rolling_xg_against'],
+                'ewma_xg': summary['overall']['ewma_xg_for'],
+                'ewma_xg_against': summary['overall']['ewma_xg_against']
             },
             'performance_rating': self._calculate_performance_rating(
-                attack_performance, defense_performance, overall_xg_avg, overall_xg_against_avg
+                overall['attack_performance'], overall['defense_performance'], overall['xg'], overall['xg_against']
             ),
             'match_details': match_details,
             'xg_sources_used': list(xg_sources_used),
@@ -283,20 +237,6 @@ class XGAnalyzer:
             'has_data': True
         }
     
-    def _weighted_average(self, values: List[Tuple[float, float]]) -> float:
-        """
-        Calcola la media ponderata di una lista di valori.
-        
-        Args:
-            values: Lista di tuple (valore, peso)
-            
-        Returns:
-            Media ponderata
-        """
-        if not values:
-            return 0.0
-        return sum(v * w for v, w in values) / sum(w for _, w in values)
-    
     def _calculate_performance_rating(self, attack_performance: float, defense_performance: float,
                                     xg_for: float, xg_against: float) -> Dict[str, Any]:
         """
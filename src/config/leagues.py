@@ -745,6 +745,12 @@ def get_league_by_name(name: str) -> Optional[Dict[str, Any]]:
     Returns:
         Dizionario con informazioni sulla lega o None se non trovata
     """
+    # Corrispondenza esatta su nome o alias nel registro canonico delle entità
+    from src.data.entity_registry import ENTITY_COMPETITION, get_registry
+    league_key = get_registry().resolve_name(ENTITY_COMPETITION, name)
+    if league_key:
+        return get_league(league_key)
+    
     # Normalizzazione del nome (rimuove spazi extra e converte in lowercase)
     name = name.strip().lower()
     
@@ -8,6 +8,7 @@ from typing import Dict, List, Any, Optional, Union
 from src.data.api.football_data import (
     get_competitions as get_football_data_competitions,
     get_matches as get_football_data_matches,
+    get_matches_multi as get_football_data_matches_multi,
     get_team as get_football_data_team,
     get_team_matches as get_football_data_team_matches,
     get_match as get_football_data_match,
@@ -23,7 +24,8 @@ from src.data.api.api_football import (
     get_standings as get_api_football_standings,
     get_team_statistics as get_api_football_team_stats,
     get_fixture_statistics as get_api_football_fixture_stats,
-    get_head_to_head as get_api_football_h2h
+    get_head_to_head as get_api_football_h2h,
+    get_odds_by_date as get_api_football_odds_by_date
 )
 
 # Funzioni di utilità
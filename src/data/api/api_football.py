@@ -8,14 +8,15 @@ che offre dati calcistici dettagliati come partite, statistiche, giocatori, etc.
 import logging
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Union, Tuple
 
 import requests
 
-from src.utils.http import get_json, APIError
-from src.utils.cache import cached
-from src.config.settings import RAPIDAPI_KEY
+from src.utils.http import get_json, APIError, RateLimiter
+from src.utils.cache import cached, id_key
+from src.config.settings import RAPIDAPI_KEY, get_setting
 from src.config.leagues import get_league, get_api_code
 
 # Configurazione logger
@@ -31,6 +32,12 @@ class APIFootball:
     
     BASE_URL = "https://api-football-v1.p.rapidapi.com/v3"
     
+    # Budget di richieste condiviso da tutte le istanze (stessa API key)
+    _rate_limiter: Optional[RateLimiter] = None
+    
+    # Numero massimo di ID accettati da /fixtures?ids=
+    MAX_IDS_PER_REQUEST = 20
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         Inizializza il client API.
@@ -47,6 +54,18 @@ class APIFootball:
         
         if not self.api_key:
             logger.warning("Nessuna API key configurata per API-Football (RapidAPI)")
+        
+        # Worker per il download concorrente delle pagine
+        self.max_workers = get_setting('api.api_football.max_workers', 4)
+        
+        if APIFootball._rate_limiter is None:
+            APIFootball._rate_limiter = RateLimiter(
+                get_setting('api.api_football.requests_per_minute', 30)
+            )
+    
+    def __str__(self) -> str:
+        # Identità stabile tra istanze, usata nelle chiavi di cache
+        return f"APIFootball({self.BASE_URL})"
     
     @cached(ttl=86400)  # Cache per 1 giorno
     def get_leagues(self, season: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -69,7 +88,7 @@ class APIFootball:
             if season:
                 params['season'] = season
             
-            response = get_json(url, params=params, headers=self.headers)
+            response = self._request(url, params)
             
             if 'response' in response:
                 return response['response']
@@ -132,7 +151,7 @@ class APIFootball:
                 logger.error("Nessun parametro fornito per get_fixtures")
                 return []
             
-            response = get_json(url, params=params, headers=self.headers)
+            response = self._request(url, params)
             
             if 'response' in response:
                 return response['response']
@@ -142,7 +161,7 @@ class APIFootball:
             logger.error(f"Errore nell'ottenere le partite: {e}")
             raise APIError(f"Errore API-Football: {e}")
     
-    @cached(ttl=3600)  # Cache per 1 ora
+    @cached(ttl=3600, key_fn=id_key('api_football.get_fixture'))  # Cache per 1 ora
     def get_fixture(self, fixture_id: int) -> Dict[str, Any]:
         """
         Ottiene informazioni dettagliate su una partita.
@@ -160,7 +179,7 @@ class APIFootball:
             url = f"{self.BASE_URL}/fixtures"
             params = {"id": fixture_id}
             
-            response = get_json(url, params=params, headers=self.headers)
+            response = self._request(url, params)
             
             if 'response' in response and response['response']:
                 return response['response'][0]
@@ -170,7 +189,7 @@ class APIFootball:
             logger.error(f"Errore nell'ottenere la partita {fixture_id}: {e}")
             raise APIError(f"Errore API-Football: {e}")
     
-    @cached(ttl=3600)  # Cache per 1 ora
+    @cached(ttl=3600, key_fn=id_key('api_football.get_fixture_statistics'))  # Cache per 1 ora
     def get_fixture_statistics(self, fixture_id: int) -> Dict[str, Any]:
         """
         Ottiene statistiche dettagliate per una partita.
@@ -188,23 +207,18 @@ class APIFootball:
             url = f"{self.BASE_URL}/fixtures/statistics"
             params = {"fixture": fixture_id}
             
-            response = get_json(url, params=params, headers=self.headers)
+            response = self._request(url, params)
             
             if 'response' in response:
                 # Organizza le statistiche per squadra
-                stats = {}
-                for team_stats in response['response']:
-                    team_id = team_stats.get('team', {}).get('id')
-                    if team_id:
-                        stats[str(team_id)] = team_stats.get('statistics', [])
-                return stats
+                return self._statistics_by_team(response['response'])
             return {}
             
         except Exception as e:
             logger.error(f"Errore nell'ottenere le statistiche per la partita {fixture_id}: {e}")
             raise APIError(f"Errore API-Football: {e}")
     
-    @cached(ttl=3600)  # Cache per 1 ora
+    @cached(ttl=3600, key_fn=id_key('api_football.get_fixture_events'))  # Cache per 1 ora
     def get_fixture_events(self, fixture_id: int) -> List[Dict[str, Any]]:
         """
         Ottiene gli eventi di una partita (gol, cartellini, sostituzioni).
@@ -222,7 +236,7 @@ class APIFootball:
             url = f"{self.BASE_URL}/fixtures/events"
             params = {"fixture": fixture_id}
             
-            response = get_json(url, params=params, headers=self.headers)
+            response = self._request(url, params)
             
             if 'response' in response:
                 return response['response']
@@ -232,7 +246,7 @@ class APIFootball:
             logger.error(f"Errore nell'ottenere gli eventi per la partita {fixture_id}: {e}")
             raise APIError(f"Errore API-Football: {e}")
     
-    @cached(ttl=3600)  # Cache per 1 ora
+    @cached(ttl=3600, key_fn=id_key('api_football.get_fixture_lineups'))  # Cache per 1 ora
     def get_fixture_lineups(self, fixture_id: int) -> Dict[str, Any]:
         """
         Ottiene le formazioni delle squadre per una partita.
@@ -250,22 +264,176 @@ class APIFootball:
             url = f"{self.BASE_URL}/fixtures/lineups"
             params = {"fixture": fixture_id}
             
-            response = get_json(url, params=params, headers=self.headers)
+            response = self._request(url, params)
             
             if 'response' in response:
                 # Organizza le formazioni per squadra
-                lineups = {}
-                for team_lineup in response['response']:
-                    team_id = team_lineup.get('team', {}).get('id')
-                    if team_id:
-                        lineups[str(team_id)] = team_lineup
-                return lineups
+                return self._lineups_by_team(response['response'])
             return {}
             
         except Exception as e:
             logger.error(f"Errore nell'ottenere le formazioni per la partita {fixture_id}: {e}")
             raise APIError(f"Errore API-Football: {e}")
     
+    # ---- Varianti batch per più partite ---- #
+    
+    def get_fixtures_batch(self, fixture_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Ottiene i dettagli di più partite con il minimo numero di richieste.
+        
+        Usa /fixtures?ids= (fino a 20 ID per richiesta), che restituisce per
+        ogni partita anche eventi, formazioni e statistiche. Ogni partita viene
+        salvata nelle voci di cache di get_fixture, get_fixture_statistics,
+        get_fixture_events e get_fixture_lineups, quindi le successive
+        chiamate singole non generano richieste.
+        
+        Args:
+            fixture_ids: ID delle partite.
+        
+        Returns:
+            Dizionario ID partita -> dettagli (come get_fixture).
+        """
+        return self._batch_lookup(APIFootball.get_fixture, fixture_ids, lambda item: item)
+    
+    def get_fixture_statistics_batch(self, fixture_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Variante batch di get_fixture_statistics (vedi get_fixtures_batch).
+        
+        Args:
+            fixture_ids: ID delle partite.
+        
+        Returns:
+            Dizionario ID partita -> statistiche per squadra.
+        """
+        return self._batch_lookup(
+            APIFootball.get_fixture_statistics, fixture_ids,
+            lambda item: self._statistics_by_team(item.get('statistics', []))
+        )
+    
+    def get_fixture_events_batch(self, fixture_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Variante batch di get_fixture_events (vedi get_fixtures_batch).
+        
+        Args:
+            fixture_ids: ID delle partite.
+        
+        Returns:
+            Dizionario ID partita -> lista di eventi.
+        """
+        return self._batch_lookup(
+            APIFootball.get_fixture_events, fixture_ids, lambda item: item.get('events', [])
+        )
+    
+    def get_fixture_lineups_batch(self, fixture_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Variante batch di get_fixture_lineups (vedi get_fixtures_batch).
+        
+        Args:
+            fixture_ids: ID delle partite.
+        
+        Returns:
+            Dizionario ID partita -> formazioni per squadra.
+        """
+        return self._batch_lookup(
+            APIFootball.get_fixture_lineups, fixture_ids,
+            lambda item: self._lineups_by_team(item.get('lineups', []))
+        )
+    
+    def _batch_lookup(self, method, fixture_ids: List[int], extract) -> Dict[int, Any]:
+        """
+        Risolve dalla cache di `method` gli ID già noti e scarica gli altri in batch.
+        
+        Args:
+            method: Metodo singolo decorato con @cached.
+            fixture_ids: ID delle partite.
+            extract: Funzione che ricava il risultato del metodo da una partita completa.
+        
+        Returns:
+            Dizionario ID partita -> risultato (le partite non trovate sono omesse).
+        """
+        results = {}
+        missing = []
+        
+        for fixture_id in dict.fromkeys(int(f) for f in fixture_ids):
+            value = method.cache.get(method.make_key(self, fixture_id))
+            if value is not None:
+                results[fixture_id] = value
+            else:
+                missing.append(fixture_id)
+        
+        if missing:
+            logger.info(f"Batch API-Football: {len(results)} partite in cache, {len(missing)} da scaricare")
+            for fixture_id, item in self._fetch_fixtures(missing).items():
+                results[fixture_id] = extract(item)
+        
+        return results
+    
+    def _fetch_fixtures(self, fixture_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Scarica le partite in gruppi da MAX_IDS_PER_REQUEST e popola le cache singole.
+        
+        Args:
+            fixture_ids: ID delle partite da scaricare.
+        
+        Returns:
+            Dizionario ID partita -> partita completa.
+        """
+        url = f"{self.BASE_URL}/fixtures"
+        chunks = [
+            fixture_ids[i:i + self.MAX_IDS_PER_REQUEST]
+            for i in range(0, len(fixture_ids), self.MAX_IDS_PER_REQUEST)
+        ]
+        
+        def fetch_chunk(chunk: List[int]) -> List[Dict[str, Any]]:
+            try:
+                data = self._request(url, {"ids": "-".join(str(f) for f in chunk)})
+                if data and 'response' in data:
+                    return data['response']
+                logger.warning(f"Risposta non valida per il batch di partite {chunk}")
+            except Exception as e:
+                logger.error(f"Errore nel batch di partite {chunk}: {e}")
+            return []
+        
+        fixtures = {}
+        workers = max(1, min(self.max_workers, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-football") as executor:
+            for items in executor.map(fetch_chunk, chunks):
+                for item in items:
+                    fixture_id = item.get('fixture', {}).get('id')
+                    if fixture_id is None:
+                        continue
+                    fixtures[fixture_id] = item
+                    self._prime_fixture_caches(fixture_id, item)
+        
+        return fixtures
+    
+    def _prime_fixture_caches(self, fixture_id: int, item: Dict[str, Any]):
+        """Salva una partita completa nelle voci di cache dei metodi singoli."""
+        APIFootball.get_fixture.prime(item, self, fixture_id)
+        APIFootball.get_fixture_statistics.prime(self._statistics_by_team(item.get('statistics', [])), self, fixture_id)
+        APIFootball.get_fixture_events.prime(item.get('events', []), self, fixture_id)
+        APIFootball.get_fixture_lineups.prime(self._lineups_by_team(item.get('lineups', [])), self, fixture_id)
+    
+    @staticmethod
+    def _statistics_by_team(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Organizza le statistiche di una partita per ID squadra."""
+        stats = {}
+        for team_stats in entries:
+            team_id = team_stats.get('team', {}).get('id')
+            if team_id:
+                stats[str(team_id)] = team_stats.get('statistics', [])
+        return stats
+    
+    @staticmethod
+    def _lineups_by_team(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Organizza le formazioni di una partita per ID squadra."""
+        lineups = {}
+        for team_lineup in entries:
+            team_id = team_lineup.get('team', {}).get('id')
+            if team_id:
+                lineups[str(team_id)] = team_lineup
+        return lineups
+    
     @cached(ttl=86400)  # Cache per 1 giorno
     def get_team(self, team_id: int) -> Dict[str, Any]:
         """
@@ -284,7 +452,7 @@ class APIFootball:
             url = f"{self.BASE_URL}/teams"
             params = {"id": team_id}
             
-            response = get_json(url, params=params, headers=self.headers)
+            response = self._request(url, params)
             
             if 'response' in response and response['response']:
                 return response['response'][0]
@@ -325,7 +493,7 @@ class APIFootball:
             if season:
                 params["season"] = season
             
-            response = get_json(url, params=params, headers=self.headers)
+            response = self._request(url, params)
             
             if 'response' in response:
                 return response['response']
@@ -371,7 +539,7 @@ class APIFootball:
                 current_year = datetime.now().year
                 params["season"] = current_year
             
-            response = get_json(url, params=params, headers=self.headers)
+            response = self._request(url, params)
             
             if 'response' in response:
                 return response['response']
@@ -411,7 +579,7 @@ class APIFootball:
                 current_year = datetime.now().year
                 params["season"] = current_year
             
-            response = get_json(url, params=params, headers=self.headers)
+            response = self._request(url, params)
             
             if 'response' in response:
                 # API restituisce una lista di leghe, ciascuna con le proprie classifiche
@@ -445,7 +613,7 @@ class APIFootball:
             url = f"{self.BASE_URL}/predictions"
             params = {"fixture": fixture_id}
             
-            response = get_json(url, params=params, headers=self.headers)
+            response = self._request(url, params)
             
             if 'response' in response and response['response']:
                 return response['response'][0]
@@ -476,8 +644,8 @@ class APIFootball:
         Raises:
             APIError: Se la richiesta all'API fallisce.
         """
+        url = f"{self.BASE_URL}/odds"
         try:
-            url = f"{self.BASE_URL}/odds"
             params = {"fixture": fixture_id}
             
             if bookmaker_id:
@@ -485,15 +653,228 @@ class APIFootball:
             if bet_id:
                 params["bet"] = bet_id
             
-            response = get_json(url, params=params, headers=self.headers)
+            items = self._get_all_pages(url, params)
+            if not items:
+                return {}
             
-            if 'response' in response and response['response']:
-                return response['response'][0]
-            return {}
+            # Le pagine successive aggiungono altri bookmaker alla stessa partita
+            odds = dict(items[0])
+            odds['bookmakers'] = [b for item in items for b in item.get('bookmakers', [])]
+            return odds
             
         except Exception as e:
             logger.error(f"Errore nell'ottenere le quote per la partita {fixture_id}: {e}")
-            raise APIError(f"Errore API-Football: {e}")
+            raise APIError(f"Errore API-Football: {e}", url)
+    
+    @cached(ttl=3600)  # Cache per 1 ora
+    def get_league_odds(
+        self,
+        league_id: int,
+        season: Optional[int] = None,
+        date: Optional[str] = None,
+        bookmaker_id: Optional[int] = None,
+        bet_id: Optional[int] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Ottiene le quote di tutte le partite di una competizione.
+        
+        Args:
+            league_id: ID della competizione.
+            season: Anno della stagione (default: stagione in corso).
+            date: Limita alle partite di una data (YYYY-MM-DD).
+            bookmaker_id: ID del bookmaker.
+            bet_id: ID del tipo di scommessa.
+        
+        Returns:
+            Dizionario ID partita -> quote compatte (vedi compact_odds).
+        
+        Raises:
+            APIError: Se la richiesta all'API fallisce.
+        """
+        url = f"{self.BASE_URL}/odds"
+        try:
+            params = {"league": league_id, "season": season or self._current_season(date)}
+            
+            if date:
+                params["date"] = date
+            if bookmaker_id:
+                params["bookmaker"] = bookmaker_id
+            if bet_id:
+                params["bet"] = bet_id
+            
+            return self.compact_odds(self._get_all_pages(url, params))
+            
+        except Exception as e:
+            logger.error(f"Errore nell'ottenere le quote per la competizione {league_id}: {e}")
+            raise APIError(f"Errore API-Football: {e}", url)
+    
+    @cached(ttl=3600)  # Cache per 1 ora
+    def get_odds_by_date(
+        self,
+        date: str,
+        leagues: Optional[List[int]] = None,
+        bookmaker_id: Optional[int] = None,
+        bet_id: Optional[int] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Ottiene le quote di tutte le partite di una data in un unico job.
+        
+        Una sola interrogazione paginata per data copre tutte le competizioni;
+        le pagine sono scaricate in parallelo e filtrate per competizione.
+        
+        Args:
+            date: Data delle partite (YYYY-MM-DD).
+            leagues: ID delle competizioni da tenere (default: tutte).
+            bookmaker_id: ID del bookmaker.
+            bet_id: ID del tipo di scommessa.
+        
+        Returns:
+            Dizionario ID partita -> quote compatte (vedi compact_odds).
+        
+        Raises:
+            APIError: Se la richiesta all'API fallisce.
+        """
+        url = f"{self.BASE_URL}/odds"
+        try:
+            params = {"date": date}
+            
+            if bookmaker_id:
+                params["bookmaker"] = bookmaker_id
+            if bet_id:
+                params["bet"] = bet_id
+            
+            items = self._get_all_pages(url, params)
+            
+            if leagues:
+                wanted = {int(league) for league in leagues}
+                items = [item for item in items if item.get('league', {}).get('id') in wanted]
+            
+            return self.compact_odds(items)
+            
+        except Exception as e:
+            logger.error(f"Errore nell'ottenere le quote per la data {date}: {e}")
+            raise APIError(f"Errore API-Football: {e}", url)
+    
+    @staticmethod
+    def compact_odds(items: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """
+        Riduce le risposte di /odds a una struttura compatta per partita.
+        
+        Per ogni mercato ed esito conserva la quota migliore (con il relativo
+        bookmaker), la media e il numero di bookmaker che la offrono.
+        
+        Args:
+            items: Elementi 'response' dell'endpoint /odds, anche su più pagine.
+        
+        Returns:
+            Dizionario ID partita -> {fixture_id, league_id, date, updated,
+            bookmakers, markets: {mercato: {esito: {best, bookmaker, average, count}}}}
+        """
+        fixtures = {}
+        
+        for item in items:
+            fixture_id = item.get('fixture', {}).get('id')
+            if fixture_id is None:
+                continue
+            
+            entry = fixtures.setdefault(fixture_id, {
+                'fixture_id': fixture_id,
+                'league_id': item.get('league', {}).get('id'),
+                'date': item.get('fixture', {}).get('date'),
+                'updated': item.get('update'),
+                'bookmakers': set(),
+                'markets': {}
+            })
+            if item.get('update') and (entry['updated'] or '') < item['update']:
+                entry['updated'] = item['update']
+            
+            for bookmaker in item.get('bookmakers', []):
+                name = bookmaker.get('name')
+                entry['bookmakers'].add(name)
+                for bet in bookmaker.get('bets', []):
+                    market = entry['markets'].setdefault(bet.get('name'), {})
+                    for value in bet.get('values', []):
+                        try:
+                            odd = float(value.get('odd'))
+                        except (TypeError, ValueError):
+                            continue
+                        outcome = market.setdefault(str(value.get('value')), {
+                            'best': odd, 'bookmaker': name, 'total': 0.0, 'count': 0
+                        })
+                        if odd > outcome['best']:
+                            outcome['best'] = odd
+                            outcome['bookmaker'] = name
+                        outcome['total'] += odd
+                        outcome['count'] += 1
+        
+        # Finalizza medie e contatori
+        for entry in fixtures.values():
+            entry['bookmakers'] = len(entry['bookmakers'])
+            for market in entry['markets'].values():
+                for outcome in market.values():
+                    outcome['average'] = round(outcome.pop('total') / outcome['count'], 3)
+        
+        return fixtures
+    
+    def _request(self, url: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Esegue una richiesta rispettando il budget condiviso di richieste.
+        
+        Lo slot del budget viene occupato solo dalle richieste che vanno in
+        rete: le risposte già nella cache HTTP non consumano il budget.
+        """
+        return get_json(url, params=params, headers=self.headers,
+                        rate_limiter=APIFootball._rate_limiter)
+    
+    def _get_all_pages(self, url: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Scarica tutte le pagine di un endpoint paginato.
+        
+        La prima risposta indica il numero totale di pagine; le restanti sono
+        scaricate in parallelo entro il budget di richieste e riunite nell'ordine
+        di pagina. Una pagina non disponibile viene saltata con un avviso.
+        
+        Args:
+            url: URL dell'endpoint.
+            params: Parametri della richiesta (senza 'page').
+        
+        Returns:
+            Elementi 'response' di tutte le pagine.
+        
+        Raises:
+            APIError: Se la prima pagina non è disponibile.
+        """
+        first = self._request(url, params)
+        if not first or 'response' not in first:
+            raise APIError("Risposta non valida dalla prima pagina", url)
+        
+        items = list(first['response'])
+        total_pages = int(first.get('paging', {}).get('total') or 1)
+        if total_pages <= 1:
+            return items
+        
+        def fetch_page(page: int) -> List[Dict[str, Any]]:
+            try:
+                data = self._request(url, {**params, 'page': page})
+                if data and 'response' in data:
+                    return data['response']
+                logger.warning(f"Pagina {page}/{total_pages} di {url} non disponibile")
+            except Exception as e:
+                logger.warning(f"Errore nella pagina {page}/{total_pages} di {url}: {e}")
+            return []
+        
+        workers = max(1, min(self.max_workers, total_pages - 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-football") as executor:
+            for page_items in executor.map(fetch_page, range(2, total_pages + 1)):
+                items.extend(page_items)
+        
+        return items
+    
+    @staticmethod
+    def _current_season(date: Optional[str] = None) -> int:
+        """Anno di inizio della stagione che contiene la data (default: oggi)."""
+        day = datetime.strptime(date, "%Y-%m-%d") if date else datetime.now()
+        return day.year if day.month >= 7 else day.year - 1
     
     def get_upcoming_matches(
         self, 
@@ -570,7 +951,7 @@ class APIFootball:
                 "last": limit
             }
             
-            response = get_json(url, params=params, headers=self.headers)
+            response = self._request(url, params)
             
             if 'response' in response:
                 return response['response']
@@ -604,7 +985,7 @@ class APIFootball:
                 params["league"] = league_id
             
             url = f"{self.BASE_URL}/fixtures"
-            response = get_json(url, params=params, headers=self.headers)
+            response = self._request(url, params)
             
             if 'response' not in response:
                 return {
@@ -876,3 +1257,24 @@ def get_head_to_head(team1_id: int, team2_id: int, limit: int = 10) -> List[Dict
     except Exception as e:
         logger.error(f"Errore in get_head_to_head({team1_id}, {team2_id}): {e}")
         return []
+
+def get_odds_by_date(date: str, leagues: Optional[List[int]] = None) -> Dict[int, Dict[str, Any]]:
+    """
+    Wrapper per api_football.get_odds_by_date().
+    Ottiene le quote compatte di tutte le partite di una data.
+    
+    Args:
+        date: Data delle partite (YYYY-MM-DD).
+        leagues: ID delle competizioni da tenere (default: tutte).
+        
+    Returns:
+        Dizionario ID partita -> quote compatte.
+    """
+    try:
+        result = api_football.get_odds_by_date(date, leagues)
+        if isinstance(result, dict):
+            return result
+        return {}
+    except Exception as e:
+        logger.error(f"Errore in get_odds_by_date({date}): {e}")
+        return {}
@@ -14,7 +14,7 @@ from typing import Dict, List, Any, Optional, Union, Tuple
 import requests
 
 from src.utils.http import get_json, APIError
-from src.utils.cache import cached
+from src.utils.cache import cached, id_key
 from src.config.settings import FOOTBALL_API_KEY
 from src.config.leagues import get_league, get_api_code
 
@@ -31,6 +31,11 @@ class FootballDataAPI:
     
     BASE_URL = "https://api.football-data.org/v4"
     
+    # Numero di ID per richiesta usato con /matches?ids=
+    MAX_IDS_PER_REQUEST = 50
+    # Intervallo massimo di date accettato da /matches in una singola richiesta
+    MAX_DAYS_PER_REQUEST = 10
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         Inizializza il client API.
@@ -45,6 +50,10 @@ class FootballDataAPI:
         if not self.api_key:
             logger.warning("Nessuna API key configurata per football-data.org")
     
+    def __str__(self) -> str:
+        # Identità stabile tra istanze, usata nelle chiavi di cache
+        return f"FootballDataAPI({self.BASE_URL})"
+    
     @cached(ttl=3600)  # Cache per 1 ora
     def get_competitions(self) -> List[Dict[str, Any]]:
         """
@@ -133,7 +142,89 @@ class FootballDataAPI:
             logger.error(f"Errore nell'ottenere le partite per {competition_code}: {e}")
             raise APIError(f"Errore API football-data: {e}")
     
-    @cached(ttl=3600)  # Cache per 1 ora
+    def get_matches_multi(
+        self,
+        competition_codes: List[str],
+        date_from: str,
+        date_to: str,
+        status: Optional[str] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Ottiene le partite di più competizioni con la query globale /matches.
+        
+        Le competizioni sono richieste insieme (competitions=PL,SA,...) e
+        l'intervallo è diviso in finestre da MAX_DAYS_PER_REQUEST giorni, quindi
+        servono una o poche richieste invece di una per competizione. Il
+        risultato di ogni competizione è salvato nella cache di get_matches,
+        così le chiamate per singolo campionato successive non consumano quota.
+        
+        Args:
+            competition_codes: Codici delle competizioni (es. ['PL', 'SA']).
+            date_from: Data inizio nel formato ISO (YYYY-MM-DD).
+            date_to: Data fine nel formato ISO (YYYY-MM-DD).
+            status: Stato delle partite (SCHEDULED, FINISHED, ecc.).
+        
+        Returns:
+            Dizionario codice competizione -> lista di partite.
+        
+        Raises:
+            APIError: Se una delle richieste all'API fallisce o non restituisce
+                dati; in questo caso la cache di get_matches non viene modificata.
+        """
+        codes = list(dict.fromkeys(c for c in competition_codes if c))
+        results = {code: [] for code in codes}
+        if not codes:
+            return results
+        
+        url = f"{self.BASE_URL}/matches"
+        seen = set()
+        start = datetime.strptime(date_from, "%Y-%m-%d").date()
+        end = datetime.strptime(date_to, "%Y-%m-%d").date()
+        
+        while start <= end:
+            window_end = min(start + timedelta(days=self.MAX_DAYS_PER_REQUEST - 1), end)
+            params = {
+                'competitions': ",".join(codes),
+                'dateFrom': start.isoformat(),
+                'dateTo': window_end.isoformat()
+            }
+            if status:
+                params['status'] = status
+            
+            try:
+                response = get_json(url, params=params, headers=self.headers)
+            except Exception as e:
+                logger.error(f"Errore nell'ottenere le partite per {params['competitions']}: {e}")
+                raise APIError(f"Errore API football-data: {e}", url)
+            
+            # Nessuna risposta (403, 429, errore di rete): non è "nessuna partita",
+            # quindi nessuna voce di cache viene popolata
+            if response is None or 'matches' not in response:
+                message = (f"Nessuna risposta valida per {params['competitions']} "
+                           f"({params['dateFrom']} - {params['dateTo']})")
+                logger.error(message)
+                raise APIError(message, url)
+            
+            for match in response['matches']:
+                code = match.get('competition', {}).get('code')
+                if code not in results or match.get('id') in seen:
+                    continue
+                seen.add(match.get('id'))
+                results[code].append(match)
+            
+            start = window_end + timedelta(days=1)
+        
+        # Popola la cache di get_matches con la stessa firma usata dal collector
+        for code, matches in results.items():
+            kwargs = {'competition_code': code, 'date_from': date_from, 'date_to': date_to}
+            if status:
+                kwargs['status'] = status
+            FootballDataAPI.get_matches.prime(matches, self, **kwargs)
+        
+        logger.info(f"Ottenute {len(seen)} partite per {len(codes)} competizioni con la query globale")
+        return results
+    
+    @cached(ttl=3600, key_fn=id_key('football_data.get_match'))  # Cache per 1 ora
     def get_match(self, match_id: int) -> Dict[str, Any]:
         """
         Ottiene informazioni dettagliate su una partita.
@@ -154,6 +245,51 @@ class FootballDataAPI:
             logger.error(f"Errore nell'ottenere la partita {match_id}: {e}")
             raise APIError(f"Errore API football-data: {e}")
     
+    def get_matches_batch(self, match_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Ottiene più partite con il minimo numero di richieste.
+        
+        Le partite già nella cache di get_match non generano richieste; le altre
+        sono scaricate con /matches?ids= in gruppi da MAX_IDS_PER_REQUEST e
+        salvate nella cache di get_match, così le chiamate singole successive
+        non consumano quota.
+        
+        Args:
+            match_ids: ID delle partite.
+        
+        Returns:
+            Dizionario ID partita -> dettagli (le partite non trovate sono omesse).
+        """
+        results = {}
+        missing = []
+        
+        for match_id in dict.fromkeys(int(m) for m in match_ids):
+            value = FootballDataAPI.get_match.cache.get(FootballDataAPI.get_match.make_key(self, match_id))
+            if value is not None:
+                results[match_id] = value
+            else:
+                missing.append(match_id)
+        
+        url = f"{self.BASE_URL}/matches"
+        for i in range(0, len(missing), self.MAX_IDS_PER_REQUEST):
+            chunk = missing[i:i + self.MAX_IDS_PER_REQUEST]
+            try:
+                response = get_json(url, params={'ids': ",".join(str(m) for m in chunk)}, headers=self.headers)
+                if not response or 'matches' not in response:
+                    logger.warning(f"Risposta non valida per il batch di partite {chunk}")
+                    continue
+                
+                for match in response['matches']:
+                    match_id = match.get('id')
+                    if match_id is None:
+                        continue
+                    results[match_id] = match
+                    FootballDataAPI.get_match.prime(match, self, match_id)
+            except Exception as e:
+                logger.error(f"Errore nel batch di partite {chunk}: {e}")
+        
+        return results
+    
     @cached(ttl=3600*12)  # Cache per 12 ore
     def get_team(self, team_id: int) -> Dict[str, Any]:
         """
@@ -283,33 +419,35 @@ class FootballDataAPI:
         today = datetime.now().strftime("%Y-%m-%d")
         future = (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%d")
         
+        # Codice football-data -> campionato
+        leagues_by_code = {}
+        for league_id, league in get_active_leagues().items():
+            league_code = get_api_code(league_id, 'football_data')
+            if league_code:
+                leagues_by_code[league_code] = (league_id, league)
+        
         all_matches = []
         
-        for league in get_active_leagues():
-            league_code = get_api_code(league['id'], 'football_data')
-            if not league_code:
-                continue
-                
-            try:
-                matches = self.get_matches(
-                    league_code, 
-                    date_from=today,
-                    date_to=future,
-                    status="SCHEDULED"
-                )
-                
-                # Aggiungi nome campionato per reference
-                for match in matches:
-                    match['league_id'] = league['id']
-                    match['league_name'] = league['name']
-                
-                all_matches.extend(matches)
-                
-                # Rispetta il rate limiting
-                time.sleep(0.5)
-                
-            except Exception as e:
-                logger.error(f"Errore nell'ottenere partite future per {league['name']}: {e}")
+        try:
+            matches_by_code = self.get_matches_multi(
+                list(leagues_by_code),
+                date_from=today,
+                date_to=future,
+                status="SCHEDULED"
+            )
+        except Exception as e:
+            logger.error(f"Errore nell'ottenere partite future: {e}")
+            return []
+        
+        for league_code, matches in matches_by_code.items():
+            league_id, league = leagues_by_code[league_code]
+            
+            # Aggiungi nome campionato per reference
+            for match in matches:
+                match['league_id'] = league_id
+                match['league_name'] = league.get('name')
+            
+            all_matches.extend(matches)
         
         return sorted(all_matches, key=lambda m: m.get('utcDate', ''))
     
@@ -487,6 +625,27 @@ def get_matches(competition_id: str, **kwargs) -> List[Dict[str, Any]]:
         logger.error(f"Errore in get_matches({competition_id}): {e}")
         return []
 
+def get_matches_multi(competition_ids: List[str], date_from: str, date_to: str,
+                      status: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Wrapper per football_data_api.get_matches_multi().
+    Ottiene le partite di più competizioni con una o poche richieste.
+    
+    Args:
+        competition_ids: Codici delle competizioni.
+        date_from: Data inizio nel formato ISO (YYYY-MM-DD).
+        date_to: Data fine nel formato ISO (YYYY-MM-DD).
+        status: Stato delle partite (opzionale).
+    
+    Returns:
+        Dizionario codice competizione -> lista di partite.
+    """
+    try:
+        return football_data_api.get_matches_multi(competition_ids, date_from, date_to, status=status)
+    except Exception as e:
+        logger.error(f"Errore in get_matches_multi({competition_ids}): {e}")
+        return {}
+
 def get_team(team_id: int) -> Dict[str, Any]:
     """
     Wrapper per football_data_api.get_team().
@@ -0,0 +1,123 @@
+"""
+Checkpoint persistenti per le esecuzioni di raccolta dati.
+Registra campionati, fasi e partite completati insieme a un'impronta dei
+dati di ingresso, così un'esecuzione interrotta (ad esempio dal limite di
+CPU dell'host) può riprendere saltando il lavoro già concluso. I checkpoint
+più vecchi del TTL vengono eliminati automaticamente.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+from src.config.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(*parts: Any) -> str:
+    """Impronta stabile degli input di un'unità di lavoro."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.md5(payload.encode()).hexdigest()
+
+
+class RunCheckpoint:
+    """
+    Registro SQLite delle unità di lavoro completate.
+
+    Ogni voce è identificata da una chiave (es. 'league:serie_a',
+    'serie_a:team:123') e vale solo se l'impronta corrente coincide con
+    quella salvata: se gli input cambiano il lavoro viene ripetuto.
+    """
+
+    def __init__(self, name: str = "collection", db_path: Optional[str] = None,
+                 ttl: Optional[int] = None):
+        """
+        Args:
+            name: Nome dell'esecuzione (separa i checkpoint di job diversi)
+            db_path: Percorso del database (default: ~/football-predictions/cache/checkpoints.db)
+            ttl: Secondi di validità dei checkpoint (default: collector.checkpoint_ttl, 12 ore)
+        """
+        if not db_path:
+            cache_dir = os.path.expanduser("~/football-predictions/cache")
+            os.makedirs(cache_dir, exist_ok=True)
+            db_path = os.path.join(cache_dir, "checkpoints.db")
+        self.name = name
+        self.db_path = db_path
+        self.ttl = ttl if ttl is not None else get_setting('collector.checkpoint_ttl', 12 * 3600)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._init_db()
+        self.purge_expired()
+
+    def _init_db(self):
+        with self._conn:
+            self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                run TEXT NOT NULL,
+                key TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                data TEXT,
+                completed_at REAL NOT NULL,
+                PRIMARY KEY (run, key)
+            )
+            ''')
+
+    def is_done(self, key: str, fp: str) -> bool:
+        """Verifica se l'unità è completata con la stessa impronta e non è scaduta."""
+        return self.get(key, fp) is not None
+
+    def get(self, key: str, fp: str) -> Optional[Dict[str, Any]]:
+        """
+        Restituisce i dati salvati per un'unità completata.
+
+        Returns:
+            Dati del checkpoint ({} se salvato senza dati) o None se assente, scaduto o con impronta diversa
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, data, completed_at FROM checkpoints WHERE run = ? AND key = ?",
+                (self.name, key)
+            ).fetchone()
+        if not row or row[0] != fp or row[2] < time.time() - self.ttl:
+            return None
+        return json.loads(row[1]) if row[1] else {}
+
+    def mark_done(self, key: str, fp: str, data: Optional[Dict[str, Any]] = None):
+        """Registra un'unità completata (scrittura immediata, sopravvive a un kill)."""
+        payload = json.dumps(data, default=str) if data is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (run, key, fingerprint, data, completed_at) VALUES (?, ?, ?, ?, ?)",
+                (self.name, key, fp, payload, time.time())
+            )
+
+    def purge_expired(self) -> int:
+        """Elimina i checkpoint scaduti di tutte le esecuzioni."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM checkpoints WHERE completed_at < ?",
+                                        (time.time() - self.ttl,))
+        if cursor.rowcount:
+            logger.info(f"Eliminati {cursor.rowcount} checkpoint scaduti")
+        return cursor.rowcount
+
+    def clear(self):
+        """Elimina tutti i checkpoint di questa esecuzione (nuovo avvio da zero)."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM checkpoints WHERE run = ?", (self.name,))
+
+    def count(self, prefix: str = "") -> int:
+        """Numero di unità completate con chiave che inizia per prefix."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM checkpoints WHERE run = ? AND key LIKE ? AND completed_at >= ?",
+                (self.name, prefix + '%', time.time() - self.ttl)
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
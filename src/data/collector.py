@@ -8,8 +8,11 @@ di fallback quando necessario.
 import os
 import time
 import json
+import hashlib
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Union, Callable, Tuple
 
@@ -20,9 +23,14 @@ from src.config.sources import get_active_sources, get_sources_for_data_type
 
 # Importa le utility
 from src.utils.database import FirebaseManager
-from src.utils.http import make_request
+from src.utils.http import make_request, host_limiter
 from src.utils.cache import cached
 from src.utils.time_utils import get_current_datetime, format_datetime
+from src.utils.task_graph import TaskGraph, STATUS_DONE, STATUS_FAILED
+from src.utils.deadline import RunDeadline, PRIORITY_CRITICAL, PRIORITY_NORMAL, PRIORITY_LOW
+from src.data.checkpoint import RunCheckpoint, fingerprint
+from src.data.freshness import FreshnessLedger, h2h_key
+from src.data.work_queue import CollectionQueue, WorkItem, league_ranks, next_kickoff, parse_timestamp
 
 # Importa i logger
 from src.monitoring.logger import get_logger
@@ -88,12 +96,31 @@ class DataCollector:
         # Ottieni le fonti dati disponibili
         self.sources = get_active_sources()
         
-        # Semaforo per limitare le richieste concorrenti
-        self.request_semaphore = threading.Semaphore(5)
+        # Semaforo per limitare i campionati aggiornati in parallelo
+        self.max_workers = max(1, int(get_setting('collector.max_workers', 5)))
+        self.request_semaphore = threading.Semaphore(self.max_workers)
+        
+        # Limiti di concorrenza per host condivisi con tutti i client HTTP
+        for host, limit in get_setting('http.host_limits', {}).items():
+            host_limiter.set_limit(host, limit)
         
         # Lista per tenere traccia degli errori
         self.errors = []
         
+        # Ultimo grafo di aggiornamento per campionato (per rieseguire i task falliti)
+        self._league_graphs: Dict[str, TaskGraph] = {}
+        
+        # Checkpoint dell'esecuzione corrente (vedi start_checkpoint)
+        self.checkpoint: Optional[RunCheckpoint] = None
+        
+        # Scadenza dell'esecuzione corrente (vedi set_deadline)
+        self.deadline: Optional[RunDeadline] = None
+        
+        # Registro di freschezza: vengono aggiornate solo le entità scadute
+        self.freshness: Optional[FreshnessLedger] = None
+        if get_setting('collector.freshness', True):
+            self.freshness = FreshnessLedger()
+        
         logger.info("DataCollector inizializzato con successo")
     
     def collect_matches(self, league_id: str, days_ahead: int = 7, 
@@ -109,6 +136,126 @@ class DataCollector:
         Returns:
             Lista di partite con dati completi
         """
+        source, raw_matches = self._collect_raw_matches(league_id, days_ahead, days_behind)
+        if not raw_matches:
+            return []
+        
+        # Standardizza e arricchisci i dati
+        processed_matches = self.match_processor.process_matches(raw_matches, source, league_id)
+        
+        # Aggiorna timestamp di ultimo aggiornamento
+        self.db.get_reference(f"data/matches/{league_id}/last_updated").set(datetime.now().isoformat())
+        
+        return processed_matches
+    
+    def sync_matches(self, league_id: str, days_ahead: int = 7,
+                     days_behind: int = 3) -> Dict[str, Any]:
+        """
+        Sincronizzazione incrementale delle partite di un campionato.
+        
+        Le fonti non offrono un filtro "modificate dopo" sugli endpoint usati,
+        quindi il confronto avviene sui dati: i record grezzi identici a quelli
+        dell'ultima sincronizzazione non vengono rinormalizzati, e dei record
+        rinormalizzati si scrivono solo quelli il cui hash di contenuto è
+        cambiato. Se nulla cambia non viene effettuata nessuna scrittura.
+        
+        Args:
+            league_id: ID del campionato
+            days_ahead: Giorni futuri da considerare
+            days_behind: Giorni passati da considerare
+            
+        Returns:
+            Dizionario con tutte le partite della finestra ('matches') e i
+            conteggi 'changed', 'unchanged' e 'skipped_raw'
+        """
+        base_path = f"data/matches/{league_id}"
+        state = self.db.get_reference(f"{base_path}/sync").get() or {}
+        raw_index = state.get('raw', {})
+        hashes = state.get('hashes', {})
+        
+        source, raw_matches = self._collect_raw_matches(league_id, days_ahead, days_behind)
+        
+        new_raw_index = {}
+        new_hashes = {}
+        unchanged_ids = []
+        changed = {}
+        skipped_raw = 0
+        to_process = {}
+        
+        for raw in raw_matches:
+            # L'hash include la fonte: lo stesso record da fonti diverse si normalizza diversamente
+            raw_hash = self._content_hash({'source': source, 'raw': raw})
+            
+            # Record grezzo identico all'ultima sincronizzazione: nessuna normalizzazione
+            if raw_hash in raw_index and raw_index[raw_hash] in hashes:
+                match_id = raw_index[raw_hash]
+                new_raw_index[raw_hash] = match_id
+                new_hashes[match_id] = hashes[match_id]
+                unchanged_ids.append(match_id)
+                skipped_raw += 1
+                continue
+            to_process[raw_hash] = raw
+        
+        processed = self.match_processor.process_matches(list(to_process.values()), source, league_id)
+        for raw_hash, match in zip(to_process, processed):
+            match_id = str(match.get('match_id') or '')
+            if not match_id:
+                continue
+            content_hash = self._content_hash(match)
+            new_raw_index[raw_hash] = match_id
+            new_hashes[match_id] = content_hash
+            if hashes.get(match_id) == content_hash:
+                unchanged_ids.append(match_id)
+            else:
+                changed[match_id] = match
+        
+        # Partite non modificate lette dallo storage per le fasi successive
+        matches = list(changed.values())
+        if unchanged_ids:
+            stored = self.db.get_reference(f"{base_path}/items").get() or {}
+            matches.extend(stored[match_id] for match_id in dict.fromkeys(unchanged_ids) if match_id in stored)
+        
+        if changed or new_hashes != hashes:
+            updates = {f"{base_path}/items/{match_id}": match for match_id, match in changed.items()}
+            updates[f"{base_path}/sync"] = {
+                'last_sync': datetime.now().isoformat(),
+                'raw': new_raw_index,
+                'hashes': new_hashes
+            }
+            if changed:
+                updates[f"{base_path}/last_updated"] = datetime.now().isoformat()
+            self.db.batch_update(updates)
+        
+        logger.info(f"Sincronizzazione partite {league_id}: {len(changed)} modificate, " +
+                    f"{len(unchanged_ids)} invariate")
+        
+        return {
+            'matches': matches,
+            'changed': len(changed),
+            'unchanged': len(unchanged_ids),
+            'skipped_raw': skipped_raw
+        }
+    
+    @staticmethod
+    def _content_hash(record: Dict[str, Any]) -> str:
+        """Hash stabile del contenuto di un record (esclusi i timestamp di elaborazione)."""
+        content = {k: v for k, v in record.items() if k != 'last_updated'}
+        return hashlib.md5(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+    
+    def _collect_raw_matches(self, league_id: str, days_ahead: int = 7,
+                             days_behind: int = 3) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Raccoglie le partite grezze di un campionato dalla prima fonte disponibile.
+        
+        Args:
+            league_id: ID del campionato
+            days_ahead: Giorni futuri da considerare
+            days_behind: Giorni passati da considerare
+            
+        Returns:
+            Tupla (nome della fonte per MatchProcessor, partite grezze); la
+            lista è vuota se nessuna fonte risponde
+        """
         logger.info(f"Raccolta partite per {league_id} ({days_behind} giorni passati, {days_ahead} giorni futuri)")
         
         # Ottieni fonti dati per le partite
@@ -118,7 +265,7 @@ class DataCollector:
         league = get_league(league_id)
         if not league:
             logger.error(f"Campionato non trovato: {league_id}")
-            return []
+            return '', []
         
         # Calcola intervallo date
         now = get_current_datetime()
@@ -126,105 +273,122 @@ class DataCollector:
         date_to = (now + timedelta(days=days_ahead)).date()
         
         raw_matches = []
+        source = ''
         errors = []
         
         # Strategia 1: Prova API ufficiali
         for source_id in match_sources.get('primary', []):
-            if source_id == 'football_data_api':
-                try:
-                    # Ottieni codice API per il campionato
-                    api_code = get_api_code(league_id, 'football_data')
-                    if api_code:
-                        matches = self.football_data_api.get_matches(
-                            competition_code=api_code,
-                            date_from=date_from.isoformat(),
-                            date_to=date_to.isoformat()
-                        )
-                        if matches:
-                            raw_matches.extend(matches)
-                            logger.info(f"Ottenute {len(matches)} partite da football_data_api")
-                            break  # Usciamo se abbiamo ottenuto dati validi
-                except Exception as e:
-                    error_msg = f"Errore nel recupero partite da football_data_api: {str(e)}"
-                    logger.warning(error_msg)
-                    errors.append(error_msg)
+            # Le API principali sono indispensabili: si fermano solo a scadenza raggiunta
+            if not self._deadline_allows('source', f"{league_id}:{source_id}", f"source:{source_id}", PRIORITY_CRITICAL):
+                continue
             
-            elif source_id == 'rapidapi_football':
-                try:
-                    # Ottieni codice API per il campionato
-                    api_code = get_api_code(league_id, 'rapidapi_football')
-                    if api_code:
-                        matches = self.api_football.get_matches(
-                            league_id=api_code,
-                            from_date=date_from.isoformat(),
-                            to_date=date_to.isoformat()
-                        )
-                        if matches:
-                            raw_matches.extend(matches)
-                            logger.info(f"Ottenute {len(matches)} partite da rapidapi_football")
-                            break  # Usciamo se abbiamo ottenuto dati validi
-                except Exception as e:
-                    error_msg = f"Errore nel recupero partite da rapidapi_football: {str(e)}"
-                    logger.warning(error_msg)
-                    errors.append(error_msg)
-        
-        # Strategia 2: Se le API non hanno funzionato, prova gli scraper
-        if not raw_matches:
-            logger.info("Nessun dato dalle API principali, utilizzo scraper come fallback")
-            for source_id in match_sources.get('fallback', []):
-                if source_id == 'fbref':
+            with self._deadline_track(f"source:{source_id}"):
+                if source_id == 'football_data_api':
                     try:
-                        league_url = league.get('urls', {}).get('fbref')
-                        if league_url:
-                            matches = self.fbref_scraper.get_matches(
-                                url=league_url,
-                                days_ahead=days_ahead,
-                                days_behind=days_behind
+                        # Ottieni codice API per il campionato
+                        api_code = get_api_code(league_id, 'football_data')
+                        if api_code:
+                            matches = self.football_data_api.get_matches(
+                                competition_code=api_code,
+                                date_from=date_from.isoformat(),
+                                date_to=date_to.isoformat()
                             )
                             if matches:
                                 raw_matches.extend(matches)
-                                logger.info(f"Ottenute {len(matches)} partite da fbref")
+                                source = 'football_data'
+                                logger.info(f"Ottenute {len(matches)} partite da football_data_api")
                                 break  # Usciamo se abbiamo ottenuto dati validi
                     except Exception as e:
-                        error_msg = f"Errore nel recupero partite da fbref: {str(e)}"
+                        error_msg = f"Errore nel recupero partite da football_data_api: {str(e)}"
                         logger.warning(error_msg)
                         errors.append(error_msg)
                 
-                elif source_id == 'sofascore':
+                elif source_id == 'rapidapi_football':
                     try:
-                        league_code = get_api_code(league_id, 'sofascore')
-                        if league_code:
-                            matches = self.sofascore_scraper.get_matches_by_league(
-                                league_id=league_code,
+                        # Ottieni codice API per il campionato
+                        api_code = get_api_code(league_id, 'rapidapi_football')
+                        if api_code:
+                            matches = self.api_football.get_matches(
+                                league_id=api_code,
                                 from_date=date_from.isoformat(),
                                 to_date=date_to.isoformat()
                             )
                             if matches:
                                 raw_matches.extend(matches)
-                                logger.info(f"Ottenute {len(matches)} partite da sofascore")
+                                source = 'api_football'
+                                logger.info(f"Ottenute {len(matches)} partite da rapidapi_football")
                                 break  # Usciamo se abbiamo ottenuto dati validi
                     except Exception as e:
-                        error_msg = f"Errore nel recupero partite da sofascore: {str(e)}"
+                        error_msg = f"Errore nel recupero partite da rapidapi_football: {str(e)}"
                         logger.warning(error_msg)
                         errors.append(error_msg)
         
-        # Se ancora non abbiamo dati, prova fonti open data
+        # Strategia 2: Se le API non hanno funzionato, prova gli scraper
         if not raw_matches:
+            logger.info("Nessun dato dalle API principali, utilizzo scraper come fallback")
+            for source_id in match_sources.get('fallback', []):
+                if not self._deadline_allows('source', f"{league_id}:{source_id}", f"source:{source_id}", PRIORITY_NORMAL):
+                    continue
+                
+                with self._deadline_track(f"source:{source_id}"):
+                    if source_id == 'fbref':
+                        try:
+                            league_url = league.get('urls', {}).get('fbref')
+                            if league_url:
+                                matches = self.fbref_scraper.get_matches(
+                                    url=league_url,
+                                    days_ahead=days_ahead,
+                                    days_behind=days_behind
+                                )
+                                if matches:
+                                    raw_matches.extend(matches)
+                                    source = 'fbref'
+                                    logger.info(f"Ottenute {len(matches)} partite da fbref")
+                                    break  # Usciamo se abbiamo ottenuto dati validi
+                        except Exception as e:
+                            error_msg = f"Errore nel recupero partite da fbref: {str(e)}"
+                            logger.warning(error_msg)
+                            errors.append(error_msg)
+                    
+                    elif source_id == 'sofascore':
+                        try:
+                            league_code = get_api_code(league_id, 'sofascore')
+                            if league_code:
+                                matches = self.sofascore_scraper.get_matches_by_league(
+                                    league_id=league_code,
+                                    from_date=date_from.isoformat(),
+                                    to_date=date_to.isoformat()
+                                )
+                                if matches:
+                                    raw_matches.extend(matches)
+                                    source = 'sofascore'
+                                    logger.info(f"Ottenute {len(matches)} partite da sofascore")
+                                    break  # Usciamo se abbiamo ottenuto dati validi
+                        except Exception as e:
+                            error_msg = f"Errore nel recupero partite da sofascore: {str(e)}"
+                            logger.warning(error_msg)
+                            errors.append(error_msg)
+        
+        # Se ancora non abbiamo dati, prova fonti open data
+        if not raw_matches and self._deadline_allows('source', f"{league_id}:open_football",
+                                                     "source:open_football", PRIORITY_LOW):
             logger.info("Nessun dato dalle fonti principali, tentativo con open data")
-            try:
-                open_football_matches = self.open_football_loader.get_matches(
-                    league=league_id,
-                    season=league.get('current_season', ''),
-                    from_date=date_from.isoformat(),
-                    to_date=date_to.isoformat()
-                )
-                if open_football_matches:
-                    raw_matches.extend(open_football_matches)
-                    logger.info(f"Ottenute {len(open_football_matches)} partite da open_football")
-            except Exception as e:
-                error_msg = f"Errore nel recupero partite da open_football: {str(e)}"
-                logger.warning(error_msg)
-                errors.append(error_msg)
+            with self._deadline_track("source:open_football"):
+                try:
+                    open_football_matches = self.open_football_loader.get_matches(
+                        league=league_id,
+                        season=league.get('current_season', ''),
+                        from_date=date_from.isoformat(),
+                        to_date=date_to.isoformat()
+                    )
+                    if open_football_matches:
+                        raw_matches.extend(open_football_matches)
+                        source = 'open_football'
+                        logger.info(f"Ottenute {len(open_football_matches)} partite da open_football")
+                except Exception as e:
+                    error_msg = f"Errore nel recupero partite da open_football: {str(e)}"
+                    logger.warning(error_msg)
+                    errors.append(error_msg)
         
         # Se ancora non abbiamo dati, registra un errore critico
         if not raw_matches:
@@ -237,15 +401,90 @@ class DataCollector:
                 'message': error_msg,
                 'details': errors
             })
-            return []
+            return '', []
         
-        # Standardizza e arricchisci i dati
-        processed_matches = self.match_processor.process(raw_matches)
+        return source, raw_matches
+    
+    def prefetch_matches(self, league_ids: Optional[List[str]] = None, days_ahead: int = 7,
+                         days_behind: int = 3) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Scarica con una query globale le partite football-data di più campionati.
         
-        # Aggiorna timestamp di ultimo aggiornamento
-        self.db.get_reference(f"data/matches/{league_id}/last_updated").set(datetime.now().isoformat())
+        Usa la stessa finestra di date di collect_matches: le partite vengono
+        salvate nella cache di FootballDataAPI.get_matches, quindi le successive
+        chiamate a collect_matches per questi campionati non fanno richieste.
         
-        return processed_matches
+        Args:
+            league_ids: ID dei campionati (default: campionati attivi)
+            days_ahead: Giorni futuri da considerare
+            days_behind: Giorni passati da considerare
+            
+        Returns:
+            Dizionario ID campionato -> partite grezze
+        """
+        if league_ids is None:
+            league_ids = list(get_active_leagues().keys())
+        
+        # Codice football-data -> ID campionato
+        leagues_by_code = {}
+        for league_id in league_ids:
+            api_code = get_api_code(league_id, 'football_data')
+            if api_code:
+                leagues_by_code[api_code] = league_id
+        
+        if not leagues_by_code:
+            return {}
+        
+        now = get_current_datetime()
+        date_from = (now - timedelta(days=days_behind)).date()
+        date_to = (now + timedelta(days=days_ahead)).date()
+        
+        try:
+            matches_by_code = self.football_data_api.get_matches_multi(
+                list(leagues_by_code),
+                date_from=date_from.isoformat(),
+                date_to=date_to.isoformat()
+            )
+        except Exception as e:
+            logger.warning(f"Query globale football_data_api non riuscita, raccolta per campionato: {e}")
+            return {}
+        
+        logger.info(f"Prefetch partite completato per {len(matches_by_code)} campionati")
+        
+        return {leagues_by_code[code]: matches for code, matches in matches_by_code.items()}
+    
+    def collect_all_matches(self, league_ids: Optional[List[str]] = None, days_ahead: int = 7,
+                            days_behind: int = 3) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Raccoglie le partite di più campionati con una sola query football-data.
+        
+        Le partite sono divise per campionato e passate a MatchProcessor da
+        collect_matches; i campionati senza codice football-data o senza
+        partite nella risposta seguono la normale catena di fallback.
+        
+        Args:
+            league_ids: ID dei campionati (default: campionati attivi)
+            days_ahead: Giorni futuri da considerare
+            days_behind: Giorni passati da considerare
+            
+        Returns:
+            Dizionario ID campionato -> partite elaborate
+        """
+        if league_ids is None:
+            league_ids = list(get_active_leagues().keys())
+        
+        self.prefetch_matches(league_ids, days_ahead=days_ahead, days_behind=days_behind)
+        
+        results = {}
+        for league_id in league_ids:
+            try:
+                results[league_id] = self.collect_matches(league_id, days_ahead=days_ahead,
+                                                          days_behind=days_behind)
+            except Exception as e:
+                logger.error(f"Errore nella raccolta partite per {league_id}: {e}")
+                results[league_id] = []
+        
+        return results
     
     def collect_team_stats(self, team_id: str, detailed: bool = True) -> Dict[str, Any]:
         """
@@ -534,12 +773,14 @@ class DataCollector:
         
         return processed_standings
     
-    def collect_match_predictions(self, match_id: str) -> Dict[str, Any]:
+    def collect_match_predictions(self, match_id: str,
+                                  h2h_data: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Raccoglie pronostici per una partita specifica.
         
         Args:
             match_id: ID della partita
+            h2h_data: Scontri diretti già raccolti (se None vengono raccolti qui)
             
         Returns:
             Dizionario con pronostici
@@ -570,7 +811,8 @@ class DataCollector:
             away_team_stats = self.collect_team_stats(away_team_id)
         
         # Raccogli scontri diretti
-        h2h_data = self.collect_head_to_head(home_team_id, away_team_id)
+        if h2h_data is None:
+            h2h_data = self.collect_head_to_head(home_team_id, away_team_id)
         
         # Raccogli quote se disponibili
         odds_data = {}
@@ -597,6 +839,12 @@ class DataCollector:
         """
         Aggiorna tutti i dati relativi a un campionato.
         
+        L'aggiornamento è un grafo di task: partite e classifica partono
+        insieme; completate le partite vengono aggiunti un task per squadra e,
+        per ogni partita futura, gli scontri diretti (che dipendono solo dalla
+        partita) e il pronostico (che dipende dagli scontri diretti e dalle due
+        squadre). I tempi dei task sono in results['tasks'].
+        
         Args:
             league_id: ID del campionato
             
@@ -605,97 +853,322 @@ class DataCollector:
         """
         logger.info(f"Aggiornamento completo dati per campionato {league_id}")
         
-        results = {
-            'timestamp': datetime.now().isoformat(),
-            'league_id': league_id,
-            'matches': {'count': 0, 'success': False},
-            'standings': {'success': False},
-            'teams': {'count': 0, 'success': False},
-            'predictions': {'count': 0, 'success': False},
-            'errors': []
-        }
+        # Campionato già completato in un'esecuzione interrotta
+        if self.checkpoint:
+            saved = self.checkpoint.get(f"league:{league_id}", self._league_fingerprint(league_id))
+            if saved is not None:
+                logger.info(f"Campionato {league_id} già completato, ripreso dal checkpoint")
+                return dict(saved, resumed=True)
         
-        # Ottieni partite
-        try:
+        graph = TaskGraph(max_workers=get_setting('collector.stage_workers', 4), name=f"refresh_{league_id}")
+        self._league_graphs[league_id] = graph
+        
+        graph.add('matches', lambda: self._refresh_matches_task(graph, league_id))
+        graph.add('standings', self._checkpointed(f"{league_id}:standings", self._league_fingerprint(league_id),
+                                                  lambda: self._refresh_standings_task(league_id)))
+        graph.run()
+        
+        return self._finish_league_refresh(league_id, graph)
+    
+    def retry_league_refresh(self, league_id: str) -> Dict[str, Any]:
+        """
+        Riesegue solo i task falliti (e quelli che ne dipendono) dell'ultimo
+        aggiornamento di un campionato.
+        
+        Args:
+            league_id: ID del campionato
+            
+        Returns:
+            Dizionario con informazioni sulle operazioni svolte
+        """
+        graph = self._league_graphs.get(league_id)
+        if graph is None:
+            return self.refresh_league_data(league_id)
+        
+        logger.info(f"Riesecuzione dei task falliti per campionato {league_id}")
+        graph.rerun_failed()
+        
+        return self._finish_league_refresh(league_id, graph)
+    
+    def _refresh_matches_task(self, graph: TaskGraph, league_id: str) -> List[Dict[str, Any]]:
+        """Raccoglie e salva le partite, poi aggiunge al grafo i task che ne dipendono."""
+        # Se tutte le partite salvate sono ancora fresche non serve interrogare le fonti
+        matches = self._fresh_stored_matches(league_id)
+        if matches is not None:
+            logger.info(f"Partite di {league_id} ancora fresche, nessuna richiesta alle fonti")
+        
+        # In modalità delta vengono scritte solo le partite modificate
+        elif get_setting('collector.delta_sync', False):
+            matches = self.sync_matches(league_id)['matches']
+        else:
             matches = self.collect_matches(league_id)
-            results['matches']['count'] = len(matches)
-            results['matches']['success'] = len(matches) > 0
             
             # Salva partite in Firebase
             if matches:
                 matches_ref = self.db.get_reference(f"data/matches/{league_id}/items")
-                matches_ref.set({match['id']: match for match in matches})
-        except Exception as e:
-            error_msg = f"Errore nell'aggiornamento partite per {league_id}: {str(e)}"
-            logger.error(error_msg)
-            results['errors'].append(error_msg)
+                matches_ref.set({match['match_id']: match for match in matches if match.get('match_id')})
         
-        # Ottieni classifica
-        try:
-            standings = self.collect_league_standings(league_id)
-            results['standings']['success'] = bool(standings)
-            
-            # Salva classifica in Firebase
-            if standings:
-                standings_ref = self.db.get_reference(f"data/standings/{league_id}")
-                standings_ref.set(standings)
-        except Exception as e:
-            error_msg = f"Errore nell'aggiornamento classifica per {league_id}: {str(e)}"
-            logger.error(error_msg)
-            results['errors'].append(error_msg)
+        if matches and self.freshness:
+            self.freshness.mark('match', [match['match_id'] for match in matches if match.get('match_id')])
         
-        # Raccogli dati squadre
-        if results['matches']['success']:
-            # Estrai ID squadre dalle partite
-            team_ids = set()
-            for match in matches:
-                if 'home_team' in match and 'id' in match['home_team']:
-                    team_ids.add(match['home_team']['id'])
-                if 'away_team' in match and 'id' in match['away_team']:
-                    team_ids.add(match['away_team']['id'])
-            
-            # Ottieni statistiche per ogni squadra
-            success_count = 0
-            for team_id in team_ids:
-                try:
-                    team_stats = self.collect_team_stats(team_id)
-                    if team_stats:
-                        # Salva statistiche squadra in Firebase
-                        team_ref = self.db.get_reference(f"data/teams/{team_id}")
-                        team_ref.set(team_stats)
-                        success_count += 1
-                except Exception as e:
-                    error_msg = f"Errore nell'aggiornamento statistiche per squadra {team_id}: {str(e)}"
-                    logger.error(error_msg)
-                    results['errors'].append(error_msg)
+        if matches:
+            self._add_match_tasks(graph, league_id, matches)
+        
+        return matches
+    
+    def _add_match_tasks(self, graph: TaskGraph, league_id: str, matches: List[Dict[str, Any]]):
+        """Aggiunge i task per squadre, scontri diretti e pronostici delle partite."""
+        league_fp = self._league_fingerprint(league_id)
+        
+        # Partite future dalla più vicina al calcio d'inizio: i loro task entrano per primi nel grafo
+        now = get_current_datetime()
+        upcoming = [match for match in matches
+                    if match.get('datetime') and datetime.fromisoformat(match['datetime']) > now]
+        upcoming.sort(key=lambda match: datetime.fromisoformat(match['datetime']))
+        upcoming_ids = {id(match) for match in upcoming}
+        
+        # Prossimo calcio d'inizio di ogni squadra (riduce il TTL dei suoi dati)
+        team_kickoffs = {}
+        for match in upcoming:
+            for side in ('home_team', 'away_team'):
+                team_kickoffs.setdefault(match.get(side, {}).get('id'), datetime.fromisoformat(match['datetime']))
+        
+        # Statistiche per ogni squadra
+        for match in upcoming + [match for match in matches if id(match) not in upcoming_ids]:
+            for side in ('home_team', 'away_team'):
+                team_id = match.get(side, {}).get('id')
+                if team_id and not graph.has(f"team:{team_id}"):
+                    graph.add(f"team:{team_id}",
+                              self._checkpointed(f"{league_id}:team:{team_id}", league_fp,
+                                                 lambda team_id=team_id: self._refresh_team_task(
+                                                     team_id, team_kickoffs.get(team_id))),
+                              deps=['matches'])
+        
+        # Scontri diretti e pronostici solo per le partite future
+        for match in upcoming:
+            match_id = match.get('match_id')
+            home_team_id = match.get('home_team', {}).get('id')
+            away_team_id = match.get('away_team', {}).get('id')
+            if not match_id or not home_team_id or not away_team_id or graph.has(f"prediction:{match_id}"):
+                continue
             
-            results['teams']['count'] = success_count
-            results['teams']['success'] = success_count > 0
-        
-        # Raccogli pronostici per partite future
-        if results['matches']['success']:
-            # Filtra solo partite future
-            now = get_current_datetime()
-            future_matches = [m for m in matches if m.get('datetime') and datetime.fromisoformat(m['datetime']) > now]
+            # Il pronostico va ripetuto solo se la partita è cambiata
+            prediction_key = f"{league_id}:prediction:{match_id}"
+            prediction_fp = fingerprint(league_fp, self._content_hash(match))
             
-            # Ottieni pronostici per ogni partita
-            success_count = 0
-            for match in future_matches:
-                try:
-                    match_id = match['id']
-                    prediction_data = self.collect_match_predictions(match_id)
-                    if prediction_data:
-                        # Salva dati pronostici in Firebase
-                        prediction_ref = self.db.get_reference(f"data/predictions/{match_id}")
-                        prediction_ref.set(prediction_data)
-                        success_count += 1
-                except Exception as e:
-                    error_msg = f"Errore nella generazione pronostici per partita {match.get('id')}: {str(e)}"
-                    logger.error(error_msg)
-                    results['errors'].append(error_msg)
+            h2h_task = f"h2h:{match_id}"
+            graph.add(h2h_task,
+                      self._deadline_gated(f"{league_id}:h2h:{match_id}", "stage:predictions",
+                                           lambda home=home_team_id, away=away_team_id, key=prediction_key, fp=prediction_fp,
+                                           kickoff=datetime.fromisoformat(match['datetime']):
+                                           None if self._checkpoint_done(key, fp) else self._refresh_h2h_task(home, away, kickoff)),
+                      deps=['matches'])
+            graph.add(f"prediction:{match_id}",
+                      self._deadline_gated(prediction_key, "stage:predictions",
+                                           self._checkpointed(prediction_key, prediction_fp,
+                                                              lambda match_id=match_id, h2h_task=h2h_task: self._refresh_prediction_task(
+                                                                  match_id, graph.result(h2h_task)))),
+                      deps=[h2h_task, f"team:{home_team_id}", f"team:{away_team_id}"])
+    
+    def _refresh_standings_task(self, league_id: str) -> Dict[str, Any]:
+        if self._is_fresh('standings', league_id):
+            return {'fresh': True}
+        
+        standings = self.collect_league_standings(league_id)
+        
+        # Salva classifica in Firebase
+        if standings:
+            standings_ref = self.db.get_reference(f"data/standings/{league_id}")
+            standings_ref.set(standings)
+            self._mark_fresh('standings', league_id)
+        
+        return standings
+    
+    def _refresh_team_task(self, team_id: str, kickoff: Optional[datetime] = None) -> Dict[str, Any]:
+        if self._is_fresh('team', team_id, kickoff):
+            return {'fresh': True}
+        
+        team_stats = self.collect_team_stats(team_id)
+        
+        # Salva statistiche squadra in Firebase
+        if team_stats:
+            team_ref = self.db.get_reference(f"data/teams/{team_id}")
+            team_ref.set(team_stats)
+            self._mark_fresh('team', team_id)
+        
+        return team_stats
+    
+    def _refresh_h2h_task(self, home_team_id: str, away_team_id: str,
+                          kickoff: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Scontri diretti della coppia: quelli salvati se ancora freschi, altrimenti dalle fonti."""
+        pair = h2h_key(home_team_id, away_team_id)
+        items_ref = self.db.get_reference(f"data/head_to_head/{pair.replace(':', '_')}/items")
+        
+        if self._is_fresh('h2h', pair, kickoff):
+            stored = items_ref.get()
+            if stored is not None:
+                return stored
+        
+        h2h_data = self.collect_head_to_head(home_team_id, away_team_id)
+        if h2h_data:
+            items_ref.set(h2h_data)
+            self._mark_fresh('h2h', pair)
+        
+        return h2h_data
+    
+    def _is_fresh(self, entity_type: str, entity_id: str, kickoff: Optional[datetime] = None) -> bool:
+        return bool(self.freshness and self.freshness.is_fresh(entity_type, entity_id, kickoff))
+    
+    def _mark_fresh(self, entity_type: str, entity_id: str):
+        if self.freshness:
+            self.freshness.mark(entity_type, entity_id)
+    
+    def _fresh_stored_matches(self, league_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Restituisce le partite salvate del campionato se sono tutte ancora fresche.
+        
+        Returns:
+            Lista di partite o None se almeno una è scaduta (o non ce ne sono)
+        """
+        if not self.freshness:
+            return None
+        
+        try:
+            stored = self.db.get_reference(f"data/matches/{league_id}/items").get()
+        except Exception as e:
+            logger.warning(f"Impossibile leggere le partite salvate di {league_id}: {e}")
+            return None
+        if not stored:
+            return None
+        
+        matches = list(stored.values()) if isinstance(stored, dict) else list(stored)
+        for match in matches:
+            kickoff = datetime.fromisoformat(match['datetime']) if match.get('datetime') else None
+            if not match.get('match_id') or not self.freshness.is_fresh('match', match['match_id'], kickoff):
+                return None
+        return matches
+    
+    def _refresh_prediction_task(self, match_id: str, h2h_data: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+        prediction_data = self.collect_match_predictions(match_id, h2h_data=h2h_data)
+        
+        # Salva dati pronostici in Firebase
+        if prediction_data:
+            prediction_ref = self.db.get_reference(f"data/predictions/{match_id}")
+            prediction_ref.set(prediction_data)
+        
+        return prediction_data
+    
+    def start_checkpoint(self, resume: bool = False, name: str = "collection") -> RunCheckpoint:
+        """
+        Attiva i checkpoint per le esecuzioni successive.
+        
+        Args:
+            resume: Se True mantiene i checkpoint validi e salta il lavoro già
+                completato; se False riparte da zero (registrando comunque i progressi)
+            name: Nome dell'esecuzione
             
-            results['predictions']['count'] = success_count
-            results['predictions']['success'] = success_count > 0
+        Returns:
+            Registro dei checkpoint in uso
+        """
+        if self.checkpoint is None or self.checkpoint.name != name:
+            self.checkpoint = RunCheckpoint(name)
+        if not resume:
+            self.checkpoint.clear()
+        else:
+            logger.info(f"Ripresa dal checkpoint: {self.checkpoint.count('league:')} campionati già completati")
+        return self.checkpoint
+    
+    def _league_fingerprint(self, league_id: str) -> str:
+        # La finestra di date cambia ogni giorno: i checkpoint di ieri non valgono oggi
+        return fingerprint(league_id, get_current_datetime().date(), 7, 3)
+    
+    def _checkpoint_done(self, key: str, fp: str) -> bool:
+        saved = self.checkpoint.get(key, fp) if self.checkpoint else None
+        return bool(saved and saved.get('ok'))
+    
+    def _checkpointed(self, key: str, fp: str, fn: Callable[[], Any]) -> Callable[[], Any]:
+        """
+        Avvolge un task in modo che venga saltato se già completato con la stessa impronta.
+        
+        Solo i risultati non vuoti sono registrati: un task che non ha prodotto
+        dati viene rieseguito alla ripresa.
+        """
+        def run():
+            if self.checkpoint:
+                saved = self.checkpoint.get(key, fp)
+                # Voci senza risultato (registrate da versioni precedenti) non contano
+                if saved is not None and saved.get('ok'):
+                    return {'resumed': True}
+            result = fn()
+            if self.checkpoint and result:
+                self.checkpoint.mark_done(key, fp, {'ok': True})
+            return result
+        return run
+    
+    def set_deadline(self, deadline: Optional[RunDeadline]):
+        """
+        Imposta la scadenza delle esecuzioni successive (None per rimuoverla).
+        
+        Vicino alla scadenza le fonti di fallback, i campionati a bassa
+        priorità e i pronostici delle partite più lontane vengono rimandati
+        e riportati nel report dell'esecuzione.
+        
+        Args:
+            deadline: Scadenza con i budget per fase e per fonte
+        """
+        self.deadline = deadline
+        self.match_processor.deadline = deadline
+    
+    def _deadline_allows(self, kind: str, item: str, name: str, priority: int) -> bool:
+        """Verifica la scadenza per un lavoro e lo registra come rimandato se non c'è tempo."""
+        if self.deadline is None or self.deadline.allows(name, priority):
+            return True
+        self.deadline.defer(kind, item)
+        return False
+    
+    def _deadline_track(self, name: str):
+        return self.deadline.track(name) if self.deadline else nullcontext()
+    
+    def _deadline_gated(self, key: str, name: str, fn: Callable[[], Any],
+                        priority: int = PRIORITY_NORMAL) -> Callable[[], Any]:
+        """Avvolge un task in modo che venga rimandato (risultato None) se la scadenza non lo consente."""
+        def run():
+            if not self._deadline_allows('task', key, name, priority):
+                return None
+            with self._deadline_track(name):
+                return fn()
+        return run
+    
+    def _finish_league_refresh(self, league_id: str, graph: TaskGraph) -> Dict[str, Any]:
+        """Costruisce il riepilogo dal grafo e registra l'aggiornamento."""
+        matches = graph.result('matches') or []
+        teams_done = [t for t in graph.tasks(STATUS_DONE, prefix='team:') if t.result]
+        predictions_done = [t for t in graph.tasks(STATUS_DONE, prefix='prediction:') if t.result]
+        
+        results = {
+            'timestamp': datetime.now().isoformat(),
+            'league_id': league_id,
+            'matches': {'count': len(matches), 'success': len(matches) > 0},
+            'standings': {'success': bool(graph.result('standings'))},
+            'teams': {'count': len(teams_done), 'success': len(teams_done) > 0},
+            'predictions': {'count': len(predictions_done), 'success': len(predictions_done) > 0},
+            'fresh': {
+                'standings': bool((graph.result('standings') or {}).get('fresh')),
+                'teams': len([t for t in teams_done if isinstance(t.result, dict) and t.result.get('fresh')])
+            },
+            'tasks': graph.get_timings(),
+            'errors': [f"Errore nel task {task.name}: {task.error}" for task in graph.tasks(STATUS_FAILED)],
+            'deferred': [d['item'] for d in (self.deadline.deferred('task') if self.deadline else [])
+                         if d['item'].startswith(f"{league_id}:")]
+        }
+        
+        # Checkpoint del campionato solo se tutti i task sono riusciti con dati e nessuno è stato
+        # rimandato: altrimenti la ripresa salterebbe il campionato senza rieseguirli
+        empty = [t.name for t in graph.tasks(STATUS_DONE) if not t.result
+                 and (t.name == 'standings' or t.name.startswith(('team:', 'prediction:')))]
+        if self.checkpoint and not results['errors'] and not results['deferred'] and not empty:
+            self.checkpoint.mark_done(f"league:{league_id}", self._league_fingerprint(league_id),
+                                      {k: v for k, v in results.items() if k != 'tasks'})
         
         # Aggiorna timestamp di ultimo aggiornamento completo
         self.db.get_reference(f"data/leagues/{league_id}/last_full_update").set(datetime.now().isoformat())
@@ -705,16 +1178,34 @@ class DataCollector:
         
         logger.info(f"Aggiornamento completato per {league_id}: {results['matches']['count']} partite, " + 
                     f"{results['teams']['count']} squadre, {results['predictions']['count']} pronostici, " +
-                    f"{len(results['errors'])} errori")
+                    f"{len(results['errors'])} errori, {len(results['deferred'])} rimandati " +
+                    f"in {results['tasks']['duration']}s")
         
         return results
     
-    def refresh_all_leagues(self, active_only: bool = True) -> Dict[str, Any]:
+    def refresh_all_leagues(self, active_only: bool = True, parallel: Optional[bool] = None,
+                            max_workers: Optional[int] = None, resume: bool = False,
+                            deadline: Optional[RunDeadline] = None) -> Dict[str, Any]:
         """
         Aggiorna i dati per tutti i campionati.
         
+        In modalità parallela i campionati sono aggiornati da un pool di worker
+        limitato da request_semaphore, mentre le singole richieste restano
+        soggette ai limiti per host condivisi. I risultati di ogni campionato
+        sono uniti per intero e nell'ordine dei campionati, indipendentemente
+        dall'ordine di completamento.
+        
+        I campionati sono aggiornati in ordine di urgenza (vedi
+        build_collection_queue). Con una scadenza quelli a bassa priorità
+        (deadline.low_priority_from) vengono rimandati per primi; il lavoro
+        rimandato è elencato in results['deferred'].
+        
         Args:
             active_only: Se aggiornare solo i campionati attivi
+            parallel: Se aggiornare i campionati in parallelo (default: collector.parallel_leagues)
+            max_workers: Numero di worker del pool (default: collector.max_workers)
+            resume: Se riprendere dall'ultimo checkpoint saltando il lavoro completato
+            deadline: Scadenza dell'esecuzione (default: quella impostata con set_deadline)
             
         Returns:
             Dizionario con risultati per ogni campionato
@@ -723,39 +1214,64 @@ class DataCollector:
         
         # Ottieni campionati
         leagues = get_active_leagues() if active_only else get_league(None)
+        league_ids = list(leagues.keys())
+        
+        if deadline is not None:
+            self.set_deadline(deadline)
+        
+        # Con una scadenza i campionati a bassa priorità vengono rimandati per primi
+        priorities = {league_id: PRIORITY_NORMAL for league_id in league_ids}
+        if self.deadline:
+            low_from = get_setting('deadline.low_priority_from', 50)
+            priorities = {league_id: PRIORITY_LOW if leagues[league_id].get('priority', 999) >= low_from
+                          else PRIORITY_NORMAL for league_id in league_ids}
+        
+        if parallel is None:
+            parallel = get_setting('collector.parallel_leagues', False)
+        
+        if resume or get_setting('collector.checkpoints', True):
+            self.start_checkpoint(resume=resume)
         
         results = {
             'timestamp': datetime.now().isoformat(),
+            'mode': 'parallel' if parallel else 'sequential',
             'leagues_count': len(leagues),
             'leagues_processed': 0,
             'leagues_success': 0,
             'total_matches': 0,
             'total_teams': 0,
             'total_predictions': 0,
+            'leagues_resumed': 0,
+            'leagues_deferred': 0,
             'errors': []
         }
         
+        # Una sola query football-data per le partite di tutti i campionati
+        prefetched = {}
+        if get_setting('collector.cross_league_matches', True):
+            prefetched = self.prefetch_matches(league_ids)
+        
+        # Campionati in ordine di urgenza invece che nell'ordine della configurazione
+        queue = self.build_collection_queue(league_ids, prefetched)
+        results['queue'] = [item.to_dict() for item in queue.items()]
+        league_ids = [item.league_id for item in queue.drain()]
+        
         # Aggiorna ogni campionato
-        for league_id, league_data in leagues.items():
-            try:
-                league_result = self.refresh_league_data(league_id)
-                
-                # Aggiorna contatori
-                results['leagues_processed'] += 1
-                if not league_result.get('errors'):
-                    results['leagues_success'] += 1
-                
-                results['total_matches'] += league_result.get('matches', {}).get('count', 0)
-                results['total_teams'] += league_result.get('teams', {}).get('count', 0)
-                results['total_predictions'] += league_result.get('predictions', {}).get('count', 0)
-                
-                # Aggiungi eventuali errori
-                for error in league_result.get('errors', []):
-                    results['errors'].append(f"[{league_id}] {error}")
-            except Exception as e:
-                error_msg = f"Errore nell'aggiornamento campionato {league_id}: {str(e)}"
-                logger.error(error_msg)
-                results['errors'].append(error_msg)
+        if parallel and len(league_ids) > 1:
+            workers = min(max_workers or self.max_workers, len(league_ids))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="league") as executor:
+                futures = [executor.submit(self._refresh_league_guarded, league_id, priorities[league_id])
+                           for league_id in league_ids]
+                outcomes = [future.result() for future in futures]
+        else:
+            outcomes = [self._refresh_league_guarded(league_id, priorities[league_id]) for league_id in league_ids]
+        
+        for league_id, (league_result, error_msg) in zip(league_ids, outcomes):
+            self._merge_league_result(results, league_id, league_result, error_msg)
+        
+        if self.deadline:
+            results['deadline'] = self.deadline.report()
+            results['deferred'] = results['deadline']['deferred']
         
         # Aggiorna timestamp di ultimo aggiornamento completo
         self.db.get_reference("data/last_full_update").set(datetime.now().isoformat())
@@ -765,10 +1281,102 @@ class DataCollector:
         
         logger.info(f"Aggiornamento completo: {results['leagues_success']}/{results['leagues_count']} campionati, " +
                    f"{results['total_matches']} partite, {results['total_teams']} squadre, " +
-                   f"{results['total_predictions']} pronostici, {len(results['errors'])} errori")
+                   f"{results['total_predictions']} pronostici, {len(results['errors'])} errori, " +
+                   f"{results['leagues_deferred']} campionati rimandati")
         
         return results
     
+    def build_collection_queue(self, league_ids: Optional[List[str]] = None,
+                               prefetched: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> CollectionQueue:
+        """
+        Costruisce la coda di urgenza dei campionati da aggiornare.
+        
+        Il prossimo calcio d'inizio viene dalle partite già scaricate con
+        prefetch_matches o, in mancanza, da quelle salvate in Firebase; l'età
+        dei dati dall'ultimo aggiornamento completo del campionato.
+        
+        Args:
+            league_ids: ID dei campionati (default: campionati attivi)
+            prefetched: Partite grezze per campionato (risultato di prefetch_matches)
+            
+        Returns:
+            Coda con un lavoro per campionato
+        """
+        if league_ids is None:
+            league_ids = list(get_active_leagues().keys())
+        prefetched = prefetched or {}
+        
+        now = get_current_datetime()
+        ranks = league_ranks()
+        publish_hours = get_setting('publishing.hours_before_match', 12)
+        
+        queue = CollectionQueue()
+        for league_id in league_ids:
+            matches = prefetched.get(league_id)
+            last_update = None
+            try:
+                if not matches:
+                    stored = self.db.get_reference(f"data/matches/{league_id}/items").get() or {}
+                    matches = list(stored.values()) if isinstance(stored, dict) else list(stored)
+                last_update = parse_timestamp(
+                    self.db.get_reference(f"data/leagues/{league_id}/last_full_update").get(), now)
+            except Exception as e:
+                logger.warning(f"Impossibile leggere lo stato del campionato {league_id} per la coda: {e}")
+            
+            queue.push(WorkItem(league_id,
+                                next_kickoff=next_kickoff(matches or [], now),
+                                league_rank=ranks.get(league_id, len(ranks)),
+                                last_update=last_update,
+                                now=now,
+                                publish_hours=publish_hours))
+        
+        return queue
+    
+    def _refresh_league_guarded(self, league_id: str, priority: int = PRIORITY_NORMAL
+                                ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Aggiorna un campionato occupando uno slot di request_semaphore.
+        
+        Returns:
+            Tupla (risultato, None) oppure (None, messaggio di errore)
+        """
+        with self.request_semaphore:
+            # La scadenza è verificata all'acquisizione dello slot, non all'invio al pool
+            if not self._deadline_allows('league', league_id, f"league:{league_id}", priority):
+                return {'league_id': league_id, 'deferred_league': True}, None
+            try:
+                return self.refresh_league_data(league_id), None
+            except Exception as e:
+                error_msg = f"Errore nell'aggiornamento campionato {league_id}: {str(e)}"
+                logger.error(error_msg)
+                return None, error_msg
+    
+    def _merge_league_result(self, results: Dict[str, Any], league_id: str,
+                             league_result: Optional[Dict[str, Any]], error_msg: Optional[str]):
+        """Aggiunge ai totali il risultato di un campionato."""
+        if league_result is None:
+            results['errors'].append(error_msg)
+            return
+        
+        if league_result.get('deferred_league'):
+            results['leagues_deferred'] += 1
+            return
+        
+        # Aggiorna contatori
+        results['leagues_processed'] += 1
+        if league_result.get('resumed'):
+            results['leagues_resumed'] += 1
+        if not league_result.get('errors'):
+            results['leagues_success'] += 1
+        
+        results['total_matches'] += league_result.get('matches', {}).get('count', 0)
+        results['total_teams'] += league_result.get('teams', {}).get('count', 0)
+        results['total_predictions'] += league_result.get('predictions', {}).get('count', 0)
+        
+        # Aggiungi eventuali errori
+        for error in league_result.get('errors', []):
+            results['errors'].append(f"[{league_id}] {error}")
+    
     def collect_data_for_match(self, match_id: str) -> Dict[str, Any]:
         """
         Raccoglie tutti i dati necessari per una specifica partita.
@@ -846,17 +1454,20 @@ class DataCollector:
 
 # Funzioni di utility globali
 
-def collect_league_data(league_id: str) -> Dict[str, Any]:
+def collect_league_data(league_id: str, resume: bool = False) -> Dict[str, Any]:
     """
     Funzione di utility per raccogliere dati di un campionato.
     
     Args:
         league_id: ID del campionato
+        resume: Se saltare il lavoro già completato in un'esecuzione interrotta
         
     Returns:
         Risultato dell'operazione
     """
     collector = DataCollector()
+    if resume:
+        collector.start_checkpoint(resume=True)
     return collector.refresh_league_data(league_id)
 
 def collect_match_data(match_id: str) -> Dict[str, Any]:
@@ -872,15 +1483,16 @@ def collect_match_data(match_id: str) -> Dict[str, Any]:
     collector = DataCollector()
     return collector.collect_data_for_match(match_id)
 
-def collect_all_leagues_data(active_only: bool = True) -> Dict[str, Any]:
+def collect_all_leagues_data(active_only: bool = True, resume: bool = False) -> Dict[str, Any]:
     """
     Funzione di utility per raccogliere dati di tutti i campionati.
     
     Args:
         active_only: Se raccogliere dati solo per campionati attivi
+        resume: Se riprendere dall'ultimo checkpoint
         
     Returns:
         Risultato dell'operazione
     """
     collector = DataCollector()
-    return collector.refresh_all_leagues(active_only)
+    return collector.refresh_all_leagues(active_only, resume=resume)
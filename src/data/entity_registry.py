@@ -0,0 +1,257 @@
+"""
+Registro canonico delle entità (squadre e competizioni) tra le fonti.
+Ogni entità ha un ID canonico, un nome, gli alias e gli ID che le assegna
+ciascuna fonte. Il registro è salvato in locale in un file JSON compatto,
+caricato una sola volta per processo e indicizzato in memoria, quindi ogni
+risoluzione da (fonte, id) o da un alias è una lettura di dizionario, senza
+confronti approssimati. I nomi sono confrontati nella forma di
+text_utils.normalize_team_name, l'unica normalizzazione usata per le chiavi.
+"""
+import os
+import json
+import atexit
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+from src.utils.text_utils import normalize_team_name
+
+logger = logging.getLogger(__name__)
+
+ENTITY_TEAM = 'team'
+ENTITY_COMPETITION = 'competition'
+ENTITY_TYPES = (ENTITY_TEAM, ENTITY_COMPETITION)
+
+# Nomi delle fonti nella configurazione -> nomi usati dai processori
+CONFIG_SOURCE_NAMES = {
+    'rapidapi_football': 'api_football',
+}
+
+
+def alias_key(name: Any) -> str:
+    """Forma di un nome usata come chiave degli alias."""
+    return normalize_team_name(str(name)) if name else ''
+
+
+class EntityRegistry:
+    """
+    Registro delle entità con indici (fonte, id) -> ID canonico e
+    alias -> ID canonico.
+
+    Un alias condiviso da due entità diverse è ambiguo e non viene risolto:
+    in quel caso il chiamante deve usare l'ID della fonte.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Percorso del file (default: ~/football-predictions/cache/entities.json)
+        """
+        if not path:
+            cache_dir = os.path.expanduser("~/football-predictions/cache")
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, "entities.json")
+        self.path = path
+        self._entities: Dict[str, Dict[str, Dict[str, Any]]] = {t: {} for t in ENTITY_TYPES}
+        self._by_source: Dict[Tuple[str, str, str], str] = {}
+        self._by_alias: Dict[Tuple[str, str], Optional[str]] = {}
+        self._dirty = False
+        self._lock = threading.RLock()
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Errore nel caricare il registro delle entità da {self.path}: {e}")
+            return
+
+        for entity_type, entities in data.items():
+            if entity_type not in self._entities:
+                continue
+            for canonical_id, entity in entities.items():
+                self._register(entity_type, canonical_id, entity.get('name'),
+                               entity.get('source_ids'), entity.get('aliases'))
+        self._dirty = False
+        logger.info(f"Caricate {len(self)} entità dal registro {self.path}")
+
+    def register(self, entity_type: str, canonical_id: str, name: Optional[str] = None,
+                 source_ids: Optional[Dict[str, Any]] = None,
+                 aliases: Optional[Iterable[str]] = None) -> bool:
+        """
+        Registra un'entità o aggiunge ID di fonti e alias a una esistente.
+
+        Args:
+            entity_type: 'team' o 'competition'
+            canonical_id: ID canonico dell'entità
+            name: Nome principale (sostituisce quello precedente)
+            source_ids: Fonte -> ID nella fonte
+            aliases: Nomi alternativi
+
+        Returns:
+            True se il registro è cambiato
+        """
+        if entity_type not in self._entities or not canonical_id:
+            return False
+        with self._lock:
+            changed = self._register(entity_type, str(canonical_id), name, source_ids, aliases)
+            self._dirty = self._dirty or changed
+            return changed
+
+    def _register(self, entity_type: str, canonical_id: str, name: Optional[str],
+                  source_ids: Optional[Dict[str, Any]], aliases: Optional[Iterable[str]]) -> bool:
+        entity = self._entities[entity_type].get(canonical_id)
+        changed = entity is None
+        if entity is None:
+            entity = {'name': name or canonical_id, 'aliases': [], 'source_ids': {}}
+            self._entities[entity_type][canonical_id] = entity
+        elif name and entity['name'] != name:
+            # Il nome precedente resta come alias
+            if entity['name'] not in entity['aliases'] and entity['name'] != canonical_id:
+                entity['aliases'].append(entity['name'])
+            entity['name'] = name
+            changed = True
+
+        for source, source_id in (source_ids or {}).items():
+            if not source or source_id in (None, ''):
+                continue
+            source_id = str(source_id)
+            key = (entity_type, source, source_id)
+            previous = self._by_source.get(key)
+            if previous is not None and previous != canonical_id:
+                logger.debug(f"ID {source}:{source_id} di {previous} assegnato anche a {canonical_id}")
+            # A parità di ID nella fonte vale l'ultima entità registrata
+            self._by_source[key] = canonical_id
+            if entity['source_ids'].get(source) != source_id:
+                entity['source_ids'][source] = source_id
+                changed = True
+
+        for alias in [entity['name'], canonical_id, *(aliases or [])]:
+            key = alias_key(alias)
+            if not key:
+                continue
+            if alias != entity['name'] and alias != canonical_id and alias not in entity['aliases']:
+                entity['aliases'].append(alias)
+                changed = True
+            current = self._by_alias.get((entity_type, key), canonical_id)
+            # Un alias già assegnato a un'altra entità diventa ambiguo
+            self._by_alias[(entity_type, key)] = current if current == canonical_id else None
+        return changed
+
+    def resolve(self, entity_type: str, source: str, source_id: Any) -> Optional[str]:
+        """
+        ID canonico di un'entità a partire dall'ID di una fonte.
+
+        Args:
+            entity_type: 'team' o 'competition'
+            source: Nome della fonte
+            source_id: ID dell'entità nella fonte
+
+        Returns:
+            ID canonico o None se sconosciuto
+        """
+        if source_id in (None, ''):
+            return None
+        return self._by_source.get((entity_type, source, str(source_id)))
+
+    def resolve_name(self, entity_type: str, name: str) -> Optional[str]:
+        """
+        ID canonico di un'entità a partire dal nome o da un alias.
+
+        Args:
+            entity_type: 'team' o 'competition'
+            name: Nome o alias
+
+        Returns:
+            ID canonico o None se sconosciuto o ambiguo
+        """
+        return self._by_alias.get((entity_type, alias_key(name)))
+
+    def source_id(self, entity_type: str, canonical_id: str, source: str) -> Optional[str]:
+        """ID di un'entità in una fonte, o None se non registrato."""
+        entity = self._entities.get(entity_type, {}).get(str(canonical_id))
+        return entity['source_ids'].get(source) if entity else None
+
+    def get(self, entity_type: str, canonical_id: str) -> Optional[Dict[str, Any]]:
+        """Voce del registro di un'entità (nome, alias e ID delle fonti)."""
+        return self._entities.get(entity_type, {}).get(str(canonical_id))
+
+    def canonical_name(self, entity_type: str, name: str) -> Optional[str]:
+        """Nome principale dell'entità a cui corrisponde un nome o alias."""
+        canonical_id = self.resolve_name(entity_type, name)
+        return self._entities[entity_type][canonical_id]['name'] if canonical_id else None
+
+    def seed_competitions(self) -> int:
+        """
+        Registra le competizioni configurate in src.config.leagues, con i
+        codici delle fonti (anche con il nome usato dai processori) e i nomi
+        alternativi.
+
+        Returns:
+            Numero di competizioni nuove o modificate
+        """
+        from src.config.leagues import LEAGUES, LEAGUE_NAME_MAP
+
+        aliases: Dict[str, List[str]] = {}
+        for league_name, league_key in LEAGUE_NAME_MAP.items():
+            aliases.setdefault(league_key, []).append(league_name)
+
+        changed = 0
+        for league_id, league in LEAGUES.items():
+            codes = dict(league.get('api_codes') or {})
+            for config_name, source in CONFIG_SOURCE_NAMES.items():
+                if config_name in codes:
+                    codes.setdefault(source, codes[config_name])
+            if self.register(ENTITY_COMPETITION, league_id, league.get('name'),
+                             codes, aliases.get(league_id)):
+                changed += 1
+        return changed
+
+    def save(self) -> bool:
+        """
+        Scrive il registro su file se è cambiato (scrittura atomica).
+
+        Returns:
+            True se non c'era nulla da scrivere o la scrittura è riuscita
+        """
+        with self._lock:
+            if not self._dirty:
+                return True
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._entities, f, ensure_ascii=False, separators=(',', ':'))
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.error(f"Errore nel salvare il registro delle entità su {self.path}: {e}")
+                return False
+            self._dirty = False
+            return True
+
+    def __len__(self) -> int:
+        return sum(len(entities) for entities in self._entities.values())
+
+
+# Registro condiviso da tutti i componenti del processo
+_registry: Optional[EntityRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> EntityRegistry:
+    """
+    Restituisce il registro delle entità del processo, caricandolo alla prima
+    chiamata e registrando le competizioni configurate.
+
+    Returns:
+        Istanza condivisa di EntityRegistry
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = EntityRegistry()
+            _registry.seed_competitions()
+            atexit.register(_registry.save)
+        return _registry
@@ -0,0 +1,163 @@
+"""
+Registro di freschezza dei dati per singola entità.
+Per ogni partita, squadra, classifica e coppia di scontri diretti registra
+quando è stata aggiornata l'ultima volta; prima di ogni richiesta il
+collector verifica se l'entità è ancora valida secondo il TTL del suo tipo
+di dato (get_cache_ttl_for_data_type) e aggiorna solo quelle scadute.
+Avvicinandosi al calcio d'inizio il TTL si riduce automaticamente.
+"""
+import os
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterable
+
+from src.config.settings import get_setting
+from src.config.sources import get_cache_ttl_for_data_type
+
+logger = logging.getLogger(__name__)
+
+# Tipo di entità -> tipo di dato di sources.DATA_TYPE_CONFIG
+ENTITY_DATA_TYPES = {
+    'match': 'matches',
+    'team': 'teams',
+    'standings': 'standings',
+    'h2h': 'historical_data'
+}
+
+
+def h2h_key(team1_id: str, team2_id: str) -> str:
+    """Chiave della coppia di scontri diretti, indipendente dall'ordine delle squadre."""
+    return ":".join(sorted((str(team1_id), str(team2_id))))
+
+
+class FreshnessLedger:
+    """
+    Registro SQLite dell'ultimo aggiornamento di ogni entità.
+
+    Il TTL di base è quello del tipo di dato; entro
+    freshness.kickoff_window ore dal calcio d'inizio viene ridotto in
+    proporzione al tempo rimanente, fino a freshness.min_ttl secondi
+    (valore usato anche durante la partita).
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: Percorso del database (default: ~/football-predictions/cache/freshness.db)
+        """
+        if not db_path:
+            cache_dir = os.path.expanduser("~/football-predictions/cache")
+            os.makedirs(cache_dir, exist_ok=True)
+            db_path = os.path.join(cache_dir, "freshness.db")
+        self.db_path = db_path
+        self.kickoff_window = get_setting('freshness.kickoff_window', 24)
+        self.min_ttl = get_setting('freshness.min_ttl', 300)
+        self.match_duration = get_setting('freshness.match_duration', 3)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._init_db()
+
+    def _init_db(self):
+        with self._conn:
+            self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS freshness (
+                entity_type TEXT NOT NULL,
+                entity_id TEXT NOT NULL,
+                refreshed_at REAL NOT NULL,
+                PRIMARY KEY (entity_type, entity_id)
+            )
+            ''')
+
+    def ttl(self, entity_type: str, kickoff: Optional[datetime] = None,
+            now: Optional[datetime] = None) -> float:
+        """
+        TTL in secondi di un'entità.
+
+        Args:
+            entity_type: 'match', 'team', 'standings' o 'h2h'
+            kickoff: Prossimo calcio d'inizio che riguarda l'entità (opzionale)
+            now: Istante di riferimento con lo stesso fuso di kickoff
+
+        Returns:
+            Secondi di validità
+        """
+        base = get_cache_ttl_for_data_type(ENTITY_DATA_TYPES.get(entity_type, entity_type))
+        if kickoff is None:
+            return base
+
+        now = now or datetime.now(kickoff.tzinfo)
+        hours_to_kickoff = (kickoff - now).total_seconds() / 3600
+        if hours_to_kickoff >= self.kickoff_window:
+            return base
+        if hours_to_kickoff <= 0:
+            # Partita in corso: dati al minimo TTL, poi di nuovo il TTL di base
+            return self.min_ttl if -hours_to_kickoff < self.match_duration else base
+        return max(self.min_ttl, min(base, base * hours_to_kickoff / self.kickoff_window))
+
+    def age(self, entity_type: str, entity_id: str) -> Optional[float]:
+        """Secondi dall'ultimo aggiornamento (None se mai aggiornata)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT refreshed_at FROM freshness WHERE entity_type = ? AND entity_id = ?",
+                (entity_type, str(entity_id))
+            ).fetchone()
+        return time.time() - row[0] if row else None
+
+    def is_fresh(self, entity_type: str, entity_id: str, kickoff: Optional[datetime] = None) -> bool:
+        """Verifica se l'entità è stata aggiornata entro il suo TTL."""
+        age = self.age(entity_type, entity_id)
+        return age is not None and age < self.ttl(entity_type, kickoff)
+
+    def stale(self, entity_type: str, entity_ids: Iterable[str],
+              kickoffs: Optional[Dict[str, datetime]] = None) -> List[str]:
+        """Filtra gli ID delle entità scadute o mai aggiornate."""
+        kickoffs = kickoffs or {}
+        return [entity_id for entity_id in entity_ids
+                if not self.is_fresh(entity_type, entity_id, kickoffs.get(entity_id))]
+
+    def mark(self, entity_type: str, entity_ids: Iterable[str]):
+        """Registra l'aggiornamento di una o più entità dello stesso tipo."""
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO freshness (entity_type, entity_id, refreshed_at) VALUES (?, ?, ?)",
+                [(entity_type, str(entity_id), now) for entity_id in entity_ids]
+            )
+
+    def invalidate(self, entity_type: str, entity_id: str):
+        """Forza l'aggiornamento dell'entità alla prossima esecuzione."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM freshness WHERE entity_type = ? AND entity_id = ?",
+                               (entity_type, str(entity_id)))
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Riepilogo per tipo di entità rispetto al TTL di base.
+
+        Returns:
+            Dizionario tipo -> {'count', 'stale', 'max_age_hours'}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT entity_type, refreshed_at FROM freshness"
+            ).fetchall()
+
+        now = time.time()
+        summary = {}
+        for entity_type, refreshed_at in rows:
+            entry = summary.setdefault(entity_type, {'count': 0, 'stale': 0, 'max_age_hours': 0.0})
+            age = now - refreshed_at
+            entry['count'] += 1
+            if age >= self.ttl(entity_type):
+                entry['stale'] += 1
+            entry['max_age_hours'] = max(entry['max_age_hours'], round(age / 3600, 2))
+        return summary
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
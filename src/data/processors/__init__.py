@@ -3,7 +3,7 @@ Package processors per l'elaborazione e la normalizzazione dei dati calcistici.
 Questo package fornisce funzionalità per elaborare, normalizzare e arricchire
 i dati raccolti da varie fonti, producendo un formato standardizzato per l'analisi.
 """
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterator, Tuple
 from datetime import datetime, timedelta
 import logging
 
@@ -26,6 +26,7 @@ from src.data.processors.xg_processor import (
     XGProcessor,
     process_match_xg,
     get_team_xg_history,
+    get_league_xg_summary,
     predict_match_xg
 )
 from src.data.processors.standings import (
@@ -33,7 +34,16 @@ from src.data.processors.standings import (
     process_league_standings,
     get_team_standing,
     get_team_form,
+    get_standings_as_of,
 )
+from src.data.processors.form_table import (
+    LeagueFormTable,
+    get_league_form,
+    form_table_as_of,
+)
+from src.data.processors.league_history import get_result_history
+from src.data.processors.batch import prefetch, stream_batch, failed_batch
+from src.utils.database import FirebaseManager
 
 # =============================================================================
 # FUNZIONI DI UTILITÀ UNIFICATE
@@ -277,18 +287,41 @@ def get_standings_history(team_id: str, league_id: str) -> Dict[str, Any]:
     """
     return get_team_standing(team_id, league_id)
 
-def calculate_form_table(league_id: str, last_n_matches: int = 5) -> List[Dict[str, Any]]:
+def calculate_form_table(league_id: str, last_n_matches: int = 5,
+                         as_of: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Calcola la classifica basata sulla forma recente.
     
+    La forma di tutte le squadre viene calcolata insieme dallo storico locale
+    dei risultati e la tabella del campionato è salvata in form_tables/<league_id>;
+    se lo storico non ha risultati del campionato si usa la forma delle classifiche.
+    
     Args:
         league_id: ID del campionato
         last_n_matches: Numero di partite recenti da considerare
+        as_of: Data (AAAA-MM-GG) per la forma a una data passata (opzionale)
     
     Returns:
         Classifica basata sulla forma
     """
-    # Implementazione semplificata
+    db = FirebaseManager()
+    if as_of:
+        form_table = form_table_as_of(get_result_history(db), league_id, as_of, last_n_matches)
+    else:
+        form_table = get_league_form(db, league_id, last_n_matches).table()
+        if form_table["teams"]:
+            try:
+                db.set(f"form_tables/{league_id}", form_table)
+            except Exception as e:
+                logger.error(f"Errore nel salvare la tabella della forma di {league_id}: {e}")
+    
+    if form_table["teams"] or as_of:
+        rows = [dict(row, recent_points=sum(1 if r == 'W' else 0.5 if r == 'D' else 0 for r in row["form"]))
+                for row in form_table["teams"]]
+        rows.sort(key=lambda x: x.get("recent_points", 0), reverse=True)
+        return rows
+    
+    # Storico locale vuoto: forma dalle classifiche delle fonti
     all_teams = get_current_standings(league_id)
     form_standings = []
     
@@ -393,77 +426,141 @@ def analyze_match(match_id: str) -> Dict[str, Any]:
 # Funzioni di batch processing
 # -----------------------------------------------------------------------------
 
-def batch_process_matches(match_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+def _batch_error(item_id: str, error: Exception) -> Dict[str, Any]:
+    """Risposta di errore per un elemento fallito di un lotto."""
+    return StandardizedResponse(error=str(error)).to_dict()
+
+def _process_match_item(match_id: str, match: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Elabora una partita di un lotto a partire dai dati salvati già letti.
+    
+    Args:
+        match_id: ID della partita
+        match: Dati salvati della partita (None se non trovata)
+    
+    Returns:
+        Risposta standardizzata per la partita
+    """
+    if not match:
+        return StandardizedResponse(
+            error=f"Partita {match_id} non trovata"
+        ).to_dict()
+    
+    match_data = get_match_processor().enrich_match_data(match)
+    
+    # Arricchisci con analisi xG se disponibile
+    xg_data = get_xg_data(match_id)
+    if xg_data:
+        match_data["xg_analysis"] = xg_data
+    
+    return StandardizedResponse(
+        success=1,
+        data=match_data
+    ).to_dict()
+
+def _process_team_item(team_id: str, team: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Elabora una squadra di un lotto a partire dai dati salvati già letti.
+    
+    Args:
+        team_id: ID della squadra
+        team: Dati salvati della squadra (None se non trovata)
+    
+    Returns:
+        Risposta standardizzata per la squadra
+    """
+    if not team:
+        return StandardizedResponse(
+            error=f"Squadra {team_id} non trovata"
+        ).to_dict()
+    
+    team_data = get_team_processor().enrich_team_data(team)
+    
+    # Arricchisci con performance xG
+    xg_performance = analyze_xg_performance(team_id)
+    if xg_performance:
+        team_data["xg_performance"] = xg_performance
+    
+    return StandardizedResponse(
+        success=1,
+        data=team_data
+    ).to_dict()
+
+def iter_process_matches(match_ids: List[str], workers: Optional[int] = None,
+                         chunk_size: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Elabora un lotto di partite in parallelo restituendo i risultati man mano.
+    
+    Le partite salvate vengono lette tutte all'inizio; gli errori di una
+    partita diventano la sua risposta di errore senza fermare il lotto, e
+    un errore di lettura diventa la risposta di tutte le partite.
+    
+    Args:
+        match_ids: Lista di ID delle partite
+        workers: Thread del pool (default: processors.batch.workers)
+        chunk_size: Partite per blocco (default: processors.batch.chunk_size)
+    
+    Yields:
+        Coppie (ID partita, risposta standardizzata) nell'ordine degli ID
+    """
+    try:
+        stored = prefetch(get_match_processor().db, "matches", match_ids, workers=workers)
+    except Exception as e:
+        yield from failed_batch(match_ids, e, _batch_error)
+        return
+    logger.info(f"Lotto di {len(match_ids)} partite: {len(stored)} trovate nel database")
+    yield from stream_batch(match_ids, _process_match_item, stored, _batch_error, workers, chunk_size)
+
+def iter_process_teams(team_ids: List[str], workers: Optional[int] = None,
+                       chunk_size: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Elabora un lotto di squadre in parallelo restituendo i risultati man mano.
+    
+    Args:
+        team_ids: Lista di ID delle squadre
+        workers: Thread del pool (default: processors.batch.workers)
+        chunk_size: Squadre per blocco (default: processors.batch.chunk_size)
+    
+    Yields:
+        Coppie (ID squadra, risposta standardizzata) nell'ordine degli ID
+    """
+    try:
+        stored = prefetch(get_team_processor().db, "teams", team_ids, workers=workers)
+    except Exception as e:
+        yield from failed_batch(team_ids, e, _batch_error)
+        return
+    logger.info(f"Lotto di {len(team_ids)} squadre: {len(stored)} trovate nel database")
+    yield from stream_batch(team_ids, _process_team_item, stored, _batch_error, workers, chunk_size)
+
+def batch_process_matches(match_ids: List[str], workers: Optional[int] = None,
+                          chunk_size: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
     """
     Elabora un batch di partite.
     
     Args:
         match_ids: Lista di ID delle partite
+        workers: Thread del pool (default: processors.batch.workers)
+        chunk_size: Partite per blocco (default: processors.batch.chunk_size)
     
     Returns:
         Dizionario con i risultati dell'elaborazione per ogni partita
     """
-    results = {}
-    
-    for match_id in match_ids:
-        try:
-            match_data = get_match_by_id(match_id)
-            if match_data:
-                # Arricchisci con analisi xG se disponibile
-                xg_data = get_xg_data(match_id)
-                if xg_data:
-                    match_data["xg_analysis"] = xg_data
-                
-                results[match_id] = StandardizedResponse(
-                    success=1,
-                    data=match_data
-                ).to_dict()
-            else:
-                results[match_id] = StandardizedResponse(
-                    error=f"Partita {match_id} non trovata"
-                ).to_dict()
-        except Exception as e:
-            results[match_id] = StandardizedResponse(
-                error=str(e)
-            ).to_dict()
-    
-    return results
-
-def batch_process_teams(team_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    return dict(iter_process_matches(match_ids, workers, chunk_size))
+
+def batch_process_teams(team_ids: List[str], workers: Optional[int] = None,
+                        chunk_size: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
     """
     Elabora un batch di squadre.
     
     Args:
         team_ids: Lista di ID delle squadre
+        workers: Thread del pool (default: processors.batch.workers)
+        chunk_size: Squadre per blocco (default: processors.batch.chunk_size)
     
     Returns:
         Dizionario con i risultati dell'elaborazione per ogni squadra
     """
-    results = {}
-    
-    for team_id in team_ids:
-        try:
-            team_data = get_team_info(team_id, by_id=True)
-            if team_data:
-                # Arricchisci con performance xG
-                xg_performance = analyze_xg_performance(team_id)
-                if xg_performance:
-                    team_data["xg_performance"] = xg_performance
-                
-                results[team_id] = StandardizedResponse(
-                    success=1,
-                    data=team_data
-                ).to_dict()
-            else:
-                results[team_id] = StandardizedResponse(
-                    error=f"Squadra {team_id} non trovata"
-                ).to_dict()
-        except Exception as e:
-            results[team_id] = StandardizedResponse(
-                error=str(e)
-            ).to_dict()
-    
-    return results
+    return dict(iter_process_teams(team_ids, workers, chunk_size))
 
 # -----------------------------------------------------------------------------
 # Informazioni sul package
@@ -491,11 +588,14 @@ __all__ = [
     # Standing functions
     "get_current_standings",
     "get_standings_history",
+    "get_standings_as_of",
     "calculate_form_table",
+    "get_league_form",
     
     # xG functions
     "get_xg_data",
     "analyze_xg_performance",
+    "get_league_xg_summary",
     
     # Analysis functions
     "analyze_match",
@@ -503,6 +603,8 @@ __all__ = [
     # Batch processing
     "batch_process_matches",
     "batch_process_teams",
+    "iter_process_matches",
+    "iter_process_teams",
     
     # Utility classes
     "StandardizedResponse"
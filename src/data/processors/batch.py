@@ -0,0 +1,135 @@
+"""
+Elaborazione a blocchi di lotti di partite o squadre su un pool di thread.
+I dati salvati di tutti gli ID vengono letti all'inizio (il nodo intero per
+i lotti grandi, letture concorrenti per quelli piccoli), poi gli elementi
+sono divisi in blocchi elaborati in parallelo. Un errore su un elemento
+diventa la sua risposta di errore senza fermare il lotto, e i risultati
+sono restituiti da un generatore nell'ordine degli ID. Se la lettura
+anticipata fallisce, l'errore diventa la risposta di ogni elemento.
+"""
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Callable, Iterator, Tuple
+
+from src.config.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+
+def _read(db: Any, path: str) -> Any:
+    # Come FirebaseManager.get, ma senza trasformare gli errori di lettura in "nessun dato"
+    ref = db.get_reference(path)
+    return ref.get() if ref else None
+
+
+def prefetch(db: Any, node: str, ids: List[str], bulk_threshold: Optional[int] = None,
+             workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Legge i dati salvati di tutti gli ID con il minor numero di letture.
+
+    Args:
+        db: Istanza del database (FirebaseManager)
+        node: Nodo del database ("matches", "teams")
+        ids: ID da leggere
+        bulk_threshold: ID oltre i quali si legge il nodo intero
+            (default: processors.batch.bulk_read_threshold, 200)
+        workers: Letture concorrenti per i lotti piccoli (default: processors.batch.workers, 8)
+
+    Returns:
+        Dizionario ID -> dati salvati (solo gli ID trovati)
+
+    Raises:
+        Exception: L'errore di lettura del database, da non confondere con
+            elementi non trovati
+    """
+    wanted = list(dict.fromkeys(ids))
+    if bulk_threshold is None:
+        bulk_threshold = get_setting('processors.batch.bulk_read_threshold', 200)
+    if workers is None:
+        workers = get_setting('processors.batch.workers', 8)
+
+    try:
+        if len(wanted) >= bulk_threshold:
+            stored = _read(db, node) or {}
+            return {item_id: stored[item_id] for item_id in wanted if stored.get(item_id)}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(wanted) or 1)),
+                                thread_name_prefix="prefetch") as executor:
+            values = list(executor.map(lambda item_id: _read(db, f"{node}/{item_id}"), wanted))
+        return {item_id: value for item_id, value in zip(wanted, values) if value}
+    except Exception as e:
+        logger.error(f"Errore nella lettura anticipata di {len(wanted)} elementi da {node}: {e}")
+        raise
+
+
+def failed_batch(ids: List[str], error: Exception,
+                 on_error: Callable[[str, Exception], Dict[str, Any]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Risposte di errore di tutti gli elementi di un lotto la cui lettura anticipata è fallita.
+
+    Args:
+        ids: ID degli elementi, nell'ordine dei risultati
+        error: Errore della lettura anticipata
+        on_error: Funzione (ID, eccezione) -> risultato per gli elementi falliti
+
+    Yields:
+        Coppie (ID, risultato di errore) nell'ordine degli ID
+    """
+    for item_id in ids:
+        yield item_id, on_error(item_id, error)
+
+
+def _run_chunk(process_item: Callable[[str, Any], Dict[str, Any]], chunk: List[str],
+               prefetched: Dict[str, Any],
+               on_error: Callable[[str, Exception], Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+    results = []
+    for item_id in chunk:
+        try:
+            results.append((item_id, process_item(item_id, prefetched.get(item_id))))
+        except Exception as e:
+            logger.error(f"Errore nell'elaborazione di {item_id}: {e}")
+            results.append((item_id, on_error(item_id, e)))
+    return results
+
+
+def stream_batch(ids: List[str], process_item: Callable[[str, Any], Dict[str, Any]],
+                 prefetched: Dict[str, Any], on_error: Callable[[str, Exception], Dict[str, Any]],
+                 workers: Optional[int] = None,
+                 chunk_size: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Elabora gli elementi a blocchi in parallelo e restituisce i risultati in ordine.
+
+    Al massimo 2 * workers blocchi sono in corso o in attesa di essere letti,
+    così un lotto di una stagione intera non tiene in memoria tutti i risultati.
+
+    Args:
+        ids: ID degli elementi, nell'ordine dei risultati
+        process_item: Funzione (ID, dati salvati o None) -> risultato
+        prefetched: Dati salvati letti con prefetch
+        on_error: Funzione (ID, eccezione) -> risultato per gli elementi falliti
+        workers: Thread del pool (default: processors.batch.workers, 8)
+        chunk_size: Elementi per blocco (default: processors.batch.chunk_size, 25)
+
+    Yields:
+        Coppie (ID, risultato) nell'ordine degli ID
+    """
+    if workers is None:
+        workers = get_setting('processors.batch.workers', 8)
+    if chunk_size is None:
+        chunk_size = get_setting('processors.batch.chunk_size', 25)
+    chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+
+    if workers < 2 or len(chunks) < 2:
+        for chunk in chunks:
+            yield from _run_chunk(process_item, chunk, prefetched, on_error)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(chunks)), thread_name_prefix="batch") as executor:
+        pending = deque()
+        next_chunk = 0
+        while next_chunk < len(chunks) or pending:
+            while next_chunk < len(chunks) and len(pending) < 2 * workers:
+                pending.append(executor.submit(_run_chunk, process_item, chunks[next_chunk], prefetched, on_error))
+                next_chunk += 1
+            yield from pending.popleft().result()
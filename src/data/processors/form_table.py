@@ -0,0 +1,228 @@
+"""
+Tabella della forma di tutte le squadre di un campionato dallo storico locale.
+Un solo passaggio cronologico sui risultati del campionato tiene, per ogni
+squadra, le ultime N partite complessive, in casa e in trasferta; da queste
+si ricavano forma, punti e forma ponderata per recency di tutte le squadre
+insieme. Ogni risultato concluso in seguito aggiorna solo le sue due squadre.
+"""
+import bisect
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple, Iterable
+
+from src.config.settings import get_setting
+from src.data.processors.league_history import ResultHistory, get_result_history
+
+logger = logging.getLogger(__name__)
+
+FORM_POINTS = {'W': 3, 'D': 1, 'L': 0}
+
+
+def _days_between(start: str, end: str) -> int:
+    try:
+        return (datetime.strptime(end[:10], "%Y-%m-%d") - datetime.strptime(start[:10], "%Y-%m-%d")).days
+    except ValueError:
+        return 0
+
+
+class LeagueFormTable:
+    """
+    Forma recente di tutte le squadre di un campionato.
+
+    La finestra è analytics.form.window partite (default 10) e la forma
+    ponderata usa il decadimento mensile analytics.form.recency_factor
+    (default 0.9), come TeamFormAnalyzer.
+    """
+
+    def __init__(self, league_id: str, window: Optional[int] = None,
+                 recency_factor: Optional[float] = None):
+        """
+        Args:
+            league_id: ID del campionato
+            window: Partite considerate per squadra
+            recency_factor: Fattore di decadimento mensile dei pesi
+        """
+        self.league_id = league_id
+        self.window = window or get_setting('analytics.form.window', 10)
+        self.recency_factor = recency_factor or get_setting('analytics.form.recency_factor', 0.9)
+        self.teams: Dict[str, Dict[str, Any]] = {}
+        self.match_ids = set()
+        self.last_result = ''
+
+    def build(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Calcola la forma di tutte le squadre con un passaggio sui risultati.
+
+        Args:
+            records: Record dei risultati (league_history.result_record)
+
+        Returns:
+            Numero di risultati applicati
+        """
+        self.teams, self.match_ids = {}, set()
+        applied = sum(1 for record in records if self.add_result(record))
+        logger.info(f"Forma di {self.league_id}: {len(self.teams)} squadre da {applied} risultati")
+        return applied
+
+    def add_result(self, record: Dict[str, Any]) -> bool:
+        """
+        Aggiunge un risultato alle finestre delle due squadre.
+
+        Args:
+            record: Record del risultato
+
+        Returns:
+            True se il risultato è nuovo per la tabella
+        """
+        if record['league_id'] != self.league_id or record['match_id'] in self.match_ids:
+            return False
+        if record['home_id'] == record['away_id']:
+            return False
+        self.match_ids.add(record['match_id'])
+        self._add_entry(record['home_id'], record['home_name'], 'home', record)
+        self._add_entry(record['away_id'], record['away_name'], 'away', record)
+        self.last_result = max(self.last_result, record['datetime'])
+        return True
+
+    def _add_entry(self, team_id: str, team_name: str, venue: str, record: Dict[str, Any]) -> None:
+        team = self.teams.get(team_id)
+        if team is None:
+            team = {'team_name': team_name, 'all': [], 'home': [], 'away': []}
+            self.teams[team_id] = team
+        elif team_name and not team['team_name']:
+            team['team_name'] = team_name
+
+        goals_for = record['home_goals'] if venue == 'home' else record['away_goals']
+        goals_against = record['away_goals'] if venue == 'home' else record['home_goals']
+        outcome = 'W' if goals_for > goals_against else 'L' if goals_for < goals_against else 'D'
+        entry = (record['datetime'], outcome, goals_for, goals_against, venue, record)
+
+        # Finestre in ordine cronologico anche per i risultati arrivati in ritardo
+        for entries in (team['all'], team[venue]):
+            position = bisect.bisect_right([e[0] for e in entries], entry[0])
+            if position > 0 or len(entries) < self.window:
+                entries.insert(position, entry)
+                del entries[:-self.window]
+
+    def team_matches(self, team_id: str) -> List[Dict[str, Any]]:
+        """Record delle ultime partite della squadra, dalla più recente."""
+        team = self.teams.get(team_id)
+        return [entry[5] for entry in reversed(team['all'])] if team else []
+
+    def team_row(self, team_id: str) -> Dict[str, Any]:
+        """
+        Riga compatta della forma di una squadra.
+
+        Args:
+            team_id: ID della squadra
+
+        Returns:
+            Forma (dalla partita più recente), punti, forma ponderata e
+            parziali casa/trasferta; dizionario vuoto se la squadra non c'è
+        """
+        team = self.teams.get(team_id)
+        if not team:
+            return {}
+        entries = team['all']
+        points = [FORM_POINTS[entry[1]] for entry in entries]
+        # Pesi relativi all'ultima partita: la media ponderata non dipende dalla data di riferimento
+        weights = [self.recency_factor ** (_days_between(entry[0], entries[-1][0]) / 30) for entry in entries]
+        return {
+            'team_id': team_id,
+            'team_name': team['team_name'],
+            'matches': len(entries),
+            'form': ''.join(entry[1] for entry in reversed(entries)),
+            'points': sum(points),
+            'weighted_points': sum(p * w for p, w in zip(points, weights)) / sum(weights),
+            'goals_for': sum(entry[2] for entry in entries),
+            'goals_against': sum(entry[3] for entry in entries),
+            'home_form': ''.join(entry[1] for entry in reversed(team['home'])),
+            'home_points': sum(FORM_POINTS[entry[1]] for entry in team['home']),
+            'away_form': ''.join(entry[1] for entry in reversed(team['away'])),
+            'away_points': sum(FORM_POINTS[entry[1]] for entry in team['away']),
+            'last_match': entries[-1][0][:10],
+        }
+
+    def table(self, as_of: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Tabella compatta della forma del campionato.
+
+        Args:
+            as_of: Data di riferimento da riportare (default: ultimo risultato)
+
+        Returns:
+            Dizionario con le righe ordinate per punti, forma ponderata e
+            differenza reti
+        """
+        rows = [self.team_row(team_id) for team_id in self.teams]
+        rows.sort(key=lambda row: (-row['points'], -row['weighted_points'],
+                                   row['goals_against'] - row['goals_for'], row['team_name']))
+        return {
+            'league_id': self.league_id,
+            'as_of': as_of or self.last_result[:10],
+            'window': self.window,
+            'teams': rows,
+        }
+
+    def __len__(self) -> int:
+        return len(self.teams)
+
+
+def form_table_as_of(history: ResultHistory, league_id: str, date: str,
+                     window: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Tabella della forma con i soli risultati fino alla data indicata.
+
+    Args:
+        history: Storico dei risultati
+        league_id: ID del campionato
+        date: Data (AAAA-MM-GG) o data e ora ISO, inclusa
+        window: Partite considerate per squadra
+
+    Returns:
+        Tabella compatta della forma alla data
+    """
+    table = LeagueFormTable(league_id, window)
+    table.build(history.league_results(league_id, until=date))
+    return table.table(as_of=date[:10])
+
+
+# Tabelle della forma per campionato e finestra del processo, aggiornate dallo storico
+_tables: Dict[Tuple[str, int], LeagueFormTable] = {}
+_tables_lock = threading.Lock()
+
+
+def _on_result(record: Dict[str, Any]) -> None:
+    for table in list(_tables.values()):
+        table.add_result(record)
+
+
+def get_league_form(db: Any, league_id: str, window: Optional[int] = None,
+                    history: Optional[ResultHistory] = None) -> LeagueFormTable:
+    """
+    Restituisce la tabella della forma di un campionato, calcolandola dallo
+    storico locale alla prima richiesta.
+
+    Args:
+        db: Istanza del database usata per leggere lo storico
+        league_id: ID del campionato
+        window: Partite considerate per squadra
+        history: Storico dei risultati (default: storico del processo)
+
+    Returns:
+        Tabella della forma aggiornata a ogni nuovo risultato
+    """
+    history = history or get_result_history(db)
+    window = window or get_setting('analytics.form.window', 10)
+    with _tables_lock:
+        table = _tables.get((league_id, window))
+        if table is None:
+            table = LeagueFormTable(league_id, window)
+            table.build(history.league_results(league_id))
+            # Storico non ancora letto: ricalcolo alla prossima richiesta
+            if not history.loaded:
+                return table
+            _tables[(league_id, window)] = table
+            history.add_listener(_on_result)
+        return table
@@ -0,0 +1,196 @@
+"""
+Matrice degli scontri diretti di un campionato calcolata dallo storico locale.
+Con un solo passaggio sui risultati del campionato raccoglie, per ogni
+coppia di squadre, i totali di tutte le sfide e le partite più recenti;
+ogni risultato concluso in seguito aggiorna solo la sua coppia. Le fonti
+remote servono solo per le coppie senza storico locale.
+"""
+import bisect
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from src.config.settings import get_setting
+from src.data.freshness import h2h_key
+from src.data.processors.league_history import ResultHistory, as_match, get_result_history
+
+logger = logging.getLogger(__name__)
+
+
+class H2HMatrix:
+    """
+    Scontri diretti di tutte le coppie di squadre di un campionato.
+
+    Per ogni coppia tiene i totali (partite, vittorie, pareggi, gol, vittorie
+    in casa) e le ultime h2h.matrix_recent_matches partite (default 10).
+    """
+
+    def __init__(self, league_id: str, recent_limit: Optional[int] = None):
+        """
+        Args:
+            league_id: ID del campionato
+            recent_limit: Partite recenti conservate per coppia
+        """
+        self.league_id = league_id
+        self.recent_limit = recent_limit or get_setting('h2h.matrix_recent_matches', 10)
+        self.pairs: Dict[str, Dict[str, Any]] = {}
+        self.last_updated = ''
+
+    def build(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Calcola la matrice con un passaggio sui risultati del campionato.
+
+        Args:
+            records: Record dei risultati (league_history.result_record)
+
+        Returns:
+            Numero di coppie di squadre con almeno uno scontro diretto
+        """
+        self.pairs = {}
+        for record in records:
+            self.add_result(record)
+        logger.info(f"Matrice scontri diretti di {self.league_id}: {len(self.pairs)} coppie da {len(records)} risultati")
+        return len(self.pairs)
+
+    def add_result(self, record: Dict[str, Any]) -> bool:
+        """
+        Aggiunge un risultato aggiornando solo la coppia delle sue squadre.
+
+        Args:
+            record: Record del risultato
+
+        Returns:
+            True se il risultato è nuovo per la coppia
+        """
+        home_id, away_id = record['home_id'], record['away_id']
+        if home_id == away_id:
+            return False
+        pair = self.pairs.get(h2h_key(home_id, away_id))
+        if pair is None:
+            pair = {
+                'match_ids': set(),
+                'totals': {
+                    'matches': 0, 'draws': 0,
+                    home_id: {'wins': 0, 'home_wins': 0, 'goals': 0},
+                    away_id: {'wins': 0, 'home_wins': 0, 'goals': 0},
+                },
+                'recent': [],
+            }
+            self.pairs[h2h_key(home_id, away_id)] = pair
+        if record['match_id'] in pair['match_ids']:
+            return False
+        pair['match_ids'].add(record['match_id'])
+
+        totals = pair['totals']
+        home_goals, away_goals = record['home_goals'], record['away_goals']
+        totals['matches'] += 1
+        totals[home_id]['goals'] += home_goals
+        totals[away_id]['goals'] += away_goals
+        if home_goals > away_goals:
+            totals[home_id]['wins'] += 1
+            totals[home_id]['home_wins'] += 1
+        elif away_goals > home_goals:
+            totals[away_id]['wins'] += 1
+        else:
+            totals['draws'] += 1
+
+        # Partite recenti in ordine cronologico, limitate alle ultime N
+        recent = pair['recent']
+        position = bisect.bisect_right([r['datetime'] for r in recent], record['datetime'])
+        recent.insert(position, record)
+        del recent[:-self.recent_limit]
+
+        self.last_updated = datetime.now().isoformat()
+        return True
+
+    def has_pair(self, team1_id: str, team2_id: str) -> bool:
+        """Verifica se le due squadre si sono già affrontate nel campionato."""
+        return h2h_key(team1_id, team2_id) in self.pairs
+
+    def recent_matches(self, team1_id: str, team2_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Ultimi scontri diretti in formato partita standard, dal più recente.
+
+        Args:
+            team1_id: ID della prima squadra
+            team2_id: ID della seconda squadra
+            limit: Numero massimo di partite
+
+        Returns:
+            Lista di partite (vuota se la coppia non ha storico)
+        """
+        pair = self.pairs.get(h2h_key(team1_id, team2_id))
+        if not pair:
+            return []
+        records = pair['recent'][::-1]
+        return [as_match(record) for record in records[:limit or len(records)]]
+
+    def summary(self, team1_id: str, team2_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Totali di tutti gli scontri diretti dal punto di vista della prima squadra.
+
+        Args:
+            team1_id: ID della prima squadra
+            team2_id: ID della seconda squadra
+
+        Returns:
+            Dizionario dei totali, o None se la coppia non ha storico
+        """
+        pair = self.pairs.get(h2h_key(team1_id, team2_id))
+        if not pair:
+            return None
+        totals = pair['totals']
+        team1, team2 = totals[team1_id], totals[team2_id]
+        return {
+            'total_matches': totals['matches'],
+            'team1_wins': team1['wins'],
+            'team2_wins': team2['wins'],
+            'draws': totals['draws'],
+            'team1_goals': team1['goals'],
+            'team2_goals': team2['goals'],
+            'home_wins_team1': team1['home_wins'],
+            'home_wins_team2': team2['home_wins'],
+            'last_match_date': pair['recent'][-1]['date'] if pair['recent'] else '',
+        }
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+
+# Matrici per campionato del processo, aggiornate dallo storico dei risultati
+_matrices: Dict[str, H2HMatrix] = {}
+_matrices_lock = threading.Lock()
+
+
+def _on_result(record: Dict[str, Any]) -> None:
+    matrix = _matrices.get(record['league_id'])
+    if matrix is not None:
+        matrix.add_result(record)
+
+
+def get_league_matrix(db: Any, league_id: str, history: Optional[ResultHistory] = None) -> H2HMatrix:
+    """
+    Restituisce la matrice degli scontri diretti di un campionato,
+    calcolandola dallo storico locale alla prima richiesta.
+
+    Args:
+        db: Istanza del database usata per leggere lo storico
+        league_id: ID del campionato
+        history: Storico dei risultati (default: storico del processo)
+
+    Returns:
+        Matrice del campionato, aggiornata a ogni nuovo risultato
+    """
+    history = history or get_result_history(db)
+    with _matrices_lock:
+        matrix = _matrices.get(league_id)
+        if matrix is None:
+            matrix = H2HMatrix(league_id)
+            matrix.build(history.league_results(league_id))
+            # Storico non ancora letto: ricalcolo alla prossima richiesta
+            if not history.loaded:
+                return matrix
+            _matrices[league_id] = matrix
+            history.add_listener(_on_result)
+        return matrix
@@ -28,6 +28,9 @@ from src.data.scrapers.eleven_v_eleven import get_scraper as get_eleven_v_eleven
 from src.data.processors.teams import get_processor as get_team_processor
 from src.data.processors.matches import get_processor as get_match_processor
 
+from src.data.entity_registry import ENTITY_TEAM, ENTITY_COMPETITION, get_registry
+from src.data.processors.h2h_matrix import get_league_matrix
+from src.data.processors.league_history import get_result_history
 from src.utils.database import FirebaseManager
 from src.utils.cache import cached
 from src.config.sources import get_sources_for_data_type
@@ -77,17 +80,23 @@ class HeadToHeadProcessor:
         team2_id: str, 
         max_matches: int = 10,
         min_matches: int = 1,
-        sources: Optional[List[str]] = None
+        sources: Optional[List[str]] = None,
+        league_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Ottiene lo storico degli scontri diretti tra due squadre.
         
+        Se le squadre si sono già affrontate, gli scontri diretti vengono
+        presi dalla matrice del campionato calcolata dallo storico locale;
+        le fonti remote sono interrogate solo per le coppie senza storico.
+        
         Args:
             team1_id: ID della prima squadra.
             team2_id: ID della seconda squadra.
             max_matches: Numero massimo di partite da restituire.
             min_matches: Numero minimo di partite richieste.
             sources: Lista delle fonti da utilizzare. Se None, usa tutte.
+            league_id: Campionato dello storico locale. Se None, quello delle squadre.
             
         Returns:
             Dizionario con i dati degli scontri diretti e le statistiche associate.
@@ -126,6 +135,15 @@ class HeadToHeadProcessor:
                 'error': 'Team data not found'
             }
         
+        # Storico locale: nessuna chiamata remota se la coppia ha già partite
+        local_h2h = self._get_h2h_from_history(
+            team1_id, team2_id, team1_data, team2_data, max_matches, league_id
+        )
+        if local_h2h and len(local_h2h['matches']) >= min_matches:
+            self.store_h2h_data(local_h2h)
+            self.h2h_cache[cache_key] = local_h2h
+            return local_h2h
+        
         # Imposta le fonti
         if not sources:
             sources = get_sources_for_data_type('head_to_head')
@@ -153,10 +171,8 @@ class HeadToHeadProcessor:
             )
             
             if source_matches:
-                # Processa ogni partita
-                for match in source_matches:
-                    processed_match = self.match_processor.process_match(match, source)
-                    all_matches.append(processed_match)
+                # Processa le partite della fonte in un solo lotto
+                all_matches.extend(self.match_processor.process_matches(source_matches, source))
         
         # Rimuovi duplicati (stesse partite da fonti diverse)
         deduplicated_matches = self._deduplicate_matches(all_matches)
@@ -196,6 +212,81 @@ class HeadToHeadProcessor:
         
         return h2h_data
     
+    def _get_h2h_from_history(
+        self,
+        team1_id: str,
+        team2_id: str,
+        team1_data: Dict[str, Any],
+        team2_data: Dict[str, Any],
+        max_matches: int,
+        league_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Calcola gli scontri diretti dalla matrice del campionato.
+        
+        Args:
+            team1_id: ID della prima squadra.
+            team2_id: ID della seconda squadra.
+            team1_data: Dati della prima squadra.
+            team2_data: Dati della seconda squadra.
+            max_matches: Numero massimo di partite da restituire.
+            league_id: Campionato da usare (opzionale).
+            
+        Returns:
+            Dati degli scontri diretti, o None se la coppia non ha storico locale.
+        """
+        try:
+            leagues = [league_id] if league_id else self._team_leagues(team1_data, team2_data)
+            if not leagues:
+                # Campionato sconosciuto: cerca in tutti quelli dello storico
+                leagues = get_result_history(self.db).leagues()
+            
+            for current_league in leagues:
+                matrix = get_league_matrix(self.db, current_league)
+                if not matrix.has_pair(team1_id, team2_id):
+                    continue
+                
+                matches = matrix.recent_matches(team1_id, team2_id, max_matches)
+                return {
+                    'team1_id': team1_id,
+                    'team2_id': team2_id,
+                    'team1_name': team1_data.get('name', ''),
+                    'team2_name': team2_data.get('name', ''),
+                    'league_id': current_league,
+                    'matches': matches,
+                    'stats': self._calculate_h2h_stats(matches, team1_id, team2_id),
+                    'trends': self._calculate_h2h_trends(matches, team1_id, team2_id),
+                    'all_time': matrix.summary(team1_id, team2_id),
+                    'source': 'local_history',
+                    'last_updated': datetime.now().isoformat()
+                }
+            return None
+            
+        except Exception as e:
+            logger.error(f"Errore nel calcolare gli scontri diretti dallo storico locale: {e}")
+            return None
+    
+    def _team_leagues(self, *teams_data: Dict[str, Any]) -> List[str]:
+        """
+        Campionati correnti delle squadre, risolti nel registro delle entità.
+        
+        Args:
+            teams_data: Dati delle squadre.
+            
+        Returns:
+            Lista di ID dei campionati, senza duplicati.
+        """
+        registry = get_registry()
+        leagues = []
+        for team_data in teams_data:
+            league = team_data.get('current_league') or {}
+            if not isinstance(league, dict):
+                continue
+            league_id = registry.resolve_name(ENTITY_COMPETITION, league.get('name', '')) or league.get('id')
+            if league_id and league_id not in leagues:
+                leagues.append(league_id)
+        return leagues
+    
     def _get_h2h_from_source(
         self, 
         team1_data: Dict[str, Any], 
@@ -251,6 +342,9 @@ class HeadToHeadProcessor:
         """
         Ottiene l'ID di una squadra per una specifica fonte.
         
+        Se i dati della squadra non lo contengono, l'ID viene letto dal
+        registro canonico delle entità.
+        
         Args:
             team_data: Dati della squadra.
             source: Nome della fonte.
@@ -260,7 +354,8 @@ class HeadToHeadProcessor:
         """
         if 'source_ids' in team_data and source in team_data['source_ids']:
             return team_data['source_ids'][source]
-        return None
+        team_id = team_data.get('team_id')
+        return get_registry().source_id(ENTITY_TEAM, team_id, source) if team_id else None
     
     def _get_h2h_football_data(self, team1_id: str, team2_id: str) -> List[Dict[str, Any]]:
         """
@@ -418,57 +513,29 @@ class HeadToHeadProcessor:
         """
         Rimuove i duplicati dalle partite.
         
+        Le partite della stessa data con le stesse squadre (per ID canonico o,
+        se sconosciuto, per somiglianza del nome) vengono unite campo per campo.
+        
         Args:
             matches: Lista di partite potenzialmente duplicate.
             
         Returns:
             Lista di partite senza duplicati.
         """
-        # Struttura per tenere traccia delle partite uniche
-        unique_matches = {}
+        # Le partite senza data o senza squadre non sono confrontabili
+        valid_matches = [
+            match for match in matches
+            if match.get('datetime') and match.get('home_team', {}).get('name')
+            and match.get('away_team', {}).get('name')
+        ]
         
-        for match in matches:
-            # Estrai la data e le squadre per identificare univocamente la partita
-            match_date = match.get('datetime', '').split('T')[0] if 'datetime' in match else ''
-            if not match_date:
-                continue
-                
-            home_team = match.get('home_team', {}).get('name', '')
-            away_team = match.get('away_team', {}).get('name', '')
-            
-            if not home_team or not away_team:
-                continue
-            
-            match_key = f"{match_date}_{home_team}_{away_team}"
-            
-            # Se la partita non è già presente o se la nuova ha più dati
-            if match_key not in unique_matches or self._has_more_data(match, unique_matches[match_key]):
-                unique_matches[match_key] = match
+        result = self.match_processor.deduplicate_matches(valid_matches)
         
-        # Converti il dizionario in lista e ordina per data (dalla più recente)
-        result = list(unique_matches.values())
+        # Ordina per data (dalla più recente)
         result.sort(key=lambda m: m.get('datetime', ''), reverse=True)
         
         return result
     
-    def _has_more_data(self, match1: Dict[str, Any], match2: Dict[str, Any]) -> bool:
-        """
-        Verifica se la prima partita ha più dati della seconda.
-        
-        Args:
-            match1: Prima partita.
-            match2: Seconda partita.
-            
-        Returns:
-            True se la prima partita ha più dati, False altrimenti.
-        """
-        # Confronta la presenza di chiavi importanti
-        important_keys = ['statistics', 'lineups', 'events', 'venue']
-        score1 = sum(1 for key in important_keys if key in match1 and match1[key])
-        score2 = sum(1 for key in important_keys if key in match2 and match2[key])
-        
-        return score1 > score2
-    
     def _calculate_h2h_stats(
         self, 
         matches: List[Dict[str, Any]], 
@@ -0,0 +1,268 @@
+"""
+Storico locale dei risultati delle partite concluse, per campionato.
+Il nodo matches viene letto una sola volta per processo (la lettura è
+ripetuta finché non riesce) e ogni partita
+conclusa diventa un record compatto (data, ID canonici delle squadre, gol,
+eventi dei gol), tenuto in ordine cronologico per campionato. Le partite
+concluse salvate in seguito vengono aggiunte in modo incrementale e
+notificate ai componenti che derivano statistiche dallo storico (scontri
+diretti, classifiche, forma).
+"""
+import time
+import bisect
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Callable
+
+from src.config.settings import get_setting
+from src.data.entity_registry import EntityRegistry, ENTITY_TEAM, ENTITY_COMPETITION, get_registry
+
+logger = logging.getLogger(__name__)
+
+
+def _canonical_team(team: Dict[str, Any], source: str, registry: Optional[EntityRegistry]) -> str:
+    team_id = str(team.get('id') or '')
+    if registry is not None:
+        return registry.resolve(ENTITY_TEAM, source, team_id) or team_id
+    return team_id
+
+
+def _league_key(match: Dict[str, Any], source: str, registry: Optional[EntityRegistry]) -> str:
+    # Campionato di raccolta, poi ID o nome della competizione nel registro
+    if match.get('league_id'):
+        return str(match['league_id'])
+    competition = match.get('competition') or {}
+    league_id = str(competition.get('id') or '')
+    if registry is not None:
+        return (registry.resolve(ENTITY_COMPETITION, source, league_id) if league_id else None) \
+            or registry.resolve_name(ENTITY_COMPETITION, competition.get('name', '')) or league_id
+    return league_id
+
+
+def result_record(match: Dict[str, Any], registry: Optional[EntityRegistry] = None) -> Optional[Dict[str, Any]]:
+    """
+    Record compatto di una partita conclusa.
+
+    Args:
+        match: Partita normalizzata
+        registry: Registro delle entità per gli ID canonici delle squadre e del campionato
+
+    Returns:
+        Record del risultato, o None se la partita non è conclusa o è incompleta
+    """
+    if not match or match.get('status') != 'finished':
+        return None
+    score = match.get('score') or {}
+    home_goals, away_goals = score.get('home'), score.get('away')
+    datetime_str = match.get('datetime') or ''
+    if home_goals is None or away_goals is None or not datetime_str:
+        return None
+
+    source = match.get('source') or next(iter(match.get('source_ids') or {}), '')
+    home_id = _canonical_team(match.get('home_team') or {}, source, registry)
+    away_id = _canonical_team(match.get('away_team') or {}, source, registry)
+    if not home_id or not away_id:
+        return None
+
+    competition = match.get('competition') or {}
+    league_id = _league_key(match, source, registry)
+    if not league_id:
+        return None
+
+    try:
+        home_goals, away_goals = int(home_goals), int(away_goals)
+    except (TypeError, ValueError):
+        return None
+
+    return {
+        'match_id': match.get('match_id', ''),
+        'datetime': datetime_str,
+        'date': datetime_str.split('T')[0],
+        'league_id': league_id,
+        'competition_name': competition.get('name', ''),
+        'home_id': home_id,
+        'away_id': away_id,
+        'home_name': (match.get('home_team') or {}).get('name', ''),
+        'away_name': (match.get('away_team') or {}).get('name', ''),
+        'home_goals': home_goals,
+        'away_goals': away_goals,
+        'goal_events': [event for event in match.get('events') or [] if event.get('type') == 'goal'],
+        'referees': match.get('referees') or [],
+    }
+
+
+def as_match(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Partita in formato standard (ridotto) ricostruita da un record."""
+    home_goals, away_goals = record['home_goals'], record['away_goals']
+    winner = 'home' if home_goals > away_goals else 'away' if away_goals > home_goals else 'draw'
+    return {
+        'match_id': record['match_id'],
+        'datetime': record['datetime'],
+        'status': 'finished',
+        'home_team': {'id': record['home_id'], 'name': record['home_name']},
+        'away_team': {'id': record['away_id'], 'name': record['away_name']},
+        'competition': {'id': record['league_id'], 'name': record['competition_name']},
+        'score': {'home': home_goals, 'away': away_goals, 'winner': winner},
+        'events': record['goal_events'],
+        'referees': record['referees'],
+    }
+
+
+class ResultHistory:
+    """
+    Risultati conclusi per campionato, in ordine cronologico.
+
+    Gli ascoltatori registrati con add_listener ricevono ogni record nuovo
+    aggiunto dopo il caricamento.
+    """
+
+    def __init__(self, db: Any, registry: Optional[EntityRegistry] = None):
+        """
+        Args:
+            db: Istanza del database (FirebaseManager)
+            registry: Registro delle entità (default: registro del processo)
+        """
+        self.db = db
+        self.registry = registry if registry is not None else get_registry()
+        self._leagues: Dict[str, List[Dict[str, Any]]] = {}
+        self._keys: Dict[str, List[str]] = {}
+        self._match_ids = set()
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.retry_seconds = get_setting('processors.history.retry_seconds', 60)
+        self._retry_at = 0.0
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    @property
+    def loaded(self) -> bool:
+        """True se le partite sono state lette."""
+        return self._loaded
+
+    def load(self) -> bool:
+        """
+        Legge le partite alla prima chiamata; le successive non fanno nulla.
+
+        Se la lettura fallisce (o il nodo è vuoto) lo storico resta non
+        caricato e la lettura viene ripetuta alla prima richiesta dopo
+        processors.history.retry_seconds secondi (default 60).
+
+        Returns:
+            True se lo storico è caricato
+        """
+        if self._loaded:
+            return True
+        with self._lock:
+            if self._loaded:
+                return True
+            if time.monotonic() < self._retry_at:
+                return False
+            try:
+                matches = self.db.get("matches") if self.db else None
+                if not matches:
+                    raise ValueError("nodo matches vuoto o non leggibile")
+                match_ids, leagues, keys = set(), {}, {}
+                records = []
+                for match in matches.values():
+                    record = result_record(match, self.registry) if isinstance(match, dict) else None
+                    if record and record['match_id'] not in match_ids:
+                        match_ids.add(record['match_id'])
+                        records.append(record)
+                records.sort(key=lambda r: r['datetime'])
+                for record in records:
+                    leagues.setdefault(record['league_id'], []).append(record)
+                    keys.setdefault(record['league_id'], []).append(record['datetime'])
+            except Exception as e:
+                self._retry_at = time.monotonic() + self.retry_seconds
+                logger.error(f"Errore nel caricare lo storico dei risultati (nuovo tentativo tra "
+                             f"{self.retry_seconds}s): {e}")
+                return False
+            self._match_ids, self._leagues, self._keys = match_ids, leagues, keys
+            self._loaded = True
+            logger.info(f"Storico locale caricato: {len(records)} risultati in {len(self._leagues)} campionati")
+            return True
+
+    def league_results(self, league_id: str, until: Optional[str] = None,
+                       since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Risultati di un campionato in ordine cronologico.
+
+        Args:
+            league_id: ID del campionato
+            until: Data (AAAA-MM-GG) o data e ora ISO: esclude le partite successive
+            since: Data (AAAA-MM-GG) o data e ora ISO: esclude le partite precedenti
+
+        Returns:
+            Lista dei record (da non modificare)
+        """
+        self.load()
+        records = self._leagues.get(league_id, [])
+        keys = self._keys.get(league_id, [])
+        # Le date senza orario includono tutte le partite del giorno
+        end = len(records) if until is None else bisect.bisect_right(
+            keys, until if 'T' in until else f"{until}T99")
+        start = 0 if since is None else bisect.bisect_left(keys, since)
+        return records[start:end]
+
+    def leagues(self) -> List[str]:
+        """ID dei campionati presenti nello storico."""
+        self.load()
+        return list(self._leagues)
+
+    def add_match(self, match: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Aggiunge una partita conclusa allo storico già caricato.
+
+        Se lo storico non è ancora stato caricato non fa nulla: la partita
+        salvata verrà letta con le altre al primo caricamento.
+
+        Args:
+            match: Partita normalizzata
+
+        Returns:
+            Record aggiunto, o None se la partita non è nuova o non è conclusa
+        """
+        if not self._loaded:
+            return None
+        record = result_record(match, self.registry)
+        with self._lock:
+            if not record or record['match_id'] in self._match_ids:
+                return None
+            self._match_ids.add(record['match_id'])
+            keys = self._keys.setdefault(record['league_id'], [])
+            position = bisect.bisect_right(keys, record['datetime'])
+            keys.insert(position, record['datetime'])
+            self._leagues.setdefault(record['league_id'], []).insert(position, record)
+
+        for listener in list(self._listeners):
+            try:
+                listener(record)
+            except Exception as e:
+                logger.error(f"Errore nell'aggiornare lo storico derivato per {record['match_id']}: {e}")
+        return record
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Registra una funzione chiamata con ogni nuovo record."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+
+# Storico condiviso da tutti i processori del processo
+_history: Optional[ResultHistory] = None
+_history_lock = threading.Lock()
+
+
+def get_result_history(db: Any) -> ResultHistory:
+    """
+    Restituisce lo storico dei risultati del processo, creandolo alla prima chiamata.
+
+    Args:
+        db: Istanza del database usata per leggere le partite
+
+    Returns:
+        Istanza condivisa di ResultHistory
+    """
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = ResultHistory(db)
+        return _history
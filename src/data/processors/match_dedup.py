@@ -0,0 +1,240 @@
+"""
+Deduplicazione delle partite raccolte da fonti diverse.
+Le partite sono divise in blocchi per data; dentro un blocco vengono
+raggruppate per coppia di squadre, usando gli ID canonici del registro
+delle entità quando la fonte li conosce e la forma normalizzata del nome
+altrimenti. Solo le partite senza corrispondenza esatta vengono confrontate
+per somiglianza dei nomi, e solo con i gruppi dello stesso giorno: il costo
+cresce quindi in modo lineare con il numero di partite. I gruppi vengono
+poi uniti campo per campo secondo le preferenze di fonte.
+"""
+import logging
+from typing import Dict, List, Any, Optional, Tuple, Set
+
+from src.config.settings import get_setting
+from src.data.entity_registry import EntityRegistry, ENTITY_TEAM, alias_key
+from src.utils.name_index import name_features
+
+logger = logging.getLogger(__name__)
+
+# Fonti preferite per ciascun campo della partita (la prima disponibile vince)
+FIELD_SOURCE_PREFERENCES = {
+    'datetime': ['football_data', 'api_football', 'sofascore', 'fbref', 'flashscore'],
+    'status': ['football_data', 'api_football', 'sofascore', 'flashscore', 'fbref'],
+    'score': ['football_data', 'api_football', 'sofascore', 'fbref', 'flashscore', 'soccerway'],
+    'venue': ['api_football', 'football_data', 'transfermarkt', 'soccerway'],
+    'statistics': ['fbref', 'sofascore', 'whoscored', 'api_football', 'understat', 'footystats'],
+    'lineups': ['api_football', 'sofascore', 'fbref', 'whoscored'],
+    'events': ['api_football', 'sofascore', 'flashscore', 'football_data'],
+    'odds': ['api_football', 'footystats', 'flashscore'],
+}
+
+# Campi che rendono una partita più completa di un'altra
+RICH_FIELDS = ('statistics', 'lineups', 'events', 'venue')
+
+
+def match_date(match: Dict[str, Any]) -> str:
+    """Data (AAAA-MM-GG) della partita, o stringa vuota se assente."""
+    return (match.get('datetime') or '').split('T')[0]
+
+
+def match_source(match: Dict[str, Any]) -> str:
+    """Fonte da cui proviene una partita normalizzata."""
+    if match.get('source'):
+        return match['source']
+    return next(iter(match.get('source_ids') or {}), '')
+
+
+def match_richness(match: Dict[str, Any]) -> int:
+    """Numero di campi ricchi (statistiche, formazioni, eventi, stadio) valorizzati."""
+    return sum(1 for key in RICH_FIELDS if match.get(key))
+
+
+def has_field_value(field: str, value: Any) -> bool:
+    """Verifica se il valore di un campo della partita è significativo."""
+    if field == 'score':
+        return bool(value) and value.get('home') is not None and value.get('away') is not None
+    if field == 'status':
+        return bool(value) and value != 'unknown'
+    if field == 'venue':
+        return bool(value) and any(value.values())
+    return bool(value)
+
+
+def preferred_source(field: str, sources: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Versione della partita da cui prendere un campo.
+
+    Args:
+        field: Nome del campo
+        sources: Versioni della stessa partita dalle diverse fonti
+
+    Returns:
+        La partita con il valore preferito, o None se nessuna lo ha
+    """
+    preferences = FIELD_SOURCE_PREFERENCES.get(field, [])
+    best = None
+    best_rank = None
+    for match in sources:
+        if not has_field_value(field, match.get(field)):
+            continue
+        source = match_source(match)
+        rank = preferences.index(source) if source in preferences else len(preferences)
+        if best_rank is None or rank < best_rank:
+            best, best_rank = match, rank
+    return best
+
+
+class _Side:
+    """ID canonici e forme dei nomi con cui una squadra compare in un gruppo."""
+
+    __slots__ = ('ids', 'forms')
+
+    def __init__(self):
+        self.ids: Set[str] = set()
+        self.forms: Set[str] = set()
+
+    def add(self, team_id: Optional[str], form: str):
+        if team_id:
+            self.ids.add(team_id)
+        if form:
+            self.forms.add(form)
+
+
+class MatchDeduplicator:
+    """
+    Raggruppa le partite che descrivono lo stesso incontro.
+
+    Due squadre coincidono se hanno lo stesso ID canonico; se almeno una
+    delle due non è nel registro si confrontano i nomi (coefficiente di Dice
+    su trigrammi e parole, soglia matches.dedup_name_threshold, default 0.6).
+    Se una delle due squadre coincide esattamente, per l'altra basta il
+    coefficiente di sovrapposizione ("Inter" e "Internazionale Milano").
+    Squadre con ID canonici diversi non coincidono mai, e una partita non
+    viene mai unita per somiglianza a un gruppo che contiene già la sua fonte.
+    """
+
+    def __init__(self, registry: Optional[EntityRegistry] = None,
+                 name_threshold: Optional[float] = None):
+        """
+        Args:
+            registry: Registro delle entità per risolvere gli ID delle squadre
+            name_threshold: Somiglianza minima dei nomi per le squadre non risolte
+        """
+        self.registry = registry
+        self.name_threshold = (name_threshold if name_threshold is not None
+                               else get_setting('matches.dedup_name_threshold', 0.6))
+        self._features: Dict[str, Set[str]] = {}
+
+    def _team_key(self, team: Dict[str, Any], source: str) -> Tuple[Optional[str], str]:
+        # (ID canonico o None, forma normalizzata del nome)
+        team = team or {}
+        name = team.get('name') or team.get('short_name') or ''
+        team_id = None
+        if self.registry is not None:
+            team_id = (self.registry.resolve(ENTITY_TEAM, source, team.get('id'))
+                       or self.registry.resolve_name(ENTITY_TEAM, name))
+        return team_id, alias_key(name)
+
+    def _similarity(self, form1: str, form2: str) -> Tuple[float, float]:
+        # (coefficiente di Dice, coefficiente di sovrapposizione) sugli elementi dei nomi
+        if form1 == form2:
+            return 1.0, 1.0
+        features1 = self._features.get(form1)
+        if features1 is None:
+            features1 = self._features[form1] = name_features(form1)
+        features2 = self._features.get(form2)
+        if features2 is None:
+            features2 = self._features[form2] = name_features(form2)
+        if not features1 or not features2:
+            return 0.0, 0.0
+        shared = len(features1 & features2)
+        return (2 * shared / (len(features1) + len(features2)),
+                shared / min(len(features1), len(features2)))
+
+    def _team_match(self, side: _Side, team_id: Optional[str], form: str) -> Tuple[bool, float, float]:
+        # (coincidenza esatta, miglior Dice, miglior sovrapposizione) con una squadra del gruppo
+        if team_id and side.ids:
+            same = team_id in side.ids
+            return same, float(same), float(same)
+        if form in side.forms:
+            return True, 1.0, 1.0
+        dice = overlap = 0.0
+        for other in side.forms:
+            pair_dice, pair_overlap = self._similarity(form, other)
+            dice, overlap = max(dice, pair_dice), max(overlap, pair_overlap)
+        return False, dice, overlap
+
+    def _match_score(self, home_side: _Side, away_side: _Side, home: Tuple[Optional[str], str],
+                     away: Tuple[Optional[str], str]) -> float:
+        # Somiglianza con un gruppo (0 se non è la stessa partita)
+        home_exact, home_dice, home_overlap = self._team_match(home_side, *home)
+        if not home_exact and home_dice < self.name_threshold and home_overlap < self.name_threshold:
+            return 0.0
+        away_exact, away_dice, away_overlap = self._team_match(away_side, *away)
+        # Una squadra gioca una sola partita al giorno: se l'altra coincide
+        # esattamente basta che un nome contenga quasi tutto l'altro
+        if home_exact:
+            return 1.0 + away_dice if away_exact or away_overlap >= self.name_threshold else 0.0
+        if away_exact:
+            return 1.0 + home_dice if home_overlap >= self.name_threshold else 0.0
+        if home_dice >= self.name_threshold and away_dice >= self.name_threshold:
+            return home_dice + away_dice
+        return 0.0
+
+    def group(self, matches: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Raggruppa le partite duplicate.
+
+        Args:
+            matches: Partite normalizzate, anche da fonti diverse
+
+        Returns:
+            Gruppi di partite nell'ordine della prima occorrenza; le partite
+            senza data o senza squadre formano un gruppo a sé
+        """
+        groups: List[List[Dict[str, Any]]] = []
+        # data -> chiave esatta -> (indice del gruppo, squadra di casa, squadra ospite, fonti)
+        exact: Dict[str, Dict[Tuple[str, str], Tuple[int, _Side, _Side, Set[str]]]] = {}
+        # data -> gruppi del giorno, per il confronto approssimato
+        blocks: Dict[str, List[Tuple[int, _Side, _Side, Set[str]]]] = {}
+
+        for match in matches:
+            date = match_date(match)
+            source = match_source(match)
+            home_id, home_form = self._team_key(match.get('home_team'), source)
+            away_id, away_form = self._team_key(match.get('away_team'), source)
+
+            if not date or not (home_id or home_form) or not (away_id or away_form):
+                groups.append([match])
+                continue
+
+            key = (home_id or f"~{home_form}", away_id or f"~{away_form}")
+            block_keys = exact.setdefault(date, {})
+            block = blocks.setdefault(date, [])
+
+            entry = block_keys.get(key)
+            if entry is None:
+                # Confronto approssimato solo con i gruppi dello stesso giorno
+                best_score = 0.0
+                for candidate in block:
+                    # Una fonte elenca ogni partita una volta sola
+                    if source in candidate[3]:
+                        continue
+                    score = self._match_score(candidate[1], candidate[2], (home_id, home_form),
+                                              (away_id, away_form))
+                    if score > best_score:
+                        entry, best_score = candidate, score
+
+            if entry is None:
+                entry = (len(groups), _Side(), _Side(), set())
+                groups.append([])
+                block.append(entry)
+
+            entry[1].add(home_id, home_form)
+            entry[2].add(away_id, away_form)
+            entry[3].add(source)
+            block_keys[key] = entry
+            groups[entry[0]].append(match)
+
+        return groups
@@ -0,0 +1,653 @@
+"""
+Registro dichiarativo dei normalizzatori delle partite per fonte.
+Ogni fonte è descritta da una specifica: percorsi dei campi nel dato grezzo,
+tabella degli stati, formato del punteggio ed eventuali passi specifici
+(statistiche per squadra, tiri, arbitri). Al caricamento del modulo ogni
+specifica viene compilata in estrattori precalcolati, così process_match
+sceglie il normalizzatore con una sola ricerca nel dizionario.
+"""
+import re
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable, Iterable, Tuple
+
+from src.utils.time_utils import parse_date
+
+logger = logging.getLogger(__name__)
+
+Extractor = Callable[[Dict[str, Any]], Any]
+
+# Stati distinti memorizzati al massimo per ogni tabella (le date usate come stato non hanno limite)
+STATUS_CACHE_SIZE = 1024
+
+
+# =============================================================================
+# ESTRATTORI
+# =============================================================================
+
+def compile_path(path: str) -> Extractor:
+    """
+    Compila un percorso puntato ('homeTeam.name') in un estrattore.
+
+    Args:
+        path: Chiavi annidate separate da punto
+
+    Returns:
+        Funzione che restituisce il valore o None se una chiave manca
+    """
+    keys = tuple(path.split('.'))
+    if len(keys) == 1:
+        key = keys[0]
+
+        def extract(data):
+            return data.get(key)
+        return extract
+
+    def extract(data):
+        for key in keys:
+            if not isinstance(data, dict):
+                return None
+            data = data.get(key)
+        return data
+    return extract
+
+
+def name_or_value(path: str) -> Extractor:
+    """Nome di un oggetto squadra, oppure il valore stesso se è già una stringa."""
+    extractor = compile_path(path)
+
+    def extract(data):
+        value = extractor(data)
+        return value.get('name') if isinstance(value, dict) else value
+    return extract
+
+
+def date_time(date_path: str, time_path: str, default_time: Optional[str] = None) -> Extractor:
+    """
+    Data e ora da campi separati in formato ISO.
+    Se la data non è interpretabile restituisce la stringa originale.
+    """
+    get_date = compile_path(date_path)
+    get_time = compile_path(time_path)
+
+    def extract(data):
+        date_str = get_date(data)
+        if not date_str:
+            return None
+        time_str = get_time(data) or default_time
+        dt = parse_date(f"{date_str} {time_str}" if time_str else date_str)
+        return dt.isoformat() if dt else date_str
+    return extract
+
+
+def timestamp(path: str) -> Extractor:
+    """Timestamp Unix in formato ISO."""
+    extractor = compile_path(path)
+
+    def extract(data):
+        value = extractor(data)
+        try:
+            return datetime.fromtimestamp(value).isoformat() if value is not None else None
+        except (TypeError, ValueError, OverflowError, OSError):
+            return None
+    return extract
+
+
+_SCORE_SEPARATOR = re.compile(r'[-:]')
+
+
+def parse_score_text(value: Any) -> Optional[Tuple[int, int]]:
+    """Punteggio da testo ("2:1", "2 - 1"); None se non interpretabile."""
+    if not isinstance(value, str):
+        return None
+    parts = _SCORE_SEPARATOR.split(value)
+    if len(parts) != 2:
+        return None
+    try:
+        return int(parts[0].strip()), int(parts[1].strip())
+    except ValueError:
+        return None
+
+
+# =============================================================================
+# STATI
+# =============================================================================
+
+class StatusMap:
+    """
+    Tabella di conversione degli stati di una fonte nel formato standard.
+
+    Gli stati esatti sono una ricerca nel dizionario; quelli riconosciuti per
+    parola chiave (o dal fallback) vengono aggiunti alla tabella alla prima
+    occorrenza, quindi le conversioni successive dello stesso valore sono O(1).
+    """
+
+    def __init__(self, exact: Optional[Dict[Any, str]] = None,
+                 keywords: Iterable[Tuple[Tuple[str, ...], str]] = (),
+                 fallback: Optional[Callable[[str], Optional[str]]] = None,
+                 default: str = 'unknown'):
+        """
+        Args:
+            exact: Valore grezzo -> stato standard
+            keywords: Coppie (sottostringhe, stato) provate in ordine sul valore minuscolo
+            fallback: Funzione chiamata sul valore minuscolo se nessuna parola chiave corrisponde
+            default: Stato per i valori non riconosciuti
+        """
+        self.table: Dict[Any, str] = dict(exact or {})
+        self.keywords = tuple(keywords)
+        self.fallback = fallback
+        self.default = default
+
+    def __call__(self, value: Any) -> str:
+        try:
+            return self.table[value]
+        except KeyError:
+            pass
+        except TypeError:
+            return self.default
+
+        status = self._resolve(value)
+        if len(self.table) < STATUS_CACHE_SIZE:
+            self.table[value] = status
+        return status
+
+    def _resolve(self, value: Any) -> str:
+        text = str(value).lower()
+        for keys, status in self.keywords:
+            if any(key in text for key in keys):
+                return status
+        if self.fallback:
+            return self.fallback(text) or self.default
+        return self.default
+
+    def map_many(self, values: Iterable[Any]) -> List[str]:
+        """Converte una colonna di stati con una ricerca per valore."""
+        table = self.table
+        return [table[value] if value in table else self(value) for value in values]
+
+
+GENERIC_KEYWORDS = (
+    (('finished', 'ft', 'aet', 'pen'), 'finished'),
+    (('half', '1h', '2h', 'ht', 'live'), 'in_progress'),
+    (('postponed',), 'postponed'),
+    (('cancel',), 'cancelled'),
+    (('suspended',), 'suspended'),
+    (('abandoned',), 'abandoned'),
+    (('scheduled', 'not started'), 'scheduled'),
+)
+
+
+def _fbref_date_status(text: str) -> Optional[str]:
+    # FBref usa la data (es. "Oct 28, 2023") come stato delle partite programmate
+    return 'scheduled' if parse_date(text) else None
+
+
+FOOTBALL_DATA_STATUS = StatusMap({
+    'SCHEDULED': 'scheduled',
+    'TIMED': 'scheduled',
+    'IN_PLAY': 'in_progress',
+    'PAUSED': 'in_progress',
+    'FINISHED': 'finished',
+    'SUSPENDED': 'suspended',
+    'POSTPONED': 'postponed',
+    'CANCELLED': 'cancelled',
+    'AWARDED': 'awarded'
+})
+
+API_FOOTBALL_STATUS = StatusMap({
+    'NS': 'scheduled',    # Not Started
+    'TBD': 'scheduled',   # To Be Defined
+    '1H': 'in_progress',  # First Half
+    'HT': 'in_progress',  # Half Time
+    '2H': 'in_progress',  # Second Half
+    'ET': 'in_progress',  # Extra Time
+    'P': 'in_progress',   # Penalty
+    'FT': 'finished',     # Full Time
+    'AET': 'finished',    # After Extra Time
+    'PEN': 'finished',    # Penalty Shootout
+    'BT': 'break',        # Break Time
+    'SUSP': 'suspended',  # Suspended
+    'INT': 'interrupted', # Interrupted
+    'PST': 'postponed',   # Postponed
+    'CANC': 'cancelled',  # Cancelled
+    'ABD': 'abandoned',   # Abandoned
+    'AWD': 'awarded',     # Technical Loss
+    'WO': 'walkover'      # Walkover
+})
+
+FBREF_STATUS = StatusMap(keywords=(
+    (('complete', 'ft'), 'finished'),
+    (('postponed', 'susp', 'cancel', 'interrupt'), 'postponed'),
+    (('ongoing', 'live', '1h', '2h', 'halftime'), 'in_progress'),
+    (('scheduled',), 'scheduled'),
+), fallback=_fbref_date_status)
+
+SOFASCORE_STATUS = StatusMap({
+    'notstarted': 'scheduled',
+    'inprogress': 'in_progress',
+    'finished': 'finished',
+    'postponed': 'postponed',
+    'canceled': 'cancelled',
+    'interrupted': 'interrupted',
+    'suspended': 'suspended',
+    'abandoned': 'abandoned'
+}, keywords=GENERIC_KEYWORDS)
+
+FOOTYSTATS_STATUS = StatusMap({
+    'complete': 'finished',
+    'incomplete': 'scheduled',
+    'suspended': 'suspended',
+    'canceled': 'cancelled',
+    'postponed': 'postponed'
+}, keywords=GENERIC_KEYWORDS)
+
+UNDERSTAT_STATUS = StatusMap({True: 'finished', False: 'scheduled'})
+
+GENERIC_STATUS = StatusMap(keywords=GENERIC_KEYWORDS)
+
+
+# =============================================================================
+# PASSI SPECIFICI PER FONTE
+# =============================================================================
+
+def _football_data_referees(match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
+    referees = match_data.get('referees')
+    if referees:
+        output['referees'] = [
+            {'name': ref.get('name', ''), 'role': ref.get('role', '')}
+            for ref in referees
+        ]
+
+
+def _api_football_team_blocks(match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
+    # Statistiche e formazioni arrivano come lista per squadra: indicizzale per ID
+    for raw_key, key, value_key in (('statistics', 'statistics', 'statistics'), ('lineups', 'lineups', None)):
+        blocks = {}
+        for block in match_data.get(raw_key) or []:
+            team_id = (block.get('team') or {}).get('id')
+            if team_id:
+                blocks[str(team_id)] = block.get(value_key, []) if value_key else block
+        if blocks:
+            output[key] = blocks
+
+
+def _understat_shots(match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
+    shots = match_data.get('shots')
+    if shots is None:
+        return
+    home_shots = []
+    away_shots = []
+    for shot in shots:
+        shot_data = {
+            'minute': shot.get('minute', 0),
+            'player': shot.get('player', ''),
+            'xG': shot.get('xG', 0.0),
+            'position': {'x': shot.get('X', 0.0), 'y': shot.get('Y', 0.0)},
+            'result': shot.get('result', '')
+        }
+        (home_shots if shot.get('h_a') == 'h' else away_shots).append(shot_data)
+
+    xg_stats = output.setdefault('xg_stats', {'source': 'understat'})
+    xg_stats['home_shots'] = home_shots
+    xg_stats['away_shots'] = away_shots
+
+
+def _status_from_datetime(match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
+    # OpenFootball non ha uno stato: lo si deduce dalla data
+    match_time = parse_date(output['datetime']) if output['datetime'] else None
+    if match_time:
+        now = datetime.now(match_time.tzinfo)
+        output['status'] = 'scheduled' if match_time > now else 'finished'
+
+
+def _always_finished(match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
+    # StatsBomb ha solo dati storici
+    output['status'] = 'finished'
+
+
+def xg_stats(container: str, home_key: str, away_key: str, source: str) -> Callable[[Dict[str, Any], Dict[str, Any]], None]:
+    """Passo che copia gli xG della partita in output['xg_stats']."""
+    extractor = compile_path(container)
+
+    def apply(match_data, output):
+        xg = extractor(match_data)
+        if isinstance(xg, dict):
+            output['xg_stats'] = {
+                'home': xg.get(home_key, 0.0),
+                'away': xg.get(away_key, 0.0),
+                'source': source
+            }
+    return apply
+
+
+# =============================================================================
+# SPECIFICHE DELLE FONTI
+# =============================================================================
+
+# Chiavi: 'id' (ID della partita e della fonte), 'fields' (campo standard ->
+# percorso, estrattore, lista di alternative o (regola, conversione)), 'status' (percorso, tabella),
+# 'score' (percorsi dei gol in casa e fuori) o 'score_text' (percorso del
+# punteggio testuale), 'steps' (passi specifici eseguiti dopo i campi)
+MATCH_SOURCE_SPECS: Dict[str, Dict[str, Any]] = {
+    'football_data': {
+        'id': 'id',
+        'fields': {
+            'home_team.id': ('homeTeam.id', str),
+            'home_team.name': 'homeTeam.name',
+            'home_team.short_name': ['homeTeam.shortName', 'homeTeam.name'],
+            'away_team.id': ('awayTeam.id', str),
+            'away_team.name': 'awayTeam.name',
+            'away_team.short_name': ['awayTeam.shortName', 'awayTeam.name'],
+            'competition.id': ('competition.id', str),
+            'competition.name': 'competition.name',
+            'datetime': 'utcDate',
+            'venue.name': 'venue',
+        },
+        'status': ('status', FOOTBALL_DATA_STATUS),
+        'score': ('score.fullTime.home', 'score.fullTime.away'),
+        'steps': [_football_data_referees],
+    },
+    'api_football': {
+        'id': 'fixture.id',
+        'fields': {
+            'home_team.id': ('teams.home.id', str),
+            'home_team.name': 'teams.home.name',
+            'away_team.id': ('teams.away.id', str),
+            'away_team.name': 'teams.away.name',
+            'competition.id': ('league.id', str),
+            'competition.name': 'league.name',
+            'datetime': 'fixture.date',
+            'venue.name': 'fixture.venue.name',
+            'venue.city': 'fixture.venue.city',
+            'events': 'events',
+        },
+        'status': ('fixture.status.short', API_FOOTBALL_STATUS),
+        'score': ('goals.home', 'goals.away'),
+        'steps': [_api_football_team_blocks],
+    },
+    'flashscore': {
+        'id': 'id',
+        'fields': {
+            'home_team.name': 'home_team',
+            'away_team.name': 'away_team',
+            'competition.name': 'tournament',
+            'datetime': ['datetime', date_time('date', 'time')],
+            'statistics': 'statistics',
+            'lineups': 'lineups',
+            'events': 'events',
+            'odds': 'odds',
+        },
+        'status': ('status', GENERIC_STATUS),
+        'score': ('score.home', 'score.away'),
+    },
+    'fbref': {
+        'id': 'match_id',
+        'fields': {
+            'home_team.id': 'home_team.id',
+            'home_team.name': 'home_team.name',
+            'away_team.id': 'away_team.id',
+            'away_team.name': 'away_team.name',
+            'competition.id': 'competition.id',
+            'competition.name': 'competition.name',
+            'datetime': date_time('date', 'time', default_time='15:00'),
+            'venue.name': 'venue',
+            'statistics': 'statistics',
+        },
+        'status': ('status', FBREF_STATUS),
+        'score': ('score.home', 'score.away'),
+        'steps': [xg_stats('xg', 'home', 'away', 'fbref')],
+    },
+    'understat': {
+        'id': 'id',
+        'fields': {
+            'home_team.id': ('h.id', str),
+            'home_team.name': 'h.title',
+            'away_team.id': ('a.id', str),
+            'away_team.name': 'a.title',
+            'competition.id': ('league.id', str),
+            'competition.name': 'league.name',
+            'datetime': 'datetime',
+        },
+        'status': ('isResult', UNDERSTAT_STATUS),
+        'score': ('goals.h', 'goals.a'),
+        'steps': [xg_stats('xG', 'h', 'a', 'understat'), _understat_shots],
+    },
+    'sofascore': {
+        'id': 'id',
+        'fields': {
+            'home_team.id': ('homeTeam.id', str),
+            'home_team.name': 'homeTeam.name',
+            'home_team.short_name': ['homeTeam.shortName', 'homeTeam.name'],
+            'away_team.id': ('awayTeam.id', str),
+            'away_team.name': 'awayTeam.name',
+            'away_team.short_name': ['awayTeam.shortName', 'awayTeam.name'],
+            'competition.id': ('tournament.id', str),
+            'competition.name': 'tournament.name',
+            'datetime': timestamp('startTimestamp'),
+            'venue.name': 'venue.stadium.name',
+            'venue.city': 'venue.city.name',
+            'statistics': 'statistics',
+            'events': 'events',
+        },
+        'status': ('status.type', SOFASCORE_STATUS),
+        'score': ('homeScore.current', 'awayScore.current'),
+        'steps': [xg_stats('xg', 'home', 'away', 'sofascore')],
+    },
+    'footystats': {
+        'id': 'id',
+        'fields': {
+            'home_team.id': ('home_team.id', str),
+            'home_team.name': 'home_team.name',
+            'away_team.id': ('away_team.id', str),
+            'away_team.name': 'away_team.name',
+            'competition.id': ('league.id', str),
+            'competition.name': 'league.name',
+            'datetime': 'date',
+            'statistics': 'stats',
+        },
+        'status': ('status', FOOTYSTATS_STATUS),
+        'score': ('home_score', 'away_score'),
+    },
+    'whoscored': {
+        'id': 'matchId',
+        'fields': {
+            'home_team.id': ('home.teamId', str),
+            'home_team.name': 'home.name',
+            'home_team.short_name': ['home.shortName', 'home.name'],
+            'away_team.id': ('away.teamId', str),
+            'away_team.name': 'away.name',
+            'away_team.short_name': ['away.shortName', 'away.name'],
+            'competition.id': ('tournament.tournamentId', str),
+            'competition.name': 'tournament.name',
+            'datetime': 'matchDate',
+            'venue.name': 'venue.name',
+            'venue.city': 'venue.city',
+            'statistics': 'stats',
+            'events': 'events',
+        },
+        'status': ('status', GENERIC_STATUS),
+        'score': ('score.homeScore', 'score.awayScore'),
+    },
+    'worldfootball': {
+        'id': 'id',
+        'fields': {
+            'home_team.name': 'home_team',
+            'away_team.name': 'away_team',
+            'competition.name': 'competition',
+            'datetime': date_time('date', 'time', default_time='15:00'),
+        },
+        'status': ('status', GENERIC_STATUS),
+        'score_text': 'score',
+    },
+    'soccerway': {
+        'id': 'id',
+        'fields': {
+            'home_team.name': 'home_team',
+            'away_team.name': 'away_team',
+            'competition.name': 'competition',
+            'datetime': date_time('date', 'time'),
+            'venue.name': 'venue',
+        },
+        'status': ('status', GENERIC_STATUS),
+        'score_text': 'score',
+    },
+    'open_football': {
+        'id': 'id',
+        'fields': {
+            'home_team.name': name_or_value('team1'),
+            'away_team.name': name_or_value('team2'),
+            'competition.name': 'competition',
+            'datetime': 'date',
+        },
+        'score': ('score1', 'score2'),
+        'steps': [_status_from_datetime],
+    },
+    'statsbomb': {
+        'id': 'match_id',
+        'fields': {
+            'home_team.id': ('home_team.home_team_id', str),
+            'home_team.name': 'home_team.home_team_name',
+            'away_team.id': ('away_team.away_team_id', str),
+            'away_team.name': 'away_team.away_team_name',
+            'competition.id': ('competition.competition_id', str),
+            'competition.name': 'competition.competition_name',
+            'datetime': 'match_date',
+            'statistics': 'stats',
+            'events': 'events',
+        },
+        'score': ('home_score', 'away_score'),
+        'steps': [_always_finished],
+    },
+}
+
+
+def _present(value: Any) -> bool:
+    """Un valore estratto viene copiato nell'output se non è None né stringa vuota."""
+    return value is not None and value != ''
+
+
+def compile_rule(rule: Any) -> Extractor:
+    """
+    Compila la regola di un campo in un estrattore.
+
+    Args:
+        rule: Percorso puntato, estrattore già pronto o lista di alternative
+            (vale la prima con un valore)
+
+    Returns:
+        Funzione che restituisce il valore o None
+    """
+    if isinstance(rule, list):
+        extractors = tuple(compile_rule(alternative) for alternative in rule)
+
+        def extract(data):
+            value = None
+            for extractor in extractors:
+                value = extractor(data)
+                if _present(value):
+                    return value
+            return value
+        return extract
+    if callable(rule):
+        return rule
+    return compile_path(rule)
+
+
+class SourceNormalizer:
+    """
+    Normalizzatore compilato di una fonte.
+
+    La specifica viene tradotta una sola volta in estrattori (vedi
+    compile_path): a ogni partita restano da eseguire solo le letture dei
+    campi, la ricerca dello stato nella tabella e il calcolo del punteggio.
+    """
+
+    def __init__(self, source: str, spec: Dict[str, Any]):
+        """
+        Args:
+            source: Nome della fonte
+            spec: Specifica della fonte (vedi MATCH_SOURCE_SPECS)
+        """
+        self.source = source
+        self.status_map: Optional[StatusMap] = spec['status'][1] if spec.get('status') else None
+        self.steps = tuple(spec.get('steps', ()))
+
+        self.get_id = compile_rule(spec['id']) if spec.get('id') else None
+        # (sezione dell'output o '' per la radice, chiave, estrattore, conversione)
+        self.fields: List[Tuple[str, str, Extractor, Optional[Callable[[Any], Any]]]] = []
+        for target, rule in spec.get('fields', {}).items():
+            rule, cast = rule if isinstance(rule, tuple) else (rule, None)
+            section, _, key = target.rpartition('.')
+            self.fields.append((section, key, compile_rule(rule), cast))
+        self.get_status = compile_rule(spec['status'][0]) if spec.get('status') else None
+        self.get_score = tuple(compile_rule(path) for path in spec['score']) if spec.get('score') else None
+        self.get_score_text = compile_rule(spec['score_text']) if spec.get('score_text') else None
+
+    def _apply(self, d: Dict[str, Any], output: Dict[str, Any]) -> None:
+        if self.get_id:
+            value = self.get_id(d)
+            if _present(value):
+                output['match_id'] = output['source_ids'][self.source] = str(value)
+
+        for section, key, extract, cast in self.fields:
+            value = extract(d)
+            if _present(value):
+                (output[section] if section else output)[key] = cast(value) if cast else value
+
+        if self.get_status:
+            value = self.get_status(d)
+            if value is not None:
+                output['status'] = self.status_map(value)
+
+        home = away = None
+        if self.get_score:
+            home, away = (extract(d) for extract in self.get_score)
+            try:
+                home, away = (int(home), int(away)) if home is not None and away is not None else (None, None)
+            except (TypeError, ValueError):
+                home = None
+        elif self.get_score_text:
+            home, away = parse_score_text(self.get_score_text(d)) or (None, None)
+        if home is not None:
+            score = output['score']
+            score['home'] = home
+            score['away'] = away
+            score['winner'] = 'home' if home > away else 'away' if away > home else 'draw'
+
+    def __call__(self, match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
+        """
+        Popola output (partita standard di process_match) dal record grezzo.
+
+        Args:
+            match_data: Dati grezzi della partita
+            output: Dizionario di output da popolare
+        """
+        try:
+            self._apply(match_data, output)
+            for step in self.steps:
+                step(match_data, output)
+        except Exception as e:
+            logger.error(f"Errore nella normalizzazione dei dati {self.source}: {e}")
+
+
+# Normalizzatori compilati per fonte
+MATCH_NORMALIZERS: Dict[str, SourceNormalizer] = {
+    source: SourceNormalizer(source, spec) for source, spec in MATCH_SOURCE_SPECS.items()
+}
+
+
+def map_statuses(source: str, values: Iterable[Any]) -> List[str]:
+    """
+    Converte in blocco gli stati grezzi di una fonte nel formato standard.
+
+    Args:
+        source: Nome della fonte
+        values: Stati grezzi
+
+    Returns:
+        Stati standard nello stesso ordine ('unknown' per le fonti senza tabella)
+    """
+    normalizer = MATCH_NORMALIZERS.get(source)
+    if not normalizer or not normalizer.status_map:
+        return ['unknown' for _ in values]
+    return normalizer.status_map.map_many(values)
@@ -5,6 +5,7 @@ Questo modulo standardizza e arricchisce i dati delle partite provenienti da div
 applicando pulizia, normalizzazione e aggregazione per garantire dati coerenti.
 """
 
+import copy
 import logging
 import time
 from datetime import datetime, timedelta
@@ -38,6 +39,14 @@ from src.data.open_data.statsbomb import get_loader as get_statsbomb
 from src.utils.database import FirebaseManager
 from src.utils.time_utils import parse_date, format_date, get_match_status
 from src.config.sources import get_sources_for_data_type, get_source_priority
+from src.utils.deadline import RunDeadline, PRIORITY_NORMAL, PRIORITY_LOW
+from src.data.processors.parallel import normalize_records
+from src.data.processors.match_normalizers import MATCH_NORMALIZERS
+from src.data.processors.match_dedup import (
+    MatchDeduplicator, FIELD_SOURCE_PREFERENCES, preferred_source, match_richness
+)
+from src.data.entity_registry import get_registry
+from src.data.processors.league_history import get_result_history
 
 # Configurazione logger
 logger = logging.getLogger(__name__)
@@ -86,6 +95,21 @@ class MatchProcessor:
         
         # Cache per mappare nomi squadre
         self.team_name_cache = {}
+        
+        # Scadenza dell'esecuzione: vicino al limite l'arricchimento remoto viene rimandato
+        self.deadline: Optional[RunDeadline] = None
+    
+    @classmethod
+    def for_normalization(cls) -> 'MatchProcessor':
+        """
+        Crea un processore senza client né database, sufficiente per process_match.
+        Usato nei processi worker della normalizzazione parallela.
+        """
+        processor = cls.__new__(cls)
+        processor.db = None
+        processor.team_name_cache = {}
+        processor.deadline = None
+        return processor
     
     
     def process_match(
@@ -125,6 +149,9 @@ class MatchProcessor:
                     'id': league_id or '',
                     'name': ''
                 },
+                # Campionato per cui la partita è stata raccolta: la fonte
+                # sovrascrive competition.id con il proprio ID
+                'league_id': league_id or '',
                 'datetime': '',
                 'status': '',
                 'score': {
@@ -143,33 +170,10 @@ class MatchProcessor:
                 'last_updated': datetime.now().isoformat()
             }
             
-            # Normalizzazione in base alla fonte
-            if source == 'football_data':
-                self._normalize_football_data(match_data, standardized_match)
-            elif source == 'api_football':
-                self._normalize_api_football(match_data, standardized_match)
-            elif source == 'flashscore':
-                self._normalize_flashscore(match_data, standardized_match)
-            elif source == 'fbref':
-                self._normalize_fbref(match_data, standardized_match)
-            elif source == 'understat':
-                self._normalize_understat(match_data, standardized_match)
-            elif source == 'sofascore':
-                self._normalize_sofascore(match_data, standardized_match)
-            elif source == 'footystats':
-                self._normalize_footystats(match_data, standardized_match)
-            elif source == 'whoscored':
-                self._normalize_whoscored(match_data, standardized_match)
-            elif source == 'soccerway':
-                self._normalize_soccerway(match_data, standardized_match)
-            elif source == 'worldfootball':
-                self._normalize_worldfootball(match_data, standardized_match)
-            elif source == 'transfermarkt':
-                self._normalize_transfermarkt(match_data, standardized_match)
-            elif source == 'open_football':
-                self._normalize_open_football(match_data, standardized_match)
-            elif source == 'statsbomb':
-                self._normalize_statsbomb(match_data, standardized_match)
+            # Normalizzazione in base alla fonte (specifica compilata in match_normalizers)
+            normalizer = MATCH_NORMALIZERS.get(source)
+            if normalizer:
+                normalizer(match_data, standardized_match)
             else:
                 logger.warning(f"Fonte non supportata: {source}")
             
@@ -181,22 +185,6 @@ class MatchProcessor:
                 date_str = standardized_match['datetime'].split('T')[0] if 'T' in standardized_match['datetime'] else ''
                 standardized_match['match_id'] = f"{home_team}_vs_{away_team}_{date_str}"
             
-            # Aggiunta ID della fonte nei source_ids
-            if source == 'football_data' and 'id' in match_data:
-                standardized_match['source_ids']['football_data'] = str(match_data['id'])
-            elif source == 'api_football' and 'fixture' in match_data and 'id' in match_data['fixture']:
-                standardized_match['source_ids']['api_football'] = str(match_data['fixture']['id'])
-            elif source == 'flashscore' and 'id' in match_data:
-                standardized_match['source_ids']['flashscore'] = str(match_data['id'])
-            elif source == 'fbref' and 'id' in match_data:
-                standardized_match['source_ids']['fbref'] = str(match_data['id'])
-            elif source == 'understat' and 'id' in match_data:
-                standardized_match['source_ids']['understat'] = str(match_data['id'])
-            elif source == 'sofascore' and 'id' in match_data:
-                standardized_match['source_ids']['sofascore'] = str(match_data['id'])
-            elif source == 'transfermarkt' and 'id' in match_data:
-                standardized_match['source_ids']['transfermarkt'] = str(match_data['id'])
-            
             return standardized_match
             
         except Exception as e:
@@ -208,358 +196,29 @@ class MatchProcessor:
                 'raw_data': match_data
             }
     
-    def _normalize_football_data(
-        self, 
-        match_data: Dict[str, Any], 
-        output: Dict[str, Any]
-    ) -> None:
-        """
-        Normalizza i dati da Football-Data API.
-        
-        Args:
-            match_data: Dati grezzi della partita da Football-Data.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita
-            if 'id' in match_data:
-                output['match_id'] = str(match_data['id'])
-                output['source_ids']['football_data'] = str(match_data['id'])
-            
-            # Squadre
-            if 'homeTeam' in match_data and match_data['homeTeam']:
-                output['home_team']['id'] = str(match_data['homeTeam'].get('id', ''))
-                output['home_team']['name'] = match_data['homeTeam'].get('name', '')
-                output['home_team']['short_name'] = match_data['homeTeam'].get('shortName', output['home_team']['name'])
-            
-            if 'awayTeam' in match_data and match_data['awayTeam']:
-                output['away_team']['id'] = str(match_data['awayTeam'].get('id', ''))
-                output['away_team']['name'] = match_data['awayTeam'].get('name', '')
-                output['away_team']['short_name'] = match_data['awayTeam'].get('shortName', output['away_team']['name'])
-            
-            # Competizione
-            if 'competition' in match_data and match_data['competition']:
-                output['competition']['id'] = str(match_data['competition'].get('id', ''))
-                output['competition']['name'] = match_data['competition'].get('name', '')
-            
-            # Data e ora
-            if 'utcDate' in match_data:
-                output['datetime'] = match_data['utcDate']
-            
-            # Stato partita
-            if 'status' in match_data:
-                output['status'] = self._map_football_data_status(match_data['status'])
-            
-            # Punteggio
-            if 'score' in match_data and match_data['score']:
-                if 'fullTime' in match_data['score'] and match_data['score']['fullTime']:
-                    home_score = match_data['score']['fullTime'].get('home')
-                    away_score = match_data['score']['fullTime'].get('away')
-                    
-                    if home_score is not None and away_score is not None:
-                        output['score']['home'] = home_score
-                        output['score']['away'] = away_score
-                        
-                        # Determina vincitore
-                        if home_score > away_score:
-                            output['score']['winner'] = 'home'
-                        elif away_score > home_score:
-                            output['score']['winner'] = 'away'
-                        else:
-                            output['score']['winner'] = 'draw'
-            
-            # Stadio
-            if 'venue' in match_data:
-                output['venue']['name'] = match_data.get('venue', '')
-            
-            # Arbitri
-            if 'referees' in match_data and match_data['referees']:
-                output['referees'] = [
-                    {
-                        'name': ref.get('name', ''),
-                        'role': ref.get('role', '')
-                    }
-                    for ref in match_data['referees']
-                ]
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati Football-Data: {e}")
-    
-    def _normalize_api_football(
-        self, 
-        match_data: Dict[str, Any], 
-        output: Dict[str, Any]
-    ) -> None:
-        """
-        Normalizza i dati da API-Football.
-        
-        Args:
-            match_data: Dati grezzi della partita da API-Football.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita
-            if 'fixture' in match_data and 'id' in match_data['fixture']:
-                output['match_id'] = str(match_data['fixture']['id'])
-                output['source_ids']['api_football'] = str(match_data['fixture']['id'])
-            
-            # Squadre
-            if 'teams' in match_data:
-                if 'home' in match_data['teams'] and match_data['teams']['home']:
-                    output['home_team']['id'] = str(match_data['teams']['home'].get('id', ''))
-                    output['home_team']['name'] = match_data['teams']['home'].get('name', '')
-                
-                if 'away' in match_data['teams'] and match_data['teams']['away']:
-                    output['away_team']['id'] = str(match_data['teams']['away'].get('id', ''))
-                    output['away_team']['name'] = match_data['teams']['away'].get('name', '')
-            
-            # Competizione
-            if 'league' in match_data and match_data['league']:
-                output['competition']['id'] = str(match_data['league'].get('id', ''))
-                output['competition']['name'] = match_data['league'].get('name', '')
-            
-            # Data e ora
-            if 'fixture' in match_data and 'date' in match_data['fixture']:
-                output['datetime'] = match_data['fixture']['date']
-            
-            # Stato partita
-            if 'fixture' in match_data and 'status' in match_data['fixture']:
-                status = match_data['fixture']['status']
-                if 'short' in status:
-                    output['status'] = self._map_api_football_status(status['short'])
-            
-            # Punteggio
-            if 'goals' in match_data:
-                home_score = match_data['goals'].get('home')
-                away_score = match_data['goals'].get('away')
-                
-                if home_score is not None and away_score is not None:
-                    output['score']['home'] = home_score
-                    output['score']['away'] = away_score
-                    
-                    # Determina vincitore
-                    if home_score > away_score:
-                        output['score']['winner'] = 'home'
-                    elif away_score > home_score:
-                        output['score']['winner'] = 'away'
-                    else:
-                        output['score']['winner'] = 'draw'
-            
-            # Stadio
-            if 'fixture' in match_data and 'venue' in match_data['fixture']:
-                venue = match_data['fixture']['venue']
-                output['venue']['name'] = venue.get('name', '')
-                output['venue']['city'] = venue.get('city', '')
-            
-            # Statistiche (se disponibili)
-            if 'statistics' in match_data and match_data['statistics']:
-                stats = {}
-                for team_stats in match_data['statistics']:
-                    team_id = team_stats.get('team', {}).get('id')
-                    if team_id:
-                        stats[str(team_id)] = team_stats.get('statistics', [])
-                
-                if stats:
-                    output['statistics'] = stats
-            
-            # Formazioni (se disponibili)
-            if 'lineups' in match_data and match_data['lineups']:
-                lineups = {}
-                for team_lineup in match_data['lineups']:
-                    team_id = team_lineup.get('team', {}).get('id')
-                    if team_id:
-                        lineups[str(team_id)] = team_lineup
-                
-                if lineups:
-                    output['lineups'] = lineups
-            
-            # Eventi (se disponibili)
-            if 'events' in match_data and match_data['events']:
-                output['events'] = match_data['events']
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati API-Football: {e}")
-    
-    def _normalize_flashscore(
-        self, 
-        match_data: Dict[str, Any], 
-        output: Dict[str, Any]
-    ) -> None:
-        """
-        Normalizza i dati da Flashscore.
-        
-        Args:
-            match_data: Dati grezzi della partita da Flashscore.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita
-            if 'id' in match_data:
-                output['match_id'] = match_data['id']
-                output['source_ids']['flashscore'] = match_data['id']
-            
-            # Squadre
-            if 'home_team' in match_data:
-                output['home_team']['name'] = match_data['home_team']
-            
-            if 'away_team' in match_data:
-                output['away_team']['name'] = match_data['away_team']
-            
-            # Competizione
-            if 'tournament' in match_data:
-                output['competition']['name'] = match_data['tournament']
-            
-            # Data e ora
-            date_str = match_data.get('date', '')
-            time_str = match_data.get('time', '')
-            
-            if date_str:
-                try:
-                    if 'datetime' in match_data:
-                        output['datetime'] = match_data['datetime']
-                    elif time_str:
-                        # Combina data e ora
-                        dt = parse_date(f"{date_str} {time_str}")
-                        output['datetime'] = dt.isoformat() if dt else ''
-                    else:
-                        dt = parse_date(date_str)
-                        output['datetime'] = dt.isoformat() if dt else ''
-                except:
-                    output['datetime'] = date_str
-            
-            # Stato partita
-            if 'status' in match_data:
-                output['status'] = self._map_flashscore_status(match_data['status'])
-            
-            # Punteggio
-            if 'score' in match_data:
-                home_score = match_data['score'].get('home')
-                away_score = match_data['score'].get('away')
-                
-                if home_score is not None and away_score is not None:
-                    try:
-                        home_score_int = int(home_score)
-                        away_score_int = int(away_score)
-                        
-                        output['score']['home'] = home_score_int
-                        output['score']['away'] = away_score_int
-                        
-                        # Determina vincitore
-                        if home_score_int > away_score_int:
-                            output['score']['winner'] = 'home'
-                        elif away_score_int > home_score_int:
-                            output['score']['winner'] = 'away'
-                        else:
-                            output['score']['winner'] = 'draw'
-                    except:
-                        # Se non può essere convertito in intero, usa i valori originali
-                        output['score']['home'] = home_score
-                        output['score']['away'] = away_score
-            
-            # Statistiche (se disponibili)
-            if 'statistics' in match_data and match_data['statistics']:
-                output['statistics'] = match_data['statistics']
-            
-            # Formazioni (se disponibili)
-            if 'lineups' in match_data and match_data['lineups']:
-                output['lineups'] = match_data['lineups']
-            
-            # Eventi (gol, cartellini, ecc.)
-            if 'events' in match_data and match_data['events']:
-                output['events'] = match_data['events']
-            
-            # Quote (se disponibili)
-            if 'odds' in match_data and match_data['odds']:
-                output['odds'] = match_data['odds']
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati Flashscore: {e}")
-    
-    def _map_football_data_status(self, status: str) -> str:
-        """
-        Mappa lo stato della partita da Football-Data a formato standard.
-        
-        Args:
-            status: Stato della partita nel formato Football-Data.
-        
-        Returns:
-            Stato della partita in formato standard.
-        """
-        status_map = {
-            'SCHEDULED': 'scheduled',
-            'TIMED': 'scheduled',
-            'IN_PLAY': 'in_progress',
-            'PAUSED': 'in_progress',
-            'FINISHED': 'finished',
-            'SUSPENDED': 'suspended',
-            'POSTPONED': 'postponed',
-            'CANCELLED': 'cancelled',
-            'AWARDED': 'awarded'
-        }
-        
-        return status_map.get(status, 'unknown')
-    
-    def _map_api_football_status(self, status: str) -> str:
+    def process_matches(
+        self,
+        matches: List[Dict[str, Any]],
+        source: str,
+        league_id: Optional[str] = None,
+        workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Mappa lo stato della partita da API-Football a formato standard.
+        Processa un lotto di partite della stessa fonte.
         
-        Args:
-            status: Stato della partita nel formato API-Football.
-        
-        Returns:
-            Stato della partita in formato standard.
-        """
-        status_map = {
-            'NS': 'scheduled',  # Not Started
-            'TBD': 'scheduled',  # To Be Defined
-            '1H': 'in_progress',  # First Half
-            'HT': 'in_progress',  # Half Time
-            '2H': 'in_progress',  # Second Half
-            'ET': 'in_progress',  # Extra Time
-            'P': 'in_progress',   # Penalty
-            'FT': 'finished',     # Full Time
-            'AET': 'finished',    # After Extra Time
-            'PEN': 'finished',    # Penalty Shootout
-            'BT': 'break',        # Break Time
-            'SUSP': 'suspended',  # Suspended
-            'INT': 'interrupted', # Interrupted
-            'PST': 'postponed',   # Postponed
-            'CANC': 'cancelled',  # Cancelled
-            'ABD': 'abandoned',   # Abandoned
-            'AWD': 'awarded',     # Technical Loss
-            'WO': 'walkover'      # Walkover
-        }
-        
-        return status_map.get(status, 'unknown')
-    
-    def _map_flashscore_status(self, status: str) -> str:
-        """
-        Mappa lo stato della partita da Flashscore a formato standard.
+        Oltre processors.parallel_threshold partite la normalizzazione è
+        divisa in blocchi su un pool di processi; l'ordine è preservato.
         
         Args:
-            status: Stato della partita nel formato Flashscore.
+            matches: Dati grezzi delle partite.
+            source: Nome della fonte dei dati.
+            league_id: ID del campionato (opzionale).
+            workers: Processi del pool (opzionale).
         
         Returns:
-            Stato della partita in formato standard.
+            Lista di partite normalizzate nell'ordine di ingresso.
         """
-        status = status.lower()
-        
-        if 'finished' in status or 'ft' in status or 'aet' in status or 'pen' in status:
-            return 'finished'
-        elif any(x in status for x in ['half', '1h', '2h', 'ht']):
-            return 'in_progress'
-        elif 'postponed' in status:
-            return 'postponed'
-        elif 'cancelled' in status:
-            return 'cancelled'
-        elif 'suspended' in status:
-            return 'suspended'
-        elif 'abandoned' in status:
-            return 'abandoned'
-        elif any(x in status for x in ['scheduled', 'not started']):
-            return 'scheduled'
-        
-        return 'unknown'
+        return normalize_records(self, 'process_match', matches, source, league_id, workers=workers)
     
     def merge_match_data(
         self, 
@@ -569,6 +228,10 @@ class MatchProcessor:
         """
         Unisce i dati della partita da diverse fonti.
         
+        I campi con preferenze di fonte (FIELD_SOURCE_PREFERENCES) vengono
+        presi dalla fonte preferita che li fornisce; gli altri dalla prima
+        fonte, completati con i valori mancanti delle successive.
+        
         Args:
             match_id: ID interno della partita.
             sources: Lista di dizionari con dati della partita da diverse fonti.
@@ -580,13 +243,20 @@ class MatchProcessor:
             logger.warning(f"Nessuna fonte dati fornita per la partita {match_id}")
             return {'match_id': match_id, 'error': 'No data sources provided'}
         
-        # Usa i dati del primo dizionario come base
-        merged_data = sources[0].copy()
+        # Usa i dati del primo dizionario come base (copia profonda: l'unione
+        # non deve modificare i dati di partenza)
+        merged_data = copy.deepcopy(sources[0])
         
         # Se c'è solo una fonte, restituisci i dati così come sono
         if len(sources) == 1:
             return merged_data
         
+        # Campi con preferenze di fonte: valore della fonte preferita disponibile
+        for field in FIELD_SOURCE_PREFERENCES:
+            preferred = preferred_source(field, sources)
+            if preferred is not None and preferred is not sources[0]:
+                merged_data[field] = copy.deepcopy(preferred[field])
+        
         # Altrimenti, unisci i dati dalle altre fonti
         for source_data in sources[1:]:
             self._merge_match_fields(merged_data, source_data)
@@ -596,6 +266,33 @@ class MatchProcessor:
         
         return merged_data
     
+    def deduplicate_matches(self, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Unisce le partite duplicate provenienti da fonti diverse.
+        
+        Le partite sono raggruppate per data e ID canonici delle squadre
+        (MatchDeduplicator) e ogni gruppo viene unito con merge_match_data,
+        usando come base la versione più completa.
+        
+        Args:
+            matches: Partite normalizzate.
+        
+        Returns:
+            Partite senza duplicati, nell'ordine della prima occorrenza.
+        """
+        deduplicator = MatchDeduplicator(get_registry())
+        result = []
+        
+        for group in deduplicator.group(matches):
+            if len(group) == 1:
+                result.append(group[0])
+                continue
+            
+            group = sorted(group, key=match_richness, reverse=True)
+            result.append(self.merge_match_data(group[0].get('match_id', ''), group))
+        
+        return result
+    
     def _merge_match_fields(
         self, 
         target: Dict[str, Any], 
@@ -627,6 +324,9 @@ class MatchProcessor:
                 if not target['competition'][field] and value:
                     target['competition'][field] = value
         
+        if source.get('league_id') and not target.get('league_id'):
+            target['league_id'] = source['league_id']
+        
         # Datetime (preferisci valori in formato ISO)
         if 'datetime' in source and source['datetime'] and not target['datetime']:
             target['datetime'] = source['datetime']
@@ -777,1147 +477,6 @@ class MatchProcessor:
         
         return None
     
-    def _normalize_fbref(self, match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
-        """
-        Normalizza i dati da FBref.
-        
-        Args:
-            match_data: Dati grezzi della partita da FBref.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita
-            if 'match_id' in match_data:
-                output['match_id'] = str(match_data['match_id'])
-                output['source_ids']['fbref'] = str(match_data['match_id'])
-            
-            # Squadre
-            if 'home_team' in match_data:
-                output['home_team']['name'] = match_data['home_team'].get('name', '')
-                output['home_team']['id'] = match_data['home_team'].get('id', '')
-            
-            if 'away_team' in match_data:
-                output['away_team']['name'] = match_data['away_team'].get('name', '')
-                output['away_team']['id'] = match_data['away_team'].get('id', '')
-            
-            # Competizione
-            if 'competition' in match_data:
-                output['competition']['name'] = match_data['competition'].get('name', '')
-                output['competition']['id'] = match_data['competition'].get('id', '')
-            
-            # Data e ora
-            if 'date' in match_data:
-                try:
-                    # FBref spesso usa formato "2023-10-21"
-                    date_str = match_data['date']
-                    time_str = match_data.get('time', '15:00')  # Orario predefinito
-                    dt = parse_date(f"{date_str} {time_str}")
-                    output['datetime'] = dt.isoformat() if dt else date_str
-                except:
-                    output['datetime'] = match_data['date']
-            
-            # Stato partita
-            if 'status' in match_data:
-                output['status'] = self._map_fbref_status(match_data['status'])
-            
-            # Punteggio
-            if 'score' in match_data:
-                try:
-                    home_score = match_data['score'].get('home', 0)
-                    away_score = match_data['score'].get('away', 0)
-                    
-                    output['score']['home'] = int(home_score)
-                    output['score']['away'] = int(away_score)
-                    
-                    # Determina vincitore
-                    if output['score']['home'] > output['score']['away']:
-                        output['score']['winner'] = 'home'
-                    elif output['score']['home'] < output['score']['away']:
-                        output['score']['winner'] = 'away'
-                    else:
-                        output['score']['winner'] = 'draw'
-                except:
-                    pass
-            
-            # Stadio
-            if 'venue' in match_data:
-                output['venue']['name'] = match_data['venue']
-            
-            # Statistiche (se disponibili)
-            if 'statistics' in match_data and match_data['statistics']:
-                output['statistics'] = match_data['statistics']
-            
-            # xG (se disponibile)
-            if 'xg' in match_data:
-                output['xg_stats'] = {
-                    'home': match_data['xg'].get('home', 0.0),
-                    'away': match_data['xg'].get('away', 0.0),
-                    'source': 'fbref'
-                }
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati FBref: {e}")
-    
-    def _normalize_understat(self, match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
-        """
-        Normalizza i dati da Understat.
-        
-        Args:
-            match_data: Dati grezzi della partita da Understat.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita
-            if 'id' in match_data:
-                output['match_id'] = str(match_data['id'])
-                output['source_ids']['understat'] = str(match_data['id'])
-            
-            # Squadre
-            if 'h' in match_data:  # home
-                output['home_team']['name'] = match_data['h'].get('title', '')
-                output['home_team']['id'] = str(match_data['h'].get('id', ''))
-            
-            if 'a' in match_data:  # away
-                output['away_team']['name'] = match_data['a'].get('title', '')
-                output['away_team']['id'] = str(match_data['a'].get('id', ''))
-            
-            # Data e ora
-            if 'datetime' in match_data:
-                output['datetime'] = match_data['datetime']
-            
-            # Stato partita (Understat usa valore numerico)
-            if 'isResult' in match_data:
-                output['status'] = 'finished' if match_data['isResult'] else 'scheduled'
-            
-            # Punteggio
-            try:
-                if 'goals' in match_data:
-                    home_score = match_data['goals'].get('h', 0)
-                    away_score = match_data['goals'].get('a', 0)
-                    
-                    output['score']['home'] = int(home_score)
-                    output['score']['away'] = int(away_score)
-                    
-                    # Determina vincitore
-                    if output['score']['home'] > output['score']['away']:
-                        output['score']['winner'] = 'home'
-                    elif output['score']['home'] < output['score']['away']:
-                        output['score']['winner'] = 'away'
-                    else:
-                        output['score']['winner'] = 'draw'
-            except:
-                pass
-            
-            # League
-            if 'league' in match_data:
-                output['competition']['name'] = match_data['league'].get('name', '')
-                output['competition']['id'] = str(match_data['league'].get('id', ''))
-            
-            # xG statistiche
-            if 'xG' in match_data:
-                output['xg_stats'] = {
-                    'home': match_data['xG'].get('h', 0.0),
-                    'away': match_data['xG'].get('a', 0.0),
-                    'source': 'understat'
-                }
-            
-            # Tiri se disponibili
-            if 'shots' in match_data:
-                home_shots = []
-                away_shots = []
-                
-                for shot in match_data['shots']:
-                    shot_data = {
-                        'minute': shot.get('minute', 0),
-                        'player': shot.get('player', ''),
-                        'xG': shot.get('xG', 0.0),
-                        'position': {'x': shot.get('X', 0.0), 'y': shot.get('Y', 0.0)},
-                        'result': shot.get('result', '')
-                    }
-                    
-                    if shot.get('h_a') == 'h':
-                        home_shots.append(shot_data)
-                    else:
-                        away_shots.append(shot_data)
-                
-                if 'xg_stats' not in output:
-                    output['xg_stats'] = {'source': 'understat'}
-                    
-                output['xg_stats']['home_shots'] = home_shots
-                output['xg_stats']['away_shots'] = away_shots
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati Understat: {e}")
-    
-    def _normalize_sofascore(self, match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
-        """
-        Normalizza i dati da SofaScore.
-        
-        Args:
-            match_data: Dati grezzi della partita da SofaScore.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita
-            if 'id' in match_data:
-                output['match_id'] = str(match_data['id'])
-                output['source_ids']['sofascore'] = str(match_data['id'])
-            
-            # Squadre
-            if 'homeTeam' in match_data:
-                output['home_team']['name'] = match_data['homeTeam'].get('name', '')
-                output['home_team']['id'] = str(match_data['homeTeam'].get('id', ''))
-                output['home_team']['short_name'] = match_data['homeTeam'].get('shortName', output['home_team']['name'])
-            
-            if 'awayTeam' in match_data:
-                output['away_team']['name'] = match_data['awayTeam'].get('name', '')
-                output['away_team']['id'] = str(match_data['awayTeam'].get('id', ''))
-                output['away_team']['short_name'] = match_data['awayTeam'].get('shortName', output['away_team']['name'])
-            
-            # Competizione
-            if 'tournament' in match_data:
-                output['competition']['name'] = match_data['tournament'].get('name', '')
-                output['competition']['id'] = str(match_data['tournament'].get('id', ''))
-            
-            # Data e ora
-            if 'startTimestamp' in match_data:
-                try:
-                    dt = datetime.fromtimestamp(match_data['startTimestamp'])
-                    output['datetime'] = dt.isoformat()
-                except:
-                    pass
-            
-            # Stato partita
-            if 'status' in match_data:
-                output['status'] = self._map_sofascore_status(match_data['status'].get('type', ''))
-            
-            # Punteggio
-            if 'homeScore' in match_data and 'awayScore' in match_data:
-                try:
-                    output['score']['home'] = int(match_data['homeScore'].get('current', 0))
-                    output['score']['away'] = int(match_data['awayScore'].get('current', 0))
-                    
-                    # Determina vincitore
-                    if output['score']['home'] > output['score']['away']:
-                        output['score']['winner'] = 'home'
-                    elif output['score']['home'] < output['score']['away']:
-                        output['score']['winner'] = 'away'
-                    else:
-                        output['score']['winner'] = 'draw'
-                except:
-                    pass
-            
-            # Stadio
-            if 'venue' in match_data:
-                output['venue']['name'] = match_data['venue'].get('stadium', {}).get('name', '')
-                output['venue']['city'] = match_data['venue'].get('city', {}).get('name', '')
-            
-            # Statistiche (se disponibili)
-            if 'statistics' in match_data and match_data['statistics']:
-                output['statistics'] = match_data['statistics']
-            
-            # Eventi (se disponibili)
-            if 'events' in match_data and match_data['events']:
-                output['events'] = match_data['events']
-            
-            # xG (se disponibile)
-            if 'xg' in match_data:
-                output['xg_stats'] = {
-                    'home': match_data['xg'].get('home', 0.0),
-                    'away': match_data['xg'].get('away', 0.0),
-                    'source': 'sofascore'
-                }
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati SofaScore: {e}")
-    
-    def _normalize_footystats(self, match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
-        """
-        Normalizza i dati da FootyStats.
-        
-        Args:
-            match_data: Dati grezzi della partita da FootyStats.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita
-            if 'id' in match_data:
-                output['match_id'] = str(match_data['id'])
-                output['source_ids']['footystats'] = str(match_data['id'])
-            
-            # Squadre
-            if 'home_team' in match_data:
-                output['home_team']['name'] = match_data['home_team'].get('name', '')
-                output['home_team']['id'] = str(match_data['home_team'].get('id', ''))
-            
-            if 'away_team' in match_data:
-                output['away_team']['name'] = match_data['away_team'].get('name', '')
-                output['away_team']['id'] = str(match_data['away_team'].get('id', ''))
-            
-            # Competizione
-            if 'league' in match_data:
-                output['competition']['name'] = match_data['league'].get('name', '')
-                output['competition']['id'] = str(match_data['league'].get('id', ''))
-            
-            # Data e ora
-            if 'date' in match_data:
-                output['datetime'] = match_data['date']
-            
-            # Stato partita
-            if 'status' in match_data:
-                output['status'] = self._map_footystats_status(match_data['status'])
-            
-            # Punteggio
-            if 'home_score' in match_data and 'away_score' in match_data:
-                try:
-                    output['score']['home'] = int(match_data['home_score'])
-                    output['score']['away'] = int(match_data['away_score'])
-                    
-                    # Determina vincitore
-                    if output['score']['home'] > output['score']['away']:
-                        output['score']['winner'] = 'home'
-                    elif output['score']['home'] < output['score']['away']:
-                        output['score']['winner'] = 'away'
-                    else:
-                        output['score']['winner'] = 'draw'
-                except:
-                    pass
-            
-            # Statistiche (se disponibili)
-            if 'stats' in match_data and match_data['stats']:
-                output['statistics'] = match_data['stats']
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati FootyStats: {e}")
-    
-    def _normalize_whoscored(self, match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
-        """
-        Normalizza i dati da WhoScored.
-        
-        Args:
-            match_data: Dati grezzi della partita da WhoScored.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita
-            if 'matchId' in match_data:
-                output['match_id'] = str(match_data['matchId'])
-                output['source_ids']['whoscored'] = str(match_data['matchId'])
-            
-            # Squadre
-            if 'home' in match_data:
-                output['home_team']['name'] = match_data['home'].get('name', '')
-                output['home_team']['id'] = str(match_data['home'].get('teamId', ''))
-                output['home_team']['short_name'] = match_data['home'].get('shortName', output['home_team']['name'])
-            
-            if 'away' in match_data:
-                output['away_team']['name'] = match_data['away'].get('name', '')
-                output['away_team']['id'] = str(match_data['away'].get('teamId', ''))
-                output['away_team']['short_name'] = match_data['away'].get('shortName', output['away_team']['name'])
-            
-            # Competizione
-            if 'tournament' in match_data:
-                output['competition']['name'] = match_data['tournament'].get('name', '')
-                output['competition']['id'] = str(match_data['tournament'].get('tournamentId', ''))
-            
-            # Data e ora
-            if 'matchDate' in match_data:
-                output['datetime'] = match_data['matchDate']
-            
-            # Stato partita
-            if 'status' in match_data:
-                output['status'] = self._map_whoscored_status(match_data['status'])
-            
-            # Punteggio
-            if 'score' in match_data:
-                try:
-                    output['score']['home'] = int(match_data['score'].get('homeScore', 0))
-                    output['score']['away'] = int(match_data['score'].get('awayScore', 0))
-                    
-                    # Determina vincitore
-                    if output['score']['home'] > output['score']['away']:
-                        output['score']['winner'] = 'home'
-                    elif output['score']['home'] < output['score']['away']:
-                        output['score']['winner'] = 'away'
-                    else:
-                        output['score']['winner'] = 'draw'
-                except:
-                    pass
-            
-            # Stadio
-            if 'venue' in match_data:
-                output['venue']['name'] = match_data['venue'].get('name', '')
-                output['venue']['city'] = match_data['venue'].get('city', '')
-            
-            # Statistiche (se disponibili)
-            if 'stats' in match_data and match_data['stats']:
-                output['statistics'] = match_data['stats']
-            
-            # Eventi (se disponibili)
-            if 'events' in match_data and match_data['events']:
-                output['events'] = match_data['events']
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati WhoScored: {e}")
-    
-    def _normalize_worldfootball(self, match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
-        """
-        Normalizza i dati da WorldFootball.
-        
-        Args:
-            match_data: Dati grezzi della partita da WorldFootball.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita
-            if 'id' in match_data:
-                output['match_id'] = str(match_data['id'])
-                output['source_ids']['worldfootball'] = str(match_data['id'])
-            
-            # Squadre
-            if 'home_team' in match_data:
-                output['home_team']['name'] = match_data['home_team']
-            
-            if 'away_team' in match_data:
-                output['away_team']['name'] = match_data['away_team']
-            
-            # Competizione
-            if 'competition' in match_data:
-                output['competition']['name'] = match_data['competition']
-            
-            # Data e ora
-            if 'date' in match_data:
-                try:
-                    date_str = match_data['date']
-                    time_str = match_data.get('time', '15:00')  # Orario predefinito
-                    dt = parse_date(f"{date_str} {time_str}")
-                    output['datetime'] = dt.isoformat() if dt else date_str
-                except:
-                    output['datetime'] = match_data['date']
-            
-            # Stato partita
-            if 'status' in match_data:
-                output['status'] = self._map_generic_status(match_data['status'])
-            
-            # Punteggio
-            if 'score' in match_data:
-                score_text = match_data['score']
-                try:
-                    # Formato tipico: "2:1" o "2-1"
-                    parts = re.split(r'[-:]', score_text)
-                    if len(parts) == 2:
-                        output['score']['home'] = int(parts[0].strip())
-                        output['score']['away'] = int(parts[1].strip())
-                        
-                        # Determina vincitore
-                        if output['score']['home'] > output['score']['away']:
-                            output['score']['winner'] = 'home'
-                        elif output['score']['home'] < output['score']['away']:
-                            output['score']['winner'] = 'away'
-                        else:
-                            output['score']['winner'] = 'draw'
-                except:
-                    pass
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati WorldFootball: {e}")
-    
-    def _normalize_soccerway(self, match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
-        """
-        Normalizza i dati da Soccerway.
-        
-        Args:
-            match_data: Dati grezzi della partita da Soccerway.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita
-            if 'id' in match_data:
-                output['match_id'] = str(match_data['id'])
-                output['source_ids']['soccerway'] = str(match_data['id'])
-            
-            # Squadre
-            if 'home_team' in match_data:
-                output['home_team']['name'] = match_data['home_team']
-            
-            if 'away_team' in match_data:
-                output['away_team']['name'] = match_data['away_team']
-            
-            # Competizione
-            if 'competition' in match_data:
-                output['competition']['name'] = match_data['competition']
-            
-            # Data e ora
-            if 'date' in match_data and 'time' in match_data:
-                try:
-                    dt = parse_date(f"{match_data['date']} {match_data['time']}")
-                    output['datetime'] = dt.isoformat() if dt else match_data['date']
-                except:
-                    output['datetime'] = match_data['date']
-            
-            # Stato partita
-            if 'status' in match_data:
-                output['status'] = self._map_generic_status(match_data['status'])
-            
-            # Punteggio
-            if 'score' in match_data:
-                try:
-                    # Formato comune: "2 - 1"
-                    parts = match_data['score'].split('-')
-                    if len(parts) == 2:
-                        output['score']['home'] = int(parts[0].strip())
-                        output['score']['away'] = int(parts[1].strip())
-                        
-                        # Determina vincitore
-                        if output['score']['home'] > output['score']['away']:
-                            output['score']['winner'] = 'home'
-                        elif output['score']['home'] < output['score']['away']:
-                            output['score']['winner'] = 'away'
-                        else:
-                            output['score']['winner'] = 'draw'
-                except:
-                    pass
-            
-            # Stadio
-            if 'venue' in match_data:
-                output['venue']['name'] = match_data['venue']
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati Soccerway: {e}")
-    
-    def _get_expected_goals_data(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Ottiene dati Expected Goals (xG) per la partita.
-        
-        Args:
-            match_data: Dati della partita.
-        
-        Returns:
-            Dizionario con dati xG della partita.
-        """
-        xg_data = {'home': 0.0, 'away': 0.0, 'home_shots': [], 'away_shots': []}
-        
-        # Prova prima con Understat
-        if 'understat' in match_data['source_ids']:
-            try:
-                source_id = match_data['source_ids']['understat']
-                understat_xg = self.understat.get_match_xg(source_id)
-                
-                if understat_xg:
-                    xg_data['home'] = understat_xg.get('home_xg', 0.0)
-                    xg_data['away'] = understat_xg.get('away_xg', 0.0)
-                    xg_data['home_shots'] = understat_xg.get('home_shots', [])
-                    xg_data['away_shots'] = understat_xg.get('away_shots', [])
-                    xg_data['source'] = 'understat'
-                    return xg_data
-            except Exception as e:
-                logger.debug(f"Errore nell'ottenere dati xG da Understat: {e}")
-        
-        # Poi prova con FBref
-        if 'fbref' in match_data['source_ids']:
-            try:
-                source_id = match_data['source_ids']['fbref']
-                fbref_xg = self.fbref.get_match_xg(source_id)
-                
-                if fbref_xg:
-                    xg_data['home'] = fbref_xg.get('home_xg', 0.0)
-                    xg_data['away'] = fbref_xg.get('away_xg', 0.0)
-                    xg_data['source'] = 'fbref'
-                    return xg_data
-            except Exception as e:
-                logger.debug(f"Errore nell'ottenere dati xG da FBref: {e}")
-        
-        # Infine prova con SofaScore
-        if 'sofascore' in match_data['source_ids']:
-            try:
-                source_id = match_data['source_ids']['sofascore']
-                sofascore_xg = self.sofascore.get_match_xg(source_id)
-                
-                if sofascore_xg:
-                    xg_data['home'] = sofascore_xg.get('home_xg', 0.0)
-                    xg_data['away'] = sofascore_xg.get('away_xg', 0.0)
-                    xg_data['source'] = 'sofascore'
-                    return xg_data
-            except Exception as e:
-                logger.debug(f"Errore nell'ottenere dati xG da SofaScore: {e}")
-        
-        # Se non abbiamo dati xG da nessuna fonte, proviamo a calcolarli dai tiri in porta
-        if 'statistics' in match_data and match_data['statistics']:
-            try:
-                stats = match_data['statistics']
-                if isinstance(stats, dict):
-                    # Calcolo xG semplificato basato sui tiri in porta (molto approssimativo)
-                    home_team_id = match_data['home_team']['id']
-                    away_team_id = match_data['away_team']['id']
-                    
-                    # Cerca statistiche per ID squadra
-                    home_stats = stats.get(home_team_id, stats.get(str(home_team_id), {}))
-                    away_stats = stats.get(away_team_id, stats.get(str(away_team_id), {}))
-                    
-                    if home_stats and away_stats:
-                        # SofaScore format
-                        if 'xG' in home_stats and 'xG' in away_stats:
-                            xg_data['home'] = float(home_stats['xG'])
-                            xg_data['away'] = float(away_stats['xG'])
-                            xg_data['source'] = 'statistics'
-                            return xg_data
-                        
-                        # API-Football format
-                        for home_stat in home_stats:
-                            if isinstance(home_stat, dict) and home_stat.get('type') == 'Expected goals (xG)':
-                                try:
-                                    xg_data['home'] = float(home_stat.get('value', 0))
-                                except:
-                                    pass
-                        
-                        for away_stat in away_stats:
-                            if isinstance(away_stat, dict) and away_stat.get('type') == 'Expected goals (xG)':
-                                try:
-                                    xg_data['away'] = float(away_stat.get('value', 0))
-                                except:
-                                    pass
-                        
-                        if xg_data['home'] > 0 or xg_data['away'] > 0:
-                            xg_data['source'] = 'statistics'
-                            return xg_data
-            except Exception as e:
-                logger.debug(f"Errore nel calcolo xG dalle statistiche: {e}")
-        
-        return None
-    
-    def _normalize_fbref(self, match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
-        """
-        Normalizza i dati da FBref.
-        
-        Args:
-            match_data: Dati grezzi della partita da FBref.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita
-            if 'match_id' in match_data:
-                output['match_id'] = str(match_data['match_id'])
-                output['source_ids']['fbref'] = str(match_data['match_id'])
-            
-            # Squadre
-            if 'home_team' in match_data:
-                output['home_team']['name'] = match_data['home_team'].get('name', '')
-                output['home_team']['id'] = match_data['home_team'].get('id', '')
-            
-            if 'away_team' in match_data:
-                output['away_team']['name'] = match_data['away_team'].get('name', '')
-                output['away_team']['id'] = match_data['away_team'].get('id', '')
-            
-            # Competizione
-            if 'competition' in match_data:
-                output['competition']['name'] = match_data['competition'].get('name', '')
-                output['competition']['id'] = match_data['competition'].get('id', '')
-            
-            # Data e ora
-            if 'date' in match_data:
-                try:
-                    # FBref spesso usa formato "2023-10-21"
-                    date_str = match_data['date']
-                    time_str = match_data.get('time', '15:00')  # Orario predefinito
-                    dt = parse_date(f"{date_str} {time_str}")
-                    output['datetime'] = dt.isoformat() if dt else date_str
-                except:
-                    output['datetime'] = match_data['date']
-            
-            # Stato partita
-            if 'status' in match_data:
-                output['status'] = self._map_fbref_status(match_data['status'])
-            
-            # Punteggio
-            if 'score' in match_data:
-                try:
-                    home_score = match_data['score'].get('home', 0)
-                    away_score = match_data['score'].get('away', 0)
-                    
-                    output['score']['home'] = int(home_score)
-                    output['score']['away'] = int(away_score)
-                    
-                    # Determina vincitore
-                    if output['score']['home'] > output['score']['away']:
-                        output['score']['winner'] = 'home'
-                    elif output['score']['home'] < output['score']['away']:
-                        output['score']['winner'] = 'away'
-                    else:
-                        output['score']['winner'] = 'draw'
-                except:
-                    pass
-            
-            # Stadio
-            if 'venue' in match_data:
-                output['venue']['name'] = match_data['venue']
-            
-            # Statistiche (se disponibili)
-            if 'statistics' in match_data and match_data['statistics']:
-                output['statistics'] = match_data['statistics']
-            
-            # xG (se disponibile)
-            if 'xg' in match_data:
-                output['xg_stats'] = {
-                    'home': match_data['xg'].get('home', 0.0),
-                    'away': match_data['xg'].get('away', 0.0),
-                    'source': 'fbref'
-                }
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati FBref: {e}")
-    
-    def _normalize_understat(self, match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
-        """
-        Normalizza i dati da Understat.
-        
-        Args:
-            match_data: Dati grezzi della partita da Understat.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita
-            if 'id' in match_data:
-                output['match_id'] = str(match_data['id'])
-                output['source_ids']['understat'] = str(match_data['id'])
-            
-            # Squadre
-            if 'h' in match_data:  # home
-                output['home_team']['name'] = match_data['h'].get('title', '')
-                output['home_team']['id'] = str(match_data['h'].get('id', ''))
-            
-            if 'a' in match_data:  # away
-                output['away_team']['name'] = match_data['a'].get('title', '')
-                output['away_team']['id'] = str(match_data['a'].get('id', ''))
-            
-            # Data e ora
-            if 'datetime' in match_data:
-                output['datetime'] = match_data['datetime']
-            
-            # Stato partita (Understat usa valore numerico)
-            if 'isResult' in match_data:
-                output['status'] = 'finished' if match_data['isResult'] else 'scheduled'
-            
-            # Punteggio
-            try:
-                if 'goals' in match_data:
-                    home_score = match_data['goals'].get('h', 0)
-                    away_score = match_data['goals'].get('a', 0)
-                    
-                    output['score']['home'] = int(home_score)
-                    output['score']['away'] = int(away_score)
-                    
-                    # Determina vincitore
-                    if output['score']['home'] > output['score']['away']:
-                        output['score']['winner'] = 'home'
-                    elif output['score']['home'] < output['score']['away']:
-                        output['score']['winner'] = 'away'
-                    else:
-                        output['score']['winner'] = 'draw'
-            except:
-                pass
-            
-            # League
-            if 'league' in match_data:
-                output['competition']['name'] = match_data['league'].get('name', '')
-                output['competition']['id'] = str(match_data['league'].get('id', ''))
-            
-            # xG statistiche
-            if 'xG' in match_data:
-                output['xg_stats'] = {
-                    'home': match_data['xG'].get('h', 0.0),
-                    'away': match_data['xG'].get('a', 0.0),
-                    'source': 'understat'
-                }
-            
-            # Tiri se disponibili
-            if 'shots' in match_data:
-                home_shots = []
-                away_shots = []
-                
-                for shot in match_data['shots']:
-                    shot_data = {
-                        'minute': shot.get('minute', 0),
-                        'player': shot.get('player', ''),
-                        'xG': shot.get('xG', 0.0),
-                        'position': {'x': shot.get('X', 0.0), 'y': shot.get('Y', 0.0)},
-                        'result': shot.get('result', '')
-                    }
-                    
-                    if shot.get('h_a') == 'h':
-                        home_shots.append(shot_data)
-                    else:
-                        away_shots.append(shot_data)
-                
-                if 'xg_stats' not in output:
-                    output['xg_stats'] = {'source': 'understat'}
-                    
-                output['xg_stats']['home_shots'] = home_shots
-                output['xg_stats']['away_shots'] = away_shots
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati Understat: {e}")
-    
-    def _normalize_sofascore(self, match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
-        """
-        Normalizza i dati da SofaScore.
-        
-        Args:
-            match_data: Dati grezzi della partita da SofaScore.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita
-            if 'id' in match_data:
-                output['match_id'] = str(match_data['id'])
-                output['source_ids']['sofascore'] = str(match_data['id'])
-            
-            # Squadre
-            if 'homeTeam' in match_data:
-                output['home_team']['name'] = match_data['homeTeam'].get('name', '')
-                output['home_team']['id'] = str(match_data['homeTeam'].get('id', ''))
-                output['home_team']['short_name'] = match_data['homeTeam'].get('shortName', output['home_team']['name'])
-            
-            if 'awayTeam' in match_data:
-                output['away_team']['name'] = match_data['awayTeam'].get('name', '')
-                output['away_team']['id'] = str(match_data['awayTeam'].get('id', ''))
-                output['away_team']['short_name'] = match_data['awayTeam'].get('shortName', output['away_team']['name'])
-            
-            # Competizione
-            if 'tournament' in match_data:
-                output['competition']['name'] = match_data['tournament'].get('name', '')
-                output['competition']['id'] = str(match_data['tournament'].get('id', ''))
-            
-            # Data e ora
-            if 'startTimestamp' in match_data:
-                try:
-                    dt = datetime.fromtimestamp(match_data['startTimestamp'])
-                    output['datetime'] = dt.isoformat()
-                except:
-                    pass
-            
-            # Stato partita
-            if 'status' in match_data:
-                output['status'] = self._map_sofascore_status(match_data['status'].get('type', ''))
-            
-            # Punteggio
-            if 'homeScore' in match_data and 'awayScore' in match_data:
-                try:
-                    output['score']['home'] = int(match_data['homeScore'].get('current', 0))
-                    output['score']['away'] = int(match_data['awayScore'].get('current', 0))
-                    
-                    # Determina vincitore
-                    if output['score']['home'] > output['score']['away']:
-                        output['score']['winner'] = 'home'
-                    elif output['score']['home'] < output['score']['away']:
-                        output['score']['winner'] = 'away'
-                    else:
-                        output['score']['winner'] = 'draw'
-                except:
-                    pass
-            
-            # Stadio
-            if 'venue' in match_data:
-                output['venue']['name'] = match_data['venue'].get('stadium', {}).get('name', '')
-                output['venue']['city'] = match_data['venue'].get('city', {}).get('name', '')
-            
-            # Statistiche (se disponibili)
-            if 'statistics' in match_data and match_data['statistics']:
-                output['statistics'] = match_data['statistics']
-            
-            # Eventi (se disponibili)
-            if 'events' in match_data and match_data['events']:
-                output['events'] = match_data['events']
-            
-            # xG (se disponibile)
-            if 'xg' in match_data:
-                output['xg_stats'] = {
-                    'home': match_data['xg'].get('home', 0.0),
-                    'away': match_data['xg'].get('away', 0.0),
-                    'source': 'sofascore'
-                }
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati SofaScore: {e}")
-    
-    def _normalize_footystats(self, match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
-        """
-        Normalizza i dati da FootyStats.
-        
-        Args:
-            match_data: Dati grezzi della partita da FootyStats.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita
-            if 'id' in match_data:
-                output['match_id'] = str(match_data['id'])
-                output['source_ids']['footystats'] = str(match_data['id'])
-            
-            # Squadre
-            if 'home_team' in match_data:
-                output['home_team']['name'] = match_data['home_team'].get('name', '')
-                output['home_team']['id'] = str(match_data['home_team'].get('id', ''))
-            
-            if 'away_team' in match_data:
-                output['away_team']['name'] = match_data['away_team'].get('name', '')
-                output['away_team']['id'] = str(match_data['away_team'].get('id', ''))
-            
-            # Competizione
-            if 'league' in match_data:
-                output['competition']['name'] = match_data['league'].get('name', '')
-                output['competition']['id'] = str(match_data['league'].get('id', ''))
-            
-            # Data e ora
-            if 'date' in match_data:
-                output['datetime'] = match_data['date']
-            
-            # Stato partita
-            if 'status' in match_data:
-                output['status'] = self._map_footystats_status(match_data['status'])
-            
-            # Punteggio
-            if 'home_score' in match_data and 'away_score' in match_data:
-                try:
-                    output['score']['home'] = int(match_data['home_score'])
-                    output['score']['away'] = int(match_data['away_score'])
-                    
-                    # Determina vincitore
-                    if output['score']['home'] > output['score']['away']:
-                        output['score']['winner'] = 'home'
-                    elif output['score']['home'] < output['score']['away']:
-                        output['score']['winner'] = 'away'
-                    else:
-                        output['score']['winner'] = 'draw'
-                except:
-                    pass
-            
-            # Statistiche (se disponibili)
-            if 'stats' in match_data and match_data['stats']:
-                output['statistics'] = match_data['stats']
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati FootyStats: {e}")
-    
-    def _normalize_whoscored(self, match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
-        """
-        Normalizza i dati da WhoScored.
-        
-        Args:
-            match_data: Dati grezzi della partita da WhoScored.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita
-            if 'matchId' in match_data:
-                output['match_id'] = str(match_data['matchId'])
-                output['source_ids']['whoscored'] = str(match_data['matchId'])
-            
-            # Squadre
-            if 'home' in match_data:
-                output['home_team']['name'] = match_data['home'].get('name', '')
-                output['home_team']['id'] = str(match_data['home'].get('teamId', ''))
-                output['home_team']['short_name'] = match_data['home'].get('shortName', output['home_team']['name'])
-            
-            if 'away' in match_data:
-                output['away_team']['name'] = match_data['away'].get('name', '')
-                output['away_team']['id'] = str(match_data['away'].get('teamId', ''))
-                output['away_team']['short_name'] = match_data['away'].get('shortName', output['away_team']['name'])
-            
-            # Competizione
-            if 'tournament' in match_data:
-                output['competition']['name'] = match_data['tournament'].get('name', '')
-                output['competition']['id'] = str(match_data['tournament'].get('tournamentId', ''))
-            
-            # Data e ora
-            if 'matchDate' in match_data:
-                output['datetime'] = match_data['matchDate']
-            
-            # Stato partita
-            if 'status' in match_data:
-                output['status'] = self._map_whoscored_status(match_data['status'])
-            
-            # Punteggio
-            if 'score' in match_data:
-                try:
-                    output['score']['home'] = int(match_data['score'].get('homeScore', 0))
-                    output['score']['away'] = int(match_data['score'].get('awayScore', 0))
-                    
-                    # Determina vincitore
-                    if output['score']['home'] > output['score']['away']:
-                        output['score']['winner'] = 'home'
-                    elif output['score']['home'] < output['score']['away']:
-                        output['score']['winner'] = 'away'
-                    else:
-                        output['score']['winner'] = 'draw'
-                except:
-                    pass
-            
-            # Stadio
-            # Formazioni (se disponibili)
-            if 'lineups' in match_data and match_data['lineups']:
-                output['lineups'] = match_data['lineups']
-            
-            # Valore di mercato
-            if 'market_value' in match_data:
-                if 'home_team' in output and 'market_value' in match_data['market_value']:
-                    output['home_team']['market_value'] = match_data['market_value'].get('home', '')
-                
-                if 'away_team' in output and 'market_value' in match_data['market_value']:
-                    output['away_team']['market_value'] = match_data['market_value'].get('away', '')
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati Transfermarkt: {e}")
-    
-    def _normalize_open_football(self, match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
-        """
-        Normalizza i dati da OpenFootball.
-        
-        Args:
-            match_data: Dati grezzi della partita da OpenFootball.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita (in OpenFootball potrebbe non esserci un ID specifico)
-            if 'id' in match_data:
-                output['match_id'] = str(match_data['id'])
-                output['source_ids']['open_football'] = str(match_data['id'])
-            
-            # Squadre
-            if 'team1' in match_data:
-                output['home_team']['name'] = match_data['team1'].get('name', match_data['team1'])
-            
-            if 'team2' in match_data:
-                output['away_team']['name'] = match_data['team2'].get('name', match_data['team2'])
-            
-            # Competizione
-            if 'competition' in match_data:
-                output['competition']['name'] = match_data['competition']
-            
-            # Data e ora
-            if 'date' in match_data:
-                output['datetime'] = match_data['date']
-            
-            # Stato (OpenFootball non ha sempre uno stato, potrebbe essere dedotto dalla data)
-            current_time = datetime.now()
-            match_time = parse_date(output['datetime']) if output['datetime'] else None
-            
-            if match_time:
-                if match_time > current_time:
-                    output['status'] = 'scheduled'
-                else:
-                    output['status'] = 'finished'
-            
-            # Punteggio
-            if 'score1' in match_data and 'score2' in match_data:
-                try:
-                    output['score']['home'] = int(match_data['score1'])
-                    output['score']['away'] = int(match_data['score2'])
-                    
-                    # Determina vincitore
-                    if output['score']['home'] > output['score']['away']:
-                        output['score']['winner'] = 'home'
-                    elif output['score']['home'] < output['score']['away']:
-                        output['score']['winner'] = 'away'
-                    else:
-                        output['score']['winner'] = 'draw'
-                except:
-                    pass
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati OpenFootball: {e}")
-    
-    def _normalize_statsbomb(self, match_data: Dict[str, Any], output: Dict[str, Any]) -> None:
-        """
-        Normalizza i dati da StatsBomb.
-        
-        Args:
-            match_data: Dati grezzi della partita da StatsBomb.
-            output: Dizionario di output da popolare.
-        """
-        try:
-            # ID partita
-            if 'match_id' in match_data:
-                output['match_id'] = str(match_data['match_id'])
-                output['source_ids']['statsbomb'] = str(match_data['match_id'])
-            
-            # Squadre
-            if 'home_team' in match_data:
-                output['home_team']['name'] = match_data['home_team'].get('home_team_name', '')
-                output['home_team']['id'] = str(match_data['home_team'].get('home_team_id', ''))
-            
-            if 'away_team' in match_data:
-                output['away_team']['name'] = match_data['away_team'].get('away_team_name', '')
-                output['away_team']['id'] = str(match_data['away_team'].get('away_team_id', ''))
-            
-            # Competizione
-            if 'competition' in match_data:
-                output['competition']['name'] = match_data['competition'].get('competition_name', '')
-                output['competition']['id'] = str(match_data['competition'].get('competition_id', ''))
-            
-            # Data e ora
-            if 'match_date' in match_data:
-                output['datetime'] = match_data['match_date']
-            
-            # Stato (StatsBomb ha solo dati storici, quindi tutti i match sono finiti)
-            output['status'] = 'finished'
-            
-            # Punteggio
-            if 'home_score' in match_data and 'away_score' in match_data:
-                try:
-                    output['score']['home'] = int(match_data['home_score'])
-                    output['score']['away'] = int(match_data['away_score'])
-                    
-                    # Determina vincitore
-                    if output['score']['home'] > output['score']['away']:
-                        output['score']['winner'] = 'home'
-                    elif output['score']['home'] < output['score']['away']:
-                        output['score']['winner'] = 'away'
-                    else:
-                        output['score']['winner'] = 'draw'
-                except:
-                    pass
-            
-            # Statistiche avanzate (se disponibili)
-            if 'stats' in match_data and match_data['stats']:
-                output['statistics'] = match_data['stats']
-            
-            # Eventi (Statsbomb è ricco di dati sugli eventi)
-            if 'events' in match_data and match_data['events']:
-                output['events'] = match_data['events']
-            
-        except Exception as e:
-            logger.error(f"Errore nella normalizzazione dei dati StatsBomb: {e}")
-    
-    def _map_fbref_status(self, status: str) -> str:
-        """
-        Mappa lo stato della partita da FBref a formato standard.
-        
-        Args:
-            status: Stato della partita nel formato FBref.
-        
-        Returns:
-            Stato della partita in formato standard.
-        """
-        status = status.lower()
-        
-        if 'complete' in status or 'ft' in status:
-            return 'finished'
-        elif any(x in status for x in ['postponed', 'susp', 'cancel', 'interrupt']):
-            return 'postponed'
-        elif any(x in status for x in ['ongoing', 'live', '1h', '2h', 'halftime']):
-            return 'in_progress'
-        elif 'scheduled' in status:
-            return 'scheduled'
-        
-        # FBref può usare formati di data (es. "Oct 28, 2023") per partite programmate
-        try:
-            parse_date(status)  # Se riesce a interpretarlo come data
-            return 'scheduled'
-        except:
-            pass
-        
-        return 'unknown'
-    
     def enrich_match_data(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Arricchisce i dati della partita con informazioni aggiuntive.
@@ -1938,7 +497,8 @@ class MatchProcessor:
             
             # Aggiungi dati delle squadre se non presenti
             for team_key, team_data in [('home_team', enriched_data['home_team']), ('away_team', enriched_data['away_team'])]:
-                if team_data.get('id') and not team_data.get('short_name'):
+                if team_data.get('id') and not team_data.get('short_name') and \
+                        self._enrichment_allowed('teams', enriched_data, PRIORITY_NORMAL):
                     try:
                         # Prova a ottenere dati aggiuntivi dalle API
                         team_id = team_data['id']
@@ -1956,7 +516,8 @@ class MatchProcessor:
                         logger.warning(f"Errore nell'arricchimento dei dati della squadra {team_id}: {e}")
             
             # Aggiungi quote se non presenti e la partita non è finita
-            if not enriched_data.get('odds') and enriched_data['status'] in ['scheduled', 'unknown']:
+            if not enriched_data.get('odds') and enriched_data['status'] in ['scheduled', 'unknown'] and \
+                    self._enrichment_allowed('odds', enriched_data, PRIORITY_NORMAL):
                 try:
                     # Prova a ottenere quote da diverse fonti
                     sources = ['api_football', 'flashscore', 'sofascore']
@@ -1975,7 +536,8 @@ class MatchProcessor:
                     logger.warning(f"Errore nell'ottenimento delle quote per la partita {enriched_data['match_id']}: {e}")
             
             # Aggiungi formazioni se non presenti e la partita è recente
-            if not enriched_data.get('lineups') and enriched_data['status'] in ['in_progress', 'finished']:
+            if not enriched_data.get('lineups') and enriched_data['status'] in ['in_progress', 'finished'] and \
+                    self._enrichment_allowed('lineups', enriched_data):
                 try:
                     # Prova a ottenere formazioni da diverse fonti
                     sources = ['api_football', 'flashscore', 'sofascore', 'fbref', 'whoscored']
@@ -1994,7 +556,8 @@ class MatchProcessor:
                     logger.warning(f"Errore nell'ottenimento delle formazioni per la partita {enriched_data['match_id']}: {e}")
             
             # Aggiungi statistiche se non presenti e la partita è iniziata o finita
-            if not enriched_data.get('statistics') and enriched_data['status'] in ['in_progress', 'finished']:
+            if not enriched_data.get('statistics') and enriched_data['status'] in ['in_progress', 'finished'] and \
+                    self._enrichment_allowed('statistics', enriched_data):
                 try:
                     # Prova a ottenere statistiche da diverse fonti
                     sources = ['api_football', 'flashscore', 'sofascore', 'fbref', 'understat', 'whoscored', 'footystats']
@@ -2015,7 +578,8 @@ class MatchProcessor:
             # Aggiungi statistiche Expected Goals (xG) se non presenti
             if (not enriched_data.get('xg_stats') and 
                 enriched_data['status'] in ['in_progress', 'finished'] and 
-                ('understat' in enriched_data['source_ids'] or 'fbref' in enriched_data['source_ids'])):
+                ('understat' in enriched_data['source_ids'] or 'fbref' in enriched_data['source_ids']) and
+                self._enrichment_allowed('xg', enriched_data)):
                 try:
                     xg_data = self._get_expected_goals_data(enriched_data)
                     if xg_data:
@@ -2032,6 +596,23 @@ class MatchProcessor:
             logger.error(f"Errore nell'arricchimento dei dati della partita {match_data.get('match_id', 'unknown')}: {e}")
             return match_data  # Restituisci i dati originali in caso di errore
     
+    def _enrichment_allowed(self, kind: str, match_data: Dict[str, Any], priority: int = PRIORITY_LOW) -> bool:
+        """
+        Verifica se la scadenza consente un arricchimento remoto; altrimenti lo rimanda.
+        
+        Args:
+            kind: Tipo di arricchimento ('teams', 'odds', 'lineups', 'statistics', 'xg')
+            match_data: Dati della partita da arricchire.
+            priority: Priorità dell'arricchimento.
+        
+        Returns:
+            True se l'arricchimento può essere eseguito.
+        """
+        if self.deadline is None or self.deadline.allows(f"enrich:{kind}", priority):
+            return True
+        self.deadline.defer('enrichment', f"{match_data.get('match_id', '')}:{kind}")
+        return False
+    
     def _enrich_team_data_from_source(self, team_data: Dict[str, Any], team_id: str, source: str) -> None:
         """
         Arricchisce i dati di una squadra da una fonte specifica.
@@ -2166,6 +747,10 @@ class MatchProcessor:
             # Salva i dati
             self.db.set_reference(f"matches/{match_id}", match_data)
             
+            # Le partite concluse aggiornano lo storico locale (scontri diretti, classifiche)
+            if match_data.get('status') == 'finished':
+                get_result_history(self.db).add_match(match_data)
+            
             logger.info(f"Dati della partita {match_id} salvati con successo")
             return True
             
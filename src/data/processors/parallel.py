@@ -0,0 +1,84 @@
+"""
+Normalizzazione a blocchi su un pool di processi.
+La normalizzazione di partite e squadre è lavoro CPU puro in Python: per i
+lotti grandi (backfill di stagioni intere da open data) i record vengono
+divisi in blocchi e normalizzati in processi separati, mantenendo l'ordine
+di ingresso. Sotto la soglia il lavoro resta nel processo corrente, dove il
+costo di serializzazione supererebbe il guadagno.
+"""
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+
+from src.config.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+# Normalizzatori già costruiti nel processo worker (uno per classe)
+_worker_normalizers: Dict[type, Any] = {}
+
+
+def _normalize_chunk(task: Tuple[type, str, str, Optional[str], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Normalizza un blocco di record in un processo worker.
+
+    Args:
+        task: Tupla (classe del processore, metodo, fonte, ID campionato, record)
+
+    Returns:
+        Record normalizzati nello stesso ordine
+    """
+    processor_cls, method_name, source, league_id, records = task
+    normalizer = _worker_normalizers.get(processor_cls)
+    if normalizer is None:
+        normalizer = processor_cls.for_normalization()
+        _worker_normalizers[processor_cls] = normalizer
+    method = getattr(normalizer, method_name)
+    return [method(record, source, league_id) for record in records]
+
+
+def normalize_records(processor: Any, method_name: str, records: List[Dict[str, Any]], source: str,
+                      league_id: Optional[str] = None, workers: Optional[int] = None,
+                      chunk_size: Optional[int] = None, threshold: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Normalizza un lotto di record, in parallelo se supera la soglia.
+
+    Args:
+        processor: Processore usato in-process (MatchProcessor o TeamProcessor)
+        method_name: Metodo di normalizzazione di un record ('process_match', 'process_team')
+        records: Record grezzi della stessa fonte
+        source: Nome della fonte dei dati
+        league_id: ID del campionato (opzionale)
+        workers: Processi del pool (default: processors.workers o numero di CPU)
+        chunk_size: Record per blocco (default: processors.chunk_size, 1000)
+        threshold: Record sotto i quali non si usa il pool (default: processors.parallel_threshold, 5000)
+
+    Returns:
+        Record normalizzati nell'ordine di ingresso
+    """
+    if threshold is None:
+        threshold = get_setting('processors.parallel_threshold', 5000)
+    if workers is None:
+        workers = get_setting('processors.workers', None) or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = get_setting('processors.chunk_size', 1000)
+
+    method = getattr(processor, method_name)
+    if len(records) < threshold or workers < 2:
+        return [method(record, source, league_id) for record in records]
+
+    processor_cls = type(processor)
+    tasks = [(processor_cls, method_name, source, league_id, records[i:i + chunk_size])
+             for i in range(0, len(records), chunk_size)]
+
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            normalized = []
+            for chunk in executor.map(_normalize_chunk, tasks):
+                normalized.extend(chunk)
+        logger.info(f"Normalizzati {len(normalized)} record {source} in {len(tasks)} blocchi su {workers} processi")
+        return normalized
+    except Exception as e:
+        logger.warning(f"Pool di normalizzazione non disponibile, elaborazione in-process: {e}")
+        return [method(record, source, league_id) for record in records]
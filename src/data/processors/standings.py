@@ -14,7 +14,9 @@ from src.utils.cache import cached
 from src.utils.database import FirebaseManager
 from src.config.settings import get_setting
 from src.config.leagues import get_league, get_league_url
-from src.data.collectors import collect_league_data
+from src.data.entity_registry import ENTITY_TEAM, alias_key, get_registry
+from src.data.processors.standings_engine import get_league_table, standings_as_of
+from src.data.processors.league_history import get_result_history
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +36,10 @@ class StandingsProcessor:
                                           ['api_football', 'flashscore', 'fbref'])
         self.min_standings_size = get_setting('processors.standings.min_size', 10)
         self.auto_update_days = get_setting('processors.standings.auto_update_days', 1)
+        # Verifica con le fonti esterne: facoltativa e al massimo una volta per intervallo
+        self.validate_sources = get_setting('processors.standings.validate_sources', False)
+        self.validation_interval_hours = get_setting('processors.standings.validation_interval_hours', 24)
+        self._last_validation: Dict[Tuple[str, str], float] = {}
         
         logger.info(f"StandingsProcessor inizializzato con fonte primaria: {self.preferred_source}")
     
@@ -82,18 +88,27 @@ class StandingsProcessor:
                 except:
                     pass
         
-        # Se arriviamo qui, serve un aggiornamento o non ci sono dati esistenti
-        logger.info(f"Raccolta classifiche aggiornate per {league_id}")
+        # Classifica calcolata dai risultati locali: le fonti servono solo per la verifica
+        table = get_league_table(self.db, league_id, season)
+        processed_data = self._process_local_standings(table.standings(), league_info)
         
-        # Raccogli dati da fonti disponibili
-        standings_data = self._collect_standings_from_sources(league_id, season)
-        
-        if not standings_data:
-            logger.warning(f"Nessuna classifica disponibile per {league_id}")
-            return {}
-        
-        # Normalizza e arricchisci
-        processed_data = self._process_standings_data(standings_data, league_info)
+        if processed_data:
+            processed_data['as_of'] = table.last_result
+            if self._validation_due(league_id, season):
+                self._validate_with_sources(processed_data, league_id, season)
+        else:
+            # Storico locale insufficiente: usa le classifiche delle fonti
+            logger.info(f"Raccolta classifiche aggiornate per {league_id}")
+            
+            # Raccogli dati da fonti disponibili
+            standings_data = self._collect_standings_from_sources(league_id, season)
+            
+            if not standings_data:
+                logger.warning(f"Nessuna classifica disponibile per {league_id}")
+                return {}
+            
+            # Normalizza e arricchisci
+            processed_data = self._process_standings_data(standings_data, league_info)
         
         # Aggiorna database
         processed_data['last_updated'] = datetime.now().isoformat()
@@ -105,6 +120,134 @@ class StandingsProcessor:
         
         return processed_data
     
+    def get_standings_as_of(self, league_id: str, date: str,
+                            season: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Classifica di un campionato con i soli risultati locali fino a una data.
+        
+        Args:
+            league_id: ID del campionato
+            date: Data (AAAA-MM-GG), inclusa
+            season: Stagione (opzionale, usa stagione corrente se non specificata)
+            
+        Returns:
+            Classifica alla data, o dizionario vuoto se lo storico è insufficiente
+        """
+        league_info = get_league(league_id)
+        if not league_info:
+            logger.warning(f"League {league_id} non trovata in configurazione")
+            return {}
+        
+        season = season or league_info.get('current_season', '')
+        history = get_result_history(self.db)
+        result = self._process_local_standings(standings_as_of(history, league_id, season, date),
+                                               league_info, min_size=1)
+        if result:
+            result.update({'league_id': league_id, 'season': season, 'as_of': date})
+        return result
+    
+    def _process_local_standings(self, rows: List[Dict[str, Any]], league_info: Dict[str, Any],
+                                 min_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Completa la classifica calcolata dallo storico locale.
+        
+        Args:
+            rows: Righe della classifica (standings_engine.LeagueTable.standings)
+            league_info: Informazioni sul campionato
+            min_size: Numero minimo di squadre (default: processors.standings.min_size)
+            
+        Returns:
+            Classifica arricchita, o dizionario vuoto se le squadre sono troppo poche
+        """
+        if len(rows) < (min_size or self.min_standings_size):
+            return {}
+        
+        for team in rows:
+            self._add_position_context(team, len(rows), league_info)
+        
+        result = {
+            "name": league_info.get("name", ""),
+            "country": league_info.get("country", ""),
+            "source": "local_history",
+            "standings": rows,
+            "groups": [],
+            "has_relegation": any(team.get("is_relegation", False) for team in rows),
+            "has_qualification": any(team.get("is_qualification", False) for team in rows),
+            "stats": {
+                "avg_goals_per_match": 0,
+                "home_win_percentage": 0,
+                "away_win_percentage": 0,
+                "draw_percentage": 0
+            }
+        }
+        
+        return self._enrich_standings(result, {})
+    
+    def _validation_due(self, league_id: str, season: str) -> bool:
+        """
+        Indica se verificare la classifica locale con le fonti, registrando la verifica.
+        
+        Args:
+            league_id: ID del campionato
+            season: Stagione
+            
+        Returns:
+            True se la verifica è abilitata e l'ultima è più vecchia dell'intervallo
+        """
+        if not self.validate_sources:
+            return False
+        now = time.time()
+        last = self._last_validation.get((league_id, season))
+        if last is not None and now - last < self.validation_interval_hours * 3600:
+            return False
+        self._last_validation[(league_id, season)] = now
+        return True
+    
+    def _validate_with_sources(self, result: Dict[str, Any], league_id: str, season: str) -> None:
+        """
+        Confronta la classifica locale con quella delle fonti esterne.
+        
+        Le differenze su partite giocate, punti e differenza reti vengono
+        registrate nel log e in result["validation"]; la classifica locale
+        non viene modificata.
+        
+        Args:
+            result: Classifica calcolata dallo storico locale
+            league_id: ID del campionato
+            season: Stagione
+        """
+        try:
+            standings_data = self._collect_standings_from_sources(league_id, season)
+            if not standings_data:
+                return
+            
+            source = self._select_primary_source(standings_data)
+            registry = get_registry()
+            by_id = {team["team_id"]: team for team in result["standings"]}
+            by_name = {alias_key(team["team_name"]): team for team in result["standings"]}
+            
+            checked = 0
+            mismatches = []
+            for source_team in standings_data[source].get("standings", []):
+                source_team = self._normalize_team_standings(source_team)
+                canonical_id = registry.resolve(ENTITY_TEAM, source, source_team["team_id"])
+                team = by_id.get(canonical_id or source_team["team_id"]) or by_name.get(alias_key(source_team["team_name"]))
+                if not team:
+                    continue
+                checked += 1
+                for field in ("matches_played", "points", "goal_difference"):
+                    if team[field] != source_team[field]:
+                        mismatches.append({"team_id": team["team_id"], "team_name": team["team_name"],
+                                           "field": field, "local": team[field], "source": source_team[field]})
+            
+            result["validation"] = {"source": source, "teams_checked": checked, "mismatches": mismatches}
+            if mismatches:
+                logger.warning(f"Classifica locale di {league_id} diversa da {source} in {len(mismatches)} valori")
+            else:
+                logger.info(f"Classifica locale di {league_id} verificata con {source} ({checked} squadre)")
+        except Exception as e:
+            logger.error(f"Errore nella verifica della classifica di {league_id}: {e}")
+    
     def _collect_standings_from_sources(self, league_id: str, 
                                       season: str) -> Dict[str, Any]:
         """
@@ -156,6 +299,7 @@ class StandingsProcessor:
                 return {}
             
             # Raccogli dati dal collettore appropriato
+            from src.data.collectors import collect_league_data
             data = collect_league_data(source_id, source, season)
             
             # Estrai la classifica dai dati
@@ -592,3 +736,19 @@ def get_team_form(team_id: str, league_id: str,
     """
     processor = StandingsProcessor()
     return processor.get_recent_form(team_id, league_id, season)
+
+def get_standings_as_of(league_id: str, date: str, 
+                      season: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Ottiene la classifica di un campionato a una data, dai risultati locali.
+    
+    Args:
+        league_id: ID del campionato
+        date: Data (AAAA-MM-GG), inclusa
+        season: Stagione (opzionale)
+        
+    Returns:
+        Classifica alla data
+    """
+    processor = StandingsProcessor()
+    return processor.get_standings_as_of(league_id, date, season)
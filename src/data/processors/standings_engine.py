@@ -0,0 +1,280 @@
+"""
+Classifiche dei campionati calcolate dai risultati conclusi dello storico locale.
+Ogni risultato è un evento che aggiorna solo le righe delle due squadre
+(punti, vittorie/pareggi/sconfitte, gol, forma, parziali casa/trasferta)
+e l'ordinamento delle squadre viene rifatto solo alla lettura. Le classifiche
+"alla data" per i backtest ripercorrono gli stessi eventi fino alla data
+richiesta. Le classifiche delle fonti esterne servono solo per la verifica.
+"""
+import bisect
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Iterable
+
+from src.config.settings import get_setting
+from src.data.processors.league_history import ResultHistory, get_result_history
+
+logger = logging.getLogger(__name__)
+
+
+def season_bounds(season: str) -> Tuple[str, str]:
+    """
+    Date di inizio e fine di una stagione.
+
+    Le stagioni a cavallo di due anni ("2023-2024", "2023/24") iniziano nel
+    mese processors.standings.season_start_month (default luglio); quelle
+    di un solo anno ("2024") coprono l'anno solare.
+
+    Args:
+        season: Stagione
+
+    Returns:
+        Coppia (inizio, fine) in formato AAAA-MM-GG; stringhe vuote se la
+        stagione non è riconosciuta
+    """
+    years = [part for part in str(season or '').replace('/', '-').split('-') if part.strip().isdigit()]
+    if not years:
+        return '', ''
+    start_year = int(years[0])
+    if len(years) == 1:
+        return f"{start_year}-01-01", f"{start_year}-12-31"
+    month = int(get_setting('processors.standings.season_start_month', 7))
+    end_year, end_month = (start_year + 1, month - 1) if month > 1 else (start_year, 12)
+    return f"{start_year}-{month:02d}-01", f"{end_year}-{end_month:02d}-31"
+
+
+def _empty_split() -> Dict[str, int]:
+    return {'matches_played': 0, 'wins': 0, 'draws': 0, 'losses': 0,
+            'goals_for': 0, 'goals_against': 0, 'points': 0}
+
+
+class LeagueTable:
+    """
+    Classifica di un campionato in una stagione, aggiornata risultato per risultato.
+
+    Punti per vittoria e pareggio vengono da processors.standings.points_win
+    e processors.standings.points_draw (default 3 e 1); la forma conserva gli
+    ultimi processors.standings.form_length risultati (default 5).
+    """
+
+    def __init__(self, league_id: str, season: str = '', form_length: Optional[int] = None):
+        """
+        Args:
+            league_id: ID del campionato
+            season: Stagione (vuota per tutti i risultati)
+            form_length: Risultati conservati nella forma di ogni squadra
+        """
+        self.league_id = league_id
+        self.season = season
+        self.start, self.end = season_bounds(season)
+        self.form_length = form_length or get_setting('processors.standings.form_length', 5)
+        self.points_win = get_setting('processors.standings.points_win', 3)
+        self.points_draw = get_setting('processors.standings.points_draw', 1)
+        self.teams: Dict[str, Dict[str, Any]] = {}
+        self.match_ids = set()
+        self.last_result = ''
+        self._ranking: Optional[List[Dict[str, Any]]] = None
+
+    def covers(self, record: Dict[str, Any]) -> bool:
+        """Verifica se il risultato appartiene alla stagione della classifica."""
+        if record['league_id'] != self.league_id:
+            return False
+        return not self.start or self.start <= record['date'] <= self.end
+
+    def build(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Calcola la classifica con un passaggio sui risultati.
+
+        Args:
+            records: Record dei risultati (league_history.result_record)
+
+        Returns:
+            Numero di risultati applicati
+        """
+        self.teams, self.match_ids, self._ranking = {}, set(), None
+        applied = sum(1 for record in records if self.apply_result(record))
+        logger.info(f"Classifica di {self.league_id} {self.season}: {len(self.teams)} squadre da {applied} risultati")
+        return applied
+
+    def apply_result(self, record: Dict[str, Any]) -> bool:
+        """
+        Applica un risultato aggiornando solo le righe delle due squadre.
+
+        Args:
+            record: Record del risultato
+
+        Returns:
+            True se il risultato è nuovo e appartiene alla classifica
+        """
+        if not self.covers(record) or record['match_id'] in self.match_ids:
+            return False
+        if record['home_id'] == record['away_id']:
+            return False
+        self.match_ids.add(record['match_id'])
+
+        home_goals, away_goals = record['home_goals'], record['away_goals']
+        self._apply_team(record['home_id'], record['home_name'], 'home', home_goals, away_goals, record['datetime'])
+        self._apply_team(record['away_id'], record['away_name'], 'away', away_goals, home_goals, record['datetime'])
+        self.last_result = max(self.last_result, record['datetime'])
+        self._ranking = None
+        return True
+
+    def _apply_team(self, team_id: str, team_name: str, venue: str,
+                    goals_for: int, goals_against: int, datetime_str: str) -> None:
+        row = self.teams.get(team_id)
+        if row is None:
+            row = {'team_id': team_id, 'team_name': team_name, 'total': _empty_split(),
+                   'home': _empty_split(), 'away': _empty_split(), 'recent': []}
+            self.teams[team_id] = row
+        elif team_name and not row['team_name']:
+            row['team_name'] = team_name
+
+        if goals_for > goals_against:
+            outcome, points = 'W', self.points_win
+        elif goals_for < goals_against:
+            outcome, points = 'L', 0
+        else:
+            outcome, points = 'D', self.points_draw
+
+        for split in (row['total'], row[venue]):
+            split['matches_played'] += 1
+            split['goals_for'] += goals_for
+            split['goals_against'] += goals_against
+            split['points'] += points
+            split[{'W': 'wins', 'D': 'draws', 'L': 'losses'}[outcome]] += 1
+
+        # Forma in ordine cronologico anche se i risultati arrivano in ritardo
+        recent = row['recent']
+        position = bisect.bisect_right([entry[0] for entry in recent], datetime_str)
+        if position > 0 or len(recent) < self.form_length:
+            recent.insert(position, (datetime_str, outcome))
+            del recent[:-self.form_length]
+
+    def standings(self) -> List[Dict[str, Any]]:
+        """
+        Righe della classifica ordinate per punti, differenza reti, gol fatti e nome.
+
+        Returns:
+            Lista di righe nel formato di StandingsProcessor._normalize_team_standings
+        """
+        if self._ranking is None:
+            rows = sorted(self.teams.values(), key=lambda row: (
+                -row['total']['points'],
+                -(row['total']['goals_for'] - row['total']['goals_against']),
+                -row['total']['goals_for'],
+                row['team_name'] or row['team_id'],
+            ))
+            self._ranking = [self._row(row, position) for position, row in enumerate(rows, 1)]
+        return [dict(row) for row in self._ranking]
+
+    @staticmethod
+    def _row(row: Dict[str, Any], position: int) -> Dict[str, Any]:
+        total = row['total']
+        matches = total['matches_played']
+        return {
+            'position': position,
+            'team_id': row['team_id'],
+            'team_name': row['team_name'],
+            'matches_played': matches,
+            'wins': total['wins'],
+            'draws': total['draws'],
+            'losses': total['losses'],
+            'goals_for': total['goals_for'],
+            'goals_against': total['goals_against'],
+            'goal_difference': total['goals_for'] - total['goals_against'],
+            'points': total['points'],
+            'avg_goals_for': total['goals_for'] / matches if matches else 0,
+            'avg_goals_against': total['goals_against'] / matches if matches else 0,
+            'form': ''.join(outcome for _, outcome in row['recent']),
+            'home': dict(row['home']),
+            'away': dict(row['away']),
+        }
+
+    def __len__(self) -> int:
+        return len(self.teams)
+
+
+def standings_as_of(history: ResultHistory, league_id: str, season: str,
+                    date: str) -> List[Dict[str, Any]]:
+    """
+    Classifica di una stagione con i soli risultati fino alla data indicata.
+
+    Args:
+        history: Storico dei risultati
+        league_id: ID del campionato
+        season: Stagione
+        date: Data (AAAA-MM-GG) o data e ora ISO, inclusa
+
+    Returns:
+        Righe della classifica alla data
+    """
+    table = LeagueTable(league_id, season)
+    table.build(history.league_results(league_id, until=date, since=table.start or None))
+    return table.standings()
+
+
+def standings_snapshots(history: ResultHistory, league_id: str, season: str,
+                        dates: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Classifiche alle date indicate con un solo passaggio sui risultati della stagione.
+
+    Args:
+        history: Storico dei risultati
+        league_id: ID del campionato
+        season: Stagione
+        dates: Date (AAAA-MM-GG) delle classifiche, incluse
+
+    Returns:
+        Dizionario data -> righe della classifica a quella data
+    """
+    table = LeagueTable(league_id, season)
+    records = history.league_results(league_id, until=max(dates) if dates else None,
+                                     since=table.start or None)
+    snapshots = {}
+    index = 0
+    for date in sorted(set(dates)):
+        while index < len(records) and records[index]['date'] <= date:
+            table.apply_result(records[index])
+            index += 1
+        snapshots[date] = table.standings()
+    return snapshots
+
+
+# Classifiche per campionato e stagione del processo, aggiornate dallo storico
+_tables: Dict[Tuple[str, str], LeagueTable] = {}
+_tables_lock = threading.Lock()
+
+
+def _on_result(record: Dict[str, Any]) -> None:
+    for table in list(_tables.values()):
+        if table.covers(record):
+            table.apply_result(record)
+
+
+def get_league_table(db: Any, league_id: str, season: str = '',
+                     history: Optional[ResultHistory] = None) -> LeagueTable:
+    """
+    Restituisce la classifica di un campionato, calcolandola dallo storico
+    locale alla prima richiesta.
+
+    Args:
+        db: Istanza del database usata per leggere lo storico
+        league_id: ID del campionato
+        season: Stagione (vuota per tutti i risultati)
+        history: Storico dei risultati (default: storico del processo)
+
+    Returns:
+        Classifica aggiornata a ogni nuovo risultato
+    """
+    history = history or get_result_history(db)
+    with _tables_lock:
+        table = _tables.get((league_id, season))
+        if table is None:
+            table = LeagueTable(league_id, season)
+            table.build(history.league_results(league_id, since=table.start or None))
+            # Storico non ancora letto: ricalcolo alla prossima richiesta
+            if not history.loaded:
+                return table
+            _tables[(league_id, season)] = table
+            history.add_listener(_on_result)
+        return table
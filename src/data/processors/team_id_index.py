@@ -0,0 +1,186 @@
+"""
+Indice inverso degli ID delle squadre per fonte.
+Mappa ogni chiave "fonte:id_fonte" sul team_id interno. L'indice viene
+caricato una sola volta per processo dal nodo team_mappings (o ricostruito
+dal nodo teams se le mappature mancano), aggiornato in memoria a ogni
+salvataggio di squadra e scritto su Firebase in un'unica update a lotti.
+"""
+import atexit
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from src.config.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+
+def mapping_key(source: str, source_id: Any) -> str:
+    """Chiave della mappatura per una coppia (fonte, ID nella fonte)."""
+    return f"{source}:{source_id}"
+
+
+class TeamIdIndex:
+    """
+    Indice "fonte:id_fonte" -> team_id con scrittura differita.
+
+    Le nuove mappature restano in sospeso finché non se ne accumulano
+    teams.mapping_flush_size (default 100), finché non si chiama flush() o
+    fino alla chiusura del processo. Se all'avvio non si trovano né
+    mappature né squadre la lettura viene ripetuta dopo
+    teams.mapping_retry_seconds secondi (default 60).
+    """
+
+    def __init__(self, db: Any, path: str = "team_mappings"):
+        """
+        Args:
+            db: Istanza del database (FirebaseManager)
+            path: Nodo delle mappature
+        """
+        self.db = db
+        self.path = path
+        self.flush_size = get_setting('teams.mapping_flush_size', 100)
+        self.mappings: Dict[str, str] = {}
+        self._pending: Dict[str, str] = {}
+        self.retry_seconds = get_setting('teams.mapping_retry_seconds', 60)
+        self._retry_at = 0.0
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def load(self) -> None:
+        """Carica le mappature alla prima chiamata; le successive non fanno nulla."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded or time.monotonic() < self._retry_at:
+                return
+            try:
+                mappings = self.db.get(self.path) if self.db else None
+                if mappings:
+                    self.mappings.update(mappings)
+                    logger.info(f"Caricate {len(mappings)} mappature di ID squadre da Firebase")
+                elif self.db and not self._rebuild_from_teams():
+                    # Lettura fallita o database vuoto: l'indice non è affidabile
+                    raise ValueError("nessuna mappatura né squadra trovata")
+            except Exception as e:
+                self._retry_at = time.monotonic() + self.retry_seconds
+                logger.error(f"Errore nel caricare le mappature degli ID delle squadre (nuovo tentativo tra "
+                             f"{self.retry_seconds}s): {e}")
+                return
+            self._loaded = True
+
+    def _rebuild_from_teams(self) -> bool:
+        # Nessuna mappatura salvata: ricostruisce l'indice dai source_ids delle squadre
+        teams = self.db.get("teams") or {}
+        for team_id, team_data in teams.items():
+            if isinstance(team_data, dict):
+                self._add(team_id, team_data.get('source_ids') or {})
+        logger.info(f"Indice degli ID squadre ricostruito da {len(teams)} squadre ({len(self.mappings)} mappature)")
+        return bool(teams)
+
+    def get(self, source: str, source_id: Any) -> Optional[str]:
+        """
+        Restituisce il team_id interno per un ID di una fonte.
+
+        Args:
+            source: Nome della fonte
+            source_id: ID della squadra nella fonte
+
+        Returns:
+            team_id interno o None se sconosciuto
+        """
+        self.load()
+        return self.mappings.get(mapping_key(source, source_id))
+
+    def add_team(self, team_id: str, source_ids: Dict[str, Any], auto_flush: bool = True) -> int:
+        """
+        Registra gli ID di una squadra in tutte le fonti.
+
+        Args:
+            team_id: ID interno della squadra
+            source_ids: Fonte -> ID nella fonte
+            auto_flush: Scrive il lotto se le mappature in sospeso superano la soglia
+
+        Returns:
+            Numero di mappature nuove o modificate
+        """
+        self.load()
+        with self._lock:
+            changed = self._add(team_id, source_ids)
+            pending = len(self._pending)
+
+        if auto_flush and pending >= self.flush_size:
+            self.flush()
+        return changed
+
+    def _add(self, team_id: str, source_ids: Dict[str, Any]) -> int:
+        changed = 0
+        for source, source_id in source_ids.items():
+            if not source or not source_id:
+                continue
+            key = mapping_key(source, source_id)
+            if self.mappings.get(key) != team_id:
+                self.mappings[key] = team_id
+                self._pending[key] = team_id
+                changed += 1
+        return changed
+
+    def flush(self) -> bool:
+        """
+        Scrive le mappature in sospeso con un'unica update.
+
+        Returns:
+            True se non c'era nulla da scrivere o la scrittura è riuscita
+        """
+        with self._lock:
+            if not self._pending or not self.db:
+                return True
+            pending, self._pending = self._pending, {}
+
+        saved = False
+        try:
+            saved = self.db.update(self.path, pending) is not False
+        except Exception as e:
+            logger.error(f"Errore nel salvare le mappature degli ID delle squadre: {e}")
+
+        if saved:
+            logger.info(f"Salvate {len(pending)} mappature di ID squadre")
+            return True
+
+        with self._lock:
+            # Rimette in coda le mappature non scritte (senza sovrascrivere le più recenti)
+            self._pending = {**pending, **self._pending}
+        return False
+
+    @property
+    def pending(self) -> int:
+        """Numero di mappature non ancora scritte."""
+        return len(self._pending)
+
+    def __len__(self) -> int:
+        self.load()
+        return len(self.mappings)
+
+
+# Indice condiviso da tutti i TeamProcessor del processo
+_index: Optional[TeamIdIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_team_id_index(db: Any) -> TeamIdIndex:
+    """
+    Restituisce l'indice degli ID squadre del processo, creandolo alla prima chiamata.
+
+    Args:
+        db: Istanza del database usata per caricare e salvare le mappature
+
+    Returns:
+        Istanza condivisa di TeamIdIndex
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = TeamIdIndex(db)
+            atexit.register(_index.flush)
+        return _index
@@ -33,6 +33,11 @@ from src.data.open_data.open_football import get_loader as get_open_football
 from src.utils.database import FirebaseManager
 from src.utils.cache import cached
 from src.config.sources import get_sources_for_data_type, get_source_priority
+from src.data.processors.parallel import normalize_records
+from src.data.processors.team_id_index import TeamIdIndex, get_team_id_index
+from src.utils.name_index import NameIndex
+from src.data.entity_registry import EntityRegistry, ENTITY_TEAM, get_registry
+from src.config.settings import get_setting
 
 # Configurazione logger
 logger = logging.getLogger(__name__)
@@ -75,20 +80,32 @@ class TeamProcessor:
         
         # Cache per mappare nomi squadre
         self.team_name_cache = {}
-        self.team_id_map = {}
         
-        # Carica mappature ID squadre da Firebase
-        self._load_team_id_mappings()
+        # Indice fonte:ID -> team_id condiviso nel processo
+        self.team_id_index: TeamIdIndex = get_team_id_index(self.db)
+        
+        # Indice dei nomi per la ricerca approssimata (costruito alla prima ricerca)
+        self.name_index: Optional[NameIndex] = None
+        
+        # Registro canonico delle entità (file locale, caricato una volta per processo)
+        self.entity_registry: EntityRegistry = get_registry()
+        
+        # Carica mappature ID squadre da Firebase (una volta per processo)
+        self.team_id_index.load()
     
-    def _load_team_id_mappings(self):
-        """Carica le mappature degli ID delle squadre da Firebase."""
-        try:
-            mappings = self.db.get_reference("team_mappings")
-            if mappings:
-                self.team_id_map = mappings
-                logger.info(f"Caricate {len(self.team_id_map)} mappature di ID squadre da Firebase")
-        except Exception as e:
-            logger.error(f"Errore nel caricare le mappature degli ID delle squadre: {e}")
+    @classmethod
+    def for_normalization(cls) -> 'TeamProcessor':
+        """
+        Crea un processore senza client né database, sufficiente per process_team.
+        Usato nei processi worker della normalizzazione parallela.
+        """
+        processor = cls.__new__(cls)
+        processor.db = None
+        processor.team_name_cache = {}
+        processor.team_id_index = None
+        processor.name_index = None
+        processor.entity_registry = None
+        return processor
     
     def process_team(
         self, 
@@ -188,6 +205,30 @@ class TeamProcessor:
                 'raw_data': team_data
             }
     
+    def process_teams(
+        self,
+        teams: List[Dict[str, Any]],
+        source: str,
+        league_id: Optional[str] = None,
+        workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Processa un lotto di squadre della stessa fonte.
+        
+        Oltre processors.parallel_threshold squadre la normalizzazione è
+        divisa in blocchi su un pool di processi; l'ordine è preservato.
+        
+        Args:
+            teams: Dati grezzi delle squadre.
+            source: Nome della fonte dei dati.
+            league_id: ID del campionato (opzionale).
+            workers: Processi del pool (opzionale).
+        
+        Returns:
+            Lista di squadre normalizzate nell'ordine di ingresso.
+        """
+        return normalize_records(self, 'process_team', teams, source, league_id, workers=workers)
+    
     def _get_source_id_field(self, source: str) -> str:
         """
         Restituisce il nome del campo contenente l'ID per una data fonte.
@@ -1186,6 +1227,13 @@ class TeamProcessor:
             # Aggiorna anche le mappature degli ID
             self._update_team_id_mappings(team_data)
             
+            # Aggiorna l'indice dei nomi, se già costruito
+            if self.name_index is not None:
+                self.name_index.add(team_id, self._team_names(team_data))
+            
+            # Registra ID delle fonti e alias nel registro canonico
+            self._register_team(team_data)
+            
             logger.info(f"Dati della squadra {team_id} salvati con successo")
             return True
             
@@ -1204,20 +1252,27 @@ class TeamProcessor:
             if 'source_ids' not in team_data or not team_data['source_ids']:
                 return
             
-            team_id = team_data['team_id']
-            
-            # Aggiorna le mappature
-            for source, source_id in team_data['source_ids'].items():
-                if source and source_id:
-                    mapping_key = f"{source}:{source_id}"
-                    self.team_id_map[mapping_key] = team_id
-            
-            # Salva le mappature aggiornate
-            self.db.set_reference("team_mappings", self.team_id_map)
+            # Aggiorna l'indice; le mappature nuove vengono salvate a lotti
+            self.team_id_index.add_team(team_data['team_id'], team_data['source_ids'])
             
         except Exception as e:
             logger.error(f"Errore nell'aggiornare le mappature degli ID delle squadre: {e}")
     
+    def _register_team(self, team_data: Dict[str, Any]) -> None:
+        """
+        Registra la squadra nel registro canonico delle entità.
+        
+        Args:
+            team_data: Dati della squadra (team_id, nomi e ID delle fonti).
+        """
+        if self.entity_registry is None:
+            return
+        aliases = [team_data.get('short_name')] + list(team_data.get('aliases') or [])
+        self.entity_registry.register(
+            ENTITY_TEAM, team_data['team_id'], team_data.get('name'),
+            team_data.get('source_ids'), [alias for alias in aliases if alias]
+        )
+    
     def get_stored_team_data(self, team_id: str) -> Optional[Dict[str, Any]]:
         """
         Recupera i dati della squadra dal database.
@@ -1237,10 +1292,54 @@ class TeamProcessor:
             logger.error(f"Errore nel recuperare i dati della squadra {team_id}: {e}")
             return None
     
+    def _team_names(self, team_data: Dict[str, Any]) -> List[str]:
+        """
+        Nomi con cui una squadra può essere cercata: nome, nome breve e alias.
+        
+        Args:
+            team_data: Dati della squadra.
+        
+        Returns:
+            Lista di nomi normalizzati.
+        """
+        names = [team_data.get('name'), team_data.get('short_name')]
+        names.extend(team_data.get('aliases') or [])
+        return [self._normalize_team_name(name) for name in names if name]
+    
+    def _get_name_index(self) -> Optional[NameIndex]:
+        """
+        Restituisce l'indice dei nomi, costruendolo da Firebase alla prima chiamata.
+        
+        Returns:
+            Indice dei nomi, o None se le squadre non sono disponibili.
+        """
+        if self.name_index is not None:
+            return self.name_index
+        
+        teams = self.db.get("teams")
+        if not teams:
+            return None
+        
+        index = NameIndex()
+        for team_id, team_data in teams.items():
+            if isinstance(team_data, dict):
+                index.add(team_id, self._team_names(team_data))
+        
+        self.name_index = index
+        logger.info(f"Indice dei nomi costruito per {len(index)} squadre")
+        return index
+    
     def find_team_by_name(self, team_name: str) -> Optional[Dict[str, Any]]:
         """
         Cerca una squadra per nome.
         
+        Il nome viene prima risolto nel registro canonico delle entità; solo
+        per i nomi sconosciuti i candidati vengono presi dall'indice dei
+        trigrammi e la somiglianza esatta è calcolata solo su quelli. Il nome
+        trovato così resta solo nella cache del processore: nel registro gli
+        alias arrivano dai dati delle fonti (store_team_data), mai da una
+        corrispondenza approssimata.
+        
         Args:
             team_name: Nome della squadra da cercare.
         
@@ -1256,31 +1355,38 @@ class TeamProcessor:
                 team_id = self.team_name_cache[normalized_name]
                 return self.get_stored_team_data(team_id)
             
-            # Altrimenti cerca nel database
-            teams = self.db.get_reference("teams")
-            if not teams:
+            # Corrispondenza esatta su nome o alias nel registro
+            if self.entity_registry is not None:
+                team_id = self.entity_registry.resolve_name(ENTITY_TEAM, team_name)
+                if team_id:
+                    self.team_name_cache[normalized_name] = team_id
+                    return self.get_stored_team_data(team_id)
+            
+            # Altrimenti cerca tra i candidati dell'indice
+            index = self._get_name_index()
+            if index is None:
                 return None
             
             # Cerca la squadra con il nome più simile
-            best_match = None
+            best_team_id = None
             best_score = 0
             
-            for team_id, team_data in teams.items():
-                if 'name' in team_data:
-                    current_name = self._normalize_team_name(team_data['name'])
-                    
+            limit = get_setting('teams.name_candidates', 10)
+            for team_id, _ in index.candidates(normalized_name, limit=limit):
+                for current_name in index.names(team_id):
                     # Calcola la somiglianza tra i nomi
                     score = self._name_similarity(normalized_name, current_name)
                     
                     if score > best_score and score > 0.8:  # Soglia di somiglianza
                         best_score = score
-                        best_match = team_data
+                        best_team_id = team_id
             
-            # Aggiorna la cache se trovato
-            if best_match and 'team_id' in best_match:
-                self.team_name_cache[normalized_name] = best_match['team_id']
+            if not best_team_id:
+                return None
             
-            return best_match
+            # Aggiorna la cache (la corrispondenza approssimata non diventa un alias permanente)
+            self.team_name_cache[normalized_name] = best_team_id
+            return self.get_stored_team_data(best_team_id)
             
         except Exception as e:
             logger.error(f"Errore nella ricerca della squadra per nome '{team_name}': {e}")
@@ -1298,31 +1404,29 @@ class TeamProcessor:
             Dizionario con i dati della squadra, o None se non trovato.
         """
         try:
-            # Controlla la mappa degli ID
-            mapping_key = f"{source}:{source_id}"
-            if mapping_key in self.team_id_map:
-                team_id = self.team_id_map[mapping_key]
-                return self.get_stored_team_data(team_id)
-            
-            # Altrimenti cerca manualmente
-            teams = self.db.get_reference("teams")
-            if not teams:
-                return None
-            
-            for team_id, team_data in teams.items():
-                if 'source_ids' in team_data and source in team_data['source_ids']:
-                    if team_data['source_ids'][source] == source_id:
-                        # Aggiorna la mappa per future ricerche
-                        self.team_id_map[mapping_key] = team_id
-                        self.db.set_reference(f"team_mappings/{mapping_key}", team_id)
-                        return team_data
-            
-            return None
+            # L'indice contiene tutte le mappature note: nessuna scansione delle squadre
+            team_id = self.team_id_index.get(source, source_id)
+            if not team_id and self.entity_registry is not None:
+                team_id = self.entity_registry.resolve(ENTITY_TEAM, source, source_id)
+            return self.get_stored_team_data(team_id) if team_id else None
             
         except Exception as e:
             logger.error(f"Errore nella ricerca della squadra con ID '{source}:{source_id}': {e}")
             return None
     
+    def flush_team_mappings(self) -> bool:
+        """
+        Salva su Firebase le mappature degli ID ancora in sospeso e su file
+        il registro delle entità.
+        
+        Returns:
+            True se il salvataggio è riuscito o non c'era nulla da salvare.
+        """
+        saved = self.team_id_index.flush()
+        if self.entity_registry is not None:
+            saved = self.entity_registry.save() and saved
+        return saved
+    
     def _name_similarity(self, name1: str, name2: str) -> float:
         """
         Calcola la somiglianza tra due nomi di squadre.
@@ -1345,16 +1449,20 @@ class TeamProcessor:
         if name1 == name2:
             return 1.0
         
-        # Trova la sottostringa comune più lunga
+        # Trova la sottostringa comune più lunga (due righe della matrice alla volta)
         len1, len2 = len(name1), len(name2)
-        matrix = [[0 for _ in range(len2 + 1)] for _ in range(len1 + 1)]
+        previous = [0] * (len2 + 1)
         max_length = 0
         
         for i in range(1, len1 + 1):
+            current = [0] * (len2 + 1)
+            char1 = name1[i-1]
             for j in range(1, len2 + 1):
-                if name1[i-1] == name2[j-1]:
-                    matrix[i][j] = matrix[i-1][j-1] + 1
-                    max_length = max(max_length, matrix[i][j])
+                if char1 == name2[j-1]:
+                    length = current[j] = previous[j-1] + 1
+                    if length > max_length:
+                        max_length = length
+            previous = current
         
         # Calcola la somiglianza come rapporto tra la lunghezza della sottostringa comune
         # e la lunghezza media dei due nomi
@@ -0,0 +1,411 @@
+"""
+Storico xG delle squadre in array NumPy.
+Per ogni squadra le partite con dati xG sono tenute in array paralleli
+(data, xG a favore e contro, gol, casa/trasferta) ordinati per data, così
+medie, medie ponderate per recency, finestre mobili e medie esponenziali si
+calcolano in forma vettoriale. Il nodo data/matches viene letto alla prima
+richiesta e di nuovo quando la lettura è più vecchia di
+processors.xg.history_reload_hours; gli xG elaborati nel frattempo
+sostituiscono i dati precedenti della stessa partita.
+"""
+import time
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from src.config.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+_NUMERIC_FIELDS = ('xg_for', 'xg_against', 'goals_for', 'goals_against')
+
+
+def _to_day(datetime_str: str) -> Optional[np.datetime64]:
+    try:
+        return np.datetime64(str(datetime_str)[:10], 'D')
+    except ValueError:
+        return None
+
+
+def _team_id(match: Dict[str, Any], side: str) -> str:
+    team = match.get(f"{side}_team")
+    if isinstance(team, dict):
+        return str(team.get('id') or match.get(f"{side}_team_id") or '')
+    return str(match.get(f"{side}_team_id") or '')
+
+
+def _team_name(match: Dict[str, Any], side: str) -> str:
+    team = match.get(f"{side}_team")
+    return team.get('name', '') if isinstance(team, dict) else str(team or '')
+
+
+def _score(match: Dict[str, Any], side: str) -> float:
+    score = match.get('score')
+    value = score.get(side) if isinstance(score, dict) else match.get(f"{side}_score")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _team_rows(match_id: str, match: Dict[str, Any]) -> List[Tuple[str, str, tuple]]:
+    """Righe (squadra, campionato, argomenti di TeamXGSeries.append) delle due squadre di una partita."""
+    xg = match.get('xg') or {}
+    status = str(match.get('status', 'finished')).lower()
+    if status != 'finished' or xg.get('home') is None or xg.get('away') is None:
+        return []
+    datetime_str = match.get('datetime') or match.get('date') or ''
+    date = _to_day(datetime_str)
+    home_id, away_id = _team_id(match, 'home'), _team_id(match, 'away')
+    if date is None or not home_id or not away_id:
+        return []
+
+    home_xg, away_xg = float(xg['home']), float(xg['away'])
+    home_goals, away_goals = _score(match, 'home'), _score(match, 'away')
+    competition = match.get('competition') or {}
+    league_id = str(match.get('league_id') or competition.get('id') or '')
+    details = {'datetime': datetime_str, 'league_id': league_id,
+               'home_team': _team_name(match, 'home'), 'away_team': _team_name(match, 'away'),
+               'xg_sources': match.get('xg_sources') or xg.get('sources') or []}
+    return [
+        (home_id, league_id, (match_id, date, True, home_xg, away_xg, home_goals, away_goals,
+                              dict(details, opponent_id=away_id, opponent_name=details['away_team']))),
+        (away_id, league_id, (match_id, date, False, away_xg, home_xg, away_goals, home_goals,
+                              dict(details, opponent_id=home_id, opponent_name=details['home_team']))),
+    ]
+
+
+def series_from_matches(team_id: str, matches: List[Dict[str, Any]]) -> "TeamXGSeries":
+    """
+    Storico xG di una squadra costruito da una lista di partite.
+
+    Args:
+        team_id: ID della squadra
+        matches: Partite con il campo xg ({"home": ..., "away": ...}) e match_id
+
+    Returns:
+        Storico xG della squadra (vuoto se nessuna partita è valida)
+    """
+    series = TeamXGSeries(team_id, capacity=max(1, len(matches)))
+    for match in matches:
+        for row_team_id, _, row in _team_rows(match.get('match_id', ''), match):
+            if row_team_id == team_id:
+                series.append(*row)
+    return series
+
+
+class TeamXGSeries:
+    """
+    Partite con xG di una squadra in array paralleli ordinati per data.
+
+    Gli array crescono per raddoppio, quindi l'aggiunta in coda costa O(1)
+    ammortizzato; una partita più vecchia dell'ultima viene inserita al suo posto
+    e una partita già presente sostituisce la riga precedente.
+    """
+
+    def __init__(self, team_id: str, capacity: int = 16):
+        """
+        Args:
+            team_id: ID della squadra
+            capacity: Capacità iniziale degli array
+        """
+        self.team_id = team_id
+        self.size = 0
+        self.dates = np.empty(capacity, dtype='datetime64[D]')
+        self.is_home = np.empty(capacity, dtype=bool)
+        self.values = {field: np.empty(capacity, dtype=float) for field in _NUMERIC_FIELDS}
+        self.details: List[Dict[str, Any]] = []
+        self._match_ids = set()
+
+    def append(self, match_id: str, date: np.datetime64, is_home: bool, xg_for: float, xg_against: float,
+               goals_for: float = np.nan, goals_against: float = np.nan,
+               details: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Aggiunge una partita mantenendo l'ordine per data, sostituendo i
+        dati precedenti se la partita è già presente.
+
+        Args:
+            match_id: ID della partita
+            date: Data della partita
+            is_home: True se la squadra giocava in casa
+            xg_for: xG della squadra
+            xg_against: xG dell'avversario
+            goals_for: Gol della squadra (NaN se non noti)
+            goals_against: Gol dell'avversario (NaN se non noti)
+            details: Dati descrittivi della partita (avversario, data ISO, fonti)
+
+        Returns:
+            True se la partita è nuova per la squadra, False se è stata aggiornata
+        """
+        is_new = match_id not in self._match_ids
+        if not is_new:
+            self._remove(match_id)
+        self._match_ids.add(match_id)
+
+        if self.size == len(self.dates):
+            self._grow()
+        position = int(np.searchsorted(self.dates[:self.size], date, side='right'))
+        arrays = [self.dates, self.is_home] + [self.values[field] for field in _NUMERIC_FIELDS]
+        if position < self.size:
+            for array in arrays:
+                array[position + 1:self.size + 1] = array[position:self.size]
+        row = (date, is_home, xg_for, xg_against, goals_for, goals_against)
+        for array, value in zip(arrays, row):
+            array[position] = value
+        self.details.insert(position, dict(details or {}, match_id=match_id))
+        self.size += 1
+        return is_new
+
+    def _remove(self, match_id: str) -> None:
+        position = next(i for i, details in enumerate(self.details) if details['match_id'] == match_id)
+        arrays = [self.dates, self.is_home] + [self.values[field] for field in _NUMERIC_FIELDS]
+        for array in arrays:
+            array[position:self.size - 1] = array[position + 1:self.size]
+        del self.details[position]
+        self._match_ids.discard(match_id)
+        self.size -= 1
+
+    def _grow(self) -> None:
+        capacity = max(16, 2 * len(self.dates))
+        self.dates = np.resize(self.dates, capacity)
+        self.is_home = np.resize(self.is_home, capacity)
+        self.values = {field: np.resize(array, capacity) for field, array in self.values.items()}
+
+    def window(self, limit: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Viste sugli array delle ultime partite, in ordine cronologico.
+
+        Args:
+            limit: Numero massimo di partite (default: tutte)
+
+        Returns:
+            Dizionario campo -> array (dates, is_home, xg_for, xg_against, goals_for, goals_against)
+        """
+        start = max(0, self.size - limit) if limit else 0
+        window = {field: array[start:self.size] for field, array in self.values.items()}
+        window['dates'] = self.dates[start:self.size]
+        window['is_home'] = self.is_home[start:self.size]
+        return window
+
+    def recent_details(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Dati descrittivi delle ultime partite, dalla più recente."""
+        start = max(0, self.size - limit) if limit else 0
+        return self.details[start:][::-1]
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def _means(values: np.ndarray, mask: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """Medie (ponderate) per riga dei valori selezionati dalla maschera; 0 per le righe vuote."""
+    valid = mask & ~np.isnan(values)
+    weights = valid * (1.0 if weights is None else weights)
+    totals = weights.sum(axis=1)
+    sums = np.where(valid, values, 0.0) * weights
+    return np.divide(sums.sum(axis=1), totals, out=np.zeros(len(values)), where=totals > 0)
+
+
+def summarize(series: List[TeamXGSeries], limit: Optional[int] = None,
+              reference_date: Optional[np.datetime64] = None) -> List[Dict[str, Any]]:
+    """
+    Statistiche xG di più squadre calcolate insieme su matrici squadre x partite.
+
+    Per ogni squadra: medie semplici e ponderate per recency (decadimento
+    mensile analytics.xg.recency_factor, default 0.9) complessive, in casa e
+    in trasferta; media mobile delle ultime processors.xg.rolling_window
+    partite (default 5) e media esponenziale con processors.xg.ewma_alpha
+    (default 0.3).
+
+    Args:
+        series: Storici xG delle squadre
+        limit: Ultime partite considerate per squadra (default: tutte)
+        reference_date: Data di riferimento dei pesi (default: oggi)
+
+    Returns:
+        Lista di statistiche, nello stesso ordine delle squadre
+    """
+    if not series:
+        return []
+    windows = [team.window(limit) for team in series]
+    width = max(1, max(len(window['dates']) for window in windows))
+
+    # Matrici allineate a destra (partita più recente nell'ultima colonna)
+    present = np.zeros((len(series), width), dtype=bool)
+    is_home = np.zeros((len(series), width), dtype=bool)
+    days = np.zeros((len(series), width), dtype='datetime64[D]')
+    values = {field: np.full((len(series), width), np.nan) for field in _NUMERIC_FIELDS}
+    for row, window in enumerate(windows):
+        size = len(window['dates'])
+        if not size:
+            continue
+        present[row, -size:] = True
+        is_home[row, -size:] = window['is_home']
+        days[row, -size:] = window['dates']
+        for field in _NUMERIC_FIELDS:
+            values[field][row, -size:] = window[field]
+
+    reference_date = reference_date if reference_date is not None else np.datetime64('today', 'D')
+    days_ago = (reference_date - days).astype(float)
+    recency = get_setting('analytics.xg.recency_factor', 0.9) ** (days_ago / 30)
+    rolling_window = get_setting('processors.xg.rolling_window', 5)
+    alpha = get_setting('processors.xg.ewma_alpha', 0.3)
+    # Pesi esponenziali per partita: 1 per la più recente, (1 - alpha)^k per la k-esima precedente
+    positions = np.cumsum(present[:, ::-1], axis=1)[:, ::-1] - 1
+    ewma_weights = (1 - alpha) ** np.maximum(positions, 0)
+    rolling = present & (positions < rolling_window)
+
+    splits = {'overall': present, 'home': present & is_home, 'away': present & ~is_home}
+    stats = {}
+    for split, mask in splits.items():
+        stats[split] = {'matches': mask.sum(axis=1)}
+        for field in _NUMERIC_FIELDS:
+            stats[split][field] = _means(values[field], mask)
+            stats[split][f"weighted_{field}"] = _means(values[field], mask, recency)
+    for field in ('xg_for', 'xg_against'):
+        stats['overall'][f"rolling_{field}"] = _means(values[field], rolling)
+        stats['overall'][f"ewma_{field}"] = _means(values[field], present, ewma_weights)
+
+    summaries = []
+    for row, team in enumerate(series):
+        summary = {'team_id': team.team_id, 'weights': recency[row][present[row]][::-1].tolist()}
+        for split, split_stats in stats.items():
+            summary[split] = {key: (int(array[row]) if key == 'matches' else float(array[row]))
+                              for key, array in split_stats.items()}
+        summaries.append(summary)
+    return summaries
+
+
+class XGHistory:
+    """
+    Storici xG di tutte le squadre del processo, con l'elenco delle squadre
+    di ogni campionato per i riepiloghi di campionato.
+    """
+
+    def __init__(self, db: Any, reload_hours: Optional[float] = None):
+        """
+        Args:
+            db: Istanza del database (FirebaseManager)
+            reload_hours: Ore dopo cui rileggere le partite (default: processors.xg.history_reload_hours, 6)
+        """
+        self.db = db
+        self.reload_hours = reload_hours if reload_hours is not None else \
+            get_setting('processors.xg.history_reload_hours', 6)
+        self.teams: Dict[str, TeamXGSeries] = {}
+        self.league_teams: Dict[str, set] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def _is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.reload_hours * 3600
+
+    def load(self) -> None:
+        """Legge le partite con xG alla prima chiamata e quando la lettura precedente è scaduta."""
+        if self._is_fresh():
+            return
+        with self._lock:
+            if self._is_fresh():
+                return
+            try:
+                matches_ref = self.db.get_reference("data/matches") if self.db else None
+                matches = matches_ref.get() if matches_ref is not None else None
+                teams, league_teams = {}, {}
+                added = sum(1 for match_id, match in (matches or {}).items()
+                            if isinstance(match, dict) and self._add(match_id, match, teams, league_teams))
+                # Gli storici nuovi sostituiscono i precedenti solo a lettura riuscita
+                self.teams, self.league_teams = teams, league_teams
+                logger.info(f"Storico xG caricato: {added} partite per {len(self.teams)} squadre")
+            except Exception as e:
+                logger.error(f"Errore nel caricare lo storico xG: {e}")
+            self._loaded_at = time.monotonic()
+
+    def add_match(self, match_id: str, match: Dict[str, Any]) -> bool:
+        """
+        Aggiunge una partita con xG agli storici delle due squadre, o ne
+        sostituisce i dati se è già presente (xG ricombinati).
+
+        Se lo storico non è ancora stato caricato non fa nulla: la partita
+        verrà letta con le altre al primo caricamento.
+
+        Args:
+            match_id: ID della partita
+            match: Partita con il campo xg ({"home": ..., "away": ...})
+
+        Returns:
+            True se la partita è stata aggiunta o aggiornata
+        """
+        if self._loaded_at is None:
+            return False
+        with self._lock:
+            return self._add(match_id, match, self.teams, self.league_teams)
+
+    @staticmethod
+    def _add(match_id: str, match: Dict[str, Any], teams: Dict[str, TeamXGSeries],
+             league_teams: Dict[str, set]) -> bool:
+        added = False
+        for team_id, league_id, row in _team_rows(match_id, match):
+            series = teams.get(team_id)
+            if series is None:
+                series = teams[team_id] = TeamXGSeries(team_id)
+            series.append(*row)
+            added = True
+            if league_id:
+                league_teams.setdefault(league_id, set()).add(team_id)
+        return added
+
+    def team(self, team_id: str) -> Optional[TeamXGSeries]:
+        """Storico xG di una squadra, o None se non ha partite con xG."""
+        self.load()
+        return self.teams.get(team_id)
+
+    def team_summary(self, team_id: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Statistiche xG di una squadra sulle ultime partite.
+
+        Args:
+            team_id: ID della squadra
+            limit: Ultime partite considerate
+
+        Returns:
+            Statistiche (vedi summarize), o dizionario vuoto senza dati
+        """
+        series = self.team(team_id)
+        return summarize([series], limit)[0] if series else {}
+
+    def league_summary(self, league_id: str, limit: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Statistiche xG di tutte le squadre di un campionato con un solo calcolo.
+
+        Args:
+            league_id: ID del campionato
+            limit: Ultime partite considerate per squadra
+
+        Returns:
+            Dizionario team_id -> statistiche (vedi summarize)
+        """
+        self.load()
+        series = [self.teams[team_id] for team_id in sorted(self.league_teams.get(league_id, ()))]
+        return {summary['team_id']: summary for summary in summarize(series, limit)}
+
+
+# Storico xG condiviso da tutti i processori del processo
+_history: Optional[XGHistory] = None
+_history_lock = threading.Lock()
+
+
+def get_xg_history(db: Any) -> XGHistory:
+    """
+    Restituisce lo storico xG del processo, creandolo alla prima chiamata.
+
+    Args:
+        db: Istanza del database usata per leggere le partite
+
+    Returns:
+        Istanza condivisa di XGHistory
+    """
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = XGHistory(db)
+        return _history
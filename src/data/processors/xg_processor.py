@@ -14,6 +14,7 @@ from datetime import datetime, timedelta
 from src.utils.cache import cached
 from src.utils.database import FirebaseManager
 from src.config.settings import get_setting
+from src.data.processors.xg_history import TeamXGSeries, get_xg_history, series_from_matches, summarize
 
 logger = logging.getLogger(__name__)
 
@@ -100,6 +101,7 @@ class XGProcessor:
         match_ref.child('xg').set(combined_xg)
         match_ref.child('xg_sources').set(combined_xg.get('sources', []))
         match_ref.child('xg_last_updated').set(datetime.now().isoformat())
+        get_xg_history(self.db).add_match(match_id, dict(match_data, xg=combined_xg))
         
         logger.info(f"Dati xG elaborati e salvati per match_id={match_id}: " 
                   f"{combined_xg.get('home')} - {combined_xg.get('away')}")
@@ -306,6 +308,11 @@ class XGProcessor:
         """
         logger.info(f"Elaborazione storia xG per team_id={team_id}")
         
+        # Storico xG del processo: nessuna query per squadra
+        series = get_xg_history(self.db).team(team_id)
+        if series:
+            return self._format_team_xg_stats(series, matches_limit)
+        
         # Ottieni le ultime partite della squadra
         matches_ref = self.db.get_reference("data/matches")
         
@@ -368,45 +375,43 @@ class XGProcessor:
         Returns:
             Statistiche xG della squadra
         """
-        # Inizializza contatori
-        total_own_xg = 0
-        total_opponent_xg = 0
-        home_own_xg = 0
-        home_opponent_xg = 0
-        away_own_xg = 0
-        away_opponent_xg = 0
-        total_home_matches = 0
-        total_away_matches = 0
-        
-        # xG per partita specifica
-        match_details = []
+        return self._format_team_xg_stats(series_from_matches(team_id, matches), len(matches))
+    
+    def _format_team_xg_stats(self, series: TeamXGSeries, 
+                            matches_limit: Optional[int] = None,
+                            summary: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Statistiche xG di una squadra dal suo storico in array.
         
-        # Processa ogni partita
-        for match in matches:
-            is_home = match.get('is_home', False)
-            team_xg = match.get('team_xg', 0)
-            opponent_xg = match.get('opponent_xg', 0)
-            
-            # Totali generali
-            total_own_xg += team_xg
-            total_opponent_xg += opponent_xg
-            
-            # Totali casa/trasferta
-            if is_home:
-                home_own_xg += team_xg
-                home_opponent_xg += opponent_xg
-                total_home_matches += 1
-            else:
-                away_own_xg += team_xg
-                away_opponent_xg += opponent_xg
-                total_away_matches += 1
+        Args:
+            series: Storico xG della squadra
+            matches_limit: Numero massimo di partite da considerare
+            summary: Statistiche già calcolate (ad es. per tutto il campionato)
             
-            # Aggiungi dettagli partita
+        Returns:
+            Statistiche xG della squadra
+        """
+        summary = summary or summarize([series], matches_limit)[0]
+        
+        def split_stats(split: Dict[str, float]) -> Dict[str, float]:
+            return {
+                'xg_for': round(split['xg_for'], 2),
+                'xg_against': round(split['xg_against'], 2),
+                'xg_difference': round(split['xg_for'] - split['xg_against'], 2)
+            }
+        
+        # Dettagli per partita, dalla più recente
+        window = series.window(matches_limit)
+        match_details = []
+        for detail, is_home, team_xg, opponent_xg, team_score, opponent_score in zip(
+                series.recent_details(matches_limit), window['is_home'][::-1].tolist(),
+                window['xg_for'][::-1].tolist(), window['xg_against'][::-1].tolist(),
+                window['goals_for'][::-1].tolist(), window['goals_against'][::-1].tolist()):
             match_detail = {
-                'match_id': match.get('match_id', ''),
-                'date': match.get('datetime', ''),
-                'home_team': match.get('home_team', ''),
-                'away_team': match.get('away_team', ''),
+                'match_id': detail['match_id'],
+                'date': detail.get('datetime', ''),
+                'home_team': detail.get('home_team', ''),
+                'away_team': detail.get('away_team', ''),
                 'is_home': is_home,
                 'team_xg': team_xg,
                 'opponent_xg': opponent_xg,
@@ -414,60 +419,49 @@ class XGProcessor:
             }
             
             # Aggiungi risultato reale se disponibile
-            if 'home_score' in match and 'away_score' in match:
-                team_score = match['home_score'] if is_home else match['away_score']
-                opponent_score = match['away_score'] if is_home else match['home_score']
-                
+            if not math.isnan(team_score) and not math.isnan(opponent_score):
                 match_detail['team_score'] = team_score
                 match_detail['opponent_score'] = opponent_score
                 match_detail['score_difference'] = team_score - opponent_score
-                
-                # Calcola differenza tra xG e gol realizzati
                 match_detail['xg_overperformance'] = team_score - team_xg
             
             match_details.append(match_detail)
         
-        # Calcola medie
-        total_matches = len(matches)
-        
-        # Statistiche complessive
-        avg_own_xg = total_own_xg / total_matches if total_matches > 0 else 0
-        avg_opponent_xg = total_opponent_xg / total_matches if total_matches > 0 else 0
-        
-        # Statistiche casa
-        avg_home_own_xg = home_own_xg / total_home_matches if total_home_matches > 0 else 0
-        avg_home_opponent_xg = home_opponent_xg / total_home_matches if total_home_matches > 0 else 0
-        
-        # Statistiche trasferta
-        avg_away_own_xg = away_own_xg / total_away_matches if total_away_matches > 0 else 0
-        avg_away_opponent_xg = away_opponent_xg / total_away_matches if total_away_matches > 0 else 0
-        
-        # Risultato complessivo
-        result = {
-            'team_id': team_id,
-            'matches_analyzed': total_matches,
-            'home_matches': total_home_matches,
-            'away_matches': total_away_matches,
-            'overall': {
-                'xg_for': round(avg_own_xg, 2),
-                'xg_against': round(avg_opponent_xg, 2),
-                'xg_difference': round(avg_own_xg - avg_opponent_xg, 2)
-            },
-            'home': {
-                'xg_for': round(avg_home_own_xg, 2),
-                'xg_against': round(avg_home_opponent_xg, 2),
-                'xg_difference': round(avg_home_own_xg - avg_home_opponent_xg, 2)
-            },
-            'away': {
-                'xg_for': round(avg_away_own_xg, 2),
-                'xg_against': round(avg_away_opponent_xg, 2),
-                'xg_difference': round(avg_away_own_xg - avg_away_opponent_xg, 2)
+        overall = summary['overall']
+        return {
+            'team_id': series.team_id,
+            'matches_analyzed': overall['matches'],
+            'home_matches': summary['home']['matches'],
+            'away_matches': summary['away']['matches'],
+            'overall': split_stats(overall),
+            'home': split_stats(summary['home']),
+            'away': split_stats(summary['away']),
+            'trend': {
+                'rolling_xg_for': round(overall['rolling_xg_for'], 2),
+                'rolling_xg_against': round(overall['rolling_xg_against'], 2),
+                'ewma_xg_for': round(overall['ewma_xg_for'], 2),
+                'ewma_xg_against': round(overall['ewma_xg_against'], 2)
             },
             'match_details': match_details,
             'last_updated': datetime.now().isoformat()
         }
+    
+    def get_league_xg_summary(self, league_id: str, 
+                            matches_limit: int = 10) -> Dict[str, Dict[str, Any]]:
+        """
+        Statistiche xG di tutte le squadre di un campionato, calcolate insieme.
         
-        return result
+        Args:
+            league_id: ID del campionato
+            matches_limit: Numero massimo di partite per squadra
+            
+        Returns:
+            Dizionario team_id -> statistiche xG (formato di process_team_xg_history)
+        """
+        history = get_xg_history(self.db)
+        summaries = history.league_summary(league_id, matches_limit)
+        return {team_id: self._format_team_xg_stats(history.team(team_id), matches_limit, summary)
+                for team_id, summary in summaries.items()}
     
     @cached(ttl=3600 * 12)  # 12 ore
     def calculate_match_xg_prediction(self, match_id: str) -> Dict[str, Any]:
@@ -635,6 +629,20 @@ def get_team_xg_history(team_id: str, matches_limit: int = 10) -> Dict[str, Any]
     processor = XGProcessor()
     return processor.process_team_xg_history(team_id, matches_limit)
 
+def get_league_xg_summary(league_id: str, matches_limit: int = 10) -> Dict[str, Dict[str, Any]]:
+    """
+    Ottiene le statistiche xG di tutte le squadre di un campionato.
+    
+    Args:
+        league_id: ID del campionato
+        matches_limit: Numero massimo di partite per squadra
+        
+    Returns:
+        Statistiche xG per squadra
+    """
+    processor = XGProcessor()
+    return processor.get_league_xg_summary(league_id, matches_limit)
+
 def predict_match_xg(match_id: str) -> Dict[str, Any]:
     """
     Predice gli xG per una partita futura.
@@ -15,6 +15,8 @@ from src.data.scrapers.worldfootball import WorldFootballScraper, get_scraper as
 from src.data.scrapers.transfermarkt import TransfermarktScraper, get_scraper as get_transfermarkt_scraper
 from src.data.scrapers.wikipedia import WikipediaScraper, get_scraper as get_wikipedia_scraper
 from src.data.scrapers.eleven_v_eleven import ElevenVElevenScraper, get_scraper as get_elevenvelevencraper
+from src.data.scrapers.crawl_scheduler import CrawlScheduler, FetchJob, FetchResult, HostPolicy, crawl
+from src.data.scrapers.historical_crawler import HistoricalCrawler, get_crawler as get_historical_crawler
 
 logger = logging.getLogger(__name__)
 
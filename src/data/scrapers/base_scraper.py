@@ -9,6 +9,7 @@ import random
 import hashlib
 import json
 import logging
+import threading
 import requests
 from datetime import datetime
 from bs4 import BeautifulSoup
@@ -18,6 +19,8 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import sqlite3
 
+from src.utils.http import host_limiter
+
 # Lista di User Agents per rotazione
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -152,13 +155,14 @@ class BaseScraper:
         self.respect_robots = respect_robots
         self.delay_range = delay_range
         self.max_retries = max_retries
+        self.logger = logging.getLogger(f"scraper.{name.lower()}")
         self.session = self._create_session()
         self.cache = ScraperCache(f"{name.lower()}_cache")
         self.robots_parser = self._init_robots_parser() if respect_robots else None
-        self.logger = logging.getLogger(f"scraper.{name.lower()}")
         
         # Timestamp ultima richiesta per gestire rate limiting
         self.last_request_time = 0
+        self._throttle_lock = threading.Lock()
     
     def _create_session(self):
         """Crea sessione HTTP con retry automatici."""
@@ -203,7 +207,7 @@ class BaseScraper:
             return True
         return self.robots_parser.can_fetch("*", url)
     
-    def get(self, url, params=None, use_cache=True, force_new_agent=False):
+    def get(self, url, params=None, use_cache=True, force_new_agent=False, throttle=True):
         """
         Effettua una richiesta GET con cache e gestione errori.
         
@@ -212,6 +216,8 @@ class BaseScraper:
             params (dict): Parametri della query string
             use_cache (bool): Se usare la cache
             force_new_agent (bool): Se forzare un nuovo user agent
+            throttle (bool): Se applicare il delay interno dello scraper
+                (False quando la spaziatura è gestita dal CrawlScheduler)
             
         Returns:
             str: Contenuto della risposta o None in caso di errore
@@ -232,7 +238,8 @@ class BaseScraper:
             return None
         
         # Attesa per rispettare rate limits
-        self._wait()
+        if throttle:
+            self._wait()
         
         # Aggiorna User-Agent se richiesto
         if force_new_agent:
@@ -241,10 +248,13 @@ class BaseScraper:
         # Effettua la richiesta
         try:
             self.logger.info(f"Richiesta a {url}")
-            response = self.session.get(url, params=params, timeout=30)
+            with host_limiter.slot(url):
+                response = self.session.get(url, params=params, timeout=30)
             
-            # Aggiorna timestamp ultima richiesta
-            self.last_request_time = time.time()
+            # Aggiorna timestamp ultima richiesta senza anticipare i turni già
+            # prenotati da _wait per altri thread
+            with self._throttle_lock:
+                self.last_request_time = max(self.last_request_time, time.time())
             
             if response.status_code == 200:
                 # Salva in cache e restituisci
@@ -254,7 +264,7 @@ class BaseScraper:
             elif response.status_code == 429:  # Too Many Requests
                 self.logger.warning(f"Rate limit raggiunto per {url}. Attesa più lunga.")
                 time.sleep(60)  # Attesa molto più lunga
-                return self.get(url, params, use_cache, True)  # Riprova con nuovo User-Agent
+                return self.get(url, params, use_cache, True, throttle=throttle)  # Riprova con nuovo User-Agent
             else:
                 self.logger.error(f"Errore {response.status_code} per {url}")
                 return None
@@ -280,15 +290,22 @@ class BaseScraper:
     
     def _wait(self):
         """Attende un periodo casuale per rispettare i rate limits."""
-        # Calcola tempo trascorso dall'ultima richiesta
-        elapsed = time.time() - self.last_request_time
-        
         # Determina il delay
         min_delay, max_delay = self.delay_range
         
-        # Se il tempo trascorso è minore del delay minimo, attendi
-        if elapsed < min_delay:
-            wait_time = min_delay - elapsed + random.uniform(0, max_delay - min_delay)
+        # Prenota il turno sotto lock: thread che condividono lo scraper
+        # restano distanziati come richieste sequenziali
+        with self._throttle_lock:
+            now = time.time()
+            elapsed = now - self.last_request_time
+            wait_time = 0.0
+            
+            # Se il tempo trascorso è minore del delay minimo, attendi
+            if elapsed < min_delay:
+                wait_time = min_delay - elapsed + random.uniform(0, max_delay - min_delay)
+            self.last_request_time = now + wait_time
+        
+        if wait_time > 0:
             time.sleep(wait_time)
     
     def parse(self, html, selector=None):
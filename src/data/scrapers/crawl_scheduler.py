@@ -0,0 +1,311 @@
+"""
+Scheduler per il crawling parallelo su più host.
+Esegue i job di fetch provenienti dalle sottoclassi di BaseScraper con un pool
+di worker, mantenendo per ogni host una spaziatura minima tra le richieste e un
+limite di concorrenza. Host diversi procedono in parallelo, quindi il delay di
+cortesia di fbref non blocca più sofascore o transfermarkt.
+"""
+import time
+import random
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Callable, Iterable
+from urllib.parse import urlparse
+
+from src.data.scrapers.base_scraper import BaseScraper
+
+logger = logging.getLogger(__name__)
+
+
+class HostPolicy:
+    """Regole di cortesia per un singolo host."""
+
+    def __init__(self, min_interval: float = 1.0, max_interval: Optional[float] = None,
+                 max_concurrency: int = 1):
+        """
+        Args:
+            min_interval: Secondi minimi tra l'avvio di due richieste allo stesso host
+            max_interval: Se indicato, la spaziatura è estratta in [min_interval, max_interval]
+            max_concurrency: Numero massimo di richieste contemporanee verso l'host
+        """
+        self.min_interval = max(0.0, float(min_interval))
+        self.max_interval = max(self.min_interval, float(max_interval)) if max_interval is not None else self.min_interval
+        self.max_concurrency = max(1, int(max_concurrency))
+
+    def next_interval(self) -> float:
+        """Restituisce la spaziatura da applicare dopo l'avvio di una richiesta."""
+        if self.max_interval > self.min_interval:
+            return random.uniform(self.min_interval, self.max_interval)
+        return self.min_interval
+
+    @classmethod
+    def from_scraper(cls, scraper: BaseScraper, max_concurrency: int = 1) -> 'HostPolicy':
+        """Costruisce la policy a partire dal delay_range dello scraper."""
+        min_delay, max_delay = getattr(scraper, 'delay_range', (1.0, 1.0))
+        return cls(min_interval=min_delay, max_interval=max_delay, max_concurrency=max_concurrency)
+
+
+class FetchJob:
+    """Richiesta di fetch da eseguire tramite uno scraper."""
+
+    def __init__(self, scraper: BaseScraper, url: str, params: Optional[Dict[str, Any]] = None,
+                 use_cache: bool = True, parser: Optional[Callable[[str], Any]] = None,
+                 tag: Optional[str] = None):
+        """
+        Args:
+            scraper: Istanza di BaseScraper (o sottoclasse) che esegue la richiesta
+            url: URL da scaricare
+            params: Parametri della query string
+            use_cache: Se usare la cache dello scraper
+            parser: Funzione opzionale applicata al contenuto scaricato
+            tag: Etichetta libera per identificare il job nei risultati
+        """
+        self.scraper = scraper
+        self.url = url
+        self.params = params
+        self.use_cache = use_cache
+        self.parser = parser
+        self.tag = tag
+        self.host = urlparse(url).netloc.lower()
+
+
+class FetchResult:
+    """Esito di un FetchJob."""
+
+    def __init__(self, job: FetchJob, content: Any = None, error: Optional[str] = None,
+                 started_at: float = 0.0, elapsed: float = 0.0):
+        self.job = job
+        self.content = content
+        self.error = error
+        self.started_at = started_at
+        self.elapsed = elapsed
+
+    @property
+    def success(self) -> bool:
+        return self.error is None and self.content is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'url': self.job.url,
+            'host': self.job.host,
+            'tag': self.job.tag,
+            'success': self.success,
+            'error': self.error,
+            'elapsed': round(self.elapsed, 4)
+        }
+
+
+class _HostState:
+    """Stato interno di un host: coda, slot attivi e prossimo avvio consentito."""
+
+    def __init__(self, policy: HostPolicy):
+        self.policy = policy
+        self.queue = deque()
+        self.active = 0
+        self.next_allowed = 0.0
+        self.requests = 0
+
+    def is_ready(self, now: float) -> bool:
+        return bool(self.queue) and self.active < self.policy.max_concurrency and self.next_allowed <= now
+
+
+class CrawlScheduler:
+    """
+    Scheduler di crawling con pool di worker e cortesia per host.
+
+    Un thread dispatcher assegna ai worker solo i job il cui host è pronto
+    (spaziatura rispettata e slot disponibili), così i worker non restano
+    bloccati in attesa su un host lento mentre altri host hanno lavoro.
+    La spaziatura è misurata tra gli avvii di due richieste allo stesso host.
+    """
+
+    def __init__(self, max_workers: int = 8, host_policies: Optional[Dict[str, HostPolicy]] = None,
+                 default_max_concurrency: int = 1):
+        """
+        Args:
+            max_workers: Numero di worker del pool
+            host_policies: Policy esplicite per host (netloc), prevalgono sui default
+            default_max_concurrency: Concorrenza per host quando la policy deriva dallo scraper
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.default_max_concurrency = default_max_concurrency
+        self._policies = {host.lower(): policy for host, policy in (host_policies or {}).items()}
+        self._hosts: Dict[str, _HostState] = {}
+        self._cond = threading.Condition()
+        self._inflight = 0
+        self._pending = 0
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crawl")
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="crawl-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def set_host_policy(self, host: str, policy: HostPolicy):
+        """Imposta o sostituisce la policy di un host."""
+        with self._cond:
+            host = host.lower()
+            self._policies[host] = policy
+            if host in self._hosts:
+                self._hosts[host].policy = policy
+            self._cond.notify_all()
+
+    def submit(self, job: FetchJob) -> Future:
+        """
+        Accoda un job di fetch.
+
+        Args:
+            job: Job da eseguire
+
+        Returns:
+            Future che si risolve con un FetchResult
+        """
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("CrawlScheduler già chiuso")
+            state = self._hosts.get(job.host)
+            if state is None:
+                policy = self._policies.get(job.host) or HostPolicy.from_scraper(
+                    job.scraper, self.default_max_concurrency
+                )
+                state = _HostState(policy)
+                self._hosts[job.host] = state
+            state.queue.append((job, future))
+            self._pending += 1
+            self._cond.notify_all()
+        return future
+
+    def run(self, jobs: Iterable[FetchJob]) -> List[FetchResult]:
+        """
+        Esegue un insieme di job e attende il completamento.
+
+        Args:
+            jobs: Job da eseguire
+
+        Returns:
+            Lista di FetchResult nello stesso ordine dei job
+        """
+        futures = [self.submit(job) for job in jobs]
+        return [future.result() for future in futures]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Restituisce contatori per host e stato del pool."""
+        with self._cond:
+            return {
+                'workers': self.max_workers,
+                'inflight': self._inflight,
+                'pending': self._pending,
+                'hosts': {
+                    host: {
+                        'requests': state.requests,
+                        'queued': len(state.queue),
+                        'active': state.active,
+                        'min_interval': state.policy.min_interval,
+                        'max_concurrency': state.policy.max_concurrency
+                    }
+                    for host, state in self._hosts.items()
+                }
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Chiude lo scheduler; con wait=True completa prima i job in coda."""
+        with self._cond:
+            self._closed = True
+            if not wait:
+                for state in self._hosts.values():
+                    while state.queue:
+                        _, future = state.queue.popleft()
+                        future.cancel()
+                        self._pending -= 1
+            self._cond.notify_all()
+        if wait:
+            self._dispatcher.join()
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown(wait=exc_type is None)
+
+    def _dispatch_loop(self):
+        """Assegna ai worker i job degli host pronti, in ordine di disponibilità."""
+        with self._cond:
+            while True:
+                if self._closed and self._pending == 0:
+                    return
+
+                now = time.monotonic()
+                dispatched = False
+
+                if self._inflight < self.max_workers:
+                    ready = [s for s in self._hosts.values() if s.is_ready(now)]
+                    # Prima l'host che aspetta da più tempo, per equità tra host
+                    ready.sort(key=lambda s: s.next_allowed)
+                    for state in ready:
+                        if self._inflight >= self.max_workers:
+                            break
+                        job, future = state.queue.popleft()
+                        self._pending -= 1
+                        if not future.set_running_or_notify_cancel():
+                            continue
+                        state.active += 1
+                        state.requests += 1
+                        state.next_allowed = now + state.policy.next_interval()
+                        self._inflight += 1
+                        self._executor.submit(self._execute, state, job, future)
+                        dispatched = True
+
+                if dispatched:
+                    continue
+
+                # Nessun host pronto: attendi il prossimo slot o un evento
+                timeout = None
+                if self._inflight < self.max_workers:
+                    waits = [
+                        s.next_allowed - now for s in self._hosts.values()
+                        if s.queue and s.active < s.policy.max_concurrency
+                    ]
+                    if waits:
+                        timeout = max(0.0, min(waits))
+                self._cond.wait(timeout)
+
+    def _execute(self, state: _HostState, job: FetchJob, future: Future):
+        """Esegue un singolo job su un worker."""
+        started = time.monotonic()
+        result = FetchResult(job, started_at=started)
+        try:
+            content = job.scraper.get(job.url, params=job.params, use_cache=job.use_cache, throttle=False)
+            if content is None:
+                result.error = f"Nessun contenuto da {job.url}"
+            elif job.parser:
+                content = job.parser(content)
+            result.content = content
+        except Exception as e:
+            logger.warning(f"Errore nel job di crawl {job.url}: {e}")
+            result.error = str(e)
+        finally:
+            result.elapsed = time.monotonic() - started
+            with self._cond:
+                state.active -= 1
+                self._inflight -= 1
+                self._cond.notify_all()
+        future.set_result(result)
+
+
+def crawl(jobs: Iterable[FetchJob], max_workers: int = 8,
+          host_policies: Optional[Dict[str, HostPolicy]] = None) -> List[FetchResult]:
+    """
+    Esegue un insieme di job con uno scheduler temporaneo.
+
+    Args:
+        jobs: Job da eseguire
+        max_workers: Numero di worker
+        host_policies: Policy esplicite per host
+
+    Returns:
+        Lista di FetchResult nello stesso ordine dei job
+    """
+    with CrawlScheduler(max_workers=max_workers, host_policies=host_policies) as scheduler:
+        return scheduler.run(jobs)
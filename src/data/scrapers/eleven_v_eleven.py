@@ -348,48 +348,9 @@ class ElevenVElevenScraper(BaseScraper):
         logger.info(f"Recuperando stagioni per competizione: {competition_id}")
         
         try:
-            # Determina l'URL corretto
-            if competition_id in self.competitions_map:
-                url = f"{self.base_url}/{self.competitions_map[competition_id]}"
-            else:
-                url = f"{self.base_url}/{competition_id}"
-            
             # Ottieni la pagina
-            soup = self.get_soup(url)
-            
-            seasons = []
-            
-            # Cerca le stagioni nella barra laterale
-            season_links = soup.select("div.block-content ul li a[href*='season']")
-            for link in season_links:
-                season_url = link.get('href', '')
-                if not season_url:
-                    continue
-                
-                season_name = link.text.strip()
-                
-                # Estrai l'anno dalla stagione
-                year_match = re.search(r'(\d{4})-(\d{4}|\d{2})', season_name)
-                if year_match:
-                    start_year = year_match.group(1)
-                    end_year = year_match.group(2)
-                    
-                    # Se l'anno finale è in formato breve (es. '09'), convertilo in completo
-                    if len(end_year) == 2:
-                        if end_year < '50':  # Euristico semplice
-                            end_year = f"20{end_year}"
-                        else:
-                            end_year = f"19{end_year}"
-                    
-                    seasons.append({
-                        'id': season_url.split('/')[-1] if '/' in season_url else season_url,
-                        'name': season_name,
-                        'url': self.base_url + season_url if season_url.startswith('/') else season_url,
-                        'start_year': start_year,
-                        'end_year': end_year
-                    })
-            
-            return sorted(seasons, key=lambda x: x.get('start_year', '0'), reverse=True)
+            soup = self.get_soup(self._competition_url(competition_id))
+            return self._parse_competition_seasons(soup)
             
         except Exception as e:
             logger.error(f"Errore nel recupero stagioni per competizione {competition_id}: {str(e)}")
@@ -515,121 +476,9 @@ class ElevenVElevenScraper(BaseScraper):
         logger.info(f"Recuperando partite per competizione: {competition_id}, stagione: {season_id}")
         
         try:
-            # Determina l'URL di base
-            if competition_id in self.competitions_map:
-                base_url = f"{self.base_url}/{self.competitions_map[competition_id]}"
-            else:
-                base_url = f"{self.base_url}/{competition_id}"
-            
-            # Se la stagione è specificata, aggiungi all'URL
-            if season_id:
-                url = f"{base_url}/season/{season_id}/matches"
-            else:
-                url = f"{base_url}/matches"
-            
             # Ottieni la pagina
-            soup = self.get_soup(url)
-            
-            matches = []
-            
-            # Estrai partite dalla tabella
-            matches_table = soup.select_one("table.table-striped")
-            if not matches_table:
-                logger.warning(f"Tabella partite non trovata per {competition_id}")
-                return []
-            
-            # Estrai righe della tabella (ignora intestazione)
-            rows = matches_table.select("tbody tr")
-            for row in rows:
-                cells = row.select("td")
-                if len(cells) < 5:  # Verifica numero minimo di celle
-                    continue
-                
-                # Estrai data
-                date_cell = cells[0]
-                date_text = date_cell.text.strip()
-                match_date = None
-                
-                if date_text:
-                    try:
-                        # Formato tipico: "DD/MM/YYYY"
-                        match_date = datetime.strptime(date_text, '%d/%m/%Y').strftime('%Y-%m-%d')
-                    except ValueError:
-                        pass
-                
-                # Estrai squadre e risultato
-                home_team_cell = cells[1]
-                score_cell = cells[2]
-                away_team_cell = cells[3]
-                
-                # Estrai link squadre
-                home_team_link = home_team_cell.select_one("a")
-                away_team_link = away_team_cell.select_one("a")
-                
-                home_team = {
-                    'name': home_team_cell.text.strip()
-                }
-                
-                away_team = {
-                    'name': away_team_cell.text.strip()
-                }
-                
-                if home_team_link:
-                    home_url = home_team_link.get('href', '')
-                    home_id = self._extract_team_id(home_url)
-                    if home_id:
-                        home_team['id'] = home_id
-                        home_team['url'] = self.base_url + home_url if home_url.startswith('/') else home_url
-                
-                if away_team_link:
-                    away_url = away_team_link.get('href', '')
-                    away_id = self._extract_team_id(away_url)
-                    if away_id:
-                        away_team['id'] = away_id
-                        away_team['url'] = self.base_url + away_url if away_url.startswith('/') else away_url
-                
-                # Estrai punteggio
-                score_text = score_cell.text.strip()
-                home_score = None
-                away_score = None
-                
-                score_match = re.search(r'(\d+)\s*-\s*(\d+)', score_text)
-                if score_match:
-                    home_score = int(score_match.group(1))
-                    away_score = int(score_match.group(2))
-                
-                # Estrai round/fase (se disponibile)
-                round_cell = cells[4] if len(cells) > 4 else None
-                round_text = round_cell.text.strip() if round_cell else None
-                
-                match_data = {
-                    'date': match_date,
-                    'home_team': home_team,
-                    'away_team': away_team,
-                    'competition': competition_id
-                }
-                
-                # Aggiungi punteggio se disponibile
-                if home_score is not None and away_score is not None:
-                    match_data['home_score'] = home_score
-                    match_data['away_score'] = away_score
-                    match_data['result'] = f"{home_score}-{away_score}"
-                    
-                    # Determina il vincitore
-                    if home_score > away_score:
-                        match_data['winner'] = 'home'
-                    elif away_score > home_score:
-                        match_data['winner'] = 'away'
-                    else:
-                        match_data['winner'] = 'draw'
-                
-                # Aggiungi round se disponibile
-                if round_text:
-                    match_data['round'] = round_text
-                
-                matches.append(match_data)
-            
-            return matches
+            soup = self.get_soup(self._competition_matches_url(competition_id, season_id))
+            return self._parse_competition_matches(soup, competition_id)
             
         except Exception as e:
             logger.error(f"Errore nel recupero partite {competition_id}: {str(e)}")
@@ -1204,6 +1053,194 @@ class ElevenVElevenScraper(BaseScraper):
             logger.error(f"Errore nell'estrazione partite h2h: {str(e)}")
             return []
     
+    # ---- Metodi di supporto per il crawling degli archivi ---- #
+    
+    def _competition_url(self, competition_id: str) -> str:
+        """
+        Costruisce l'URL della pagina di una competizione.
+        
+        Args:
+            competition_id: ID della competizione (chiave da competitions_map o path)
+            
+        Returns:
+            URL della pagina
+        """
+        if competition_id in self.competitions_map:
+            return f"{self.base_url}/{self.competitions_map[competition_id]}"
+        return f"{self.base_url}/{competition_id}"
+    
+    def _competition_matches_url(self, competition_id: str, season_id: Optional[str] = None) -> str:
+        """
+        Costruisce l'URL della pagina partite di una competizione.
+        
+        Args:
+            competition_id: ID della competizione
+            season_id: ID della stagione (opzionale, default: ultima stagione)
+            
+        Returns:
+            URL della pagina
+        """
+        base_url = self._competition_url(competition_id)
+        if season_id:
+            return f"{base_url}/season/{season_id}/matches"
+        return f"{base_url}/matches"
+    
+    def _parse_competition_seasons(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+        """
+        Estrae le stagioni dalla pagina di una competizione.
+        
+        Args:
+            soup: Pagina della competizione
+            
+        Returns:
+            Lista di stagioni, dalla più recente
+        """
+        seasons = []
+        
+        # Cerca le stagioni nella barra laterale
+        season_links = soup.select("div.block-content ul li a[href*='season']")
+        for link in season_links:
+            season_url = link.get('href', '')
+            if not season_url:
+                continue
+            
+            season_name = link.text.strip()
+            
+            # Estrai l'anno dalla stagione
+            year_match = re.search(r'(\d{4})-(\d{4}|\d{2})', season_name)
+            if year_match:
+                start_year = year_match.group(1)
+                end_year = year_match.group(2)
+                
+                # Se l'anno finale è in formato breve (es. '09'), convertilo in completo
+                if len(end_year) == 2:
+                    if end_year < '50':  # Euristico semplice
+                        end_year = f"20{end_year}"
+                    else:
+                        end_year = f"19{end_year}"
+                
+                seasons.append({
+                    'id': season_url.split('/')[-1] if '/' in season_url else season_url,
+                    'name': season_name,
+                    'url': self.base_url + season_url if season_url.startswith('/') else season_url,
+                    'start_year': start_year,
+                    'end_year': end_year
+                })
+        
+        return sorted(seasons, key=lambda x: x.get('start_year', '0'), reverse=True)
+    
+    def _parse_competition_matches(self, soup: BeautifulSoup, competition_id: str) -> List[Dict[str, Any]]:
+        """
+        Estrae le partite dalla pagina partite di una competizione.
+        
+        Args:
+            soup: Pagina delle partite
+            competition_id: ID della competizione
+            
+        Returns:
+            Lista di partite
+        """
+        matches = []
+        
+        # Estrai partite dalla tabella
+        matches_table = soup.select_one("table.table-striped")
+        if not matches_table:
+            logger.warning(f"Tabella partite non trovata per {competition_id}")
+            return []
+        
+        # Estrai righe della tabella (ignora intestazione)
+        rows = matches_table.select("tbody tr")
+        for row in rows:
+            cells = row.select("td")
+            if len(cells) < 5:  # Verifica numero minimo di celle
+                continue
+            
+            # Estrai data
+            date_cell = cells[0]
+            date_text = date_cell.text.strip()
+            match_date = None
+            
+            if date_text:
+                try:
+                    # Formato tipico: "DD/MM/YYYY"
+                    match_date = datetime.strptime(date_text, '%d/%m/%Y').strftime('%Y-%m-%d')
+                except ValueError:
+                    pass
+            
+            # Estrai squadre e risultato
+            home_team_cell = cells[1]
+            score_cell = cells[2]
+            away_team_cell = cells[3]
+            
+            # Estrai link squadre
+            home_team_link = home_team_cell.select_one("a")
+            away_team_link = away_team_cell.select_one("a")
+            
+            home_team = {
+                'name': home_team_cell.text.strip()
+            }
+            
+            away_team = {
+                'name': away_team_cell.text.strip()
+            }
+            
+            if home_team_link:
+                home_url = home_team_link.get('href', '')
+                home_id = self._extract_team_id(home_url)
+                if home_id:
+                    home_team['id'] = home_id
+                    home_team['url'] = self.base_url + home_url if home_url.startswith('/') else home_url
+            
+            if away_team_link:
+                away_url = away_team_link.get('href', '')
+                away_id = self._extract_team_id(away_url)
+                if away_id:
+                    away_team['id'] = away_id
+                    away_team['url'] = self.base_url + away_url if away_url.startswith('/') else away_url
+            
+            # Estrai punteggio
+            score_text = score_cell.text.strip()
+            home_score = None
+            away_score = None
+            
+            score_match = re.search(r'(\d+)\s*-\s*(\d+)', score_text)
+            if score_match:
+                home_score = int(score_match.group(1))
+                away_score = int(score_match.group(2))
+            
+            # Estrai round/fase (se disponibile)
+            round_cell = cells[4] if len(cells) > 4 else None
+            round_text = round_cell.text.strip() if round_cell else None
+            
+            match_data = {
+                'date': match_date,
+                'home_team': home_team,
+                'away_team': away_team,
+                'competition': competition_id
+            }
+            
+            # Aggiungi punteggio se disponibile
+            if home_score is not None and away_score is not None:
+                match_data['home_score'] = home_score
+                match_data['away_score'] = away_score
+                match_data['result'] = f"{home_score}-{away_score}"
+                
+                # Determina il vincitore
+                if home_score > away_score:
+                    match_data['winner'] = 'home'
+                elif away_score > home_score:
+                    match_data['winner'] = 'away'
+                else:
+                    match_data['winner'] = 'draw'
+            
+            # Aggiungi round se disponibile
+            if round_text:
+                match_data['round'] = round_text
+            
+            matches.append(match_data)
+        
+        return matches
+    
     # ---- Metodi di supporto ---- #
     
     def _extract_team_id(self, url: Optional[str]) -> Optional[str]:
@@ -0,0 +1,654 @@
+"""
+Crawler riprendibile per gli archivi storici di WorldFootball e 11v11.
+Costruire anni di storico H2H richiede migliaia di pagine che non stanno in
+una singola esecuzione programmata: il crawler mantiene su SQLite una
+frontiera di URL (deduplicata per URL), salva un checkpoint dopo ogni pagina
+e scrive le partite normalizzate in un archivio locale. Un'esecuzione
+interrotta riprende dalla frontiera, e refresh_current_season() riscarica
+solo la stagione in corso.
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable
+
+from src.data.scrapers.base_scraper import BaseScraper
+from src.data.scrapers.crawl_scheduler import CrawlScheduler, FetchJob, FetchResult
+from src.config.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+# Tipi di pagina nella frontiera
+PAGE_SEASONS = 'seasons'
+PAGE_MATCHES = 'matches'
+
+# Stati di una pagina nella frontiera
+STATUS_PENDING = 'pending'
+STATUS_IN_PROGRESS = 'in_progress'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+
+class ArchiveSource:
+    """
+    Adattatore tra il crawler e uno scraper d'archivio.
+
+    Le sottoclassi indicano come costruire gli URL delle pagine stagioni e
+    partite e come estrarne i dati; la normalizzazione è comune.
+    """
+
+    name = ''
+
+    def __init__(self, scraper: BaseScraper):
+        self.scraper = scraper
+
+    def seasons_url(self, competition: str) -> str:
+        raise NotImplementedError
+
+    def matches_url(self, competition: str, season: str) -> str:
+        raise NotImplementedError
+
+    def parse_seasons(self, soup: Any) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def parse_matches(self, soup: Any, competition: str, season: str) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def season_year(self, season: Dict[str, Any]) -> Optional[int]:
+        """Restituisce l'anno di inizio di una stagione, se noto."""
+        year = season.get('year') or season.get('start_year')
+        try:
+            return int(year)
+        except (TypeError, ValueError):
+            return None
+
+    def normalize(self, raw: Dict[str, Any], competition: str, season: str) -> Dict[str, Any]:
+        """
+        Converte una partita dello scraper nel formato dell'archivio locale.
+
+        Args:
+            raw: Partita come restituita dallo scraper
+            competition: ID della competizione
+            season: ID della stagione
+
+        Returns:
+            Partita normalizzata
+        """
+        home = raw.get('home_team') or {}
+        away = raw.get('away_team') or {}
+        home_name = home.get('name', '') if isinstance(home, dict) else str(home)
+        away_name = away.get('name', '') if isinstance(away, dict) else str(away)
+        date = raw.get('date') or ''
+        home_score = raw.get('home_score')
+        away_score = raw.get('away_score')
+
+        # Chiave stabile da data e squadre: gli id estratti dagli URL non sono sempre univoci
+        identity = f"{date[:10]}:{home_name.lower()}:{away_name.lower()}"
+        key = hashlib.md5(f"{self.name}:{competition}:{season}:{identity}".encode()).hexdigest()
+
+        return {
+            'match_id': key,
+            'source': self.name,
+            'source_id': raw.get('id'),
+            'competition': competition,
+            'season': season,
+            'date': date[:10] or None,
+            'datetime': date if 'T' in date else None,
+            'round': raw.get('round'),
+            'home_team': home_name,
+            'away_team': away_name,
+            'home_team_id': home.get('id') if isinstance(home, dict) else None,
+            'away_team_id': away.get('id') if isinstance(away, dict) else None,
+            'home_score': home_score,
+            'away_score': away_score,
+            'status': 'FINISHED' if home_score is not None and away_score is not None else 'SCHEDULED'
+        }
+
+
+class WorldFootballArchive(ArchiveSource):
+    """Archivio dei campionati di WorldFootball.net."""
+
+    name = 'worldfootball'
+
+    def seasons_url(self, competition: str) -> str:
+        return self.scraper._league_seasons_url(competition)
+
+    def matches_url(self, competition: str, season: str) -> str:
+        return self.scraper._league_fixtures_url(competition, season)
+
+    def parse_seasons(self, soup: Any) -> List[Dict[str, Any]]:
+        return self.scraper._parse_league_seasons(soup)
+
+    def parse_matches(self, soup: Any, competition: str, season: str) -> List[Dict[str, Any]]:
+        return self.scraper._parse_league_fixtures(soup, competition, season)
+
+
+class ElevenVElevenArchive(ArchiveSource):
+    """Archivio delle competizioni di 11v11.com."""
+
+    name = 'eleven_v_eleven'
+
+    def seasons_url(self, competition: str) -> str:
+        return self.scraper._competition_url(competition)
+
+    def matches_url(self, competition: str, season: str) -> str:
+        return self.scraper._competition_matches_url(competition, season)
+
+    def parse_seasons(self, soup: Any) -> List[Dict[str, Any]]:
+        return self.scraper._parse_competition_seasons(soup)
+
+    def parse_matches(self, soup: Any, competition: str, season: str) -> List[Dict[str, Any]]:
+        return self.scraper._parse_competition_matches(soup, competition)
+
+
+class CrawlStore:
+    """
+    Stato persistente del crawler su SQLite.
+
+    Contiene la frontiera (una riga per URL, quindi deduplicata), l'archivio
+    delle partite normalizzate e alcuni metadati. Ogni pagina elaborata viene
+    salvata in un'unica transazione insieme alle partite e ai nuovi URL, così
+    un'interruzione non lascia checkpoint parziali.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: Percorso del database (default: ~/football-predictions/cache/historical_archive.db)
+        """
+        if not db_path:
+            cache_dir = os.path.expanduser("~/football-predictions/cache")
+            os.makedirs(cache_dir, exist_ok=True)
+            db_path = os.path.join(cache_dir, "historical_archive.db")
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.row_factory = sqlite3.Row
+        self._init_db()
+
+    def _init_db(self):
+        with self._conn:
+            self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS frontier (
+                url TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                competition TEXT NOT NULL,
+                season TEXT,
+                year INTEGER,
+                min_year INTEGER,
+                use_cache INTEGER DEFAULT 1,
+                status TEXT DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                error TEXT,
+                matches INTEGER DEFAULT 0,
+                added_at REAL,
+                fetched_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_frontier_status ON frontier (status, kind, year);
+            CREATE TABLE IF NOT EXISTS matches (
+                match_id TEXT PRIMARY KEY,
+                source TEXT,
+                competition TEXT,
+                season TEXT,
+                date TEXT,
+                home_team TEXT,
+                away_team TEXT,
+                data TEXT,
+                updated_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_matches_competition ON matches (competition, season);
+            CREATE INDEX IF NOT EXISTS idx_matches_teams ON matches (home_team, away_team);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            ''')
+
+    def close(self):
+        self._conn.close()
+
+    def enqueue(self, url: str, source: str, kind: str, competition: str,
+                season: Optional[str] = None, year: Optional[int] = None,
+                min_year: Optional[int] = None, use_cache: bool = True,
+                force: bool = False) -> bool:
+        """
+        Aggiunge un URL alla frontiera.
+
+        Args:
+            url: URL della pagina
+            source: Nome della fonte d'archivio
+            kind: PAGE_SEASONS o PAGE_MATCHES
+            competition: ID della competizione
+            season: ID della stagione (solo per le pagine partite)
+            year: Anno di inizio della stagione
+            min_year: Anno minimo da scaricare (solo per le pagine stagioni)
+            use_cache: Se lo scraper può usare la propria cache
+            force: Se True rimette in coda anche un URL già elaborato
+
+        Returns:
+            True se l'URL è stato aggiunto o rimesso in coda
+        """
+        with self._conn:
+            return self._enqueue(url, source, kind, competition, season, year, min_year, use_cache, force)
+
+    def _enqueue(self, url, source, kind, competition, season, year, min_year, use_cache, force) -> bool:
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO frontier (url, source, kind, competition, season, year, min_year, "
+            "use_cache, status, added_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, source, kind, competition, season, year, min_year, int(use_cache), STATUS_PENDING, time.time())
+        )
+        if cursor.rowcount or not force:
+            return bool(cursor.rowcount)
+        cursor = self._conn.execute(
+            "UPDATE frontier SET status = ?, attempts = 0, error = NULL, use_cache = ?, "
+            "min_year = COALESCE(?, min_year) WHERE url = ? AND status != ?",
+            (STATUS_PENDING, int(use_cache), min_year, url, STATUS_IN_PROGRESS)
+        )
+        return bool(cursor.rowcount)
+
+    def claim(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Prende in carico le prossime pagine da scaricare.
+
+        Le pagine stagioni precedono le pagine partite, e tra queste le
+        stagioni più recenti precedono le più vecchie.
+        """
+        with self._conn:
+            rows = self._conn.execute(
+                "SELECT * FROM frontier WHERE status = ? "
+                "ORDER BY kind = ? DESC, COALESCE(year, 0) DESC, added_at LIMIT ?",
+                (STATUS_PENDING, PAGE_SEASONS, limit)
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE frontier SET status = ? WHERE url = ?",
+                [(STATUS_IN_PROGRESS, row['url']) for row in rows]
+            )
+        return [dict(row) for row in rows]
+
+    def release_in_progress(self) -> int:
+        """Rimette in coda le pagine rimaste in carico da un'esecuzione interrotta."""
+        with self._conn:
+            cursor = self._conn.execute(
+                "UPDATE frontier SET status = ? WHERE status = ?", (STATUS_PENDING, STATUS_IN_PROGRESS)
+            )
+        return cursor.rowcount
+
+    def complete_page(self, url: str, matches: Optional[List[Dict[str, Any]]] = None,
+                      new_pages: Optional[List[Dict[str, Any]]] = None) -> Dict[str, int]:
+        """
+        Segna una pagina come completata salvando partite e nuovi URL (checkpoint).
+
+        Args:
+            url: URL della pagina completata
+            matches: Partite normalizzate estratte dalla pagina
+            new_pages: Argomenti di enqueue() per le pagine scoperte
+
+        Returns:
+            Contatori di partite inserite/aggiornate e pagine aggiunte
+        """
+        counts = {'inserted': 0, 'updated': 0, 'queued': 0}
+        now = time.time()
+        with self._conn:
+            for match in matches or []:
+                data = json.dumps(match, sort_keys=True)
+                existing = self._conn.execute(
+                    "SELECT data FROM matches WHERE match_id = ?", (match['match_id'],)
+                ).fetchone()
+                if existing is None:
+                    counts['inserted'] += 1
+                elif existing['data'] != data:
+                    counts['updated'] += 1
+                else:
+                    continue
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO matches (match_id, source, competition, season, date, "
+                    "home_team, away_team, data, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (match['match_id'], match['source'], match['competition'], match['season'],
+                     match['date'], match['home_team'], match['away_team'], data, now)
+                )
+            for page in new_pages or []:
+                if self._enqueue(
+                    page['url'], page['source'], page['kind'], page['competition'],
+                    page.get('season'), page.get('year'), page.get('min_year'),
+                    page.get('use_cache', True), page.get('force', False)
+                ):
+                    counts['queued'] += 1
+            self._conn.execute(
+                "UPDATE frontier SET status = ?, error = NULL, matches = ?, fetched_at = ? WHERE url = ?",
+                (STATUS_DONE, len(matches or []), now, url)
+            )
+        return counts
+
+    def fail_page(self, url: str, error: str, max_attempts: int) -> bool:
+        """
+        Registra un errore su una pagina.
+
+        Returns:
+            True se la pagina ha esaurito i tentativi ed è segnata come fallita
+        """
+        with self._conn:
+            self._conn.execute(
+                "UPDATE frontier SET attempts = attempts + 1, error = ?, "
+                "status = CASE WHEN attempts + 1 >= ? THEN ? ELSE ? END WHERE url = ?",
+                (error, max_attempts, STATUS_FAILED, STATUS_PENDING, url)
+            )
+            row = self._conn.execute("SELECT status FROM frontier WHERE url = ?", (url,)).fetchone()
+        return row is not None and row['status'] == STATUS_FAILED
+
+    def retry_failed(self) -> int:
+        """Rimette in coda tutte le pagine fallite."""
+        with self._conn:
+            cursor = self._conn.execute(
+                "UPDATE frontier SET status = ?, attempts = 0 WHERE status = ?", (STATUS_PENDING, STATUS_FAILED)
+            )
+        return cursor.rowcount
+
+    def get_counts(self) -> Dict[str, Any]:
+        """Restituisce i contatori della frontiera per stato e il numero di partite."""
+        counts = {STATUS_PENDING: 0, STATUS_IN_PROGRESS: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+        for row in self._conn.execute("SELECT status, COUNT(*) AS n FROM frontier GROUP BY status"):
+            counts[row['status']] = row['n']
+        counts['matches'] = self._conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+        return counts
+
+    def get_matches(self, competition: Optional[str] = None, season: Optional[str] = None,
+                    team: Optional[str] = None, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Legge le partite dall'archivio locale, ordinate per data.
+
+        Args:
+            competition: Filtra per competizione
+            season: Filtra per stagione
+            team: Filtra per nome squadra (casa o trasferta)
+            source: Filtra per fonte
+
+        Returns:
+            Lista di partite normalizzate
+        """
+        clauses, params = [], []
+        for column, value in (('competition', competition), ('season', season), ('source', source)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if team is not None:
+            clauses.append("(home_team = ? OR away_team = ?)")
+            params.extend([team, team])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn.execute(f"SELECT data FROM matches {where} ORDER BY date", params)
+        return [json.loads(row['data']) for row in rows]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+class HistoricalCrawler:
+    """
+    Crawler riprendibile degli archivi storici.
+
+    Uso tipico in un job programmato:
+        crawler = HistoricalCrawler()
+        crawler.seed('eleven_v_eleven', 'premier_league', from_year=1990)
+        crawler.run(time_budget=1800)  # riprende da dove si era fermato
+
+    Le pagine sono scaricate a blocchi tramite CrawlScheduler, che rispetta
+    la spaziatura per host ricavata dal delay_range di ciascuno scraper.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, sources: Optional[Dict[str, ArchiveSource]] = None,
+                 max_workers: Optional[int] = None, batch_size: Optional[int] = None,
+                 max_attempts: Optional[int] = None,
+                 progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Args:
+            db_path: Percorso del database di stato (default in ~/football-predictions/cache)
+            sources: Adattatori d'archivio per nome (default: WorldFootball e 11v11)
+            max_workers: Worker dello scheduler
+            batch_size: Pagine prese in carico per blocco (ogni blocco è un checkpoint)
+            max_attempts: Tentativi per pagina prima di segnarla come fallita
+            progress_callback: Funzione chiamata con lo stato di avanzamento dopo ogni blocco
+        """
+        self.store = CrawlStore(db_path)
+        self.sources = sources if sources is not None else self._default_sources()
+        self.max_workers = max_workers or get_setting('scrapers.historical_crawler.max_workers', 4)
+        self.batch_size = batch_size or get_setting('scrapers.historical_crawler.batch_size', 20)
+        self.max_attempts = max_attempts or get_setting('scrapers.historical_crawler.max_attempts', 3)
+        self.progress_callback = progress_callback
+        self._run_stats = self._empty_run_stats()
+
+    @staticmethod
+    def _default_sources() -> Dict[str, ArchiveSource]:
+        from src.data.scrapers.worldfootball import get_scraper as get_worldfootball_scraper
+        from src.data.scrapers.eleven_v_eleven import get_scraper as get_eleven_v_eleven_scraper
+        return {
+            WorldFootballArchive.name: WorldFootballArchive(get_worldfootball_scraper()),
+            ElevenVElevenArchive.name: ElevenVElevenArchive(get_eleven_v_eleven_scraper())
+        }
+
+    @staticmethod
+    def _empty_run_stats() -> Dict[str, Any]:
+        return {'started_at': None, 'pages': 0, 'failed': 0, 'inserted': 0, 'updated': 0, 'queued': 0}
+
+    def _get_source(self, source: str) -> ArchiveSource:
+        if source not in self.sources:
+            raise ValueError(f"Fonte d'archivio non supportata: {source}. Disponibili: {', '.join(self.sources)}")
+        return self.sources[source]
+
+    def seed(self, source: str, competition: str, from_year: Optional[int] = None) -> bool:
+        """
+        Aggiunge una competizione alla frontiera. Ripetere il seed è innocuo.
+
+        Args:
+            source: Nome della fonte ('worldfootball' o 'eleven_v_eleven')
+            competition: ID della competizione per lo scraper
+            from_year: Prima stagione da scaricare (default: tutte)
+
+        Returns:
+            True se la competizione è stata aggiunta
+        """
+        archive = self._get_source(source)
+        return self.store.enqueue(
+            archive.seasons_url(competition), source, PAGE_SEASONS, competition, min_year=from_year
+        )
+
+    def refresh_current_season(self, source: str, competition: str) -> bool:
+        """
+        Prepara il ri-crawl incrementale della sola stagione in corso.
+
+        La pagina delle stagioni viene riscaricata senza cache; all'elaborazione
+        la stagione più recente viene rimessa in coda, anch'essa senza cache.
+        Le stagioni concluse già in archivio non vengono riscaricate.
+
+        Returns:
+            True se la pagina delle stagioni è stata rimessa in coda
+        """
+        archive = self._get_source(source)
+        return self.store.enqueue(
+            archive.seasons_url(competition), source, PAGE_SEASONS, competition,
+            use_cache=False, force=True
+        )
+
+    def run(self, max_pages: Optional[int] = None, time_budget: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Elabora la frontiera fino a esaurimento, limite di pagine o tempo.
+
+        Args:
+            max_pages: Numero massimo di pagine da scaricare in questa esecuzione
+            time_budget: Secondi disponibili; il blocco in corso viene comunque completato
+
+        Returns:
+            Stato di avanzamento finale (vedi get_progress)
+        """
+        released = self.store.release_in_progress()
+        if released:
+            logger.info(f"Ripresa crawl: {released} pagine interrotte rimesse in coda")
+
+        self._run_stats = self._empty_run_stats()
+        self._run_stats['started_at'] = time.monotonic()
+
+        with CrawlScheduler(max_workers=self.max_workers) as scheduler:
+            while True:
+                limit = self.batch_size
+                if max_pages is not None:
+                    limit = min(limit, max_pages - self._run_stats['pages'])
+                if limit <= 0:
+                    break
+                if time_budget is not None and time.monotonic() - self._run_stats['started_at'] >= time_budget:
+                    logger.info("Budget di tempo esaurito, crawl sospeso")
+                    break
+
+                batch = self.store.claim(limit)
+                if not batch:
+                    break
+
+                jobs = [
+                    FetchJob(self.sources[row['source']].scraper, row['url'],
+                             use_cache=bool(row['use_cache']), tag=row['kind'])
+                    for row in batch
+                ]
+                for row, result in zip(batch, scheduler.run(jobs)):
+                    self._handle_result(row, result)
+
+                progress = self.get_progress()
+                logger.info(
+                    f"Crawl storico: {progress['done']}/{progress['total']} pagine, "
+                    f"{progress['matches']} partite, {progress['pages_per_second']} pagine/s"
+                )
+                if self.progress_callback:
+                    self.progress_callback(progress)
+
+        return self.get_progress()
+
+    def _handle_result(self, row: Dict[str, Any], result: FetchResult):
+        """Elabora una pagina scaricata e salva il checkpoint."""
+        self._run_stats['pages'] += 1
+        if not result.success:
+            self._fail(row, result.error or "Nessun contenuto")
+            return
+
+        archive = self.sources[row['source']]
+        try:
+            soup = archive.scraper.parse(result.content)
+            if soup is None:
+                raise ValueError("HTML non valido")
+
+            if row['kind'] == PAGE_SEASONS:
+                counts = self.store.complete_page(row['url'], new_pages=self._season_pages(archive, row, soup))
+            else:
+                raw_matches = archive.parse_matches(soup, row['competition'], row['season'])
+                matches = [archive.normalize(raw, row['competition'], row['season']) for raw in raw_matches]
+                counts = self.store.complete_page(row['url'], matches=matches)
+        except Exception as e:
+            self._fail(row, f"Errore di parsing: {e}")
+            return
+
+        for key in ('inserted', 'updated', 'queued'):
+            self._run_stats[key] += counts[key]
+
+    def _season_pages(self, archive: ArchiveSource, row: Dict[str, Any], soup: Any) -> List[Dict[str, Any]]:
+        """Costruisce le pagine partite delle stagioni trovate in una pagina stagioni."""
+        seasons = archive.parse_seasons(soup)
+        if seasons:
+            self.store.set_meta(f"current_season:{row['source']}:{row['competition']}", seasons[0]['id'])
+
+        refresh = not row['use_cache']
+        pages = []
+        for index, season in enumerate(seasons):
+            year = archive.season_year(season)
+            if row['min_year'] and year is not None and year < row['min_year']:
+                continue
+            # In refresh solo la stagione corrente viene riscaricata
+            current = index == 0
+            pages.append({
+                'url': archive.matches_url(row['competition'], season['id']),
+                'source': row['source'],
+                'kind': PAGE_MATCHES,
+                'competition': row['competition'],
+                'season': season['id'],
+                'year': year,
+                'use_cache': not (refresh and current),
+                'force': refresh and current
+            })
+        return pages
+
+    def _fail(self, row: Dict[str, Any], error: str):
+        exhausted = self.store.fail_page(row['url'], error, self.max_attempts)
+        if exhausted:
+            self._run_stats['failed'] += 1
+            logger.warning(f"Pagina abbandonata dopo {self.max_attempts} tentativi: {row['url']} ({error})")
+        else:
+            logger.debug(f"Errore su {row['url']}, verrà ritentata: {error}")
+
+    def get_progress(self) -> Dict[str, Any]:
+        """
+        Restituisce avanzamento e throughput.
+
+        Returns:
+            Contatori della frontiera, partite in archivio, statistiche
+            dell'esecuzione corrente e stima del tempo residuo
+        """
+        counts = self.store.get_counts()
+        stats = self._run_stats
+        elapsed = time.monotonic() - stats['started_at'] if stats['started_at'] else 0.0
+        pages_per_second = stats['pages'] / elapsed if elapsed > 0 else 0.0
+        remaining = counts[STATUS_PENDING] + counts[STATUS_IN_PROGRESS]
+
+        return {
+            'pending': counts[STATUS_PENDING],
+            'in_progress': counts[STATUS_IN_PROGRESS],
+            'done': counts[STATUS_DONE],
+            'failed': counts[STATUS_FAILED],
+            'total': sum(counts[s] for s in (STATUS_PENDING, STATUS_IN_PROGRESS, STATUS_DONE, STATUS_FAILED)),
+            'matches': counts['matches'],
+            'run': {
+                'pages': stats['pages'],
+                'failed': stats['failed'],
+                'matches_inserted': stats['inserted'],
+                'matches_updated': stats['updated'],
+                'pages_queued': stats['queued'],
+                'elapsed': round(elapsed, 2)
+            },
+            'pages_per_second': round(pages_per_second, 3),
+            'matches_per_second': round((stats['inserted'] + stats['updated']) / elapsed, 3) if elapsed > 0 else 0.0,
+            'eta_seconds': round(remaining / pages_per_second, 1) if pages_per_second > 0 else None,
+            'updated_at': datetime.now().isoformat()
+        }
+
+    def get_matches(self, **filters) -> List[Dict[str, Any]]:
+        """Legge le partite normalizzate dall'archivio locale (vedi CrawlStore.get_matches)."""
+        return self.store.get_matches(**filters)
+
+    def get_current_season(self, source: str, competition: str) -> Optional[str]:
+        """Restituisce l'ultima stagione corrente vista per una competizione."""
+        return self.store.get_meta(f"current_season:{source}:{competition}")
+
+    def retry_failed(self) -> int:
+        """Rimette in coda le pagine fallite per la prossima esecuzione."""
+        return self.store.retry_failed()
+
+    def close(self):
+        self.store.close()
+
+
+# Istanza globale
+_crawler_instance = None
+
+def get_crawler() -> HistoricalCrawler:
+    """
+    Ottiene l'istanza globale del crawler storico.
+
+    Returns:
+        Istanza di HistoricalCrawler.
+    """
+    global _crawler_instance
+    if _crawler_instance is None:
+        _crawler_instance = HistoricalCrawler()
+    return _crawler_instance
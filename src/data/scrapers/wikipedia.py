@@ -11,13 +11,16 @@ import requests
 from bs4 import BeautifulSoup
 from typing import Dict, List, Any, Optional, Union
 
-from src.utils.cache import cached
+from src.utils.cache import cached, DiskCache
 from src.utils.http import make_request, HTTPError
 from src.config.settings import get_setting
 from src.data.scrapers.base_scraper import BaseScraper
 
 logger = logging.getLogger(__name__)
 
+# Numero massimo di titoli per query accettato dall'API MediaWiki
+MAX_TITLES_PER_QUERY = 50
+
 class WikipediaScraper(BaseScraper):
     """
     Scraper per estrarre informazioni calcistiche da Wikipedia.
@@ -46,6 +49,14 @@ class WikipediaScraper(BaseScraper):
         # Cache time-to-live in secondi
         self.cache_ttl = get_setting('scrapers.wikipedia.cache_ttl', 86400)  # Default 24 hours
     
+        # Cache dei redirect (titolo richiesto -> titolo canonico), in memoria e su disco
+        self.redirect_ttl = get_setting('scrapers.wikipedia.redirect_ttl', 86400 * 7)
+        self._redirects: Dict[str, Optional[str]] = {}
+        self._redirect_store = DiskCache("wikipedia_redirects")
+    
+        # Titoli delle pagine già associati ai nomi delle squadre
+        self._team_titles: Dict[str, str] = {}
+    
         logger.info(f"WikipediaScraper inizializzato con lingua: {self.lang}")
     
     def _make_api_request(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -70,13 +81,13 @@ class WikipediaScraper(BaseScraper):
         
         try:
             response = make_request(
-                "GET", 
-                self.api_url, 
+                self.api_url,
+                method="GET",
                 params=all_params,
-                headers=self.headers
+                headers=dict(self.session.headers)
             )
             
-            return response.json()
+            return response.json() if response is not None else {}
         except Exception as e:
             logger.error(f"Errore nella richiesta API Wikipedia: {str(e)}")
             return {}
@@ -129,9 +140,9 @@ class WikipediaScraper(BaseScraper):
         try:
             url = f"{self.base_url}/wiki/{title.replace(' ', '_')}"
             
-            response = make_request("GET", url, headers=self.headers)
+            response = make_request(url, method="GET", headers=dict(self.session.headers))
             
-            return response.text
+            return response.text if response is not None else None
         except Exception as e:
             logger.error(f"Errore nel recupero della pagina '{title}': {str(e)}")
             return None
@@ -202,15 +213,32 @@ class WikipediaScraper(BaseScraper):
         Returns:
             Informazioni sulla squadra
         """
-        # Cerca la pagina della squadra
-        search_results = self.search(f"{team_name} football club", limit=5)
+        page_title = self._team_titles.get(team_name)
         
-        if not search_results:
-            logger.warning(f"Nessun risultato trovato per '{team_name}'")
-            return {}
+        if not page_title:
+            # Cerca la pagina della squadra
+            search_results = self.search(f"{team_name} football club", limit=5)
+            
+            if not search_results:
+                logger.warning(f"Nessun risultato trovato per '{team_name}'")
+                return {}
+            
+            # Prendi il primo risultato (migliore corrispondenza)
+            page_title = search_results[0]["title"]
+            self._team_titles[team_name] = page_title
         
-        # Prendi il primo risultato (migliore corrispondenza)
-        page_title = search_results[0]["title"]
+        return self._build_team_info(page_title)
+    
+    def _build_team_info(self, page_title: str) -> Dict[str, Any]:
+        """
+        Costruisce le informazioni di una squadra dalla sua pagina.
+        
+        Args:
+            page_title: Titolo della pagina Wikipedia della squadra
+            
+        Returns:
+            Informazioni sulla squadra
+        """
         page_html = self.get_page_content(page_title)
         
         if not page_html:
@@ -233,6 +261,215 @@ class WikipediaScraper(BaseScraper):
         
         return info
     
+    # ---- Query in batch ---- #
+    
+    def query_pages(self, titles: List[str], with_content: bool = False) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Interroga l'API per più titoli, fino a 50 per richiesta.
+        
+        Usa prop=revisions|pageprops e risolve redirect e normalizzazioni,
+        quindi ogni titolo richiesto è associato alla propria pagina.
+        
+        Args:
+            titles: Titoli da interrogare
+            with_content: Se includere il wikitesto dell'ultima revisione
+            
+        Returns:
+            Dizionario titolo richiesto -> dati della pagina (None se inesistente)
+        """
+        unique_titles = list(dict.fromkeys(t for t in titles if t))
+        results = {}
+        
+        for start in range(0, len(unique_titles), MAX_TITLES_PER_QUERY):
+            chunk = unique_titles[start:start + MAX_TITLES_PER_QUERY]
+            rvprop = "ids|timestamp|content" if with_content else "ids|timestamp"
+            params = {
+                "titles": "|".join(chunk),
+                "redirects": 1,
+                "prop": "revisions|pageprops",
+                "rvprop": rvprop,
+                "rvslots": "main"
+            }
+            
+            query = self._query_with_continue(params)
+            if not query:
+                continue
+            
+            # Mappe di normalizzazione e redirect restituite dall'API
+            aliases = {}
+            for entry in query.get("normalized", []) + query.get("redirects", []):
+                aliases[entry.get("from")] = entry.get("to")
+            
+            for title in chunk:
+                final = title
+                seen = set()
+                while final in aliases and final not in seen:
+                    seen.add(final)
+                    final = aliases[final]
+                
+                page = query["pages"].get(final)
+                if page is None or page.get("missing") or page.get("invalid"):
+                    self._remember_redirect(title, None)
+                    results[title] = None
+                    continue
+                
+                self._remember_redirect(title, page["title"])
+                results[title] = self._page_summary(page, with_content)
+        
+        return results
+    
+    def resolve_titles(self, titles: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Risolve i titoli nel titolo canonico, seguendo i redirect.
+        
+        I titoli già presenti nella cache dei redirect non generano richieste.
+        
+        Args:
+            titles: Titoli da risolvere
+            
+        Returns:
+            Dizionario titolo -> titolo canonico (None se la pagina non esiste)
+        """
+        resolved = {}
+        unknown = []
+        
+        for title in dict.fromkeys(titles):
+            found, canonical = self._lookup_redirect(title)
+            if found:
+                resolved[title] = canonical
+            else:
+                unknown.append(title)
+        
+        if unknown:
+            for title, page in self.query_pages(unknown).items():
+                resolved[title] = page["title"] if page else None
+        
+        return resolved
+    
+    def prefetch_team_info(self, team_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Recupera le informazioni di più squadre riducendo le richieste.
+        
+        I nomi vengono prima risolti con query in batch (50 titoli per
+        richiesta): una pagina con infobox da club calcistico evita la ricerca.
+        Solo i nomi non risolti passano dalla ricerca testuale. I titoli trovati
+        restano associati ai nomi, quindi get_team_info non ripete la ricerca.
+        
+        Args:
+            team_names: Nomi delle squadre
+            
+        Returns:
+            Dizionario nome squadra -> informazioni (vuoto se non trovata)
+        """
+        names = list(dict.fromkeys(team_names))
+        pending = [name for name in names if name not in self._team_titles]
+        
+        if pending:
+            pages = self.query_pages(pending, with_content=True)
+            for name in pending:
+                page = pages.get(name)
+                if page and not page["disambiguation"] and self._is_football_club(page.get("content", "")):
+                    self._team_titles[name] = page["title"]
+        
+        unresolved = [name for name in names if name not in self._team_titles]
+        if unresolved:
+            logger.info(f"Ricerca testuale per {len(unresolved)}/{len(names)} squadre non risolte in batch")
+        
+        results = {}
+        for name in names:
+            try:
+                results[name] = self.get_team_info(name)
+            except Exception as e:
+                logger.error(f"Errore nel recupero info per '{name}': {str(e)}")
+                results[name] = {}
+        
+        return results
+    
+    def _query_with_continue(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Esegue una query seguendo i parametri 'continue' dell'API.
+        
+        Args:
+            params: Parametri della query
+            
+        Returns:
+            Sezione 'query' unita, con le pagine indicizzate per titolo
+        """
+        merged = {"normalized": [], "redirects": [], "pages": {}}
+        request_params = dict(params)
+        
+        while True:
+            data = self._make_api_request(request_params)
+            query = data.get("query")
+            if not query:
+                break
+            
+            merged["normalized"].extend(query.get("normalized", []))
+            merged["redirects"].extend(query.get("redirects", []))
+            
+            for page in query.get("pages", []):
+                existing = merged["pages"].setdefault(page.get("title"), {})
+                for key, value in page.items():
+                    if key == "revisions" and existing.get("revisions"):
+                        continue
+                    if key == "pageprops":
+                        existing.setdefault("pageprops", {}).update(value)
+                    else:
+                        existing[key] = value
+            
+            if "continue" not in data:
+                break
+            request_params = {**params, **data["continue"]}
+        
+        return merged if merged["pages"] else {}
+    
+    def _page_summary(self, page: Dict[str, Any], with_content: bool) -> Dict[str, Any]:
+        """Riduce una pagina dell'API ai campi utili."""
+        pageprops = page.get("pageprops", {})
+        revisions = page.get("revisions") or [{}]
+        revision = revisions[0]
+        
+        summary = {
+            "title": page.get("title"),
+            "pageid": page.get("pageid"),
+            "disambiguation": "disambiguation" in pageprops,
+            "wikibase_item": pageprops.get("wikibase_item"),
+            "revid": revision.get("revid"),
+            "timestamp": revision.get("timestamp")
+        }
+        
+        if with_content:
+            summary["content"] = revision.get("slots", {}).get("main", {}).get("content", "")
+        
+        return summary
+    
+    def _is_football_club(self, wikitext: str) -> bool:
+        """Verifica se il wikitesto contiene l'infobox di un club calcistico."""
+        return bool(re.search(r'\{\{\s*Infobox\s+football\s+club', wikitext or "", re.IGNORECASE))
+    
+    def _lookup_redirect(self, title: str):
+        """
+        Cerca un titolo nella cache dei redirect.
+        
+        Returns:
+            Tupla (trovato, titolo canonico o None)
+        """
+        if title in self._redirects:
+            return True, self._redirects[title]
+        
+        stored = self._redirect_store.get(f"{self.lang}:{title}")
+        if stored is None:
+            return False, None
+        
+        canonical = stored or None
+        self._redirects[title] = canonical
+        return True, canonical
+    
+    def _remember_redirect(self, title: str, canonical: Optional[str]):
+        """Salva nella cache il titolo canonico ('' su disco per le pagine inesistenti)."""
+        self._redirects[title] = canonical
+        self._redirect_store.set(f"{self.lang}:{title}", canonical or "", self.redirect_ttl)
+    
     def _extract_infobox(self, soup: BeautifulSoup) -> Dict[str, Any]:
         """
         Estrae informazioni dall'infobox di una pagina Wikipedia.
@@ -105,37 +105,9 @@ class WorldFootballScraper(BaseScraper):
         logger.info(f"Recuperando stagioni per campionato: {league_id}")
         
         try:
-            # Converti l'ID del campionato se necessario
-            league_path = self._get_league_path(league_id)
-            url = f"{self.base_url}/competitions/{league_path}/"
-            
+            url = self._league_seasons_url(league_id)
             soup = self.get_soup(url)
-            seasons = []
-            
-            # Cerca nella sezione delle stagioni
-            season_links = soup.select("div.data table.competition-rounds a")
-            for link in season_links:
-                season_url = link.get('href', '')
-                if not season_url:
-                    continue
-                    
-                season_name = link.text.strip()
-                season_id = season_url.strip('/').split('/')[-1]
-                
-                # Cerca di estrarre l'anno
-                year_match = re.search(r'(\d{4})-(\d{4}|\d{2})', season_name)
-                year = None
-                if year_match:
-                    year = year_match.group(1)
-                
-                seasons.append({
-                    'id': season_id,
-                    'name': season_name,
-                    'year': year,
-                    'url': self.base_url + season_url
-                })
-            
-            return sorted(seasons, key=lambda x: x.get('year', '0'), reverse=True)
+            return self._parse_league_seasons(soup)
             
         except Exception as e:
             logger.error(f"Errore nel recupero stagioni per campionato {league_id}: {str(e)}")
@@ -260,9 +232,6 @@ class WorldFootballScraper(BaseScraper):
         logger.info(f"Recuperando partite per campionato: {league_id}, stagione: {season}")
         
         try:
-            # Converti l'ID del campionato se necessario
-            league_path = self._get_league_path(league_id)
-            
             # Se la stagione non è specificata, cerca di ottenere quella corrente
             if not season:
                 seasons = self.get_league_seasons(league_id)
@@ -272,25 +241,9 @@ class WorldFootballScraper(BaseScraper):
                     logger.warning(f"Nessuna stagione trovata per campionato {league_id}")
                     return []
             
-            url = f"{self.base_url}/competitions/{league_path}/{season}/matches/"
+            url = self._league_fixtures_url(league_id, season)
             soup = self.get_soup(url)
-            
-            matches = []
-            
-            # Estrai le giornate del campionato
-            rounds_tables = soup.select("div.data > h2, div.data > table.standard_tabelle")
-            current_round = None
-            
-            for element in rounds_tables:
-                # Se è un'intestazione, imposta la giornata corrente
-                if element.name == 'h2':
-                    current_round = element.text.strip()
-                # Se è una tabella, estrai le partite
-                elif element.name == 'table' and current_round:
-                    round_matches = self._extract_matches_from_table(element, current_round, league_id, season)
-                    matches.extend(round_matches)
-            
-            return matches
+            return self._parse_league_fixtures(soup, league_id, season)
             
         except Exception as e:
             logger.error(f"Errore nel recupero partite per campionato {league_id}, stagione {season}: {str(e)}")
@@ -1249,6 +1202,99 @@ class WorldFootballScraper(BaseScraper):
         
         return matches
 
+    # ---- Metodi di supporto per il crawling degli archivi ---- #
+    
+    def _league_seasons_url(self, league_id: str) -> str:
+        """
+        Costruisce l'URL della pagina con le stagioni di un campionato.
+        
+        Args:
+            league_id: ID del campionato
+            
+        Returns:
+            URL della pagina
+        """
+        return f"{self.base_url}/competitions/{self._get_league_path(league_id)}/"
+    
+    def _league_fixtures_url(self, league_id: str, season: str) -> str:
+        """
+        Costruisce l'URL della pagina partite di una stagione.
+        
+        Args:
+            league_id: ID del campionato
+            season: ID della stagione
+            
+        Returns:
+            URL della pagina
+        """
+        return f"{self.base_url}/competitions/{self._get_league_path(league_id)}/{season}/matches/"
+    
+    def _parse_league_seasons(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+        """
+        Estrae le stagioni dalla pagina di un campionato.
+        
+        Args:
+            soup: Pagina del campionato
+            
+        Returns:
+            Lista di stagioni, dalla più recente
+        """
+        seasons = []
+        
+        # Cerca nella sezione delle stagioni
+        season_links = soup.select("div.data table.competition-rounds a")
+        for link in season_links:
+            season_url = link.get('href', '')
+            if not season_url:
+                continue
+                
+            season_name = link.text.strip()
+            season_id = season_url.strip('/').split('/')[-1]
+            
+            # Cerca di estrarre l'anno
+            year_match = re.search(r'(\d{4})-(\d{4}|\d{2})', season_name)
+            year = None
+            if year_match:
+                year = year_match.group(1)
+            
+            seasons.append({
+                'id': season_id,
+                'name': season_name,
+                'year': year,
+                'url': self.base_url + season_url
+            })
+        
+        return sorted(seasons, key=lambda x: x.get('year', '0'), reverse=True)
+    
+    def _parse_league_fixtures(self, soup: BeautifulSoup, league_id: str, season: str) -> List[Dict[str, Any]]:
+        """
+        Estrae le partite dalla pagina partite di una stagione.
+        
+        Args:
+            soup: Pagina delle partite
+            league_id: ID del campionato
+            season: ID della stagione
+            
+        Returns:
+            Lista di partite
+        """
+        matches = []
+        
+        # Estrai le giornate del campionato
+        rounds_tables = soup.select("div.data > h2, div.data > table.standard_tabelle")
+        current_round = None
+        
+        for element in rounds_tables:
+            # Se è un'intestazione, imposta la giornata corrente
+            if element.name == 'h2':
+                current_round = element.text.strip()
+            # Se è una tabella, estrai le partite
+            elif element.name == 'table' and current_round:
+                round_matches = self._extract_matches_from_table(element, current_round, league_id, season)
+                matches.extend(round_matches)
+        
+        return matches
+    
     # ---- Metodi di supporto per l'estrazione ID ---- #
     
     def _get_league_path(self, league_id: str) -> str:
@@ -9,12 +9,15 @@ import json
 import time
 import logging
 import datetime
-from typing import Dict, List, Any, Optional, Union, Tuple
+from functools import partial
+from typing import Dict, List, Any, Optional, Union, Tuple, Callable
 from bs4 import BeautifulSoup
 
 from src.data.scrapers.base_scraper import BaseScraper
 from src.utils.cache import cached
 from src.utils.database import FirebaseManager
+from src.utils.hedging import HedgedFetcher
+from src.data.entity_registry import ENTITY_TEAM, get_registry
 from src.config.settings import get_setting
 
 logger = logging.getLogger(__name__)
@@ -47,6 +50,15 @@ class WhoScoredScraper(BaseScraper):
         self.db = FirebaseManager()
         self.min_wait_time = get_setting('scrapers.whoscored.min_wait_time', 3)
         
+        # Modalità hedged: le fonti alternative partono in parallelo dopo un ritardo
+        # calcolato sui percentili di latenza della fonte in corso
+        self.hedged_mode = get_setting('scrapers.whoscored.hedged_mode', False)
+        self.hedger = HedgedFetcher(
+            hedge_delay=get_setting('scrapers.whoscored.hedge_delay', 2.0),
+            percentile=get_setting('scrapers.whoscored.hedge_percentile', 90),
+            max_delay=get_setting('scrapers.whoscored.hedge_max_delay', 10.0)
+        )
+        
         logger.info(f"WhoScoredScraper inizializzato con source primaria: {self.preferred_source}")
     
     @cached(ttl=86400)  # 24 ore
@@ -80,18 +92,10 @@ class WhoScoredScraper(BaseScraper):
                 logger.warning(f"Informazioni squadre mancanti per match_id={match_id}")
                 return {}
             
-            # Prova fonte primaria
-            source = self.preferred_source
-            stats = self._get_stats_from_source(source, match_id, home_team, away_team, match_date)
-            
-            # Se la fonte primaria fallisce, prova alternative
-            if not stats:
-                for alt_source in self.base_urls.keys():
-                    if alt_source != self.preferred_source:
-                        logger.info(f"Tentativo con fonte alternativa: {alt_source}")
-                        stats = self._get_stats_from_source(alt_source, match_id, home_team, away_team, match_date)
-                        if stats:
-                            break
+            # Prova fonte primaria, poi le alternative (in sequenza o hedged)
+            source, stats = self._fetch_from_sources(
+                self._get_stats_from_source, match_id, home_team, away_team, match_date
+            )
             
             if not stats:
                 logger.warning(f"Nessuna statistica trovata per {home_team} vs {away_team}")
@@ -101,7 +105,7 @@ class WhoScoredScraper(BaseScraper):
             stats['match_id'] = match_id
             stats['home_team'] = home_team
             stats['away_team'] = away_team
-            stats['source'] = self.preferred_source
+            stats['source'] = source
             stats['collected_at'] = datetime.datetime.now().isoformat()
             
             return stats
@@ -110,6 +114,54 @@ class WhoScoredScraper(BaseScraper):
             logger.error(f"Errore nel recupero statistiche per match_id={match_id}: {str(e)}")
             return {}
     
+    def _source_order(self) -> List[str]:
+        """Restituisce le fonti in ordine di preferenza (primaria per prima)."""
+        return [self.preferred_source] + [s for s in self.base_urls.keys() if s != self.preferred_source]
+    
+    def _fetch_from_sources(self, fetch_fn: Callable[..., Dict[str, Any]], 
+                            *args) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        Interroga le fonti finché una restituisce dati validi.
+        
+        In modalità sequenziale prova le fonti una dopo l'altra; in modalità
+        hedged avvia la primaria e lancia la successiva dopo il ritardo di
+        hedging, restituendo il primo risultato valido.
+        
+        Args:
+            fetch_fn: Metodo _get_*_from_source da invocare come fetch_fn(source, *args)
+            *args: Argomenti passati a fetch_fn dopo il nome della fonte
+            
+        Returns:
+            Tupla (fonte che ha risposto, dati) oppure (None, {}) se nessuna fonte risponde
+        """
+        sources = self._source_order()
+        
+        if self.hedged_mode:
+            source, stats = self.hedger.fetch([(s, partial(fetch_fn, s, *args)) for s in sources])
+            return source, stats or {}
+        
+        for source in sources:
+            if source != self.preferred_source:
+                logger.info(f"Tentativo con fonte alternativa: {source}")
+            stats = fetch_fn(source, *args)
+            if stats:
+                return source, stats
+        
+        return None, {}
+    
+    def get_hedge_metrics(self) -> Dict[str, Any]:
+        """
+        Restituisce le metriche della modalità hedged.
+        
+        Returns:
+            Contatori di chiamate, vittorie della primaria e dell'hedging,
+            tasso di vittoria dell'hedging e vittorie per fonte
+        """
+        metrics = self.hedger.get_metrics()
+        metrics['latency_p50'] = {s: self.hedger.latencies.percentile(s, 50) for s in self.base_urls}
+        metrics['latency_p90'] = {s: self.hedger.latencies.percentile(s, 90) for s in self.base_urls}
+        return metrics
+    
     def _get_stats_from_source(self, source: str, match_id: str, 
                               home_team: str, away_team: str, 
                               match_date: str) -> Dict[str, Any]:
@@ -660,6 +712,10 @@ class WhoScoredScraper(BaseScraper):
         """
         Normalizza il nome di una squadra per la ricerca.
         
+        I nomi noti al registro canonico delle entità vengono sostituiti dal
+        nome principale della squadra, così varianti diverse producono la
+        stessa ricerca.
+        
         Args:
             name: Nome squadra originale
             
@@ -668,6 +724,8 @@ class WhoScoredScraper(BaseScraper):
         """
         if not name:
             return ""
+        
+        name = get_registry().canonical_name(ENTITY_TEAM, name) or name
             
         # Rimuovi prefissi/suffissi comuni
         name = re.sub(r'^FC\s+', '', name)
@@ -778,20 +836,10 @@ class WhoScoredScraper(BaseScraper):
         # Normalizza nome squadra
         team_name_norm = self._normalize_team_name(team_name)
         
-        stats = {}
-        
-        # Prova con fonte preferita
-        source = self.preferred_source
-        stats = self._get_team_stats_from_source(source, team_name_norm, league_id)
-        
-        # Se la fonte primaria fallisce, prova alternative
-        if not stats:
-            for alt_source in self.base_urls.keys():
-                if alt_source != self.preferred_source:
-                    logger.info(f"Tentativo con fonte alternativa: {alt_source}")
-                    stats = self._get_team_stats_from_source(alt_source, team_name_norm, league_id)
-                    if stats:
-                        break
+        # Prova fonte preferita, poi le alternative (in sequenza o hedged)
+        source, stats = self._fetch_from_sources(
+            self._get_team_stats_from_source, team_name_norm, league_id
+        )
         
         if not stats:
             logger.warning(f"Nessuna statistica trovata per {team_name}")
@@ -1346,18 +1394,10 @@ class WhoScoredScraper(BaseScraper):
             if team_data:
                 team_name = team_data.get('name', '')
         
-        # Prova fonte primaria
-        source = self.preferred_source
-        player_stats = self._get_player_stats_from_source(source, player_name, team_name)
-        
-        # Se la fonte primaria fallisce, prova alternative
-        if not player_stats:
-            for alt_source in self.base_urls.keys():
-                if alt_source != self.preferred_source:
-                    logger.info(f"Tentativo con fonte alternativa: {alt_source}")
-                    player_stats = self._get_player_stats_from_source(alt_source, player_name, team_name)
-                    if player_stats:
-                        break
+        # Prova fonte primaria, poi le alternative (in sequenza o hedged)
+        source, player_stats = self._fetch_from_sources(
+            self._get_player_stats_from_source, player_name, team_name
+        )
         
         if not player_stats:
             logger.warning(f"Nessuna statistica trovata per {player_name}")
@@ -0,0 +1,164 @@
+"""
+Coda di priorità del lavoro di raccolta dati.
+I campionati vengono aggiornati in ordine di urgenza invece che nell'ordine
+del dizionario di configurazione: prima quelli con una partita nella
+finestra di pubblicazione (dal calcio d'inizio più vicino), poi quelli con
+partite nei prossimi giorni, infine quelli senza partite in programma. A
+parità di urgenza contano la priorità del campionato e l'età dei dati.
+"""
+import heapq
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterator
+
+from src.config.settings import get_setting
+from src.config.leagues import get_leagues_by_priority
+from src.utils.time_utils import get_current_datetime
+
+logger = logging.getLogger(__name__)
+
+# Fasce di urgenza
+BUCKET_PUBLISHING = 0   # partita entro la finestra di pubblicazione
+BUCKET_UPCOMING = 1     # partita nei prossimi giorni
+BUCKET_IDLE = 2         # nessuna partita in programma
+
+
+def parse_timestamp(value: Any, now: datetime) -> Optional[datetime]:
+    """
+    Converte un orario ISO (anche con 'Z') in datetime confrontabile con now.
+
+    Returns:
+        Datetime con fuso orario o None se il valore non è valido
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=now.tzinfo)
+    return parsed
+
+
+class WorkItem:
+    """Lavoro di raccolta per un campionato con i fattori di urgenza."""
+
+    def __init__(self, league_id: str, next_kickoff: Optional[datetime] = None,
+                 league_rank: int = 999, last_update: Optional[datetime] = None,
+                 now: Optional[datetime] = None, publish_hours: Optional[float] = None):
+        """
+        Args:
+            league_id: ID del campionato
+            next_kickoff: Calcio d'inizio della prossima partita (None se nessuna)
+            league_rank: Posizione del campionato in get_leagues_by_priority
+            last_update: Ultimo aggiornamento completo dei dati
+            now: Istante di riferimento (default: ora corrente)
+            publish_hours: Ore prima della partita in cui si pubblica (default: publishing.hours_before_match)
+        """
+        now = now or get_current_datetime()
+        if publish_hours is None:
+            publish_hours = get_setting('publishing.hours_before_match', 12)
+
+        self.league_id = league_id
+        self.next_kickoff = next_kickoff
+        self.league_rank = league_rank
+        self.last_update = last_update
+        self.hours_to_kickoff = (next_kickoff - now).total_seconds() / 3600 if next_kickoff else None
+        self.staleness_hours = (now - last_update).total_seconds() / 3600 if last_update else float('inf')
+
+        if self.hours_to_kickoff is None:
+            self.bucket = BUCKET_IDLE
+        elif self.hours_to_kickoff <= publish_hours:
+            self.bucket = BUCKET_PUBLISHING
+        else:
+            self.bucket = BUCKET_UPCOMING
+
+    def sort_key(self) -> tuple:
+        """
+        Chiave di ordinamento (più piccola = più urgente).
+
+        Nella finestra di pubblicazione decide il calcio d'inizio; per le
+        partite dei prossimi giorni il giorno della partita, poi la priorità
+        del campionato; a parità vengono prima i dati più vecchi.
+        """
+        if self.bucket == BUCKET_PUBLISHING:
+            return (self.bucket, self.hours_to_kickoff, self.league_rank, -self.staleness_hours)
+        if self.bucket == BUCKET_UPCOMING:
+            return (self.bucket, int(self.hours_to_kickoff // 24), self.league_rank, -self.staleness_hours)
+        return (self.bucket, 0, self.league_rank, -self.staleness_hours)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'league_id': self.league_id,
+            'bucket': self.bucket,
+            'next_kickoff': self.next_kickoff.isoformat() if self.next_kickoff else None,
+            'hours_to_kickoff': round(self.hours_to_kickoff, 2) if self.hours_to_kickoff is not None else None,
+            'league_rank': self.league_rank,
+            'staleness_hours': round(self.staleness_hours, 2) if self.staleness_hours != float('inf') else None
+        }
+
+
+class CollectionQueue:
+    """
+    Coda di priorità thread-safe dei campionati da aggiornare.
+
+    pop() restituisce sempre il lavoro più urgente; a parità di chiave
+    vale l'ordine di inserimento.
+    """
+
+    def __init__(self, items: Optional[List[WorkItem]] = None):
+        self._heap: List[tuple] = []
+        self._counter = 0
+        self._lock = threading.Lock()
+        for item in items or []:
+            self.push(item)
+
+    def push(self, item: WorkItem):
+        with self._lock:
+            heapq.heappush(self._heap, (item.sort_key(), self._counter, item))
+            self._counter += 1
+
+    def pop(self) -> Optional[WorkItem]:
+        """Estrae il lavoro più urgente (None se la coda è vuota)."""
+        with self._lock:
+            if not self._heap:
+                return None
+            return heapq.heappop(self._heap)[2]
+
+    def drain(self) -> Iterator[WorkItem]:
+        """Estrae i lavori in ordine di urgenza finché la coda non è vuota."""
+        while True:
+            item = self.pop()
+            if item is None:
+                return
+            yield item
+
+    def items(self) -> List[WorkItem]:
+        """Lavori in coda in ordine di urgenza, senza estrarli."""
+        with self._lock:
+            return [entry[2] for entry in sorted(self._heap)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._heap)
+
+
+def league_ranks() -> Dict[str, int]:
+    """Posizione di ogni campionato attivo nell'ordine di get_leagues_by_priority."""
+    return {league['id']: rank for rank, league in enumerate(get_leagues_by_priority())}
+
+
+def next_kickoff(matches: List[Dict[str, Any]], now: datetime) -> Optional[datetime]:
+    """
+    Calcio d'inizio più vicino tra le partite future.
+
+    Accetta sia partite normalizzate ('datetime') sia grezze di football-data ('utcDate').
+    """
+    upcoming = []
+    for match in matches:
+        kickoff = parse_timestamp(match.get('datetime') or match.get('utcDate'), now)
+        if kickoff and kickoff > now:
+            upcoming.append(kickoff)
+    return min(upcoming) if upcoming else None
@@ -195,6 +195,26 @@ class HealthChecker:
                         'message': str(e)
                     }
             
+            # Freschezza per singola entità dal registro del collector
+            try:
+                from src.data.freshness import FreshnessLedger
+                ledger = FreshnessLedger()
+                entities = ledger.summary()
+                ledger.close()
+                
+                total = sum(entry['count'] for entry in entities.values())
+                stale = sum(entry['stale'] for entry in entities.values())
+                results['entities'] = {
+                    'types': entities,
+                    'stale_ratio': round(stale / total, 2) if total else 0.0,
+                    'status': 'unknown' if not total else 'ok' if stale / total < 0.5 else 'warning'
+                }
+            except Exception as e:
+                results['entities'] = {
+                    'status': 'error',
+                    'message': str(e)
+                }
+            
             return results
         except Exception as e:
             logger.error(f"Errore nel controllo della freschezza dei dati: {e}")
@@ -21,6 +21,7 @@ from src.utils.time_utils import (
     should_expire_now
 )
 from src.config.settings import get_setting
+from src.utils.deadline import RunDeadline, PRIORITY_CRITICAL, PRIORITY_LOW
 from src.publishing.wordpress import WordPressPublisher
 from src.content.generator import ContentGenerator
 
@@ -54,13 +55,16 @@ class ArticlePublisher:
                    f"rimozione {self.expire_hours_after}h dopo")
     
     def publish_pending_articles(self, league_id: Optional[str] = None,
-                               limit: Optional[int] = None) -> Dict[str, Any]:
+                               limit: Optional[int] = None,
+                               deadline: Optional[RunDeadline] = None) -> Dict[str, Any]:
         """
         Pubblica articoli in attesa che sono pronti per la pubblicazione.
         
         Args:
             league_id: ID del campionato specifico (opzionale)
             limit: Numero massimo di articoli da pubblicare (opzionale)
+            deadline: Scadenza dell'esecuzione; raggiunta la riserva gli articoli
+                rimanenti vengono rimandati (opzionale)
         
         Returns:
             Risultati dell'operazione con statistiche
@@ -76,7 +80,8 @@ class ArticlePublisher:
             "failed": 0,
             "skipped": 0,
             "errors": [],
-            "published": []
+            "published": [],
+            "deferred": []
         }
         
         try:
@@ -136,10 +141,17 @@ class ArticlePublisher:
             logger.info(f"Trovate {len(pending_matches)} partite in attesa di pubblicazione")
             
             # Pubblica gli articoli
-            for match_info in pending_matches:
+            for index, match_info in enumerate(pending_matches):
                 match_id = match_info["match_id"]
                 match = match_info["match"]
                 
+                # Vicino alla scadenza gli articoli meno urgenti passano al prossimo ciclo
+                if deadline and not deadline.allows("stage:publishing", PRIORITY_CRITICAL):
+                    for deferred_info in pending_matches[index:]:
+                        deadline.defer("article", deferred_info["match_id"])
+                        results["deferred"].append(deferred_info["match_id"])
+                    break
+                
                 try:
                     # Verifica se abbiamo già un articolo generato
                     article_ref = self.db.get_reference(f"articles/{match_id}")
@@ -217,8 +229,11 @@ class ArticlePublisher:
                         results["errors"].append(error_msg)
                         logger.error(error_msg)
                     
-                    # Attendi intervallo di sicurezza
-                    time.sleep(self.publish_interval_seconds)
+                    # Attendi intervallo di sicurezza (senza superare la scadenza)
+                    interval = self.publish_interval_seconds
+                    if deadline:
+                        interval = max(0, min(interval, deadline.remaining() - deadline.reserve))
+                    time.sleep(interval)
                     
                 except Exception as e:
                     results["failed"] += 1
@@ -232,7 +247,8 @@ class ArticlePublisher:
             logger.error(error_msg, exc_info=True)
         
         logger.info(f"Pubblicazione completata: {results['success']} successi, " +
-                   f"{results['failed']} falliti, {results['skipped']} saltati")
+                   f"{results['failed']} falliti, {results['skipped']} saltati, " +
+                   f"{len(results['deferred'])} rimandati")
         
         return results
     
@@ -554,12 +570,15 @@ class ArticlePublisher:
             logger.error(error_msg, exc_info=True)
             return {"success": False, "error": error_msg}
     
-    def run_publication_cycle(self, league_id: Optional[str] = None) -> Dict[str, Any]:
+    def run_publication_cycle(self, league_id: Optional[str] = None,
+                              deadline: Optional[RunDeadline] = None) -> Dict[str, Any]:
         """
         Esegue un ciclo completo di pubblicazione: pubblica nuovi articoli e pulisce quelli scaduti.
         
         Args:
             league_id: ID del campionato specifico (opzionale)
+            deadline: Scadenza dell'esecuzione; la pulizia viene rimandata per
+                prima, poi gli articoli meno urgenti (opzionale)
         
         Returns:
             Risultati dell'operazione
@@ -587,21 +606,26 @@ class ArticlePublisher:
             logger.info(f"Pubblicazione nuovi articoli (limite: {publish_limit})")
             results["publication"] = self.publish_pending_articles(
                 league_id=league_id,
-                limit=publish_limit
+                limit=publish_limit,
+                deadline=deadline
             )
         except Exception as e:
             logger.error(f"Errore nella pubblicazione: {str(e)}", exc_info=True)
             results["publication"] = {"success": 0, "failed": 0, "error": str(e)}
         
-        # Pulizia articoli scaduti
-        try:
-            logger.info(f"Pulizia articoli scaduti (limite: {cleanup_limit})")
-            results["cleanup"] = self.cleanup_expired_articles(
-                limit=cleanup_limit
-            )
-        except Exception as e:
-            logger.error(f"Errore nella pulizia: {str(e)}", exc_info=True)
-            results["cleanup"] = {"success": 0, "failed": 0, "error": str(e)}
+        # Pulizia articoli scaduti (rimandata per prima se il tempo stringe)
+        if deadline and not deadline.allows("stage:cleanup", PRIORITY_LOW):
+            deadline.defer("stage", "cleanup")
+            results["cleanup"] = {"success": 0, "failed": 0, "deferred": True}
+        else:
+            try:
+                logger.info(f"Pulizia articoli scaduti (limite: {cleanup_limit})")
+                results["cleanup"] = self.cleanup_expired_articles(
+                    limit=cleanup_limit
+                )
+            except Exception as e:
+                logger.error(f"Errore nella pulizia: {str(e)}", exc_info=True)
+                results["cleanup"] = {"success": 0, "failed": 0, "error": str(e)}
         
         # Aggiorna stato
         try:
@@ -655,18 +679,20 @@ def cleanup_articles(limit: Optional[int] = None) -> Dict[str, Any]:
     publisher = ArticlePublisher()
     return publisher.cleanup_expired_articles(limit)
 
-def run_publication_cycle(league_id: Optional[str] = None) -> Dict[str, Any]:
+def run_publication_cycle(league_id: Optional[str] = None,
+                          deadline: Optional[RunDeadline] = None) -> Dict[str, Any]:
     """
     Esegue un ciclo completo di pubblicazione.
     
     Args:
         league_id: ID del campionato specifico (opzionale)
+        deadline: Scadenza dell'esecuzione (opzionale)
     
     Returns:
         Risultati dell'operazione
     """
     publisher = ArticlePublisher()
-    return publisher.run_publication_cycle(league_id)
+    return publisher.run_publication_cycle(league_id, deadline)
 
 def get_publishing_status() -> Dict[str, Any]:
     """
@@ -605,10 +605,34 @@ class MultiLevelCache(Cache):
             
         return success
 
+def id_key(name: str) -> Callable[..., str]:
+    """
+    Crea una key_fn per metodi che ricevono un solo ID (es. get_match(self, match_id)).
+    
+    L'ID viene normalizzato, quindi 123, "123" e match_id=123 producono la
+    stessa chiave: le voci popolate da una richiesta batch con prime()
+    coincidono con quelle lette dalle chiamate singole.
+    
+    Args:
+        name: Nome univoco del metodo (es. 'football_data.get_match')
+        
+    Returns:
+        Funzione (owner, id) -> chiave di cache
+    """
+    def make_key(owner: Any, *args, **kwargs) -> str:
+        entity_id = args[0] if args else next(iter(kwargs.values()), '')
+        return hashlib.md5(f"{name}:{owner}:{str(entity_id).strip()}".encode()).hexdigest()
+    return make_key
+
 def cached(ttl: int = 3600, namespace: str = "default", key_fn: Optional[Callable] = None):
     """
     Decoratore per cachare i risultati di una funzione.
     
+    La funzione decorata espone la cache (wrapper.cache), il TTL (wrapper.ttl),
+    la generazione della chiave (wrapper.make_key) e wrapper.prime(value, *args, **kwargs)
+    per popolare la voce corrispondente a una chiamata, ad esempio a partire
+    dal risultato di una richiesta batch.
+    
     Args:
         ttl: Tempo di vita in secondi
         namespace: Namespace per la cache
@@ -620,32 +644,39 @@ def cached(ttl: int = 3600, namespace: str = "default", key_fn: Optional[Callabl
     cache = MultiLevelCache(namespace)
     
     def decorator(func):
-        def wrapper(*args, **kwargs):
+        def make_key(*args, **kwargs) -> str:
             # Genera la chiave di cache
             if key_fn:
                 # Usa la funzione personalizzata
-                key = key_fn(*args, **kwargs)
-            else:
-                # Genera chiave basata su funzione, args e kwargs
-                key_parts = [func.__module__, func.__name__]
-                
-                # Aggiungi args (se serializzabili)
-                for arg in args:
+                return key_fn(*args, **kwargs)
+            
+            # Genera chiave basata su funzione, args e kwargs
+            key_parts = [func.__module__, func.__name__]
+            
+            # Aggiungi args (se serializzabili)
+            for arg in args:
+                try:
+                    key_parts.append(str(arg))
+                except:
+                    key_parts.append(str(hash(arg)))
+            
+            # Aggiungi kwargs (se serializzabili)
+            if kwargs:
+                for k, v in sorted(kwargs.items()):
                     try:
-                        key_parts.append(str(arg))
+                        key_parts.append(f"{k}:{v}")
                     except:
-                        key_parts.append(str(hash(arg)))
-                
-                # Aggiungi kwargs (se serializzabili)
-                if kwargs:
-                    for k, v in sorted(kwargs.items()):
-                        try:
-                            key_parts.append(f"{k}:{v}")
-                        except:
-                            key_parts.append(f"{k}:{hash(v)}")
-                
-                # Genera hash della chiave
-                key = hashlib.md5(":".join(key_parts).encode()).hexdigest()
+                        key_parts.append(f"{k}:{hash(v)}")
+            
+            # Genera hash della chiave
+            return hashlib.md5(":".join(key_parts).encode()).hexdigest()
+        
+        def prime(value: Any, *args, **kwargs) -> bool:
+            # Salva un risultato già noto come se fosse prodotto dalla chiamata
+            return cache.set(make_key(*args, **kwargs), value, ttl)
+        
+        def wrapper(*args, **kwargs):
+            key = make_key(*args, **kwargs)
             
             # Cerca nella cache
             result = cache.get(key)
@@ -659,6 +690,12 @@ def cached(ttl: int = 3600, namespace: str = "default", key_fn: Optional[Callabl
             cache.set(key, result, ttl)
             
             return result
+        
+        wrapper.cache = cache
+        wrapper.ttl = ttl
+        wrapper.make_key = make_key
+        wrapper.prime = prime
+        wrapper.__wrapped__ = func
         return wrapper
     return decorator
 
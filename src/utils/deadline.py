@@ -0,0 +1,137 @@
+"""
+Scadenza dell'esecuzione e budget di tempo per fase e per fonte.
+Il job pianificato ha un limite rigido di tempo reale e di CPU: il
+RunDeadline permette ai componenti di chiedere se c'è ancora tempo per un
+lavoro di una certa priorità, di misurare il tempo speso per fase/fonte e di
+registrare cosa è stato rimandato, così il report finale lo elenca.
+"""
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from src.config.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+# Priorità del lavoro: più è bassa, prima viene sacrificato all'avvicinarsi della scadenza
+PRIORITY_CRITICAL = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+
+class RunDeadline:
+    """
+    Scadenza di un'esecuzione con margini per priorità e budget per nome.
+
+    Il lavoro critico è consentito finché resta il margine di sicurezza
+    (reserve); quello normale e quello a bassa priorità richiedono
+    rispettivamente almeno normal_margin e low_margin della durata totale.
+    Un budget (es. 'source:fbref', 'stage:predictions') limita inoltre il
+    tempo complessivo speso con quel nome.
+    """
+
+    def __init__(self, seconds: Optional[float] = None, cpu_seconds: Optional[float] = None,
+                 reserve: Optional[float] = None, budgets: Optional[Dict[str, float]] = None,
+                 normal_margin: Optional[float] = None, low_margin: Optional[float] = None):
+        """
+        Args:
+            seconds: Secondi di tempo reale disponibili (None = nessun limite)
+            cpu_seconds: Secondi di CPU del processo disponibili (None = nessun limite)
+            reserve: Secondi tenuti da parte per chiudere l'esecuzione (default: deadline.reserve, 30)
+            budgets: Secondi massimi per nome di fase/fonte (default: deadline.budgets)
+            normal_margin: Frazione della durata che deve restare per il lavoro normale (default 0.1)
+            low_margin: Frazione della durata che deve restare per il lavoro a bassa priorità (default 0.25)
+        """
+        self.seconds = seconds
+        self.cpu_seconds = cpu_seconds
+        self.reserve = reserve if reserve is not None else get_setting('deadline.reserve', 30)
+        self.budgets = dict(budgets if budgets is not None else get_setting('deadline.budgets', {}))
+        self.normal_margin = normal_margin if normal_margin is not None else get_setting('deadline.normal_margin', 0.1)
+        self.low_margin = low_margin if low_margin is not None else get_setting('deadline.low_margin', 0.25)
+        self.started_at = datetime.now()
+        self._wall_start = time.monotonic()
+        self._cpu_start = time.process_time()
+        self._spent: Dict[str, float] = {}
+        self._deferred: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        """Secondi rimanenti (il minimo tra tempo reale e CPU; inf se senza limiti)."""
+        remaining = float('inf')
+        if self.seconds is not None:
+            remaining = self.seconds - (time.monotonic() - self._wall_start)
+        if self.cpu_seconds is not None:
+            remaining = min(remaining, self.cpu_seconds - (time.process_time() - self._cpu_start))
+        return remaining
+
+    def expired(self) -> bool:
+        return self.remaining() <= self.reserve
+
+    def allows(self, name: Optional[str] = None, priority: int = PRIORITY_NORMAL,
+               estimate: float = 0.0) -> bool:
+        """
+        Verifica se c'è tempo per un lavoro.
+
+        Args:
+            name: Nome della fase o fonte con eventuale budget
+            priority: PRIORITY_CRITICAL, PRIORITY_NORMAL o PRIORITY_LOW
+            estimate: Durata stimata del lavoro in secondi
+
+        Returns:
+            True se il lavoro può partire
+        """
+        if name and name in self.budgets and self.spent(name) + estimate > self.budgets[name]:
+            return False
+
+        total = min(t for t in (self.seconds, self.cpu_seconds, float('inf')) if t is not None)
+        if total == float('inf'):
+            return True
+
+        needed = self.reserve + estimate
+        if priority == PRIORITY_NORMAL:
+            needed += total * self.normal_margin
+        elif priority >= PRIORITY_LOW:
+            needed += total * self.low_margin
+        return self.remaining() > needed
+
+    def spent(self, name: str) -> float:
+        with self._lock:
+            return self._spent.get(name, 0.0)
+
+    @contextmanager
+    def track(self, name: str):
+        """Somma al budget `name` il tempo trascorso nel blocco."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._spent[name] = self._spent.get(name, 0.0) + time.monotonic() - started
+
+    def defer(self, kind: str, item: Any, reason: str = "deadline"):
+        """Registra un lavoro rimandato per il report finale."""
+        with self._lock:
+            self._deferred.append({'kind': kind, 'item': item, 'reason': reason})
+        logger.info(f"Rimandato {kind} {item}: {reason}")
+
+    def deferred(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [d for d in self._deferred if kind is None or d['kind'] == kind]
+
+    def report(self) -> Dict[str, Any]:
+        """Riepilogo per il report dell'esecuzione."""
+        remaining = self.remaining()
+        with self._lock:
+            spent = {name: round(value, 3) for name, value in self._spent.items()}
+            deferred = list(self._deferred)
+        return {
+            'started_at': self.started_at.isoformat(),
+            'elapsed': round(time.monotonic() - self._wall_start, 3),
+            'cpu': round(time.process_time() - self._cpu_start, 3),
+            'remaining': round(remaining, 3) if remaining != float('inf') else None,
+            'spent': spent,
+            'deferred': deferred
+        }
@@ -0,0 +1,207 @@
+"""
+Richieste "hedged" su più fonti equivalenti.
+Avvia la fonte primaria e, se non risponde entro un ritardo derivato dai
+percentili di latenza osservati, avvia anche la fonte successiva. Restituisce
+il primo risultato valido e scarta gli altri, tenendo metriche su quanto
+spesso l'hedging vince.
+"""
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Finestra mobile delle latenze osservate per ciascuna fonte."""
+
+    def __init__(self, window: int = 100):
+        """
+        Args:
+            window: Numero massimo di campioni mantenuti per fonte
+        """
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, source: str, latency: float):
+        """Registra la latenza (in secondi) di una chiamata a una fonte."""
+        with self._lock:
+            samples = self._samples.get(source)
+            if samples is None:
+                samples = self._samples[source] = deque(maxlen=self.window)
+            samples.append(latency)
+
+    def count(self, source: str) -> int:
+        with self._lock:
+            return len(self._samples.get(source, ()))
+
+    def percentile(self, source: str, pct: float) -> Optional[float]:
+        """
+        Calcola un percentile delle latenze di una fonte.
+
+        Args:
+            source: Nome della fonte
+            pct: Percentile richiesto (0-100)
+
+        Returns:
+            Latenza in secondi o None se non ci sono campioni
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(source, ()))
+        if not samples:
+            return None
+        # Interpolazione lineare tra i due campioni più vicini
+        rank = (len(samples) - 1) * min(max(pct, 0.0), 100.0) / 100.0
+        low = int(rank)
+        high = min(low + 1, len(samples) - 1)
+        return samples[low] + (samples[high] - samples[low]) * (rank - low)
+
+
+class HedgedFetcher:
+    """
+    Esegue la stessa richiesta su più fonti in modalità hedged.
+
+    La fonte successiva parte quando la precedente non ha risposto entro il
+    ritardo di hedging, oppure subito se la precedente ha già fallito. I thread
+    già avviati non possono essere interrotti: i loro risultati vengono
+    scartati, mentre le fonti non ancora avviate vengono annullate.
+    """
+
+    def __init__(self, hedge_delay: float = 2.0, percentile: float = 90.0,
+                 min_delay: float = 0.2, max_delay: float = 10.0,
+                 min_samples: int = 5, window: int = 100):
+        """
+        Args:
+            hedge_delay: Ritardo usato finché una fonte ha meno di min_samples campioni
+            percentile: Percentile di latenza della fonte in corso usato come ritardo
+            min_delay: Limite inferiore del ritardo calcolato
+            max_delay: Limite superiore del ritardo calcolato
+            min_samples: Campioni necessari prima di usare il percentile
+            window: Dimensione della finestra di latenze per fonte
+        """
+        self.hedge_delay = hedge_delay
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.latencies = LatencyTracker(window)
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            'calls': 0,
+            'hedged_calls': 0,
+            'primary_wins': 0,
+            'hedge_wins': 0,
+            'no_result': 0,
+            'launched': 0,
+            'abandoned': 0,
+            'wins_by_source': {}
+        }
+
+    def delay_for(self, source: str) -> float:
+        """Restituisce il ritardo di hedging per la fonte attualmente in corso."""
+        if self.latencies.count(source) < self.min_samples:
+            return self.hedge_delay
+        value = self.latencies.percentile(source, self.percentile)
+        return min(max(value, self.min_delay), self.max_delay)
+
+    def fetch(self, candidates: List[Tuple[str, Callable[[], Any]]],
+              is_valid: Callable[[Any], bool] = bool) -> Tuple[Optional[str], Any]:
+        """
+        Esegue le fonti in modalità hedged.
+
+        Args:
+            candidates: Lista ordinata di (nome fonte, funzione senza argomenti)
+            is_valid: Predicato che stabilisce se un risultato è utilizzabile
+
+        Returns:
+            Tupla (fonte vincente, risultato) oppure (None, None) se nessuna fonte risponde
+        """
+        if not candidates:
+            return None, None
+
+        executor = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="hedge")
+        futures = {}
+        next_index = 0
+        winner, result = None, None
+
+        def launch():
+            nonlocal next_index
+            source, fn = candidates[next_index]
+            futures[executor.submit(self._timed_call, source, fn)] = source
+            next_index += 1
+
+        try:
+            launch()
+            processed = set()
+
+            while True:
+                pending = [f for f in futures if f not in processed]
+                if not pending:
+                    break
+
+                timeout = None
+                if next_index < len(candidates):
+                    timeout = self.delay_for(candidates[next_index - 1][0])
+
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    processed.add(future)
+                    source, value = future.result()
+                    if winner is None and is_valid(value):
+                        winner, result = source, value
+
+                if winner is not None:
+                    break
+
+                # Ritardo scaduto oppure una fonte ha fallito: avvia la successiva
+                if next_index < len(candidates):
+                    launch()
+        finally:
+            # Le fonti ancora in corso vengono abbandonate: il risultato è scartato
+            abandoned = sum(1 for f in futures if not f.done() and not f.cancel())
+            executor.shutdown(wait=False)
+
+        self._record_outcome(candidates, winner, next_index, abandoned)
+        return winner, result
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Restituisce le metriche di hedging con i tassi di vittoria."""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+            metrics['wins_by_source'] = dict(self._metrics['wins_by_source'])
+        hedged = metrics['hedged_calls']
+        metrics['hedge_win_rate'] = round(metrics['hedge_wins'] / hedged, 4) if hedged else 0.0
+        return metrics
+
+    def _timed_call(self, source: str, fn: Callable[[], Any]) -> Tuple[str, Any]:
+        started = time.monotonic()
+        try:
+            value = fn()
+        except Exception as e:
+            logger.warning(f"Errore dalla fonte {source}: {e}")
+            value = None
+        self.latencies.record(source, time.monotonic() - started)
+        return source, value
+
+    def _record_outcome(self, candidates, winner, launched, abandoned):
+        primary = candidates[0][0]
+        with self._metrics_lock:
+            self._metrics['calls'] += 1
+            self._metrics['launched'] += launched
+            self._metrics['abandoned'] += abandoned
+            if launched > 1:
+                self._metrics['hedged_calls'] += 1
+            if winner is None:
+                self._metrics['no_result'] += 1
+                return
+            wins = self._metrics['wins_by_source']
+            wins[winner] = wins.get(winner, 0) + 1
+            if winner == primary:
+                self._metrics['primary_wins'] += 1
+            else:
+                self._metrics['hedge_wins'] += 1
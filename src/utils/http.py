@@ -9,12 +9,15 @@ import logging
 import random
 import hashlib
 import sqlite3
+import threading
 import requests
+from contextlib import contextmanager
 from typing import Dict, List, Any, Optional, Union, Tuple
 from datetime import datetime
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from pathlib import Path
+from urllib.parse import urlparse
 
 # Configurazione logging
 logger = logging.getLogger(__name__)
@@ -170,15 +173,16 @@ def make_request(
             default_headers.update(headers)
         
         # Make request
-        response = session.request(
-            method=method,
-            url=url,
-            params=params,
-            headers=default_headers,
-            data=data,
-            json=json,
-            timeout=timeout
-        )
+        with host_limiter.slot(url):
+            response = session.request(
+                method=method,
+                url=url,
+                params=params,
+                headers=default_headers,
+                data=data,
+                json=json,
+                timeout=timeout
+            )
         
         # Log request info
         logger.debug(f"Request: {method} {url} - Status: {response.status_code}")
@@ -446,7 +450,8 @@ def create_session(max_retries: int = 3, backoff_factor: float = 0.3,
 
 def get(url: str, params: Dict = None, headers: Dict = None, timeout: int = 30, 
         max_retries: int = 3, use_cache: bool = True, cache_ttl: int = 3600,
-        cache_name: str = "http_cache") -> Optional[requests.Response]:
+        cache_name: str = "http_cache",
+        rate_limiter: Optional['RateLimiter'] = None) -> Optional[requests.Response]:
     """
     Effettua una richiesta GET con retry, cache e gestione errori.
     
@@ -459,6 +464,7 @@ def get(url: str, params: Dict = None, headers: Dict = None, timeout: int = 30,
         use_cache: Se usare la cache
         cache_ttl: Tempo di vita della cache in secondi
         cache_name: Nome della cache
+        rate_limiter: Limitatore di frequenza, consultato solo se la risposta non è in cache
         
     Returns:
         Oggetto Response o None in caso di errore
@@ -488,7 +494,10 @@ def get(url: str, params: Dict = None, headers: Dict = None, timeout: int = 30,
     
     try:
         logger.debug(f"GET: {url}")
-        response = session.get(url, params=params, timeout=timeout)
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        with host_limiter.slot(url):
+            response = session.get(url, params=params, timeout=timeout)
         
         # Salva in cache se richiesto e status code accettabile
         if use_cache and cache and response.status_code == 200:
@@ -554,7 +563,8 @@ def post(url: str, data: Dict = None, json_data: Dict = None, headers: Dict = No
     
     try:
         logger.debug(f"POST: {url}")
-        response = session.post(url, data=data, json=json_data, timeout=timeout)
+        with host_limiter.slot(url):
+            response = session.post(url, data=data, json=json_data, timeout=timeout)
         return response
     except Exception as e:
         logger.error(f"Errore nella richiesta POST a {url}: {str(e)}")
@@ -608,7 +618,8 @@ def download_file(url: str, output_path: str, chunk_size: int = 8192,
         return False
 
 def get_json(url: str, params: Dict = None, headers: Dict = None, timeout: int = 30,
-            max_retries: int = 3, use_cache: bool = True, cache_ttl: int = 3600) -> Optional[Dict]:
+            max_retries: int = 3, use_cache: bool = True, cache_ttl: int = 3600,
+            rate_limiter: Optional['RateLimiter'] = None) -> Optional[Dict]:
     """
     Effettua una richiesta GET e converte il risultato in JSON.
     
@@ -620,6 +631,7 @@ def get_json(url: str, params: Dict = None, headers: Dict = None, timeout: int =
         max_retries: Numero massimo di tentativi
         use_cache: Se usare la cache
         cache_ttl: Tempo di vita della cache in secondi
+        rate_limiter: Limitatore di frequenza, consultato solo se la risposta non è in cache
         
     Returns:
         Dizionario JSON o None in caso di errore
@@ -631,7 +643,8 @@ def get_json(url: str, params: Dict = None, headers: Dict = None, timeout: int =
         timeout=timeout,
         max_retries=max_retries,
         use_cache=use_cache,
-        cache_ttl=cache_ttl
+        cache_ttl=cache_ttl,
+        rate_limiter=rate_limiter
     )
     
     if not response or response.status_code != 200:
@@ -685,3 +698,90 @@ def get_random_user_agent() -> str:
         Stringa User-Agent
     """
     return random.choice(USER_AGENTS)
+
+class RateLimiter:
+    """
+    Limitatore di frequenza condiviso tra thread.
+    
+    Ogni chiamata ad acquire() prenota il prossimo slot libero, quindi più
+    worker che interrogano la stessa API restano complessivamente entro il
+    budget di richieste al minuto.
+    """
+    
+    def __init__(self, requests_per_minute: float):
+        """
+        Args:
+            requests_per_minute: Richieste consentite al minuto (<= 0 disattiva il limite)
+        """
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """
+        Attende il proprio turno.
+        
+        Returns:
+            Secondi di attesa effettivi
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+class HostLimiter:
+    """
+    Limite di richieste concorrenti per host condiviso tra thread.
+    
+    Tutte le richieste del processo che passano da questo modulo (e dagli
+    scraper basati su BaseScraper) occupano uno slot dell'host di destinazione,
+    quindi più worker in parallelo non superano la concorrenza prevista per
+    ciascun sito o API.
+    """
+    
+    def __init__(self, default_limit: int = 4, limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            default_limit: Richieste concorrenti per host senza limite specifico (<= 0 nessun limite)
+            limits: Limiti specifici per host (es. {'api.football-data.org': 1})
+        """
+        self.default_limit = default_limit
+        self._limits = dict(limits or {})
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+    
+    def set_limit(self, host: str, limit: int):
+        """Imposta il limite di un host; vale per le richieste successive."""
+        with self._lock:
+            self._limits[host.lower()] = limit
+            self._semaphores.pop(host.lower(), None)
+    
+    def get_limit(self, host: str) -> int:
+        """Restituisce il limite di concorrenza di un host."""
+        return self._limits.get(host.lower(), self.default_limit)
+    
+    @contextmanager
+    def slot(self, url: str):
+        """Occupa uno slot dell'host dell'URL per la durata del blocco."""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None and self.get_limit(host) > 0:
+                semaphore = self._semaphores[host] = threading.BoundedSemaphore(self.get_limit(host))
+        
+        if semaphore is None:
+            yield
+            return
+        
+        semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+# Limiti per host condivisi da tutto il processo
+host_limiter = HostLimiter()
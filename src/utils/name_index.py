@@ -0,0 +1,130 @@
+"""
+Indice in memoria per la ricerca approssimata di nomi.
+Ogni nome (con i suoi alias) viene scomposto in trigrammi e parole; un indice
+invertito associa ogni elemento alle voci che lo contengono. Una ricerca
+conta gli elementi in comune solo con le voci che ne condividono almeno uno
+e restituisce i migliori candidati, su cui il chiamante applica poi la
+misura di somiglianza esatta.
+"""
+import re
+import logging
+import unicodedata
+from typing import Dict, List, Iterable, Set, Tuple, Hashable
+
+logger = logging.getLogger(__name__)
+
+_NON_ALNUM = re.compile(r'[^a-z0-9 ]+')
+_SPACES = re.compile(r'\s+')
+
+
+def index_form(name: str) -> str:
+    """Forma del nome usata nell'indice: minuscolo, senza accenti né punteggiatura."""
+    if not name:
+        return ''
+    name = unicodedata.normalize('NFKD', str(name).lower())
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    return _SPACES.sub(' ', _NON_ALNUM.sub(' ', name)).strip()
+
+
+def name_features(name: str) -> Set[str]:
+    """Trigrammi (con spazi di bordo) e parole intere di un nome in forma d'indice."""
+    if not name:
+        return set()
+    padded = f"  {name} "
+    features = {padded[i:i + 3] for i in range(len(padded) - 2)}
+    features.update(f"#{word}" for word in name.split())
+    return features
+
+
+class NameIndex:
+    """
+    Indice invertito di trigrammi e parole su nomi e alias.
+
+    Le voci sono identificate da una chiave (es. team_id); add() sostituisce
+    i nomi già indicizzati per la stessa chiave, quindi l'indice si aggiorna
+    in modo incrementale senza ricostruzioni complete.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+        self._entries: Dict[int, Tuple[Hashable, str, str, int]] = {}
+        self._entries_by_key: Dict[Hashable, List[int]] = {}
+        self._next_entry = 0
+
+    def add(self, key: Hashable, names: Iterable[str]):
+        """
+        Indicizza i nomi di una voce, sostituendo quelli precedenti.
+
+        Args:
+            key: Chiave della voce
+            names: Nome principale e alias
+        """
+        self.remove(key)
+        entry_ids = []
+        forms = {}
+        for name in names:
+            form = index_form(name)
+            if form and form not in forms:
+                forms[form] = name
+        for form, name in forms.items():
+            features = name_features(form)
+            entry_id = self._next_entry
+            self._next_entry += 1
+            self._entries[entry_id] = (key, name, form, len(features))
+            for feature in features:
+                self._postings.setdefault(feature, set()).add(entry_id)
+            entry_ids.append(entry_id)
+        if entry_ids:
+            self._entries_by_key[key] = entry_ids
+
+    def remove(self, key: Hashable):
+        """Rimuove una voce dall'indice (se presente)."""
+        for entry_id in self._entries_by_key.pop(key, []):
+            _, _, form, _ = self._entries.pop(entry_id)
+            for feature in name_features(form):
+                posting = self._postings.get(feature)
+                if posting is not None:
+                    posting.discard(entry_id)
+                    if not posting:
+                        del self._postings[feature]
+
+    def names(self, key: Hashable) -> List[str]:
+        """Nomi indicizzati di una voce, come passati ad add()."""
+        return [self._entries[entry_id][1] for entry_id in self._entries_by_key.get(key, [])]
+
+    def candidates(self, name: str, limit: int = 10, min_score: float = 0.0) -> List[Tuple[Hashable, float]]:
+        """
+        Voci con più trigrammi e parole in comune con il nome cercato.
+
+        Args:
+            name: Nome da cercare
+            limit: Numero massimo di candidati
+            min_score: Punteggio minimo (coefficiente di Dice sugli elementi)
+
+        Returns:
+            Coppie (chiave, punteggio) in ordine di punteggio decrescente
+        """
+        features = name_features(index_form(name))
+        if not features:
+            return []
+
+        shared: Dict[int, int] = {}
+        for feature in features:
+            for entry_id in self._postings.get(feature, ()):
+                shared[entry_id] = shared.get(entry_id, 0) + 1
+
+        query_size = len(features)
+        best: Dict[Hashable, float] = {}
+        for entry_id, count in shared.items():
+            key, _, _, entry_size = self._entries[entry_id]
+            score = 2 * count / (query_size + entry_size)
+            if score >= min_score and score > best.get(key, -1.0):
+                best[key] = score
+
+        return sorted(best.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries_by_key
+
+    def __len__(self) -> int:
+        return len(self._entries_by_key)
@@ -0,0 +1,194 @@
+"""
+Esecuzione di task con dipendenze dichiarate (DAG).
+Ogni task parte appena tutte le sue dipendenze sono completate con successo,
+così le fasi di I/O indipendenti si sovrappongono. I task possono aggiungere
+nuovi task durante l'esecuzione (ad esempio un task per squadra dopo aver
+scaricato le partite), i tempi di ogni task sono registrati e il sottografo
+fallito può essere rieseguito senza ripetere i task riusciti.
+"""
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Any, Optional, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = 'pending'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+STATUS_SKIPPED = 'skipped'
+
+
+class Task:
+    """Singolo nodo del grafo: una funzione senza argomenti e le sue dipendenze."""
+
+    def __init__(self, name: str, fn: Callable[[], Any], deps: Iterable[str] = ()):
+        """
+        Args:
+            name: Nome univoco del task
+            fn: Funzione da eseguire
+            deps: Nomi dei task che devono completare prima di questo
+        """
+        self.name = name
+        self.fn = fn
+        self.deps = list(deps)
+        self.reset()
+
+    def reset(self):
+        self.status = STATUS_PENDING
+        self.result = None
+        self.error: Optional[str] = None
+        self.started: Optional[float] = None
+        self.duration: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'status': self.status,
+            'deps': list(self.deps),
+            'duration': round(self.duration, 4) if self.duration is not None else None,
+            'error': self.error
+        }
+
+
+class TaskGraph:
+    """
+    Scheduler di un grafo di task su un pool di thread.
+
+    Un task il cui predecessore fallisce (o manca) viene marcato come
+    saltato; rerun_failed() rimette in coda i task falliti e saltati e
+    riesegue solo quel sottografo.
+    """
+
+    def __init__(self, max_workers: int = 4, name: str = "graph"):
+        """
+        Args:
+            max_workers: Task eseguiti contemporaneamente
+            name: Nome del grafo usato nei log e nei thread
+        """
+        self.max_workers = max(1, max_workers)
+        self.name = name
+        self._tasks: Dict[str, Task] = {}
+        self._lock = threading.Lock()
+        self._started: Optional[float] = None
+        self._duration: Optional[float] = None
+
+    def add(self, name: str, fn: Callable[[], Any], deps: Iterable[str] = ()) -> Task:
+        """
+        Aggiunge un task al grafo; può essere chiamato anche da un task in esecuzione.
+
+        Raises:
+            ValueError: Se esiste già un task con lo stesso nome
+        """
+        task = Task(name, fn, deps)
+        with self._lock:
+            if name in self._tasks:
+                raise ValueError(f"Task duplicato: {name}")
+            self._tasks[name] = task
+        return task
+
+    def has(self, name: str) -> bool:
+        with self._lock:
+            return name in self._tasks
+
+    def result(self, name: str, default: Any = None) -> Any:
+        """Restituisce il risultato di un task completato."""
+        with self._lock:
+            task = self._tasks.get(name)
+        return task.result if task and task.status == STATUS_DONE else default
+
+    def tasks(self, status: Optional[str] = None, prefix: str = "") -> List[Task]:
+        """Restituisce i task (in ordine di inserimento) filtrati per stato e prefisso."""
+        with self._lock:
+            return [t for t in self._tasks.values()
+                    if t.name.startswith(prefix) and (status is None or t.status == status)]
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Esegue tutti i task in attesa rispettando le dipendenze.
+
+        Returns:
+            Riepilogo con tempi e stato per task (vedi get_timings)
+        """
+        self._started = time.monotonic()
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name) as executor:
+            while True:
+                for task in self._ready_tasks():
+                    task.status = STATUS_RUNNING
+                    task.started = time.monotonic()
+                    running[executor.submit(task.fn)] = task
+
+                if not running:
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    task.duration = time.monotonic() - task.started
+                    try:
+                        task.result = future.result()
+                        task.status = STATUS_DONE
+                    except Exception as e:
+                        task.error = str(e)
+                        task.status = STATUS_FAILED
+                        logger.warning(f"Task {task.name} fallito: {e}")
+
+        # Dipendenze mai aggiunte al grafo
+        for task in self.tasks(STATUS_PENDING):
+            task.status = STATUS_SKIPPED
+            task.error = "Dipendenze mancanti: " + ", ".join(d for d in task.deps if not self.has(d))
+
+        self._duration = time.monotonic() - self._started
+        return self.get_timings()
+
+    def rerun_failed(self) -> Dict[str, Any]:
+        """Rimette in coda i task falliti o saltati e riesegue solo quel sottografo."""
+        for task in self.tasks():
+            if task.status in (STATUS_FAILED, STATUS_SKIPPED):
+                task.reset()
+        return self.run()
+
+    def get_timings(self) -> Dict[str, Any]:
+        """
+        Restituisce i tempi del grafo.
+
+        Returns:
+            Dizionario con durata totale, conteggi per stato e dettaglio per task
+        """
+        tasks = self.tasks()
+        counts = {}
+        for task in tasks:
+            counts[task.status] = counts.get(task.status, 0) + 1
+        busy = sum(t.duration or 0.0 for t in tasks)
+        return {
+            'duration': round(self._duration, 4) if self._duration is not None else None,
+            'busy': round(busy, 4),
+            'counts': counts,
+            'tasks': {t.name: t.to_dict() for t in tasks}
+        }
+
+    def _ready_tasks(self) -> List[Task]:
+        ready = []
+        with self._lock:
+            changed = True
+            # Propaga i fallimenti lungo le catene di dipendenze
+            while changed:
+                changed = False
+                for task in self._tasks.values():
+                    if task.status != STATUS_PENDING:
+                        continue
+                    failed = [d for d in task.deps
+                              if d in self._tasks and self._tasks[d].status in (STATUS_FAILED, STATUS_SKIPPED)]
+                    if failed:
+                        task.status = STATUS_SKIPPED
+                        task.error = "Dipendenza fallita: " + ", ".join(failed)
+                        changed = True
+
+            for task in self._tasks.values():
+                if task.status == STATUS_PENDING and all(
+                        d in self._tasks and self._tasks[d].status == STATUS_DONE for d in task.deps):
+                    ready.append(task)
+        return ready
@@ -0,0 +1,92 @@
+"""
+Benchmark sintetico del CrawlScheduler su più host.
+Confronta il crawling sequenziale (un host dopo l'altro, con il delay interno
+di BaseScraper) con lo scheduler parallelo, usando server stand-in locali.
+
+Esecuzione:
+    python tests/data/benchmark_crawl_scheduler.py
+"""
+import os
+import sys
+import time
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+sys.path.insert(0, test_dir)
+
+from src.data.scrapers.base_scraper import BaseScraper
+from src.data.scrapers.crawl_scheduler import CrawlScheduler, FetchJob, HostPolicy
+from standin_servers import start_servers, stop_servers
+
+DELAY = 0.2            # spaziatura minima per host (secondi)
+LATENCY = 0.05         # latenza simulata del server (secondi)
+JOBS_PER_HOST = 10
+HOST_COUNTS = [1, 2, 4, 8]
+
+
+def make_scrapers(servers):
+    return [
+        BaseScraper(name=f"standin_{i}", base_url=server.base_url, respect_robots=False,
+                    delay_range=(DELAY, DELAY), max_retries=0)
+        for i, server in enumerate(servers)
+    ]
+
+
+def build_jobs(scrapers, run_id):
+    return [
+        FetchJob(scraper, f"{scraper.base_url}/page/{run_id}/{n}", use_cache=False)
+        for n in range(JOBS_PER_HOST)
+        for scraper in scrapers
+    ]
+
+
+def run_sequential(scrapers, run_id):
+    # Come la pipeline attuale: tutte le pagine di un host, poi il successivo
+    started = time.perf_counter()
+    for job in sorted(build_jobs(scrapers, run_id), key=lambda j: j.host):
+        job.scraper.get(job.url, use_cache=False)
+    return time.perf_counter() - started
+
+
+def run_scheduled(scrapers, run_id):
+    policies = {
+        FetchJob(scraper, scraper.base_url).host: HostPolicy(min_interval=DELAY, max_concurrency=1)
+        for scraper in scrapers
+    }
+    started = time.perf_counter()
+    with CrawlScheduler(max_workers=16, host_policies=policies) as scheduler:
+        results = scheduler.run(build_jobs(scrapers, run_id))
+    elapsed = time.perf_counter() - started
+    failures = sum(1 for r in results if not r.success)
+    return elapsed, failures
+
+
+def min_spacing(server):
+    times = sorted(r['time'] for r in server.requests)
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    return min(gaps) if gaps else float('nan')
+
+
+def main():
+    print(f"delay={DELAY}s latency={LATENCY}s jobs/host={JOBS_PER_HOST}")
+    print(f"{'hosts':>5} {'seq (s)':>9} {'sched (s)':>10} {'speedup':>8} {'req/s':>7} {'min gap':>8}")
+    for count in HOST_COUNTS:
+        servers = start_servers(count, latency=LATENCY)
+        try:
+            scrapers = make_scrapers(servers)
+            seq = run_sequential(scrapers, "seq")
+            for server in servers:
+                server.requests.clear()
+            sched, failures = run_scheduled(scrapers, "sched")
+            total = count * JOBS_PER_HOST
+            gap = min(min_spacing(server) for server in servers)
+            print(f"{count:>5} {seq:>9.2f} {sched:>10.2f} {seq / sched:>7.1f}x {total / sched:>7.1f} {gap:>8.3f}"
+                  + (f"  ({failures} errori)" if failures else ""))
+        finally:
+            stop_servers(servers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark sintetico della deduplicazione delle partite tra fonti.
+Genera uno storico di partite da una fonte principale e una seconda fonte
+che ne ripete una parte con nomi delle squadre diversi, poi misura il tempo
+di MatchDeduplicator.group e di MatchProcessor.merge_match_data al crescere
+del numero di partite (la crescita attesa è lineare).
+
+Esecuzione:
+    python tests/data/benchmark_match_dedup.py
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+from datetime import date, timedelta
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.data.entity_registry import EntityRegistry, ENTITY_TEAM
+from src.data.processors.match_dedup import MatchDeduplicator
+from src.data.processors.matches import MatchProcessor
+
+SIZES = [10000, 50000, 100000]
+TEAMS = 400
+DUPLICATE_SHARE = 0.4
+MATCHES_PER_DAY = 30
+
+
+def make_match(source, source_id, home, away, day):
+    return {
+        'match_id': f"{source}_{source_id}", 'source': source, 'source_ids': {source: str(source_id)},
+        'home_team': {'id': home[0], 'name': home[1], 'short_name': ''},
+        'away_team': {'id': away[0], 'name': away[1], 'short_name': ''},
+        'competition': {'id': '', 'name': ''}, 'datetime': f"{day.isoformat()}T20:00:00Z",
+        'status': 'finished', 'score': {'home': 1, 'away': 0, 'winner': 'home'},
+        'venue': {'name': '', 'city': ''}, 'statistics': {}, 'lineups': {}, 'events': [], 'odds': {}
+    }
+
+
+def build_matches(size, registry):
+    """Partite della fonte principale più i duplicati della seconda fonte, mescolati."""
+    rng = random.Random(size)
+    names = [f"Squadra {i} Calcio" for i in range(TEAMS)]
+    for i, name in enumerate(names):
+        # Metà delle squadre ha l'ID della seconda fonte nel registro
+        source_ids = {'football_data': str(i)}
+        if i % 2 == 0:
+            source_ids['sofascore'] = str(10000 + i)
+        registry.register(ENTITY_TEAM, f"team_{i}", name, source_ids)
+
+    primary_size = size - int(size * DUPLICATE_SHARE)
+    primary = []
+    day = date(2000, 1, 1)
+    while len(primary) < primary_size:
+        teams = rng.sample(range(TEAMS), 2 * min(MATCHES_PER_DAY, primary_size - len(primary)))
+        for home, away in zip(teams[::2], teams[1::2]):
+            primary.append(make_match('football_data', len(primary), (str(home), names[home]),
+                                      (str(away), names[away]), day))
+        day += timedelta(days=1)
+
+    duplicates = []
+    for match in rng.sample(primary, int(size * DUPLICATE_SHARE)):
+        home = int(match['home_team']['id'])
+        away = int(match['away_team']['id'])
+        duplicates.append(make_match(
+            'sofascore', len(duplicates),
+            (str(10000 + home), f"FC Squadra {home}"), (str(10000 + away), f"Squadra {away}"),
+            date.fromisoformat(match['datetime'][:10])
+        ))
+
+    matches = primary + duplicates
+    rng.shuffle(matches)
+    return matches
+
+
+def main():
+    processor = MatchProcessor.for_normalization()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        registry = EntityRegistry(os.path.join(tmp_dir, "entities.json"))
+        for size in SIZES:
+            matches = build_matches(size, registry)
+
+            start = time.perf_counter()
+            groups = MatchDeduplicator(registry).group(matches)
+            group_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            merged = [processor.merge_match_data(group[0]['match_id'], group) if len(group) > 1 else group[0]
+                      for group in groups]
+            merge_time = time.perf_counter() - start
+
+            print(f"{size:>7} partite -> {len(merged):>7} uniche (attese {size - int(size * DUPLICATE_SHARE)}) | "
+                  f"raggruppamento {group_time:6.2f}s ({size / group_time:,.0f}/s) | "
+                  f"unione {merge_time:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
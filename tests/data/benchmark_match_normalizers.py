@@ -0,0 +1,118 @@
+"""
+Benchmark sintetico della normalizzazione delle partite per fonte.
+Misura le partite normalizzate al secondo da MatchProcessor.process_match
+per ogni fonte registrata, con un record grezzo rappresentativo del formato
+della fonte, e la conversione in blocco degli stati.
+
+Esecuzione:
+    python tests/data/benchmark_match_normalizers.py
+"""
+import os
+import sys
+import time
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.data.processors.matches import MatchProcessor
+from src.data.processors.match_normalizers import map_statuses
+
+ROUNDS = 20000
+
+SAMPLES = {
+    'football_data': {
+        'id': 1234, 'utcDate': '2023-05-20T20:45:00Z', 'status': 'FINISHED', 'venue': 'San Siro',
+        'homeTeam': {'id': 98, 'name': 'AC Milan', 'shortName': 'Milan'},
+        'awayTeam': {'id': 108, 'name': 'FC Internazionale Milano', 'shortName': 'Inter'},
+        'competition': {'id': 2019, 'name': 'Serie A'},
+        'score': {'fullTime': {'home': 1, 'away': 2}},
+        'referees': [{'name': 'Daniele Orsato', 'role': 'REFEREE'}]
+    },
+    'api_football': {
+        'fixture': {'id': 1234, 'date': '2023-05-20T20:45:00+00:00', 'status': {'short': 'FT'},
+                    'venue': {'name': 'San Siro', 'city': 'Milano'}},
+        'teams': {'home': {'id': 489, 'name': 'AC Milan'}, 'away': {'id': 505, 'name': 'Inter'}},
+        'league': {'id': 135, 'name': 'Serie A'},
+        'goals': {'home': 1, 'away': 2},
+        'statistics': [{'team': {'id': 489}, 'statistics': [{'type': 'Shots on Goal', 'value': 4}]},
+                       {'team': {'id': 505}, 'statistics': [{'type': 'Shots on Goal', 'value': 6}]}]
+    },
+    'flashscore': {
+        'id': 'xYz123', 'home_team': 'AC Milan', 'away_team': 'Inter', 'tournament': 'Serie A',
+        'date': '20/05/2023', 'time': '20:45', 'status': 'Finished', 'score': {'home': '1', 'away': '2'}
+    },
+    'fbref': {
+        'match_id': 'a1b2c3', 'home_team': {'id': 'dc56fe14', 'name': 'Milan'},
+        'away_team': {'id': 'd609edc0', 'name': 'Inter'}, 'competition': {'id': '11', 'name': 'Serie A'},
+        'date': '2023-05-20', 'time': '20:45', 'status': 'Complete', 'venue': 'Stadio Giuseppe Meazza',
+        'score': {'home': 1, 'away': 2}, 'xg': {'home': 1.3, 'away': 1.9}
+    },
+    'understat': {
+        'id': 21564, 'h': {'id': 75, 'title': 'AC Milan'}, 'a': {'id': 87, 'title': 'Inter'},
+        'datetime': '2023-05-20 20:45:00', 'isResult': True, 'goals': {'h': '1', 'a': '2'},
+        'league': {'id': 3, 'name': 'Serie A'}, 'xG': {'h': '1.31', 'a': '1.94'},
+        'shots': [{'minute': 12, 'player': 'Leao', 'xG': 0.12, 'X': 0.88, 'Y': 0.41, 'result': 'SavedShot', 'h_a': 'h'},
+                  {'minute': 33, 'player': 'Lautaro', 'xG': 0.45, 'X': 0.91, 'Y': 0.52, 'result': 'Goal', 'h_a': 'a'}]
+    },
+    'sofascore': {
+        'id': 10389234, 'startTimestamp': 1684608300, 'status': {'type': 'finished'},
+        'homeTeam': {'id': 2692, 'name': 'Milan', 'shortName': 'Milan'},
+        'awayTeam': {'id': 2697, 'name': 'Inter', 'shortName': 'Inter'},
+        'tournament': {'id': 33, 'name': 'Serie A'},
+        'homeScore': {'current': 1}, 'awayScore': {'current': 2},
+        'venue': {'stadium': {'name': 'San Siro'}, 'city': {'name': 'Milano'}}
+    },
+    'footystats': {
+        'id': 5521, 'home_team': {'id': 1, 'name': 'AC Milan'}, 'away_team': {'id': 2, 'name': 'Inter'},
+        'league': {'id': 7, 'name': 'Serie A'}, 'date': '2023-05-20T20:45:00', 'status': 'complete',
+        'home_score': 1, 'away_score': 2
+    },
+    'whoscored': {
+        'matchId': 1640123, 'home': {'teamId': 80, 'name': 'AC Milan'}, 'away': {'teamId': 75, 'name': 'Inter'},
+        'tournament': {'tournamentId': 5, 'name': 'Serie A'}, 'matchDate': '2023-05-20T20:45:00',
+        'status': 'FT', 'score': {'homeScore': 1, 'awayScore': 2}
+    },
+    'worldfootball': {
+        'id': 'milan-inter-2023', 'home_team': 'AC Milan', 'away_team': 'Inter', 'competition': 'Serie A',
+        'date': '20/05/2023', 'time': '20:45', 'status': 'finished', 'score': '1:2'
+    },
+    'soccerway': {
+        'id': 3876543, 'home_team': 'AC Milan', 'away_team': 'Inter', 'competition': 'Serie A',
+        'date': '20/05/2023', 'time': '20:45', 'status': 'FT', 'score': '1 - 2', 'venue': 'San Siro'
+    },
+    'open_football': {
+        'team1': 'AC Milan', 'team2': 'Inter', 'competition': 'Serie A', 'date': '2023-05-20',
+        'score1': 1, 'score2': 2
+    },
+    'statsbomb': {
+        'match_id': 3878561, 'match_date': '2023-05-20',
+        'home_team': {'home_team_id': 243, 'home_team_name': 'AC Milan'},
+        'away_team': {'away_team_id': 238, 'away_team_name': 'Inter'},
+        'competition': {'competition_id': 12, 'competition_name': 'Serie A'},
+        'home_score': 1, 'away_score': 2
+    },
+}
+
+
+def main():
+    processor = MatchProcessor.for_normalization()
+
+    print(f"{'fonte':<15} {'partite/s':>12}")
+    for source, sample in SAMPLES.items():
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            processor.process_match(sample, source)
+        elapsed = time.perf_counter() - started
+        print(f"{source:<15} {ROUNDS / elapsed:>12,.0f}")
+
+    statuses = ['FINISHED', 'SCHEDULED', 'IN_PLAY', 'POSTPONED'] * (ROUNDS // 4)
+    started = time.perf_counter()
+    map_statuses('football_data', statuses)
+    elapsed = time.perf_counter() - started
+    print(f"{'stati (blocco)':<15} {len(statuses) / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark sintetico della normalizzazione a blocchi su pool di processi.
+Confronta la normalizzazione in-process di un lotto di 50.000 partite
+football-data con quella divisa in blocchi su 2 e 4 processi, e verifica
+che l'output sia identico e nello stesso ordine.
+
+Esecuzione:
+    python tests/data/benchmark_normalization_pool.py
+"""
+import os
+import sys
+import time
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.data.processors.matches import MatchProcessor
+from src.data.processors.parallel import normalize_records
+
+MATCHES = 50000
+CHUNK_SIZE = 1000
+WORKER_COUNTS = [2, 4]
+STATUSES = ['SCHEDULED', 'FINISHED', 'IN_PLAY', 'POSTPONED']
+
+
+def build_matches(count):
+    return [
+        {
+            'id': 100000 + n,
+            'homeTeam': {'id': n % 20, 'name': f"Home {n % 20}", 'shortName': f"H{n % 20}"},
+            'awayTeam': {'id': (n + 7) % 20, 'name': f"Away {(n + 7) % 20}"},
+            'competition': {'id': 2019, 'name': 'Serie A'},
+            'utcDate': f"20{10 + n % 14:02d}-0{1 + n % 9}-1{n % 10}T18:00:00Z",
+            'status': STATUSES[n % len(STATUSES)],
+            'score': {'fullTime': {'home': n % 4, 'away': n % 3}},
+            'referees': [{'name': f"Referee {n % 30}"}]
+        }
+        for n in range(count)
+    ]
+
+
+def comparable(matches):
+    # last_updated dipende dall'istante di normalizzazione
+    return [{k: v for k, v in match.items() if k != 'last_updated'} for match in matches]
+
+
+def run(processor, matches, workers):
+    started = time.perf_counter()
+    normalized = normalize_records(processor, 'process_match', matches, 'football_data',
+                                   workers=workers, chunk_size=CHUNK_SIZE, threshold=0)
+    return normalized, time.perf_counter() - started
+
+
+def main():
+    processor = MatchProcessor.for_normalization()
+    matches = build_matches(MATCHES)
+
+    baseline, baseline_elapsed = run(processor, matches, workers=1)
+    print(f"CPU disponibili: {os.cpu_count()}")
+    print(f"{'processi':>9} {'tempo (s)':>10} {'speedup':>8} {'identico':>9}")
+    print(f"{1:>9} {baseline_elapsed:>10.2f} {1.0:>8.2f} {'-':>9}")
+
+    expected = comparable(baseline)
+    for workers in WORKER_COUNTS:
+        normalized, elapsed = run(processor, matches, workers)
+        identical = comparable(normalized) == expected
+        print(f"{workers:>9} {elapsed:>10.2f} {baseline_elapsed / elapsed:>8.2f} {str(identical):>9}")
+
+
+if __name__ == "__main__":
+    main()
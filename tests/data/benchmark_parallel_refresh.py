@@ -0,0 +1,127 @@
+"""
+Benchmark dell'aggiornamento parallelo dei campionati in DataCollector.
+Ogni campionato simula l'aggiornamento reale con richieste a tre host
+stand-in (API partite, API classifiche, sito di statistiche); il tempo di
+refresh_all_leagues sequenziale viene confrontato con la modalità a pool,
+con limiti per host attivi.
+
+Esecuzione:
+    python tests/data/benchmark_parallel_refresh.py
+"""
+import os
+import sys
+import time
+import logging
+import threading
+from unittest import mock
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+sys.path.insert(0, test_dir)
+
+import src.data.collector as collector_module
+import src.data.work_queue as work_queue_module
+from src.data.collector import DataCollector
+from src.utils.http import get_json, host_limiter
+from standin_servers import start_servers, stop_servers
+
+LATENCY = 0.03         # latenza simulata del server (secondi)
+TEAMS_PER_LEAGUE = 2   # richieste di statistiche squadra per campionato
+HOST_LIMIT = 4         # richieste concorrenti consentite per host
+LEAGUE_COUNTS = [10, 30, 100]
+WORKER_COUNTS = [5, 10]
+
+
+class RecordingReference:
+    """Riferimento Firebase locale che registra le scritture."""
+
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+
+    def set(self, value):
+        with self.db.lock:
+            self.db.writes.append(self.path)
+
+    def push(self, value):
+        self.set(value)
+
+    def get(self):
+        return None
+
+
+class RecordingDB:
+    def __init__(self):
+        self.writes = []
+        self.lock = threading.Lock()
+
+    def get_reference(self, path):
+        return RecordingReference(self, path)
+
+
+def make_collector(servers, workers):
+    # Solo gli attributi usati da refresh_all_leagues: niente Firebase né client reali
+    collector = DataCollector.__new__(DataCollector)
+    collector.db = RecordingDB()
+    collector.errors = []
+    collector.max_workers = workers
+    collector.request_semaphore = threading.Semaphore(workers)
+    collector.deadline = None
+    collector.checkpoint = None
+    collector.start_checkpoint = lambda resume=False: None
+    collector.prefetch_matches = lambda league_ids, **kwargs: {}
+
+    matches_api, standings_api, stats_site = (server.base_url for server in servers)
+
+    def refresh_league_data(league_id):
+        matches = get_json(f"{matches_api}/matches/{league_id}", use_cache=False) or {}
+        get_json(f"{standings_api}/standings/{league_id}", use_cache=False)
+        for team in range(TEAMS_PER_LEAGUE):
+            get_json(f"{stats_site}/teams/{league_id}/{team}", use_cache=False)
+        collector.db.get_reference(f"data/matches/{league_id}/items").set(matches)
+        return {'matches': {'count': len(matches.get('matches', []))}, 'errors': []}
+
+    collector.refresh_league_data = refresh_league_data
+    return collector
+
+
+def run(servers, league_count, parallel, workers):
+    leagues = {f"league_{i:03d}": {} for i in range(league_count)}
+    collector = make_collector(servers, workers)
+    with mock.patch.object(collector_module, 'get_active_leagues', return_value=leagues), \
+            mock.patch.object(collector_module, 'get_setting', side_effect=lambda key, default=None: default), \
+            mock.patch.object(work_queue_module, 'get_leagues_by_priority', return_value=[]):
+        started = time.perf_counter()
+        results = collector.refresh_all_leagues(parallel=parallel, max_workers=workers)
+        elapsed = time.perf_counter() - started
+    return elapsed, results
+
+
+def main():
+    logging.disable(logging.INFO)
+    servers = start_servers(3, latency=LATENCY, default_body={})
+    servers[0].default_body = {'matches': [{'id': 1}, {'id': 2}]}
+    for server in servers:
+        host_limiter.set_limit(server.base_url.split('://')[1], HOST_LIMIT)
+
+    try:
+        print(f"latency={LATENCY}s requests/league={2 + TEAMS_PER_LEAGUE} host limit={HOST_LIMIT}")
+        header = f"{'leagues':>7} {'seq (s)':>9}" + "".join(f" {f'pool {w} (s)':>12} {'speedup':>8}" for w in WORKER_COUNTS)
+        print(header)
+        for count in LEAGUE_COUNTS:
+            seq, expected = run(servers, count, False, 1)
+            row = f"{count:>7} {seq:>9.2f}"
+            for workers in WORKER_COUNTS:
+                elapsed, results = run(servers, count, True, workers)
+                same = {k: v for k, v in results.items() if k not in ('timestamp', 'mode')} == \
+                    {k: v for k, v in expected.items() if k not in ('timestamp', 'mode')}
+                row += f" {elapsed:>12.2f} {seq / elapsed:>7.1f}x" + ("" if same else " (risultati diversi)")
+            print(row)
+    finally:
+        stop_servers(servers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""
+Cache in memoria per i test dei client delle API.
+Sostituisce la cache dei metodi decorati con @cached in modo che le chiamate
+singole e le richieste batch leggano e scrivano le stesse voci.
+"""
+from unittest import mock
+
+
+def memory_caches(*methods):
+    """Sostituisce la cache dei metodi @cached con un dizionario in memoria."""
+    store = {}
+    patches = []
+    for method in methods:
+        patches.append(mock.patch.object(method.cache, 'get', side_effect=store.get))
+        patches.append(mock.patch.object(method.cache, 'set',
+                                         side_effect=lambda key, value, ttl=3600: store.__setitem__(key, value)))
+    return store, patches
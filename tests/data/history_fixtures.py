@@ -0,0 +1,73 @@
+"""
+Partite e database in memoria per i test dello storico dei risultati.
+Il database restituisce riferimenti come FirebaseManager.get_reference e
+legge con get come FirebaseManager.get; HistoryTestCase prepara per ogni
+test un registro delle entità in una directory temporanea.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from typing import Dict, List, Any
+
+from src.data.entity_registry import EntityRegistry
+from src.data.processors.league_history import ResultHistory
+
+
+def finished(match_id, home, away, date, home_goals, away_goals, league='serie_a'):
+    """Partita conclusa in formato standard."""
+    return {
+        'match_id': match_id, 'source': 'football_data', 'status': 'finished', 'datetime': f"{date}T18:00:00Z",
+        'home_team': {'id': home, 'name': home.title()}, 'away_team': {'id': away, 'name': away.title()},
+        'competition': {'id': league, 'name': 'Serie A'},
+        'score': {'home': home_goals, 'away': away_goals, 'winner': None}
+    }
+
+
+class MatchesReference:
+    """Riferimento Firebase in memoria al nodo matches."""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+
+    def get(self):
+        return self.data
+
+
+class FakeDatabase:
+    """Nodo matches in memoria che conta le letture e registra le scritture."""
+
+    def __init__(self, matches: List[Dict[str, Any]]):
+        self.matches = {match['match_id']: match for match in matches}
+        self.saved: Dict[str, Any] = {}
+        self.reads = 0
+
+    def get_reference(self, path):
+        if path == "matches":
+            self.reads += 1
+            return MatchesReference(dict(self.matches))
+        return None
+
+    def get(self, path, default=None):
+        # Come FirebaseManager.get: legge dal riferimento
+        ref = self.get_reference(path)
+        return (ref.get() if ref else None) or default
+
+    def set(self, path, value):
+        self.saved[path] = value
+        return True
+
+
+class HistoryTestCase(unittest.TestCase):
+    """Test con un registro delle entità temporaneo e uno storico dei risultati."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.registry = EntityRegistry(os.path.join(self.tmp_dir, "entities.json"))
+
+    def make_history(self, matches: List[Dict[str, Any]]) -> ResultHistory:
+        """Crea self.db con le partite e self.history che lo legge."""
+        self.db = FakeDatabase(matches)
+        self.history = ResultHistory(self.db, self.registry)
+        return self.history
@@ -0,0 +1,99 @@
+"""
+Server HTTP locali che simulano i siti/API esterni nei benchmark.
+Ogni StandInServer ascolta su una porta diversa di 127.0.0.1, quindi per lo
+scheduler è un host distinto. Le risposte possono essere fisse o "replay" di
+payload registrati (path -> corpo), con una latenza artificiale configurabile.
+"""
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlparse
+
+
+class StandInServer:
+    """Server HTTP locale con latenza simulata e registro delle richieste."""
+
+    def __init__(self, latency: float = 0.05, routes: Optional[Dict[str, Any]] = None,
+                 default_body: str = "<html><body>ok</body></html>"):
+        """
+        Args:
+            latency: Secondi di attesa prima di ogni risposta
+            routes: Mappa path -> corpo (str o oggetto serializzabile in JSON)
+            default_body: Corpo restituito per i path non presenti in routes
+        """
+        self.latency = latency
+        self.routes = routes or {}
+        self.default_body = default_body
+        self.requests: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'StandInServer':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                started = time.monotonic()
+                with server._lock:
+                    server.requests.append({'path': self.path, 'time': started})
+                if server.latency:
+                    time.sleep(server.latency)
+
+                body = server.routes.get(urlparse(self.path).path, server.default_body)
+                if callable(body):
+                    body = body(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                if not isinstance(body, str):
+                    body = json.dumps(body)
+                    content_type = "application/json"
+                else:
+                    content_type = "text/html; charset=utf-8"
+
+                payload = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def start_servers(count: int, **kwargs) -> List[StandInServer]:
+    """Avvia `count` server stand-in con la stessa configurazione."""
+    return [StandInServer(**kwargs).start() for _ in range(count)]
+
+
+def stop_servers(servers: List[StandInServer]):
+    """Arresta i server stand-in."""
+    for server in servers:
+        server.stop()
@@ -0,0 +1,153 @@
+"""
+Test per il client API-Football.
+Verifica che tutte le richieste di rete passino dal budget condiviso, che
+le risposte già in cache non lo consumino e che le richieste batch popolino
+le stesse voci di cache lette dalle chiamate singole.
+"""
+import os
+import sys
+import json
+import unittest
+from unittest import mock
+
+import requests
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+sys.path.insert(0, test_dir)
+
+import src.utils.http as http_module
+import src.data.api.api_football as api_football_module
+from src.utils.http import RateLimiter, get_json
+from src.data.api.api_football import APIFootball
+from cache_fixtures import memory_caches
+
+
+class CountingLimiter(RateLimiter):
+    """Limitatore senza attese che conta gli slot occupati."""
+
+    def __init__(self):
+        super().__init__(0)
+        self.acquired = 0
+
+    def acquire(self) -> float:
+        self.acquired += 1
+        return 0.0
+
+
+class FakeHTTPCache:
+    """Cache HTTP in memoria con le risposte indicate."""
+
+    entries = {}
+
+    def __init__(self, name="http_cache"):
+        pass
+
+    def get(self, url, method="GET", params=None, headers=None):
+        return self.entries.get(url)
+
+    def set(self, url, method, params, headers, response_text, status_code, ttl):
+        self.entries[url] = {'text': response_text, 'status_code': status_code}
+
+
+class FakeSession:
+    """Sessione che restituisce sempre la stessa risposta JSON."""
+
+    def __init__(self, payload):
+        self.headers = {}
+        self.payload = payload
+
+    def get(self, url, params=None, timeout=None):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(self.payload).encode()
+        return response
+
+
+class TestRateLimitedRequests(unittest.TestCase):
+    """Test per il budget di richieste condiviso."""
+
+    def setUp(self):
+        FakeHTTPCache.entries = {}
+        self.api = APIFootball(api_key="test")
+
+    def test_every_request_uses_shared_limiter(self):
+        """Tutti i metodi passano il limitatore condiviso alla richiesta."""
+        with mock.patch.object(api_football_module, 'get_json',
+                               return_value={'response': [{'team': {'id': 1}}]}) as fake_get_json:
+            APIFootball.get_team.__wrapped__(self.api, 1)
+            APIFootball.get_fixture.__wrapped__(self.api, 10)
+            APIFootball.get_standings.__wrapped__(self.api, 135, 2023)
+            self.api.get_match_head_to_head(1, 2)
+
+        self.assertEqual(fake_get_json.call_count, 4)
+        for call in fake_get_json.call_args_list:
+            self.assertIs(call.kwargs['rate_limiter'], APIFootball._rate_limiter)
+
+    def test_cache_hit_takes_no_slot(self):
+        """Solo le richieste che vanno in rete occupano uno slot del budget."""
+        limiter = CountingLimiter()
+        url = "https://api-football-v1.p.rapidapi.com/v3/teams"
+        with mock.patch.object(http_module, 'HTTPCache', FakeHTTPCache), \
+                mock.patch.object(http_module, 'create_session',
+                                  return_value=FakeSession({'response': [1]})):
+            self.assertEqual(get_json(url, params={'id': 1}, rate_limiter=limiter), {'response': [1]})
+            self.assertEqual(limiter.acquired, 1)
+
+            # Seconda richiesta servita dalla cache HTTP
+            self.assertEqual(get_json(url, params={'id': 1}, rate_limiter=limiter), {'response': [1]})
+            self.assertEqual(limiter.acquired, 1)
+
+    def test_limiter_spaces_requests(self):
+        """Il limitatore distanzia gli slot consecutivi dell'intervallo previsto."""
+        limiter = RateLimiter(1200)
+        waits = [limiter.acquire() for _ in range(3)]
+        self.assertEqual(waits[0], 0)
+        self.assertGreater(sum(waits), 0.07)
+
+
+class TestBatchCacheKeys(unittest.TestCase):
+    """Test per le voci di cache popolate dalle richieste batch."""
+
+    METHODS = (APIFootball.get_fixture, APIFootball.get_fixture_statistics,
+               APIFootball.get_fixture_events, APIFootball.get_fixture_lineups)
+
+    def setUp(self):
+        self.store, patches = memory_caches(*self.METHODS)
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_batch_keys_match_single_calls(self):
+        """Le chiavi del batch coincidono con quelle delle chiamate singole, per ID int o str."""
+        api = APIFootball(api_key="test")
+        item = {'fixture': {'id': 7}, 'events': [{'type': 'Goal'}],
+                'statistics': [{'team': {'id': 1}, 'statistics': [{'type': 'Shots', 'value': 3}]}],
+                'lineups': []}
+        with mock.patch.object(APIFootball, '_request', return_value={'response': [item]}) as request:
+            self.assertEqual(api.get_fixtures_batch(['7']), {7: item})
+
+            other = APIFootball(api_key="test")
+            for method in self.METHODS:
+                for call in ((other, 7), (other, '7'), (api, ' 7')):
+                    self.assertIn(method.make_key(*call), self.store)
+                self.assertEqual(method.make_key(api, fixture_id=7), method.make_key(api, 7))
+
+            # Le chiamate singole, anche da un'altra istanza, non fanno richieste
+            self.assertEqual(other.get_fixture_events('7'), [{'type': 'Goal'}])
+            self.assertEqual(other.get_fixture_statistics(fixture_id=7), {'1': [{'type': 'Shots', 'value': 3}]})
+            self.assertEqual(request.call_count, 1)
+
+    def test_cached_ids_are_not_fetched(self):
+        """Gli ID già in cache non vengono richiesti di nuovo."""
+        api = APIFootball(api_key="test")
+        APIFootball.get_fixture.prime({'fixture': {'id': 3}}, api, '3')
+        with mock.patch.object(APIFootball, '_request', return_value={'response': []}) as request:
+            self.assertEqual(api.get_fixtures_batch([3]), {3: {'fixture': {'id': 3}}})
+        request.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Test per l'elaborazione a blocchi dei lotti di partite e squadre.
+Verifica la lettura anticipata dei dati salvati, l'ordine dei risultati con
+più thread, l'isolamento degli errori dei singoli elementi e la risposta
+degli elementi quando la lettura anticipata fallisce.
+"""
+import os
+import sys
+import time
+import threading
+import unittest
+from unittest import mock
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+import src.data.processors as processors_module
+from src.data.processors.batch import prefetch, stream_batch
+
+
+class FakeReference:
+    """Riferimento Firebase in memoria."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def get(self):
+        return self.data
+
+
+class FakeDatabase:
+    """Nodo in memoria che registra i percorsi letti."""
+
+    def __init__(self, items):
+        self.items = items
+        self.paths = []
+        self.lock = threading.Lock()
+
+    def get_reference(self, path):
+        with self.lock:
+            self.paths.append(path)
+        if path == "matches":
+            return FakeReference(dict(self.items))
+        return FakeReference(self.items.get(path.split("/", 1)[1]))
+
+
+class FailingReference:
+    """Riferimento la cui lettura fallisce."""
+
+    def get(self):
+        raise ConnectionError("database non raggiungibile")
+
+
+class FailingDatabase:
+    """Database che non risponde."""
+
+    def get_reference(self, path):
+        return FailingReference()
+
+
+def error_response(item_id, error):
+    return {'success': 0, 'error': str(error)}
+
+
+class TestBatch(unittest.TestCase):
+    """Test per prefetch e stream_batch."""
+
+    def setUp(self):
+        self.db = FakeDatabase({f"m{i}": {'match_id': f"m{i}"} for i in range(10)})
+
+    def test_prefetch_bulk_or_per_id(self):
+        """Sopra la soglia si legge il nodo una volta; sotto, solo gli ID richiesti."""
+        stored = prefetch(self.db, "matches", ['m1', 'm2', 'x', 'm1'], bulk_threshold=3)
+        self.assertEqual(sorted(stored), ['m1', 'm2'])
+        self.assertEqual(self.db.paths, ["matches"])
+
+        self.db.paths = []
+        stored = prefetch(self.db, "matches", ['m3', 'x'], bulk_threshold=3, workers=2)
+        self.assertEqual(list(stored), ['m3'])
+        self.assertEqual(sorted(self.db.paths), ["matches/m3", "matches/x"])
+
+    def test_results_in_order_with_isolated_failures(self):
+        """I risultati seguono l'ordine degli ID anche se i blocchi finiscono in ordine diverso."""
+        ids = [f"m{i}" for i in range(10)] + ['missing']
+        stored = prefetch(self.db, "matches", ids, bulk_threshold=1)
+        threads = set()
+
+        def process(item_id, match):
+            threads.add(threading.current_thread().name)
+            time.sleep(0.02 if item_id in ('m0', 'm1') else 0)
+            if item_id == 'm4':
+                raise ValueError("errore di rete")
+            return {'success': 1 if match else 0}
+
+        results = list(stream_batch(ids, process, stored, error_response, workers=4, chunk_size=2))
+
+        self.assertEqual([item_id for item_id, _ in results], ids)
+        self.assertEqual(dict(results)['m4'], {'success': 0, 'error': "errore di rete"})
+        self.assertEqual(dict(results)['m5'], {'success': 1})
+        self.assertEqual(dict(results)['missing'], {'success': 0})
+        self.assertGreater(len(threads), 1)
+
+    def test_streaming_is_lazy(self):
+        """Il generatore elabora solo i blocchi necessari ai risultati letti (più quelli in anticipo)."""
+        processed = []
+        stream = stream_batch([str(i) for i in range(100)], lambda item_id, _: processed.append(item_id) or {},
+                              {}, error_response, workers=2, chunk_size=5)
+        self.assertEqual(next(stream)[0], '0')
+        self.assertLessEqual(len(processed), 4 * 5)
+        stream.close()
+
+
+class TestPrefetchErrors(unittest.TestCase):
+    """Test per gli errori della lettura anticipata."""
+
+    def test_read_error_is_raised(self):
+        """Un errore di lettura non diventa un lotto di elementi non trovati."""
+        for bulk_threshold in (1, 10):
+            with self.assertRaises(ConnectionError):
+                prefetch(FailingDatabase(), "matches", ['m1', 'm2'], bulk_threshold=bulk_threshold)
+
+    def test_each_item_reports_read_error(self):
+        """Ogni partita e squadra del lotto riceve l'errore di lettura, non "non trovata"."""
+        processor = mock.Mock(db=FailingDatabase())
+        with mock.patch.object(processors_module, 'get_match_processor', return_value=processor), \
+                mock.patch.object(processors_module, 'get_team_processor', return_value=processor):
+            matches = processors_module.batch_process_matches(['m1', 'm2'])
+            teams = dict(processors_module.iter_process_teams(['inter']))
+
+        self.assertEqual(list(matches), ['m1', 'm2'])
+        self.assertEqual(list(teams), ['inter'])
+        for response in list(matches.values()) + list(teams.values()):
+            self.assertEqual(response['success'], 0)
+            self.assertEqual(response['error'], "database non raggiungibile")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Test per i checkpoint delle esecuzioni di raccolta dati.
+Verifica validità per impronta, scadenza automatica e ripartenza da zero.
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.data.checkpoint import RunCheckpoint, fingerprint
+
+
+class TestRunCheckpoint(unittest.TestCase):
+    """Test per RunCheckpoint."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, 'checkpoints.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_survives_restart_and_checks_fingerprint(self):
+        """Un checkpoint vale dopo la riapertura solo con la stessa impronta."""
+        fp = fingerprint('serie_a', '2024-05-01', 7, 3)
+        checkpoint = RunCheckpoint(db_path=self.db_path, ttl=3600)
+        checkpoint.mark_done('league:serie_a', fp, {'matches': {'count': 10}})
+        checkpoint.close()
+
+        reopened = RunCheckpoint(db_path=self.db_path, ttl=3600)
+        self.assertEqual(reopened.get('league:serie_a', fp), {'matches': {'count': 10}})
+        self.assertFalse(reopened.is_done('league:serie_a', fingerprint('serie_a', '2024-05-02', 7, 3)))
+        self.assertEqual(reopened.count('league:'), 1)
+        reopened.close()
+
+    def test_stale_checkpoints_expire(self):
+        """I checkpoint più vecchi del TTL non valgono e vengono eliminati."""
+        checkpoint = RunCheckpoint(db_path=self.db_path, ttl=0.05)
+        checkpoint.mark_done('serie_a:standings', 'fp')
+        self.assertTrue(checkpoint.is_done('serie_a:standings', 'fp'))
+        time.sleep(0.1)
+        self.assertFalse(checkpoint.is_done('serie_a:standings', 'fp'))
+        self.assertEqual(checkpoint.purge_expired(), 1)
+        checkpoint.close()
+
+    def test_clear_is_per_run(self):
+        """clear() elimina solo i checkpoint dell'esecuzione indicata."""
+        collection = RunCheckpoint('collection', db_path=self.db_path, ttl=3600)
+        other = RunCheckpoint('publishing', db_path=self.db_path, ttl=3600)
+        collection.mark_done('league:serie_a', 'fp')
+        other.mark_done('league:serie_a', 'fp')
+
+        collection.clear()
+
+        self.assertFalse(collection.is_done('league:serie_a', 'fp'))
+        self.assertTrue(other.is_done('league:serie_a', 'fp'))
+        collection.close()
+        other.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Test per la scadenza delle esecuzioni e i budget per fase e per fonte.
+Verifica margini per priorità, esaurimento dei budget e report del lavoro rimandato.
+"""
+import os
+import sys
+import time
+import unittest
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.utils.deadline import RunDeadline, PRIORITY_CRITICAL, PRIORITY_NORMAL, PRIORITY_LOW
+
+
+class TestRunDeadline(unittest.TestCase):
+    """Test per RunDeadline."""
+
+    def test_low_priority_work_is_dropped_first(self):
+        """Avvicinandosi alla scadenza cade prima il lavoro a bassa priorità, poi quello normale."""
+        deadline = RunDeadline(seconds=1.0, reserve=0.1, budgets={}, normal_margin=0.2, low_margin=0.6)
+        self.assertTrue(deadline.allows(priority=PRIORITY_LOW))
+
+        time.sleep(0.35)
+        self.assertFalse(deadline.allows(priority=PRIORITY_LOW))
+        self.assertTrue(deadline.allows(priority=PRIORITY_NORMAL))
+
+        time.sleep(0.4)
+        self.assertFalse(deadline.allows(priority=PRIORITY_NORMAL))
+        self.assertTrue(deadline.allows(priority=PRIORITY_CRITICAL))
+        self.assertFalse(deadline.expired())
+
+    def test_source_budget(self):
+        """Una fonte che ha esaurito il proprio budget non viene più interrogata."""
+        deadline = RunDeadline(budgets={'source:fbref': 0.05})
+        self.assertTrue(deadline.allows('source:fbref', PRIORITY_LOW))
+
+        with deadline.track('source:fbref'):
+            time.sleep(0.06)
+
+        self.assertFalse(deadline.allows('source:fbref', PRIORITY_CRITICAL))
+        self.assertTrue(deadline.allows('source:sofascore', PRIORITY_LOW))
+
+    def test_report_lists_deferred_work(self):
+        """Il report elenca il lavoro rimandato e il tempo speso per nome."""
+        deadline = RunDeadline(budgets={})
+        with deadline.track('stage:predictions'):
+            pass
+        deadline.defer('league', 'eredivisie')
+        deadline.defer('task', 'serie_a:prediction:42')
+
+        report = deadline.report()
+
+        self.assertIsNone(report['remaining'])
+        self.assertIn('stage:predictions', report['spent'])
+        self.assertEqual([d['item'] for d in report['deferred']], ['eredivisie', 'serie_a:prediction:42'])
+        self.assertEqual(len(deadline.deferred('league')), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
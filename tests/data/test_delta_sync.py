@@ -0,0 +1,135 @@
+"""
+Test per la sincronizzazione incrementale delle partite di un campionato.
+Verifica che le partite grezze vengano normalizzate con la fonte da cui sono
+state raccolte e che una sincronizzazione senza modifiche non scriva nulla.
+"""
+import os
+import sys
+import copy
+import unittest
+from unittest import mock
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.data.collector import DataCollector
+from src.data.processors.matches import MatchProcessor
+
+
+def fd_match(match_id, home, away, home_goals=None, away_goals=None):
+    """Partita grezza di football-data.org."""
+    finished = home_goals is not None
+    return {
+        'id': match_id, 'utcDate': '2024-03-02T17:00:00Z', 'status': 'FINISHED' if finished else 'SCHEDULED',
+        'homeTeam': {'id': home[0], 'name': home[1], 'shortName': home[1]},
+        'awayTeam': {'id': away[0], 'name': away[1], 'shortName': away[1]},
+        'competition': {'id': 2019, 'name': 'Serie A', 'code': 'SA'},
+        'score': {'fullTime': {'home': home_goals, 'away': away_goals}},
+        'referees': []
+    }
+
+
+class FakeReference:
+    """Riferimento a un percorso del database in memoria."""
+
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+
+    def get(self):
+        return copy.deepcopy(self.db.read(self.path))
+
+    def set(self, value):
+        self.db.writes.append(self.path)
+        self.db.write(self.path, value)
+
+
+class FakeDatabase:
+    """Database ad albero in memoria che registra le scritture."""
+
+    def __init__(self):
+        self.root = {}
+        self.writes = []
+
+    def read(self, path):
+        node = self.root
+        for part in path.split('/'):
+            if not isinstance(node, dict) or part not in node:
+                return None
+            node = node[part]
+        return node
+
+    def write(self, path, value):
+        parts = path.split('/')
+        node = self.root
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = copy.deepcopy(value)
+
+    def get_reference(self, path):
+        return FakeReference(self, path)
+
+    def batch_update(self, updates):
+        for path, value in updates.items():
+            self.writes.append(path)
+            self.write(path, value)
+        return True
+
+
+class TestSyncMatches(unittest.TestCase):
+    """Test per DataCollector.sync_matches."""
+
+    def setUp(self):
+        self.collector = DataCollector.__new__(DataCollector)
+        self.collector.db = FakeDatabase()
+        self.collector.match_processor = MatchProcessor.for_normalization()
+        self.raw = [
+            fd_match(1001, (108, 'FC Internazionale Milano'), (98, 'AC Milan'), 2, 1),
+            fd_match(1002, (109, 'Juventus FC'), (113, 'SSC Napoli')),
+        ]
+
+    def sync(self):
+        with mock.patch.object(DataCollector, '_collect_raw_matches',
+                               return_value=('football_data', copy.deepcopy(self.raw))):
+            return self.collector.sync_matches('serie_a')
+
+    def test_matches_normalized_with_collection_source(self):
+        """Le partite sono normalizzate come football-data e salvate per ID."""
+        result = self.sync()
+
+        self.assertEqual((result['changed'], result['unchanged']), (2, 0))
+        items = self.collector.db.read('data/matches/serie_a/items')
+        self.assertEqual(set(items), {'1001', '1002'})
+        self.assertEqual(items['1001']['source'], 'football_data')
+        self.assertEqual(items['1001']['home_team']['name'], 'FC Internazionale Milano')
+        self.assertEqual((items['1001']['status'], items['1001']['score']['home']), ('finished', 2))
+
+    def test_second_sync_makes_no_writes(self):
+        """Con gli stessi dati grezzi la seconda sincronizzazione non scrive nulla."""
+        self.sync()
+        writes = len(self.collector.db.writes)
+        self.assertGreater(writes, 0)
+
+        result = self.sync()
+
+        self.assertEqual(len(self.collector.db.writes), writes)
+        self.assertEqual((result['changed'], result['unchanged'], result['skipped_raw']), (0, 2, 2))
+        self.assertEqual({m['match_id'] for m in result['matches']}, {'1001', '1002'})
+
+    def test_only_changed_match_is_written(self):
+        """Una partita modificata nella fonte è l'unica riscritta."""
+        self.sync()
+        self.collector.db.writes = []
+        self.raw[1] = fd_match(1002, (109, 'Juventus FC'), (113, 'SSC Napoli'), 0, 0)
+
+        result = self.sync()
+
+        self.assertEqual((result['changed'], result['unchanged']), (1, 1))
+        item_writes = [path for path in self.collector.db.writes if '/items/' in path]
+        self.assertEqual(item_writes, ['data/matches/serie_a/items/1002'])
+
+
+if __name__ == "__main__":
+    unittest.main()
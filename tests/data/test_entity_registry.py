@@ -0,0 +1,127 @@
+"""
+Test per il registro canonico delle entità.
+Verifica la risoluzione da ID delle fonti e alias, la persistenza su file e
+l'uso del registro nella ricerca delle squadre.
+"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.data.entity_registry import EntityRegistry, ENTITY_TEAM, ENTITY_COMPETITION
+from src.utils.name_index import NameIndex
+from src.data.processors.teams import TeamProcessor
+
+
+class TestEntityRegistry(unittest.TestCase):
+    """Test per EntityRegistry."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "entities.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_resolve_by_source_and_alias(self):
+        """Ogni fonte e ogni alias portano allo stesso ID; gli alias condivisi sono ambigui."""
+        registry = EntityRegistry(self.path)
+        registry.register(ENTITY_TEAM, 'milan', 'AC Milan',
+                          {'football_data': 98, 'fbref': 'dc56fe14'}, ['Milan', 'Rossoneri'])
+        registry.register(ENTITY_TEAM, 'inter', 'Inter', {'football_data': '108'}, ['Internazionale'])
+
+        self.assertEqual(registry.resolve(ENTITY_TEAM, 'football_data', '98'), 'milan')
+        self.assertEqual(registry.resolve(ENTITY_TEAM, 'fbref', 'dc56fe14'), 'milan')
+        self.assertEqual(registry.resolve_name(ENTITY_TEAM, 'MILAN'), 'milan')
+        self.assertIsNone(registry.resolve_name(ENTITY_TEAM, 'Inter Milan'))
+        self.assertEqual(registry.canonical_name(ENTITY_TEAM, 'internazionale'), 'Inter')
+        self.assertEqual(registry.source_id(ENTITY_TEAM, 'inter', 'football_data'), '108')
+
+        registry.register(ENTITY_TEAM, 'milan_women', 'Milan Women', aliases=['Milan'])
+        self.assertIsNone(registry.resolve_name(ENTITY_TEAM, 'Milan'))
+        self.assertEqual(registry.resolve_name(ENTITY_TEAM, 'Rossoneri'), 'milan')
+
+    def test_saved_and_reloaded(self):
+        """Il registro viene scritto solo se cambiato e ricaricato identico."""
+        registry = EntityRegistry(self.path)
+        self.assertEqual(registry.seed_competitions(), len(registry))
+        registry.register(ENTITY_TEAM, 'napoli', 'SSC Napoli', {'understat': 93})
+        self.assertTrue(registry.save())
+        mtime = os.path.getmtime(self.path)
+
+        reloaded = EntityRegistry(self.path)
+        self.assertEqual(len(reloaded), len(registry))
+        self.assertEqual(reloaded.resolve(ENTITY_TEAM, 'understat', 93), 'napoli')
+        self.assertEqual(reloaded.resolve(ENTITY_COMPETITION, 'football_data', 'SA'), 'serie_a')
+        self.assertEqual(reloaded.resolve_name(ENTITY_COMPETITION, 'EPL'), 'premier_league')
+        self.assertFalse(reloaded.seed_competitions())
+        self.assertTrue(reloaded.save())
+        self.assertEqual(os.path.getmtime(self.path), mtime)
+
+
+class FakeDatabase:
+    """Squadre in memoria; il nodo completo non deve essere letto."""
+
+    def __init__(self):
+        self.data = {}
+        self.full_reads = 0
+
+    def get_reference(self, path):
+        return self.data.get(path)
+
+    def get(self, path, default=None):
+        if path == "teams":
+            self.full_reads += 1
+        return self.data.get(path, default)
+
+    def set_reference(self, path, value):
+        self.data[path] = value
+
+
+class TestTeamProcessorRegistry(unittest.TestCase):
+    """Test per la ricerca delle squadre tramite il registro."""
+
+    def test_find_team_by_name_without_fuzzy_search(self):
+        """Nomi e alias registrati con la squadra sono risolti senza costruire l'indice dei nomi."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+
+        processor = TeamProcessor.for_normalization()
+        processor.db = FakeDatabase()
+        processor.entity_registry = EntityRegistry(os.path.join(tmp_dir, "entities.json"))
+
+        processor._register_team({'team_id': 'roma', 'name': 'AS Roma', 'short_name': 'Roma',
+                                  'aliases': ['Giallorossi'], 'source_ids': {'sofascore': 2702}})
+        processor.db.set_reference("teams/roma", {'team_id': 'roma', 'name': 'AS Roma'})
+
+        self.assertEqual(processor.find_team_by_name('giallorossi')['team_id'], 'roma')
+        self.assertEqual(processor.entity_registry.resolve(ENTITY_TEAM, 'sofascore', '2702'), 'roma')
+        self.assertEqual(processor.db.full_reads, 0)
+
+    def test_fuzzy_match_is_not_saved_as_alias(self):
+        """Un nome trovato per somiglianza non viene registrato come alias permanente."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+
+        processor = TeamProcessor.for_normalization()
+        processor.db = FakeDatabase()
+        processor.entity_registry = EntityRegistry(os.path.join(tmp_dir, "entities.json"))
+        team = {'team_id': 'inter', 'name': 'Internazionale Milano', 'short_name': 'Inter'}
+        processor._register_team(team)
+        processor.db.set_reference("teams/inter", team)
+        processor.name_index = NameIndex()
+        processor.name_index.add('inter', ['Internazionale Milano', 'Inter'])
+
+        self.assertEqual(processor.find_team_by_name('Internazionale Milan')['team_id'], 'inter')
+        self.assertIsNone(processor.entity_registry.resolve_name(ENTITY_TEAM, 'Internazionale Milan'))
+        self.assertNotIn('Internazionale Milan', processor.entity_registry.get(ENTITY_TEAM, 'inter')['aliases'])
+
+
+if __name__ == "__main__":
+    unittest.main()
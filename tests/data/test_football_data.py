@@ -0,0 +1,107 @@
+"""
+Test per il client football-data.org.
+Verifica che le richieste batch e la query globale delle partite popolino le
+stesse voci di cache lette dalle chiamate singole, e che una richiesta fallita
+non venga salvata come "nessuna partita".
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+sys.path.insert(0, test_dir)
+
+import src.data.api.football_data as football_data_module
+from src.utils.http import APIError
+from src.data.api.football_data import FootballDataAPI
+from cache_fixtures import memory_caches
+
+
+class TestMatchesBatch(unittest.TestCase):
+    """Test per get_matches_batch."""
+
+    def setUp(self):
+        self.store, patches = memory_caches(FootballDataAPI.get_match)
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_batch_keys_match_single_calls(self):
+        """Le chiavi del batch coincidono con quelle di get_match, per ID int o str."""
+        api = FootballDataAPI(api_key="test")
+        match = {'id': 501, 'homeTeam': {'id': 1}, 'awayTeam': {'id': 2}}
+        with mock.patch.object(football_data_module, 'get_json', return_value={'matches': [match]}) as get_json:
+            self.assertEqual(api.get_matches_batch(['501']), {501: match})
+
+            other = FootballDataAPI(api_key="test")
+            for call in ((other, 501), (other, '501'), (api, ' 501')):
+                self.assertIn(FootballDataAPI.get_match.make_key(*call), self.store)
+            self.assertEqual(other.get_match(match_id='501'), match)
+
+            # Gli ID già in cache non vengono richiesti di nuovo
+            self.assertEqual(api.get_matches_batch([501]), {501: match})
+            self.assertEqual(get_json.call_count, 1)
+
+
+def fd_match(match_id, code, date):
+    """Partita grezza football-data."""
+    return {'id': match_id, 'utcDate': f"{date}T18:00:00Z", 'competition': {'code': code}}
+
+
+class TestMatchesMulti(unittest.TestCase):
+    """Test per get_matches_multi."""
+
+    def setUp(self):
+        self.store, patches = memory_caches(FootballDataAPI.get_matches)
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.api = FootballDataAPI(api_key="test")
+
+    def test_success_splits_windows_and_groups_by_competition(self):
+        """L'intervallo è diviso in finestre e le partite raggruppate per competizione."""
+        responses = [
+            {'matches': [fd_match(1, 'SA', '2024-03-02'), fd_match(2, 'PL', '2024-03-03')]},
+            {'matches': [fd_match(2, 'PL', '2024-03-03'), fd_match(3, 'SA', '2024-03-14'),
+                         fd_match(4, 'CL', '2024-03-14')]},
+        ]
+        with mock.patch.object(football_data_module, 'get_json', side_effect=responses) as get_json:
+            result = self.api.get_matches_multi(['SA', 'PL'], '2024-03-01', '2024-03-15')
+
+        self.assertEqual({code: [m['id'] for m in matches] for code, matches in result.items()},
+                         {'SA': [1, 3], 'PL': [2]})
+        windows = [(c.kwargs['params']['dateFrom'], c.kwargs['params']['dateTo']) for c in get_json.call_args_list]
+        self.assertEqual(windows, [('2024-03-01', '2024-03-10'), ('2024-03-11', '2024-03-15')])
+        self.assertEqual(get_json.call_args_list[0].kwargs['params']['competitions'], 'SA,PL')
+
+    def test_cache_keys_match_get_matches(self):
+        """Le voci salvate sono quelle lette da get_matches con la firma del collector."""
+        with mock.patch.object(football_data_module, 'get_json',
+                               return_value={'matches': [fd_match(1, 'SA', '2024-03-02')]}) as get_json:
+            self.api.get_matches_multi(['SA', 'PL'], '2024-03-01', '2024-03-05')
+
+            other = FootballDataAPI(api_key="test")
+            self.assertEqual(other.get_matches(competition_code='SA', date_from='2024-03-01',
+                                               date_to='2024-03-05'), [fd_match(1, 'SA', '2024-03-02')])
+            # Una competizione senza partite nella finestra è comunque in cache
+            self.assertEqual(other.get_matches(competition_code='PL', date_from='2024-03-01',
+                                               date_to='2024-03-05'), [])
+            self.assertEqual(get_json.call_count, 1)
+        self.assertEqual(len(self.store), 2)
+
+    def test_failed_window_raises_and_caches_nothing(self):
+        """Una finestra senza risposta solleva APIError e non popola la cache."""
+        responses = [{'matches': [fd_match(1, 'SA', '2024-03-02')]}, None]
+        with mock.patch.object(football_data_module, 'get_json', side_effect=responses):
+            with self.assertRaises(APIError):
+                self.api.get_matches_multi(['SA', 'PL'], '2024-03-01', '2024-03-15')
+
+        self.assertEqual(self.store, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Test per la tabella della forma di un campionato calcolata dallo storico locale.
+Verifica il calcolo di tutte le squadre in un passaggio, l'aggiornamento
+incrementale, la forma alla data, il salvataggio in calculate_form_table e
+l'uso della tabella in TeamFormAnalyzer.
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+sys.path.insert(0, test_dir)
+
+import src.data.processors as processors_module
+from src.data.processors.form_table import LeagueFormTable, form_table_as_of, get_league_form
+from history_fixtures import HistoryTestCase, finished
+
+
+class TestLeagueFormTable(HistoryTestCase):
+    """Test per LeagueFormTable."""
+
+    def setUp(self):
+        super().setUp()
+        self.make_history([
+            finished('m1', 'inter', 'milan', '2023-08-20', 2, 0),
+            finished('m2', 'milan', 'juventus', '2023-08-27', 1, 1),
+            finished('m3', 'juventus', 'inter', '2023-09-03', 0, 1),
+            finished('m4', 'milan', 'napoli', '2023-09-17', 3, 1),
+            finished('m5', 'napoli', 'inter', '2023-09-24', 2, 2),
+        ])
+
+    def test_single_pass_all_teams(self):
+        """Un passaggio produce forma, punti e parziali casa/trasferta di tutte le squadre."""
+        table = LeagueFormTable('serie_a', window=3)
+        self.assertEqual(table.build(self.history.league_results('serie_a')), 5)
+        rows = {row['team_id']: row for row in table.table()['teams']}
+
+        self.assertEqual([row['team_id'] for row in table.table()['teams']][:2], ['inter', 'milan'])
+        self.assertEqual((rows['inter']['form'], rows['inter']['points']), ('DWW', 7))
+        self.assertEqual((rows['inter']['home_form'], rows['inter']['away_form']), ('W', 'DW'))
+        self.assertEqual((rows['milan']['form'], rows['milan']['home_points']), ('WDL', 4))
+        # Le partite più recenti pesano di più: due vittorie vecchie e un pareggio recente
+        self.assertLess(rows['inter']['weighted_points'], 7 / 3)
+        self.assertEqual(table.table()['as_of'], '2023-09-24')
+        self.assertEqual(self.db.reads, 1)
+
+    def test_incremental_and_as_of(self):
+        """I nuovi risultati aggiornano la tabella; la forma alla data ignora i successivi."""
+        table = get_league_form(self.db, 'serie_a', window=2, history=self.history)
+        self.history.add_match(finished('m6', 'inter', 'napoli', '2023-09-10', 0, 1))
+
+        self.assertEqual(table.team_row('inter')['form'], 'DL')
+        self.assertEqual(table.team_row('napoli')['away_form'], 'LW')
+
+        snapshot = form_table_as_of(self.history, 'serie_a', '2023-08-27', window=2)
+        self.assertEqual(snapshot['as_of'], '2023-08-27')
+        self.assertEqual({row['team_id']: row['form'] for row in snapshot['teams']},
+                         {'inter': 'W', 'milan': 'DL', 'juventus': 'D'})
+
+
+class TestCalculateFormTable(HistoryTestCase):
+    """Test per calculate_form_table."""
+
+    def setUp(self):
+        super().setUp()
+        self.make_history([
+            finished('m1', 'inter', 'milan', '2023-08-20', 2, 0),
+            finished('m2', 'milan', 'juventus', '2023-08-27', 1, 1),
+        ])
+        self.table = LeagueFormTable('serie_a', window=5)
+        self.table.build(self.history.league_results('serie_a'))
+
+    def calculate(self):
+        with mock.patch.object(processors_module, 'FirebaseManager', return_value=self.db), \
+                mock.patch.object(processors_module, 'get_league_form', return_value=self.table):
+            return processors_module.calculate_form_table('serie_a')
+
+    def test_table_is_saved(self):
+        """La tabella del campionato è salvata in form_tables/<league_id>."""
+        rows = self.calculate()
+
+        self.assertEqual([row['team_id'] for row in rows], ['inter', 'juventus', 'milan'])
+        self.assertEqual(self.db.saved['form_tables/serie_a'], self.table.table())
+
+    def test_write_error_is_logged(self):
+        """Un errore di scrittura viene registrato e la tabella è comunque restituita."""
+        self.db.set = mock.Mock(side_effect=RuntimeError("database non raggiungibile"))
+
+        with self.assertLogs(processors_module.logger, level='ERROR') as logs:
+            rows = self.calculate()
+
+        self.assertEqual(len(rows), 3)
+        self.assertIn("serie_a: database non raggiungibile", logs.output[0])
+
+
+class TestTeamFormAnalyzerLeagueTable(HistoryTestCase):
+    """Test per l'uso della tabella della forma in TeamFormAnalyzer."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Il pacchetto src.analytics importa anche i modelli di previsione:
+        # l'import è isolato qui per non impedire gli altri test del modulo
+        try:
+            from src.analytics.statistics.team_form import TeamFormAnalyzer
+        except ImportError as e:
+            raise unittest.SkipTest(f"src.analytics non importabile: {e}")
+        cls.analyzer_class = TeamFormAnalyzer
+
+    def setUp(self):
+        super().setUp()
+        self.make_history([finished('m1', 'inter', 'milan', '2023-08-20', 2, 0)])
+
+    def test_team_form_analyzer_uses_league_table(self):
+        """Con il campionato indicato TeamFormAnalyzer usa la tabella del campionato."""
+        TeamFormAnalyzer = self.analyzer_class
+        get_league_form(self.db, 'serie_a_form_test', window=10, history=self.history)
+        self.history.add_match(finished('t1', 'inter', 'milan', '2023-10-01', 1, 0, league='serie_a_form_test'))
+        self.history.add_match(finished('t2', 'milan', 'inter', '2023-10-08', 1, 1, league='serie_a_form_test'))
+
+        analyzer = TeamFormAnalyzer.__new__(TeamFormAnalyzer)
+        analyzer.db = self.db
+        analyzer.form_window = 10
+        matches = analyzer._league_form_matches('inter', 'serie_a_form_test')
+
+        self.assertEqual([m['match_id'] for m in matches], ['t2', 't1'])
+        self.assertEqual((matches[0]['home_team_id'], matches[0]['away_score']), ('milan', 1))
+        self.assertEqual(analyzer._league_form_matches('napoli', 'serie_a_form_test'), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Test per il registro di freschezza delle entità.
+Verifica TTL per tipo di dato, riduzione vicino al calcio d'inizio e
+selezione delle sole entità scadute.
+"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.data.freshness import FreshnessLedger, h2h_key
+from src.config.sources import get_cache_ttl_for_data_type
+
+
+class TestFreshnessLedger(unittest.TestCase):
+    """Test per FreshnessLedger."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.ledger = FreshnessLedger(db_path=os.path.join(self.tmp_dir, 'freshness.db'))
+        self.ledger.kickoff_window = 24
+        self.ledger.min_ttl = 300
+
+    def tearDown(self):
+        self.ledger.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_ttl_tightens_near_kickoff(self):
+        """Il TTL è quello del tipo di dato lontano dalla partita e si riduce avvicinandosi."""
+        base = get_cache_ttl_for_data_type('teams')
+        now = datetime.now()
+
+        self.assertEqual(self.ledger.ttl('team'), base)
+        self.assertEqual(self.ledger.ttl('team', now + timedelta(hours=48), now), base)
+        self.assertAlmostEqual(self.ledger.ttl('team', now + timedelta(hours=6), now), base / 4)
+        self.assertEqual(self.ledger.ttl('team', now + timedelta(minutes=1), now), 300)
+        self.assertEqual(self.ledger.ttl('team', now - timedelta(hours=1), now), 300)
+
+    def test_only_stale_entities_are_selected(self):
+        """Solo le entità mai aggiornate o scadute vanno aggiornate."""
+        self.ledger.mark('team', ['10', '11'])
+
+        self.assertTrue(self.ledger.is_fresh('team', '10'))
+        self.assertEqual(self.ledger.stale('team', ['10', '11', '12']), ['12'])
+
+        self.ledger.invalidate('team', '11')
+        self.assertEqual(self.ledger.stale('team', ['10', '11']), ['11'])
+
+    def test_summary_and_h2h_key(self):
+        """Il riepilogo conta le entità per tipo; la coppia H2H non dipende dall'ordine."""
+        self.assertEqual(h2h_key('7', '3'), h2h_key('3', '7'))
+        self.ledger.mark('h2h', h2h_key('7', '3'))
+        self.ledger.mark('standings', 'serie_a')
+
+        summary = self.ledger.summary()
+
+        self.assertEqual(summary['h2h']['count'], 1)
+        self.assertEqual(summary['standings']['stale'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
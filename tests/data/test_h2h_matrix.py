@@ -0,0 +1,171 @@
+"""
+Test per lo storico locale dei risultati e la matrice degli scontri diretti.
+Verifica il caricamento unico dello storico (ripetuto se la lettura
+fallisce), l'aggiornamento incrementale delle coppie, il campionato delle
+partite normalizzate dalle fonti reali e l'uso della matrice in
+HeadToHeadProcessor.
+"""
+import os
+import sys
+import unittest
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+sys.path.insert(0, test_dir)
+
+from src.data.entity_registry import ENTITY_TEAM
+from src.data.processors.matches import MatchProcessor
+from src.data.processors.league_history import ResultHistory
+from src.data.processors.h2h_matrix import H2HMatrix, get_league_matrix
+from src.data.processors.head_to_head import HeadToHeadProcessor
+from history_fixtures import FakeDatabase, HistoryTestCase, finished
+
+
+class UnavailableDatabase(FakeDatabase):
+    """Database che, come FirebaseManager non inizializzato, non restituisce riferimenti."""
+
+    available = False
+
+    def get_reference(self, path):
+        return super().get_reference(path) if self.available else None
+
+
+class TestH2HMatrix(HistoryTestCase):
+    """Test per ResultHistory e H2HMatrix."""
+
+    def setUp(self):
+        super().setUp()
+        self.make_history([
+            finished('m3', 'inter', 'milan', '2023-09-16', 5, 1),
+            finished('m1', 'milan', 'inter', '2023-05-10', 0, 2),
+            finished('m2', 'milan', 'juventus', '2023-05-20', 1, 1),
+            finished('m4', 'inter', 'milan', '2023-02-05', 1, 0, league='coppa_italia'),
+            dict(finished('m5', 'milan', 'inter', '2024-02-04', 0, 0), status='scheduled'),
+        ])
+
+    def test_history_loaded_once_in_order(self):
+        """Lo storico è letto una volta, in ordine di data, con il filtro "fino a"."""
+        self.assertEqual([r['match_id'] for r in self.history.league_results('serie_a')], ['m1', 'm2', 'm3'])
+        self.assertEqual([r['match_id'] for r in self.history.league_results('serie_a', until='2023-05-20')],
+                         ['m1', 'm2'])
+        self.assertEqual(sorted(self.history.leagues()), ['coppa_italia', 'serie_a'])
+        self.assertEqual(self.db.reads, 1)
+
+    def test_matrix_summary_and_incremental_update(self):
+        """Un passaggio calcola tutte le coppie; un nuovo risultato aggiorna solo la sua."""
+        matrix = H2HMatrix('serie_a', recent_limit=2)
+        self.assertEqual(matrix.build(self.history.league_results('serie_a')), 2)
+        self.history.add_listener(matrix.add_result)
+
+        self.assertEqual(matrix.summary('milan', 'inter'), {
+            'total_matches': 2, 'team1_wins': 0, 'team2_wins': 2, 'draws': 0,
+            'team1_goals': 1, 'team2_goals': 7, 'home_wins_team1': 0, 'home_wins_team2': 1,
+            'last_match_date': '2023-09-16'
+        })
+
+        self.history.add_match(finished('m6', 'milan', 'inter', '2024-02-04', 1, 0))
+        self.assertIsNone(self.history.add_match(finished('m6', 'milan', 'inter', '2024-02-04', 1, 0)))
+
+        self.assertEqual(matrix.summary('inter', 'milan')['team2_wins'], 1)
+        self.assertEqual([m['match_id'] for m in matrix.recent_matches('inter', 'milan')], ['m6', 'm3'])
+        self.assertEqual(matrix.summary('milan', 'juventus')['draws'], 1)
+        self.assertFalse(matrix.has_pair('inter', 'juventus'))
+        self.assertEqual(self.db.reads, 1)
+
+    def test_failed_read_is_retried(self):
+        """Una lettura fallita non segna lo storico come caricato e le matrici non restano vuote."""
+        db = UnavailableDatabase([finished('r1', 'inter', 'milan', '2023-09-16', 5, 1, league='serie_a_retry')])
+        history = ResultHistory(db, self.registry)
+        history.retry_seconds = 0
+
+        self.assertFalse(history.load())
+        self.assertEqual(len(get_league_matrix(db, 'serie_a_retry', history=history)), 0)
+        self.assertIsNone(history.add_match(finished('r2', 'milan', 'inter', '2023-10-01', 1, 0,
+                                                     league='serie_a_retry')))
+
+        db.available = True
+        matrix = get_league_matrix(db, 'serie_a_retry', history=history)
+        self.assertTrue(history.loaded)
+        self.assertTrue(matrix.has_pair('inter', 'milan'))
+        self.assertIs(get_league_matrix(db, 'serie_a_retry', history=history), matrix)
+        self.assertEqual(db.reads, 1)
+
+    def test_processor_uses_local_history(self):
+        """Con storico locale il processore non interroga le fonti remote."""
+        matrix = get_league_matrix(self.db, 'serie_a_test', history=self.history)
+        self.assertEqual(len(matrix), 0)
+        self.history.add_match(finished('m7', 'inter', 'milan', '2023-10-01', 2, 2, league='serie_a_test'))
+
+        processor = HeadToHeadProcessor.__new__(HeadToHeadProcessor)
+        processor.db = self.db
+        h2h = processor._get_h2h_from_history('milan', 'inter', {'name': 'Milan'}, {'name': 'Inter'},
+                                              10, league_id='serie_a_test')
+
+        self.assertEqual(h2h['source'], 'local_history')
+        self.assertEqual([m['match_id'] for m in h2h['matches']], ['m7'])
+        self.assertEqual(h2h['stats']['draws'], 1)
+        self.assertIsNone(processor._get_h2h_from_history('milan', 'napoli', {}, {}, 10, league_id='serie_a_test'))
+
+
+# Partite grezze Inter-Milan come arrivano dalle fonti, con i loro ID
+RAW_DERBIES = {
+    'football_data': {
+        'id': 401, 'utcDate': '2023-09-16T16:00:00Z', 'status': 'FINISHED',
+        'homeTeam': {'id': 108, 'name': 'FC Internazionale Milano'},
+        'awayTeam': {'id': 98, 'name': 'AC Milan'},
+        'competition': {'id': 2019, 'name': 'Serie A', 'code': 'SA'},
+        'score': {'fullTime': {'home': 5, 'away': 1}}, 'referees': []
+    },
+    'api_football': {
+        'fixture': {'id': 1035100, 'date': '2024-04-22T18:45:00+00:00', 'status': {'short': 'FT'}},
+        'league': {'id': 135, 'name': 'Serie A'},
+        'teams': {'home': {'id': 489, 'name': 'AC Milan'}, 'away': {'id': 505, 'name': 'Inter'}},
+        'goals': {'home': 1, 'away': 2}
+    },
+    'sofascore': {
+        'id': 11393001, 'startTimestamp': 1707076800, 'status': {'type': 'finished'},
+        'tournament': {'id': 33, 'name': 'Serie A'},
+        'homeTeam': {'id': 2697, 'name': 'Inter'}, 'awayTeam': {'id': 2692, 'name': 'Milan'},
+        'homeScore': {'current': 1}, 'awayScore': {'current': 0}
+    },
+}
+
+
+class TestNormalizedSources(HistoryTestCase):
+    """Test dello storico con partite prodotte dai normalizzatori delle fonti."""
+
+    def setUp(self):
+        super().setUp()
+        self.registry.seed_competitions()
+        self.registry.register(ENTITY_TEAM, 'inter', 'Inter',
+                               {'football_data': 108, 'api_football': 505, 'sofascore': 2697})
+        self.registry.register(ENTITY_TEAM, 'milan', 'Milan',
+                               {'football_data': 98, 'api_football': 489, 'sofascore': 2692})
+        self.processor = MatchProcessor.for_normalization()
+
+    def history_of(self, league_id=None):
+        return self.make_history([self.processor.process_match(raw, source, league_id)
+                                  for source, raw in RAW_DERBIES.items()])
+
+    def test_collected_league_is_used(self):
+        """Le partite raccolte per un campionato finiscono sotto il suo ID, per ogni fonte."""
+        history = self.history_of('serie_a')
+
+        self.assertEqual(history.leagues(), ['serie_a'])
+        matrix = H2HMatrix('serie_a')
+        self.assertEqual(matrix.build(history.league_results('serie_a')), 1)
+        summary = matrix.summary('inter', 'milan')
+        self.assertEqual((summary['total_matches'], summary['team1_wins'], summary['team2_wins']), (3, 3, 0))
+
+    def test_source_competition_ids_are_resolved(self):
+        """Senza campionato di raccolta, l'ID o il nome della competizione è risolto nel registro."""
+        history = self.history_of()
+
+        self.assertEqual(history.leagues(), ['serie_a'])
+        self.assertEqual(len(history.league_results('serie_a')), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Test per le richieste hedged su più fonti.
+Verifica il ritardo derivato dal percentile di latenza, la vittoria della
+prima risposta valida, l'abbandono delle fonti più lente e le metriche.
+"""
+import os
+import sys
+import time
+import threading
+import unittest
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.utils.hedging import HedgedFetcher, LatencyTracker
+
+
+class TestLatencyTracker(unittest.TestCase):
+    """Test per LatencyTracker."""
+
+    def test_percentile_interpolates_and_keeps_window(self):
+        """Il percentile interpola tra i campioni e la finestra scarta i più vecchi."""
+        tracker = LatencyTracker(window=4)
+        self.assertIsNone(tracker.percentile('fbref', 90))
+
+        for latency in [9.0, 1.0, 2.0, 3.0, 4.0]:
+            tracker.record('fbref', latency)
+
+        self.assertEqual(tracker.count('fbref'), 4)
+        self.assertEqual(tracker.percentile('fbref', 0), 1.0)
+        self.assertEqual(tracker.percentile('fbref', 100), 4.0)
+        self.assertAlmostEqual(tracker.percentile('fbref', 50), 2.5)
+
+
+class TestHedgedFetcher(unittest.TestCase):
+    """Test per HedgedFetcher."""
+
+    def setUp(self):
+        self.release = threading.Event()
+
+    def tearDown(self):
+        # Sblocca le fonti lente abbandonate dai test
+        self.release.set()
+
+    def slow(self, value):
+        def call():
+            self.release.wait(5)
+            return value
+        return call
+
+    def test_delay_from_latency_percentile(self):
+        """Con pochi campioni vale il ritardo fisso, poi il percentile limitato."""
+        fetcher = HedgedFetcher(hedge_delay=2.0, percentile=50, min_delay=0.2, max_delay=1.0, min_samples=3)
+        fetcher.latencies.record('whoscored', 0.5)
+        self.assertEqual(fetcher.delay_for('whoscored'), 2.0)
+
+        fetcher.latencies.record('whoscored', 0.6)
+        fetcher.latencies.record('whoscored', 0.7)
+        self.assertAlmostEqual(fetcher.delay_for('whoscored'), 0.6)
+
+        for _ in range(10):
+            fetcher.latencies.record('fbref', 5.0)
+            fetcher.latencies.record('sofascore', 0.01)
+        self.assertEqual(fetcher.delay_for('fbref'), 1.0)
+        self.assertEqual(fetcher.delay_for('sofascore'), 0.2)
+
+    def test_first_valid_response_wins(self):
+        """Una risposta non valida avvia subito la fonte successiva; vince la prima valida."""
+        fetcher = HedgedFetcher(hedge_delay=5.0)
+        calls = []
+
+        def source(name, value):
+            def call():
+                calls.append(name)
+                return value
+            return call
+
+        started = time.monotonic()
+        winner, result = fetcher.fetch([
+            ('whoscored', source('whoscored', {})),
+            ('fbref', source('fbref', {'xg': 1.2})),
+            ('sofascore', source('sofascore', {'xg': 1.4})),
+        ])
+
+        self.assertEqual((winner, result), ('fbref', {'xg': 1.2}))
+        self.assertEqual(calls, ['whoscored', 'fbref'])
+        # Nessuna attesa del ritardo di hedging dopo la risposta non valida
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_slow_primary_is_hedged_and_abandoned(self):
+        """La fonte lenta viene superata dopo il ritardo e il suo risultato scartato."""
+        fetcher = HedgedFetcher(hedge_delay=0.05)
+        calls = []
+
+        def fast():
+            calls.append('fbref')
+            return {'xg': 0.9}
+
+        def never():
+            calls.append('sofascore')
+            return {'xg': 2.0}
+
+        winner, result = fetcher.fetch([
+            ('whoscored', self.slow({'xg': 3.0})),
+            ('fbref', fast),
+            ('sofascore', never),
+        ])
+
+        self.assertEqual((winner, result), ('fbref', {'xg': 0.9}))
+        # La terza fonte non viene mai avviata
+        self.assertEqual(calls, ['fbref'])
+        metrics = fetcher.get_metrics()
+        self.assertEqual((metrics['launched'], metrics['abandoned']), (2, 1))
+
+    def test_metrics(self):
+        """Le metriche contano chiamate, hedging, vittorie per fonte e fallimenti."""
+        fetcher = HedgedFetcher(hedge_delay=0.05)
+
+        fetcher.fetch([('whoscored', lambda: {'xg': 1.0}), ('fbref', lambda: {'xg': 1.1})])
+        fetcher.fetch([('whoscored', self.slow({'xg': 1.0})), ('fbref', lambda: {'xg': 1.1})])
+        self.assertEqual(fetcher.fetch([('whoscored', lambda: None), ('fbref', lambda: {})]), (None, None))
+
+        metrics = fetcher.get_metrics()
+        self.assertEqual(metrics['calls'], 3)
+        self.assertEqual(metrics['hedged_calls'], 2)
+        self.assertEqual((metrics['primary_wins'], metrics['hedge_wins'], metrics['no_result']), (1, 1, 1))
+        self.assertEqual(metrics['wins_by_source'], {'whoscored': 1, 'fbref': 1})
+        self.assertEqual(metrics['hedge_win_rate'], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Test per il crawler storico riprendibile.
+Usa una fonte d'archivio finta per verificare ripresa da checkpoint,
+deduplicazione degli URL e ri-crawl della sola stagione corrente.
+"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.data.scrapers.historical_crawler import ArchiveSource, HistoricalCrawler
+
+
+class FakeScraper:
+    """Scraper finto: ogni URL restituisce il proprio path, senza HTML."""
+
+    delay_range = (0.0, 0.0)
+
+    def __init__(self):
+        self.fetched = []
+
+    def get(self, url, params=None, use_cache=True, throttle=True):
+        self.fetched.append((url, use_cache))
+        return url
+
+    def parse(self, html):
+        return html
+
+
+class FakeArchive(ArchiveSource):
+    """Competizione con tre stagioni e due partite per stagione."""
+
+    name = 'fake'
+    seasons = ['2023-2024', '2022-2023', '2021-2022']
+
+    def seasons_url(self, competition):
+        return f"http://archive.test/{competition}/"
+
+    def matches_url(self, competition, season):
+        return f"http://archive.test/{competition}/{season}/matches"
+
+    def parse_seasons(self, soup):
+        return [{'id': s, 'year': s[:4]} for s in self.seasons]
+
+    def parse_matches(self, soup, competition, season):
+        year = season[:4]
+        return [
+            {'date': f"{year}-09-01", 'home_team': {'name': 'A'}, 'away_team': {'name': 'B'},
+             'home_score': 1, 'away_score': 0},
+            {'date': f"{year}-09-08", 'home_team': {'name': 'B'}, 'away_team': {'name': 'A'},
+             'home_score': 2, 'away_score': 2}
+        ]
+
+
+class TestHistoricalCrawler(unittest.TestCase):
+    """Test per HistoricalCrawler."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, 'archive.db')
+        self.scraper = FakeScraper()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _crawler(self):
+        return HistoricalCrawler(db_path=self.db_path, sources={'fake': FakeArchive(self.scraper)},
+                                 max_workers=2, batch_size=2)
+
+    def test_resume_from_checkpoint(self):
+        """Un'esecuzione interrotta riprende senza riscaricare le pagine completate."""
+        crawler = self._crawler()
+        crawler.seed('fake', 'league')
+        progress = crawler.run(max_pages=2)
+        self.assertEqual(progress['done'], 2)
+        self.assertEqual(progress['pending'], 2)
+        crawler.close()
+
+        resumed = self._crawler()
+        progress = resumed.run()
+        self.assertEqual(progress['pending'], 0)
+        self.assertEqual(progress['done'], 4)
+        self.assertEqual(progress['matches'], 6)
+        self.assertEqual(len(self.scraper.fetched), 4)
+        self.assertEqual(len(resumed.get_matches(team='A')), 6)
+        resumed.close()
+
+    def test_dedupe_and_min_year(self):
+        """Il seed ripetuto non duplica gli URL e from_year esclude le stagioni vecchie."""
+        crawler = self._crawler()
+        self.assertTrue(crawler.seed('fake', 'league', from_year=2022))
+        self.assertFalse(crawler.seed('fake', 'league', from_year=2022))
+        progress = crawler.run()
+        self.assertEqual(progress['total'], 3)
+        self.assertEqual({m['season'] for m in crawler.get_matches()}, {'2023-2024', '2022-2023'})
+        crawler.close()
+
+    def test_refresh_current_season_only(self):
+        """Il refresh riscarica solo la pagina stagioni e la stagione corrente, senza cache."""
+        crawler = self._crawler()
+        crawler.seed('fake', 'league')
+        crawler.run()
+        self.scraper.fetched.clear()
+
+        crawler.refresh_current_season('fake', 'league')
+        progress = crawler.run()
+        self.assertEqual(self.scraper.fetched, [
+            ('http://archive.test/league/', False),
+            ('http://archive.test/league/2023-2024/matches', False)
+        ])
+        self.assertEqual(progress['run']['matches_inserted'], 0)
+        self.assertEqual(progress['matches'], 6)
+        self.assertEqual(crawler.get_current_season('fake', 'league'), '2023-2024')
+        crawler.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+Test per l'aggiornamento completo di un campionato in DataCollector.
+Verifica che il grafo dei task parta dalle partite normalizzate da
+MatchProcessor e aggiunga squadre, scontri diretti e pronostici, e che le
+partite salvate ancora fresche evitino le richieste alle fonti.
+"""
+import os
+import sys
+import copy
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.data.checkpoint import RunCheckpoint
+from src.data.collector import DataCollector
+from src.data.freshness import FreshnessLedger
+from src.data.processors.matches import MatchProcessor
+
+
+def fd_match(match_id, home, away, days_from_now, home_goals=None, away_goals=None):
+    """Partita grezza di football-data.org, a una distanza in giorni da oggi."""
+    kickoff = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=days_from_now)
+    return {
+        'id': match_id, 'utcDate': kickoff.isoformat().replace('+00:00', 'Z'),
+        'status': 'FINISHED' if home_goals is not None else 'SCHEDULED',
+        'homeTeam': {'id': home[0], 'name': home[1]}, 'awayTeam': {'id': away[0], 'name': away[1]},
+        'competition': {'id': 2019, 'name': 'Serie A', 'code': 'SA'},
+        'score': {'fullTime': {'home': home_goals, 'away': away_goals}}, 'referees': []
+    }
+
+
+class FakeReference:
+    """Riferimento a un percorso del database in memoria."""
+
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+
+    def get(self):
+        return copy.deepcopy(self.db.data.get(self.path))
+
+    def set(self, value):
+        self.db.data[self.path] = copy.deepcopy(value)
+
+    def push(self, value):
+        self.db.data.setdefault(f"{self.path}/log", []).append(value)
+
+
+class FakeDatabase:
+    """Database in memoria indicizzato per percorso."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get_reference(self, path):
+        return FakeReference(self, path)
+
+    def batch_update(self, updates):
+        for path, value in updates.items():
+            self.data[path] = copy.deepcopy(value)
+        return True
+
+
+class TestRefreshLeagueData(unittest.TestCase):
+    """Test per DataCollector.refresh_league_data."""
+
+    def setUp(self):
+        self.collector = DataCollector.__new__(DataCollector)
+        self.collector.db = FakeDatabase()
+        self.collector.match_processor = MatchProcessor.for_normalization()
+        self.collector.errors = []
+        self.collector._league_graphs = {}
+        self.collector.checkpoint = None
+        self.collector.deadline = None
+        self.collector.freshness = None
+        self.raw = [
+            fd_match(1001, (108, 'FC Internazionale Milano'), (98, 'AC Milan'), -2, 2, 1),
+            fd_match(1002, (109, 'Juventus FC'), (113, 'SSC Napoli'), 2),
+        ]
+
+        patches = [
+            mock.patch.object(DataCollector, '_collect_raw_matches', return_value=('football_data', self.raw)),
+            mock.patch.object(DataCollector, 'collect_league_standings', return_value={'standings': [1]}),
+            mock.patch.object(DataCollector, 'collect_team_stats', side_effect=lambda team_id: {'id': team_id}),
+            mock.patch.object(DataCollector, 'collect_head_to_head', return_value=[{'match_id': 'old'}]),
+            mock.patch.object(DataCollector, 'collect_match_predictions',
+                              side_effect=lambda match_id, h2h_data=None: {'match_id': match_id}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_tasks_from_normalized_matches(self):
+        """Le partite normalizzate sono salvate per ID e generano i task che ne dipendono."""
+        results = self.collector.refresh_league_data('serie_a')
+
+        self.assertEqual(results['errors'], [])
+        self.assertEqual(results['matches']['count'], 2)
+        self.assertEqual(results['teams']['count'], 4)
+        self.assertEqual(results['predictions']['count'], 1)
+        self.assertEqual(sorted(self.collector.db.data['data/matches/serie_a/items']), ['1001', '1002'])
+        self.assertEqual(self.collector.db.data['data/predictions/1002'], {'match_id': '1002'})
+        DataCollector.collect_head_to_head.assert_called_once_with('109', '113')
+
+    def test_delta_sync_adds_upcoming_tasks(self):
+        """In modalità delta le partite sincronizzate generano gli stessi task."""
+        with mock.patch('src.data.collector.get_setting',
+                        side_effect=lambda key, default=None: True if key == 'collector.delta_sync' else default):
+            results = self.collector.refresh_league_data('serie_a')
+
+        self.assertEqual(results['errors'], [])
+        self.assertEqual((results['matches']['count'], results['predictions']['count']), (2, 1))
+
+    def test_fresh_stored_matches_skip_fetch(self):
+        """Con tutte le partite salvate ancora fresche le fonti non vengono interrogate."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        self.collector.freshness = FreshnessLedger(db_path=os.path.join(tmp_dir, 'freshness.db'))
+        self.addCleanup(self.collector.freshness.close)
+
+        self.collector.refresh_league_data('serie_a')
+        self.assertTrue(self.collector.freshness.is_fresh('match', '1001'))
+        self.assertEqual(DataCollector._collect_raw_matches.call_count, 1)
+
+        results = self.collector.refresh_league_data('serie_a')
+
+        self.assertEqual(DataCollector._collect_raw_matches.call_count, 1)
+        self.assertEqual(results['errors'], [])
+        self.assertEqual((results['matches']['count'], results['predictions']['count']), (2, 1))
+
+        # Una partita scaduta fa rileggere le fonti
+        self.collector.freshness.invalidate('match', '1002')
+        self.collector.refresh_league_data('serie_a')
+        self.assertEqual(DataCollector._collect_raw_matches.call_count, 2)
+
+    def test_resume_retries_empty_tasks(self):
+        """Alla ripresa i task senza risultato vengono rieseguiti, quelli riusciti no."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        self.collector.checkpoint = RunCheckpoint('test', db_path=os.path.join(tmp_dir, 'checkpoints.db'))
+        self.addCleanup(self.collector.checkpoint.close)
+
+        with mock.patch.object(DataCollector, 'collect_team_stats',
+                               side_effect=lambda team_id: {} if team_id == '113' else {'id': team_id}):
+            results = self.collector.refresh_league_data('serie_a')
+        self.assertEqual(results['teams']['count'], 3)
+        self.assertIsNone(self.collector.checkpoint.get('league:serie_a', self.collector._league_fingerprint('serie_a')))
+
+        results = self.collector.refresh_league_data('serie_a')
+
+        self.assertNotIn('resumed', results)
+        self.assertEqual(results['teams']['count'], 4)
+        # Solo la squadra senza dati viene richiesta di nuovo
+        DataCollector.collect_team_stats.assert_called_once_with('113')
+        self.assertIsNotNone(self.collector.checkpoint.get('league:serie_a',
+                                                           self.collector._league_fingerprint('serie_a')))
+
+
+if __name__ == "__main__":
+    unittest.main()
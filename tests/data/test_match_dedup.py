@@ -0,0 +1,105 @@
+"""
+Test per la deduplicazione delle partite tra fonti diverse.
+Verifica il raggruppamento per data e ID canonici, il confronto dei nomi
+limitato al blocco e l'unione dei campi secondo le preferenze di fonte.
+"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.data.entity_registry import EntityRegistry, ENTITY_TEAM
+from src.data.processors.match_dedup import MatchDeduplicator
+from src.data.processors.matches import MatchProcessor
+
+
+def make_match(source, source_id, home, away, date, score=(None, None), **fields):
+    """Partita normalizzata minima di una fonte."""
+    match = {
+        'match_id': f"{source}_{source_id}", 'source': source, 'source_ids': {source: source_id},
+        'home_team': {'id': home[0], 'name': home[1], 'short_name': ''},
+        'away_team': {'id': away[0], 'name': away[1], 'short_name': ''},
+        'competition': {'id': 'serie_a', 'name': ''}, 'datetime': date, 'status': 'finished',
+        'score': {'home': score[0], 'away': score[1], 'winner': None},
+        'venue': {'name': '', 'city': ''}, 'statistics': {}, 'lineups': {}, 'events': [], 'odds': {}
+    }
+    match.update(fields)
+    return match
+
+
+class TestMatchDeduplicator(unittest.TestCase):
+    """Test per MatchDeduplicator."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.registry = EntityRegistry(os.path.join(self.tmp_dir, "entities.json"))
+        self.registry.register(ENTITY_TEAM, 'inter', 'Inter', {'fbref': 'd609edc0', 'sofascore': '2697'},
+                               ['Internazionale'])
+        self.registry.register(ENTITY_TEAM, 'milan', 'AC Milan', {'fbref': 'dc56fe14', 'sofascore': '2692'})
+        self.registry.register(ENTITY_TEAM, 'inter_women', 'Inter Women', {'fbref': 'w1'})
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_grouped_by_canonical_ids(self):
+        """Nomi diversi con ID noti vanno nello stesso gruppo; date e squadre diverse no."""
+        matches = [
+            make_match('fbref', 'a1', ('dc56fe14', 'Milan'), ('d609edc0', 'Inter'), '2023-05-20'),
+            make_match('sofascore', '77', ('2692', 'AC Milan'), ('2697', 'Internazionale'), '2023-05-20T18:45:00'),
+            make_match('sofascore', '78', ('2697', 'Inter'), ('2692', 'Milan'), '2023-05-20T18:45:00'),
+            make_match('fbref', 'a2', ('dc56fe14', 'Milan'), ('d609edc0', 'Inter'), '2023-09-16'),
+            make_match('fbref', 'a3', ('', ''), ('d609edc0', 'Inter'), ''),
+        ]
+        groups = MatchDeduplicator(self.registry).group(matches)
+
+        self.assertEqual([[m['match_id'] for m in group] for group in groups],
+                         [['fbref_a1', 'sofascore_77'], ['sofascore_78'], ['fbref_a2'], ['fbref_a3']])
+
+    def test_fuzzy_only_for_unknown_teams(self):
+        """Le squadre non registrate sono confrontate per nome; ID canonici diversi non si uniscono."""
+        matches = [
+            make_match('flashscore', 'x', ('', 'Hellas Verona'), ('', 'Sassuolo'), '2023-05-21'),
+            make_match('worldfootball', 'y', ('', 'Verona'), ('', 'US Sassuolo Calcio'), '2023-05-21'),
+            make_match('fbref', 'z', ('', 'Hellas Verona'), ('', 'Sassuolo'), '2023-05-22'),
+            make_match('fbref', 'a1', ('dc56fe14', 'Milan'), ('d609edc0', 'Inter'), '2023-05-21'),
+            make_match('fbref', 'a9', ('dc56fe14', 'Milan'), ('w1', 'Inter'), '2023-05-21'),
+        ]
+        groups = MatchDeduplicator(self.registry, name_threshold=0.5).group(matches)
+
+        self.assertEqual([[m['match_id'] for m in group] for group in groups],
+                         [['flashscore_x', 'worldfootball_y'], ['fbref_z'], ['fbref_a1'], ['fbref_a9']])
+
+
+class TestDeduplicateMatches(unittest.TestCase):
+    """Test per MatchProcessor.deduplicate_matches e merge_match_data."""
+
+    def test_field_level_preferences(self):
+        """Ogni campo viene dalla fonte preferita; i campi mancanti sono completati dalle altre."""
+        processor = MatchProcessor.for_normalization()
+        fbref = make_match('fbref', 'a1', ('dc56fe14', 'Milan'), ('d609edc0', 'Inter'), '2023-05-20',
+                           score=(1, 1), statistics={'home': {'shots': 12}})
+        football_data = make_match('football_data', '42', ('98', 'AC Milan'), ('108', 'FC Internazionale Milano'),
+                                   '2023-05-20T18:45:00Z', score=(1, 2),
+                                   statistics={'home': {'shots': 11, 'corners': 5}},
+                                   venue={'name': 'San Siro', 'city': ''})
+
+        merged = processor.merge_match_data('m1', [fbref, football_data])
+
+        self.assertEqual(merged['score']['away'], 2)
+        self.assertEqual(merged['datetime'], '2023-05-20T18:45:00Z')
+        self.assertEqual(merged['statistics'], {'home': {'shots': 12, 'corners': 5}})
+        self.assertEqual(merged['venue']['name'], 'San Siro')
+        self.assertEqual(merged['source_ids'], {'fbref': 'a1', 'football_data': '42'})
+        self.assertEqual(fbref['source_ids'], {'fbref': 'a1'})
+
+        self.assertEqual(len(processor.deduplicate_matches([fbref, football_data])), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Test per il registro dei normalizzatori delle partite.
+Verifica la normalizzazione tramite le specifiche compilate per fonte e la
+conversione degli stati con tabelle e parole chiave.
+"""
+import os
+import sys
+import unittest
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.data.processors.matches import MatchProcessor
+from src.data.processors.match_normalizers import (
+    MATCH_NORMALIZERS, StatusMap, GENERIC_KEYWORDS, map_statuses
+)
+
+
+class TestMatchNormalizers(unittest.TestCase):
+    """Test per MATCH_NORMALIZERS e StatusMap."""
+
+    def setUp(self):
+        self.processor = MatchProcessor.for_normalization()
+
+    def test_football_data_spec(self):
+        """I campi annidati, lo stato e il vincitore arrivano dalla specifica compilata."""
+        match = self.processor.process_match({
+            'id': 1234,
+            'homeTeam': {'id': 98, 'name': 'AC Milan'},
+            'awayTeam': {'id': 108, 'name': 'Inter', 'shortName': 'Inter'},
+            'utcDate': '2023-05-20T20:45:00Z',
+            'status': 'IN_PLAY',
+            'score': {'fullTime': {'home': 2, 'away': 0}},
+            'referees': [{'name': 'Orsato'}]
+        }, 'football_data', league_id='serie_a')
+
+        self.assertEqual(match['match_id'], '1234')
+        self.assertEqual(match['source_ids'], {'football_data': '1234'})
+        self.assertEqual(match['home_team'], {'id': '98', 'name': 'AC Milan', 'short_name': 'AC Milan'})
+        self.assertEqual(match['competition']['id'], 'serie_a')
+        self.assertEqual(match['status'], 'in_progress')
+        self.assertEqual(match['score'], {'home': 2, 'away': 0, 'winner': 'home'})
+        self.assertEqual(match['referees'], [{'name': 'Orsato', 'role': ''}])
+
+    def test_text_score_and_missing_fields(self):
+        """Punteggio testuale e campi mancanti lasciano i default della partita standard."""
+        match = self.processor.process_match({
+            'id': 77, 'home_team': 'Torino', 'away_team': 'Juventus',
+            'status': 'FT', 'score': '1 - 1'
+        }, 'soccerway')
+
+        self.assertEqual(match['status'], 'finished')
+        self.assertEqual(match['score'], {'home': 1, 'away': 1, 'winner': 'draw'})
+        self.assertEqual(match['venue'], {'name': '', 'city': ''})
+        self.assertEqual(match['datetime'], '')
+
+        unknown = self.processor.process_match({'id': 1}, 'nessuna_fonte')
+        self.assertNotIn('nessuna_fonte', MATCH_NORMALIZERS)
+        self.assertEqual(unknown['source_ids'], {})
+
+    def test_empty_values_keep_defaults(self):
+        """None e stringhe vuote non sovrascrivono i default; lo zero è un valore valido."""
+        match = self.processor.process_match({
+            'id': 0,
+            'homeTeam': {'id': 98, 'name': 'AC Milan', 'shortName': ''},
+            'awayTeam': {'id': None, 'name': ''},
+            'status': 'FINISHED',
+            'score': {'fullTime': {'home': 0, 'away': 0}}
+        }, 'football_data')
+
+        self.assertEqual(match['match_id'], '0')
+        self.assertEqual(match['home_team']['short_name'], 'AC Milan')
+        self.assertEqual(match['away_team'], {'id': '', 'name': '', 'short_name': ''})
+        self.assertEqual(match['score'], {'home': 0, 'away': 0, 'winner': 'draw'})
+
+    def test_status_map(self):
+        """Le parole chiave vengono risolte una volta e poi lette dalla tabella."""
+        status_map = StatusMap({'NS': 'scheduled'}, keywords=GENERIC_KEYWORDS)
+
+        self.assertEqual(status_map.map_many(['NS', 'Finished', 'Postponed', 'boh']),
+                         ['scheduled', 'finished', 'postponed', 'unknown'])
+        self.assertEqual(status_map.table['Finished'], 'finished')
+        self.assertEqual(status_map(['non', 'hashable']), 'unknown')
+        self.assertEqual(map_statuses('football_data', ['TIMED', 'AWARDED']), ['scheduled', 'awarded'])
+        self.assertEqual(map_statuses('open_football', ['x']), ['unknown'])
+
+
+if __name__ == "__main__":
+    unittest.main()
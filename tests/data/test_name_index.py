@@ -0,0 +1,89 @@
+"""
+Test per l'indice dei nomi e la ricerca delle squadre per nome.
+Verifica la selezione dei candidati per trigrammi, l'aggiornamento
+incrementale e l'uso dell'indice in TeamProcessor.find_team_by_name.
+"""
+import os
+import sys
+import unittest
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.utils.name_index import NameIndex, index_form
+from src.data.processors.teams import TeamProcessor
+
+
+class FakeDatabase:
+    """Nodo 'teams' in memoria che conta le letture complete."""
+
+    def __init__(self, teams):
+        self.data = {f"teams/{team_id}": team for team_id, team in teams.items()}
+        self.full_reads = 0
+
+    def get_reference(self, path):
+        return self.data.get(path)
+
+    def get(self, path, default=None):
+        # Lettura completa del nodo, come FirebaseManager.get
+        if path == "teams":
+            self.full_reads += 1
+            return {key.split('/', 1)[1]: value for key, value in self.data.items() if key.startswith("teams/")}
+        return self.data.get(path, default)
+
+    def set_reference(self, path, value):
+        self.data[path] = value
+
+
+class TestNameIndex(unittest.TestCase):
+    """Test per NameIndex."""
+
+    def setUp(self):
+        self.index = NameIndex()
+        self.index.add('milan', ['AC Milan', 'Milan'])
+        self.index.add('inter', ['Internazionale', 'Inter'])
+        self.index.add('monza', ['AC Monza'])
+
+    def test_candidates_ranked_by_shared_trigrams(self):
+        """Il candidato migliore condivide più trigrammi; gli alias contano come il nome."""
+        self.assertEqual(self.index.candidates('Milano')[0][0], 'milan')
+        self.assertEqual(self.index.candidates('inter')[0], ('inter', 1.0))
+        self.assertEqual(index_form('Atlético  Madrid!'), 'atletico madrid')
+        self.assertEqual(self.index.candidates('zzz'), [])
+
+    def test_incremental_update(self):
+        """add() sostituisce i nomi della stessa chiave e remove() li toglie dall'indice."""
+        self.index.add('monza', ['Monza Brianza'])
+        self.assertEqual(self.index.names('monza'), ['Monza Brianza'])
+        self.assertNotIn('monza', [key for key, _ in self.index.candidates('AC Monza', min_score=0.9)])
+
+        self.index.remove('inter')
+        self.assertNotIn('inter', self.index)
+        self.assertEqual(len(self.index), 2)
+
+
+class TestFindTeamByName(unittest.TestCase):
+    """Test per TeamProcessor.find_team_by_name con l'indice dei nomi."""
+
+    def test_index_built_once_and_updated_on_store(self):
+        """Le squadre sono lette una volta; store_team_data aggiorna l'indice."""
+        processor = TeamProcessor.for_normalization()
+        processor.db = FakeDatabase({
+            '1': {'team_id': '1', 'name': 'Juventus FC', 'short_name': 'Juventus'},
+            '2': {'team_id': '2', 'name': 'Torino FC', 'aliases': ['Toro']},
+        })
+
+        self.assertEqual(processor.find_team_by_name('Juventus')['team_id'], '1')
+        self.assertEqual(processor.find_team_by_name('toro')['team_id'], '2')
+        self.assertIsNone(processor.find_team_by_name('Sassuolo'))
+
+        processor.store_team_data({'team_id': '3', 'name': 'US Sassuolo', 'short_name': 'Sassuolo'})
+
+        self.assertEqual(processor.find_team_by_name('Sassuolo')['team_id'], '3')
+        self.assertEqual(processor.db.full_reads, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,6 +8,8 @@ import sys
 import unittest
 from unittest.mock import patch, MagicMock
 import json
+import time
+import threading
 
 # Aggiungi la directory radice al path di Python per permettere import relativi
 test_dir = os.path.dirname(os.path.abspath(__file__))
@@ -61,6 +63,57 @@ class TestBaseScraper(unittest.TestCase):
             # Verifica che i risultati siano gli stessi
             self.assertEqual(result1.text, result2.text)
 
+
+class TestBaseScraperThrottle(unittest.TestCase):
+    """Test per la spaziatura delle richieste di BaseScraper condiviso tra thread."""
+    
+    def setUp(self):
+        """Scraper con delay fisso e sessione finta che registra gli istanti delle richieste."""
+        self.scraper = BaseScraper("throttle_test", "https://example.com",
+                                   respect_robots=False, delay_range=(0.1, 0.1))
+        self.started = []
+        self.lock = threading.Lock()
+        
+        def fake_get(url, params=None, timeout=None):
+            with self.lock:
+                self.started.append(time.time())
+            time.sleep(0.02)
+            response = MagicMock()
+            response.status_code = 200
+            response.text = "ok"
+            return response
+        
+        self.scraper.session.get = fake_get
+    
+    def test_concurrent_requests_stay_spaced(self):
+        """Le richieste concluse non anticipano i turni già prenotati dagli altri thread."""
+        def call(delay):
+            time.sleep(delay)
+            self.scraper.get("https://example.com/page", use_cache=False)
+        
+        # Tre richieste insieme, una quarta dopo la fine della prima
+        threads = [threading.Thread(target=call, args=(delay,)) for delay in (0, 0, 0, 0.05)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        started = sorted(self.started)
+        gaps = [b - a for a, b in zip(started, started[1:])]
+        self.assertEqual(len(started), 4)
+        self.assertGreaterEqual(min(gaps), 0.09)
+    
+    def test_rate_limited_retry_keeps_throttle_flag(self):
+        """Il nuovo tentativo dopo un 429 mantiene throttle=False."""
+        responses = [MagicMock(status_code=429), MagicMock(status_code=200, text="ok")]
+        self.scraper.session.get = MagicMock(side_effect=responses)
+        
+        with patch('time.sleep'), patch.object(self.scraper, '_wait') as wait:
+            self.assertEqual(self.scraper.get("https://example.com/page", use_cache=False, throttle=False), "ok")
+        
+        wait.assert_not_called()
+        self.assertEqual(self.scraper.session.get.call_count, 2)
+
 class TestFlashScoreScraper(unittest.TestCase):
     """Test per FlashScoreScraper."""
     
@@ -269,6 +322,41 @@ class TestWikipediaScraper(unittest.TestCase):
             self.assertIn('history', info)
             self.assertIn('honours', info)
             self.assertIn('stadium', info)
+    
+    @patch('src.data.scrapers.wikipedia.WikipediaScraper._make_api_request')
+    def test_query_pages_batch(self, mock_api_request):
+        """Test query in batch con redirect e pagine mancanti."""
+        mock_api_request.return_value = {
+            "query": {
+                "normalized": [{"from": "juventus", "to": "Juventus"}],
+                "redirects": [{"from": "Juventus", "to": "Juventus FC"}],
+                "pages": [
+                    {
+                        "title": "Juventus FC",
+                        "pageid": 1,
+                        "pageprops": {"wikibase_item": "Q1422"},
+                        "revisions": [{"revid": 10, "slots": {"main": {"content": "{{Infobox football club}}"}}}]
+                    },
+                    {"title": "Milan", "pageid": 2, "pageprops": {"disambiguation": ""}, "revisions": [{"revid": 20}]},
+                    {"title": "Nonexistent Club", "missing": True}
+                ]
+            }
+        }
+        
+        pages = self.scraper.query_pages(["juventus", "Milan", "Nonexistent Club"], with_content=True)
+        
+        # Una sola richiesta per tutti i titoli, risultati separati per titolo
+        self.assertEqual(mock_api_request.call_count, 1)
+        self.assertEqual(mock_api_request.call_args[0][0]["titles"], "juventus|Milan|Nonexistent Club")
+        self.assertEqual(pages["juventus"]["title"], "Juventus FC")
+        self.assertTrue(self.scraper._is_football_club(pages["juventus"]["content"]))
+        self.assertTrue(pages["Milan"]["disambiguation"])
+        self.assertIsNone(pages["Nonexistent Club"])
+        
+        # I redirect risolti sono serviti dalla cache senza nuove richieste
+        resolved = self.scraper.resolve_titles(["juventus"])
+        self.assertEqual(resolved, {"juventus": "Juventus FC"})
+        self.assertEqual(mock_api_request.call_count, 1)
 
 if __name__ == "__main__":
     unittest.main()
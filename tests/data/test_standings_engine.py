@@ -0,0 +1,190 @@
+"""
+Test per la classifica calcolata dallo storico locale dei risultati.
+Verifica l'applicazione incrementale dei risultati, le classifiche alla
+data, la classifica delle partite normalizzate dalle fonti reali e la
+verifica (facoltativa e periodica) con le classifiche delle fonti in
+StandingsProcessor.
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+sys.path.insert(0, test_dir)
+
+import src.data.processors.standings as standings_module
+from src.data.entity_registry import ENTITY_TEAM
+from src.data.processors.matches import MatchProcessor
+from src.data.processors.standings_engine import LeagueTable, season_bounds, standings_snapshots
+from src.data.processors.standings import StandingsProcessor
+from history_fixtures import HistoryTestCase, finished
+
+
+class TestStandingsEngine(HistoryTestCase):
+    """Test per LeagueTable e StandingsProcessor."""
+
+    def setUp(self):
+        super().setUp()
+        self.make_history([
+            finished('m1', 'inter', 'milan', '2023-08-20', 2, 0),
+            finished('m2', 'milan', 'juventus', '2023-08-27', 1, 1),
+            finished('m3', 'juventus', 'inter', '2023-09-03', 0, 1),
+            finished('m0', 'milan', 'inter', '2023-05-06', 3, 0),
+        ])
+
+    def test_incremental_results(self):
+        """Ogni risultato aggiorna punti, forma e parziali; quelli fuori stagione sono ignorati."""
+        self.assertEqual(season_bounds('2023-2024'), ('2023-07-01', '2024-06-31'))
+        table = LeagueTable('serie_a', '2023-2024', form_length=2)
+        self.assertEqual(table.build(self.history.league_results('serie_a')), 3)
+        self.history.add_listener(table.apply_result)
+
+        rows = {row['team_id']: row for row in table.standings()}
+        self.assertEqual([row['team_id'] for row in table.standings()], ['inter', 'juventus', 'milan'])
+        self.assertEqual((rows['inter']['points'], rows['inter']['goal_difference']), (6, 3))
+        self.assertEqual(rows['inter']['away'], {'matches_played': 1, 'wins': 1, 'draws': 0, 'losses': 0,
+                                                 'goals_for': 1, 'goals_against': 0, 'points': 3})
+
+        # Un risultato arrivato in ritardo entra nella forma in ordine di data
+        self.history.add_match(finished('m4', 'juventus', 'milan', '2023-09-30', 3, 0))
+        self.history.add_match(finished('m5', 'milan', 'inter', '2023-09-10', 2, 1))
+        rows = {row['team_id']: row for row in table.standings()}
+        self.assertEqual(rows['milan']['form'], 'WL')
+        self.assertEqual(rows['milan']['matches_played'], 4)
+        self.assertEqual([row['team_id'] for row in table.standings()], ['inter', 'juventus', 'milan'])
+
+    def test_snapshots_as_of_date(self):
+        """Le classifiche alla data contano solo i risultati fino a quel giorno."""
+        snapshots = standings_snapshots(self.history, 'serie_a', '2023-2024', ['2023-08-27', '2023-08-20'])
+
+        self.assertEqual([row['team_id'] for row in snapshots['2023-08-20']], ['inter', 'milan'])
+        self.assertEqual({row['team_id']: row['points'] for row in snapshots['2023-08-27']},
+                         {'inter': 3, 'milan': 1, 'juventus': 1})
+
+    def test_processor_validates_with_sources(self):
+        """La classifica locale resta primaria; le differenze delle fonti sono solo segnalate."""
+        processor = StandingsProcessor.__new__(StandingsProcessor)
+        processor.min_standings_size = 3
+        processor.preferred_source = 'football_data'
+        processor.fallback_sources = []
+        table = LeagueTable('serie_a', '2023-2024')
+        table.build(self.history.league_results('serie_a'))
+        result = processor._process_local_standings(table.standings(), {'name': 'Serie A'})
+
+        processor._get_standings_from_source = lambda source, league_id, season: {'standings': [
+            {'team_id': '108', 'team_name': 'Inter', 'played': 3, 'points': 9, 'goal_difference': 4},
+            {'team_id': '98', 'team_name': 'Milan', 'played': 2, 'points': 1, 'goal_difference': -2},
+            {'team_id': '109', 'team_name': 'Juventus FC', 'played': 2, 'points': 1, 'goal_difference': -1},
+        ]}
+        processor._validate_with_sources(result, 'serie_a', '2023-2024')
+
+        self.assertEqual(result['source'], 'local_history')
+        self.assertEqual(result['standings'][0]['points'], 6)
+        self.assertEqual(result['validation']['teams_checked'], 3)
+        self.assertEqual([(m['team_id'], m['field']) for m in result['validation']['mismatches']],
+                         [('inter', 'matches_played'), ('inter', 'points'), ('inter', 'goal_difference')])
+
+
+def fd_raw(match_id, home, away, date, home_goals, away_goals):
+    """Partita conclusa grezza di football-data.org."""
+    return {'id': match_id, 'utcDate': f"{date}T18:00:00Z", 'status': 'FINISHED',
+            'homeTeam': {'id': home, 'name': str(home)}, 'awayTeam': {'id': away, 'name': str(away)},
+            'competition': {'id': 2019, 'name': 'Serie A'},
+            'score': {'fullTime': {'home': home_goals, 'away': away_goals}}}
+
+
+def af_raw(match_id, home, away, date, home_goals, away_goals):
+    """Partita conclusa grezza di API-Football."""
+    return {'fixture': {'id': match_id, 'date': f"{date}T18:00:00+00:00", 'status': {'short': 'FT'}},
+            'league': {'id': 135, 'name': 'Serie A'},
+            'teams': {'home': {'id': home, 'name': str(home)}, 'away': {'id': away, 'name': str(away)}},
+            'goals': {'home': home_goals, 'away': away_goals}}
+
+
+class FakeReference:
+    """Riferimento in memoria a un percorso del database."""
+
+    def __init__(self, store, path):
+        self.store = store
+        self.path = path
+
+    def get(self):
+        return self.store.get(self.path)
+
+    def set(self, value):
+        self.store[self.path] = value
+
+
+class TestNormalizedStandings(HistoryTestCase):
+    """Test della classifica con partite prodotte dai normalizzatori delle fonti."""
+
+    def setUp(self):
+        super().setUp()
+        self.registry.seed_competitions()
+        for team_id, fd_id, af_id in (('inter', 108, 505), ('milan', 98, 489), ('juventus', 109, 496)):
+            self.registry.register(ENTITY_TEAM, team_id, team_id.title(),
+                                   {'football_data': fd_id, 'api_football': af_id})
+
+        processor = MatchProcessor.for_normalization()
+        matches = [
+            processor.process_match(fd_raw(1, 108, 98, '2023-08-20', 2, 0), 'football_data', 'serie_a'),
+            processor.process_match(af_raw(2, 489, 496, '2023-08-27', 1, 1), 'api_football', 'serie_a'),
+            # Partita salvata senza campionato di raccolta: risolta dal registro
+            processor.process_match(af_raw(3, 496, 505, '2023-09-03', 0, 1), 'api_football'),
+        ]
+        self.make_history(matches)
+        self.table = LeagueTable('serie_a', '2023-2024')
+        self.table.build(self.history.league_results('serie_a'))
+
+    def processor(self, **settings):
+        processor = StandingsProcessor.__new__(StandingsProcessor)
+        store = {}
+        processor.db = mock.Mock()
+        processor.db.get_reference.side_effect = lambda path: FakeReference(store, path)
+        processor.min_standings_size = 3
+        processor.auto_update_days = 1
+        processor.validate_sources = settings.get('validate_sources', False)
+        processor.validation_interval_hours = settings.get('validation_interval_hours', 24)
+        processor._last_validation = {}
+        return processor
+
+    def standings(self, processor):
+        with mock.patch.object(standings_module, 'get_league_table', return_value=self.table):
+            return StandingsProcessor.process_league_standings.__wrapped__(
+                processor, 'serie_a', '2023-2024', force_update=True)
+
+    def test_table_from_source_matches(self):
+        """Le partite di fonti diverse formano un'unica classifica con ID canonici."""
+        self.assertEqual(self.history.leagues(), ['serie_a'])
+        rows = {row['team_id']: row['points'] for row in self.table.standings()}
+        self.assertEqual(rows, {'inter': 6, 'milan': 1, 'juventus': 1})
+
+    def test_sources_not_queried_by_default(self):
+        """Senza verifica abilitata la classifica locale non interroga le fonti."""
+        processor = self.processor()
+        with mock.patch.object(StandingsProcessor, '_collect_standings_from_sources') as collect:
+            result = self.standings(processor)
+
+        collect.assert_not_called()
+        self.assertEqual((result['source'], result['standings'][0]['team_id']), ('local_history', 'inter'))
+
+    def test_validation_is_periodic(self):
+        """Con la verifica abilitata le fonti sono interrogate una volta per intervallo."""
+        processor = self.processor(validate_sources=True)
+        with mock.patch.object(StandingsProcessor, '_collect_standings_from_sources',
+                               return_value={}) as collect:
+            self.standings(processor)
+            self.standings(processor)
+            self.assertEqual(collect.call_count, 1)
+
+            processor.validation_interval_hours = 0
+            self.standings(processor)
+            self.assertEqual(collect.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
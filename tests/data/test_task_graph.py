@@ -0,0 +1,79 @@
+"""
+Test per lo scheduler a grafo di task usato da refresh_league_data.
+Verifica sovrapposizione dei task indipendenti, task aggiunti a runtime
+e riesecuzione del solo sottografo fallito.
+"""
+import os
+import sys
+import time
+import unittest
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.utils.task_graph import TaskGraph, STATUS_DONE, STATUS_FAILED, STATUS_SKIPPED
+
+
+class TestTaskGraph(unittest.TestCase):
+    """Test per TaskGraph."""
+
+    def test_independent_tasks_overlap(self):
+        """I task senza dipendenze reciproche girano in parallelo."""
+        graph = TaskGraph(max_workers=4)
+        graph.add('a', lambda: time.sleep(0.1) or 'a')
+        graph.add('b', lambda: time.sleep(0.1) or 'b')
+        graph.add('c', lambda: graph.result('a') + graph.result('b'), deps=['a', 'b'])
+
+        timings = graph.run()
+
+        self.assertEqual(graph.result('c'), 'ab')
+        self.assertLess(timings['duration'], 0.18)
+        self.assertEqual(timings['counts'], {STATUS_DONE: 3})
+        self.assertIsNotNone(timings['tasks']['a']['duration'])
+
+    def test_dynamic_tasks(self):
+        """Un task può aggiungere al grafo task che dipendono da lui."""
+        graph = TaskGraph(max_workers=2)
+
+        def expand():
+            for i in range(3):
+                graph.add(f"child:{i}", lambda i=i: i * 10, deps=['root'])
+            return 'root'
+
+        graph.add('root', expand)
+        graph.run()
+
+        self.assertEqual([t.result for t in graph.tasks(prefix='child:')], [0, 10, 20])
+
+    def test_rerun_failed_subgraph(self):
+        """Solo i task falliti e i loro discendenti vengono rieseguiti."""
+        calls = {'ok': 0, 'flaky': 0, 'after': 0}
+
+        def flaky():
+            calls['flaky'] += 1
+            if calls['flaky'] == 1:
+                raise ValueError("errore temporaneo")
+            return 'flaky'
+
+        def count(name):
+            calls[name] += 1
+            return name
+
+        graph = TaskGraph(max_workers=2)
+        graph.add('ok', lambda: count('ok'))
+        graph.add('flaky', flaky)
+        graph.add('after', lambda: count('after'), deps=['flaky', 'ok'])
+
+        timings = graph.run()
+        self.assertEqual(timings['tasks']['flaky']['status'], STATUS_FAILED)
+        self.assertEqual(timings['tasks']['after']['status'], STATUS_SKIPPED)
+
+        timings = graph.rerun_failed()
+        self.assertEqual(timings['counts'], {STATUS_DONE: 3})
+        self.assertEqual(calls, {'ok': 1, 'flaky': 2, 'after': 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
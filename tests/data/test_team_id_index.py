@@ -0,0 +1,120 @@
+"""
+Test per l'indice inverso degli ID delle squadre per fonte.
+Verifica il caricamento unico, la ricostruzione dalle squadre e la
+scrittura a lotti delle nuove mappature.
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.data.processors.team_id_index import TeamIdIndex
+from src.data.processors.teams import TeamProcessor
+
+
+class FakeDatabase:
+    """Database in memoria che registra letture e scritture."""
+
+    def __init__(self, data):
+        self.data = data
+        self.reads = []
+        self.updates = []
+
+    def get_reference(self, path):
+        self.reads.append(path)
+        return self.data.get(path)
+
+    def get(self, path, default=None):
+        # Come FirebaseManager.get: gli errori di lettura diventano il default
+        self.reads.append(path)
+        return self.data.get(path) or default
+
+    def set_reference(self, path, value):
+        self.data[path] = value
+
+    def update(self, path, values):
+        self.updates.append((path, dict(values)))
+        self.data.setdefault(path, {}).update(values)
+        return True
+
+
+class TestTeamIdIndex(unittest.TestCase):
+    """Test per TeamIdIndex."""
+
+    def test_loaded_once_and_flushed_in_one_update(self):
+        """Le mappature sono lette una volta; quelle nuove sono scritte insieme."""
+        db = FakeDatabase({'team_mappings': {'football_data:98': 'milan'}})
+        index = TeamIdIndex(db)
+        index.flush_size = 10
+
+        self.assertEqual(index.get('football_data', 98), 'milan')
+        self.assertIsNone(index.get('fbref', 'dc56fe14'))
+        self.assertEqual(index.add_team('milan', {'fbref': 'dc56fe14', 'football_data': '98'}), 1)
+        self.assertEqual(index.add_team('inter', {'fbref': 'd609edc0', 'sofascore': 2697}), 2)
+        self.assertEqual(index.pending, 3)
+
+        self.assertTrue(index.flush())
+        self.assertEqual(db.reads, ['team_mappings'])
+        self.assertEqual(db.updates, [('team_mappings', {
+            'fbref:dc56fe14': 'milan', 'fbref:d609edc0': 'inter', 'sofascore:2697': 'inter'
+        })])
+        self.assertEqual(index.pending, 0)
+
+    def test_rebuilt_from_teams_without_mappings(self):
+        """Senza mappature salvate l'indice viene ricostruito dai source_ids delle squadre."""
+        db = FakeDatabase({'teams': {
+            'milan': {'source_ids': {'football_data': '98', 'understat': '75'}},
+            'inter': {'source_ids': {'football_data': '108'}},
+        }})
+        index = TeamIdIndex(db)
+
+        self.assertEqual(index.get('understat', '75'), 'milan')
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.pending, 3)
+
+    def test_empty_read_is_retried(self):
+        """Una lettura senza mappature né squadre non segna l'indice come caricato."""
+        db = FakeDatabase({})
+        index = TeamIdIndex(db)
+
+        with mock.patch('src.data.processors.team_id_index.time.monotonic', return_value=100.0):
+            self.assertIsNone(index.get('football_data', '98'))
+            db.data['team_mappings'] = {'football_data:98': 'milan'}
+            # Prima dell'intervallo di attesa non si rilegge
+            self.assertIsNone(index.get('football_data', '98'))
+        self.assertEqual(db.reads, ['team_mappings', 'teams'])
+
+        with mock.patch('src.data.processors.team_id_index.time.monotonic',
+                        return_value=100.0 + index.retry_seconds):
+            self.assertEqual(index.get('football_data', '98'), 'milan')
+
+
+class TestFindTeamBySourceId(unittest.TestCase):
+    """Test per TeamProcessor.find_team_by_source_id con l'indice."""
+
+    def test_lookup_without_scanning_teams(self):
+        """La ricerca legge solo la squadra trovata; il salvataggio aggiorna l'indice."""
+        db = FakeDatabase({'team_mappings': {'api_football:489': 'milan'},
+                           'teams/milan': {'team_id': 'milan', 'name': 'AC Milan'}})
+        processor = TeamProcessor.for_normalization()
+        processor.db = db
+        processor.team_id_index = TeamIdIndex(db)
+
+        self.assertEqual(processor.find_team_by_source_id('api_football', '489')['name'], 'AC Milan')
+        self.assertIsNone(processor.find_team_by_source_id('api_football', '505'))
+
+        processor.store_team_data({'team_id': 'inter', 'name': 'Inter', 'source_ids': {'api_football': '505'}})
+        self.assertEqual(processor.find_team_by_source_id('api_football', '505')['name'], 'Inter')
+        self.assertNotIn('teams', db.reads)
+
+        self.assertTrue(processor.flush_team_mappings())
+        self.assertEqual(db.updates, [('team_mappings', {'api_football:505': 'inter'})])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Test per la coda di urgenza del lavoro di raccolta dati.
+Verifica l'ordinamento per calcio d'inizio, finestra di pubblicazione,
+priorità del campionato ed età dei dati.
+"""
+import os
+import sys
+import unittest
+from datetime import timedelta
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.data.work_queue import (
+    CollectionQueue, WorkItem, next_kickoff,
+    BUCKET_PUBLISHING, BUCKET_UPCOMING, BUCKET_IDLE
+)
+from src.utils.time_utils import get_current_datetime
+
+
+class TestCollectionQueue(unittest.TestCase):
+    """Test per CollectionQueue e WorkItem."""
+
+    def setUp(self):
+        self.now = get_current_datetime()
+
+    def item(self, league_id, hours=None, rank=0, stale_hours=1):
+        return WorkItem(league_id,
+                        next_kickoff=self.now + timedelta(hours=hours) if hours is not None else None,
+                        league_rank=rank,
+                        last_update=self.now - timedelta(hours=stale_hours),
+                        now=self.now,
+                        publish_hours=12)
+
+    def test_urgency_order(self):
+        """Le partite nella finestra di pubblicazione passano davanti ai campionati più importanti."""
+        queue = CollectionQueue([
+            self.item('serie_a', hours=60, rank=0),
+            self.item('idle', rank=1),
+            self.item('eredivisie', hours=2, rank=9),
+            self.item('liga', hours=10, rank=3),
+            self.item('bundesliga', hours=50, rank=2, stale_hours=48),
+            self.item('ligue_1', hours=55, rank=4),
+        ])
+
+        order = [item.league_id for item in queue.drain()]
+
+        self.assertEqual(order, ['eredivisie', 'liga', 'serie_a', 'bundesliga', 'ligue_1', 'idle'])
+        self.assertEqual(len(queue), 0)
+
+    def test_staleness_breaks_ties(self):
+        """A parità di urgenza e priorità vengono prima i dati più vecchi."""
+        queue = CollectionQueue([
+            self.item('fresh', hours=30, rank=1, stale_hours=2),
+            self.item('stale', hours=30, rank=1, stale_hours=30),
+        ])
+        self.assertEqual([item.league_id for item in queue.items()], ['stale', 'fresh'])
+
+    def test_next_kickoff_buckets(self):
+        """Il prossimo calcio d'inizio ignora le partite passate e accetta i dati grezzi."""
+        matches = [
+            {'datetime': (self.now - timedelta(hours=5)).isoformat()},
+            {'utcDate': (self.now + timedelta(hours=40)).astimezone().strftime('%Y-%m-%dT%H:%M:%S%z')},
+            {'datetime': (self.now + timedelta(hours=6)).isoformat()},
+        ]
+        kickoff = next_kickoff(matches, self.now)
+
+        self.assertAlmostEqual((kickoff - self.now).total_seconds(), 6 * 3600, delta=1)
+        self.assertEqual(WorkItem('a', kickoff, now=self.now, publish_hours=12).bucket, BUCKET_PUBLISHING)
+        self.assertEqual(WorkItem('a', kickoff, now=self.now, publish_hours=3).bucket, BUCKET_UPCOMING)
+        self.assertEqual(WorkItem('a', next_kickoff([], self.now), now=self.now).bucket, BUCKET_IDLE)
+
+
+if __name__ == "__main__":
+    unittest.main()
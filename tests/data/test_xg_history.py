@@ -0,0 +1,148 @@
+"""
+Test per lo storico xG delle squadre in array NumPy.
+Verifica l'ordine per data con aggiunte incrementali, la sostituzione degli
+xG aggiornati, la rilettura periodica, le medie vettoriali (semplici,
+ponderate, mobili ed esponenziali), i riepiloghi di campionato e il formato
+delle statistiche di XGProcessor.
+"""
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Aggiungi la directory radice al path di Python per permettere import relativi
+test_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(test_dir))
+sys.path.insert(0, root_dir)
+
+from src.data.processors.xg_history import XGHistory, TeamXGSeries, series_from_matches, summarize
+from src.data.processors.xg_processor import XGProcessor
+
+
+def xg_match(home, away, date, home_xg, away_xg, home_score, away_score, league='serie_a'):
+    """Partita del nodo data/matches con xG."""
+    return {
+        'home_team_id': home, 'away_team_id': away, 'home_team': home.title(), 'away_team': away.title(),
+        'datetime': f"{date}T18:00:00Z", 'status': 'FINISHED', 'league_id': league,
+        'home_score': home_score, 'away_score': away_score,
+        'xg': {'home': home_xg, 'away': away_xg}, 'xg_sources': ['understat']
+    }
+
+
+class FakeReference:
+    def __init__(self, data):
+        self.data = data
+
+    def get(self):
+        return self.data
+
+
+class FakeDatabase:
+    """Nodo data/matches in memoria che conta le letture."""
+
+    def __init__(self, matches):
+        self.matches = matches
+        self.reads = 0
+
+    def get_reference(self, path):
+        self.reads += 1
+        return FakeReference(dict(self.matches)) if path == "data/matches" else None
+
+
+class TestXGHistory(unittest.TestCase):
+    """Test per TeamXGSeries, summarize e XGHistory."""
+
+    def setUp(self):
+        self.db = FakeDatabase({
+            'm1': xg_match('inter', 'milan', '2023-08-20', 2.0, 0.5, 2, 0),
+            'm3': xg_match('juventus', 'inter', '2023-09-03', 1.0, 1.5, 0, 1),
+            'm2': xg_match('milan', 'juventus', '2023-08-27', 1.2, 1.2, 1, 1),
+            'm4': dict(xg_match('inter', 'napoli', '2023-09-17', 0, 0, 0, 0), status='SCHEDULED'),
+        })
+        self.history = XGHistory(self.db)
+
+    def test_incremental_append_keeps_date_order(self):
+        """Le partite arrivate in ritardo sono inserite al loro posto; i duplicati sostituiti."""
+        series = TeamXGSeries('inter', capacity=1)
+        for match_id, day, xg in [('a', '2023-09-03', 1.5), ('b', '2023-09-24', 0.7), ('c', '2023-08-20', 2.0)]:
+            self.assertTrue(series.append(match_id, np.datetime64(day), True, xg, 1.0))
+        self.assertFalse(series.append('a', np.datetime64('2023-09-03'), True, 9.0, 9.0))
+
+        window = series.window()
+        self.assertEqual(window['xg_for'].tolist(), [2.0, 9.0, 0.7])
+        self.assertEqual(series.window(2)['dates'].astype(str).tolist(), ['2023-09-03', '2023-09-24'])
+        self.assertEqual([d['match_id'] for d in series.recent_details()], ['b', 'a', 'c'])
+
+        # Una data corretta sposta la partita al suo nuovo posto
+        self.assertFalse(series.append('c', np.datetime64('2023-10-01'), False, 2.0, 1.0))
+        self.assertEqual(len(series), 3)
+        self.assertEqual(series.window()['xg_for'].tolist(), [9.0, 0.7, 2.0])
+        self.assertEqual(series.window()['is_home'].tolist(), [True, True, False])
+        self.assertEqual([d['match_id'] for d in series.recent_details()], ['c', 'b', 'a'])
+
+    def test_recombined_xg_replaces_loaded_value(self):
+        """Gli xG ricombinati di una partita già caricata sostituiscono i precedenti."""
+        self.assertAlmostEqual(self.history.team_summary('juventus')['overall']['xg_for'], 1.1)
+
+        self.assertTrue(self.history.add_match('m3', xg_match('juventus', 'inter', '2023-09-03', 2.2, 1.5, 0, 1)))
+
+        summary = self.history.team_summary('juventus')
+        self.assertEqual(summary['overall']['matches'], 2)
+        self.assertAlmostEqual(summary['home']['xg_for'], 2.2)
+        self.assertAlmostEqual(self.history.team_summary('inter')['away']['xg_against'], 2.2)
+        self.assertEqual(self.db.reads, 1)
+
+    def test_history_reloaded_after_interval(self):
+        """Dopo l'intervallo di rilettura le partite salvate da altri processi sono lette."""
+        history = XGHistory(self.db, reload_hours=1)
+        self.assertEqual(len(history.team('inter')), 2)
+        self.db.matches['m5'] = xg_match('napoli', 'inter', '2023-09-24', 0.5, 1.0, 0, 2)
+        self.assertEqual(len(history.team('inter')), 2)
+
+        history.reload_hours = 0
+        self.assertEqual(len(history.team('inter')), 3)
+        self.assertEqual(sorted(history.league_summary('serie_a')), ['inter', 'juventus', 'milan', 'napoli'])
+        self.assertEqual(self.db.reads, 3)
+
+    def test_vectorized_stats_match_python(self):
+        """Le medie vettoriali coincidono con il calcolo partita per partita."""
+        matches = [dict(xg_match('inter', f"team{i}", f"2023-0{1 + i}-10", 1.0 + i, 0.5 * i, i, 1), match_id=str(i))
+                   for i in range(4)]
+        matches.append(dict(xg_match('other', 'inter', '2023-06-10', 0.4, 2.5, 0, 3), match_id='4'))
+        series = series_from_matches('inter', matches)
+        summary = summarize([series], reference_date=np.datetime64('2023-07-10'))[0]
+
+        xg_for = [1.0, 2.0, 3.0, 4.0, 2.5]
+        weights = [0.9 ** ((np.datetime64('2023-07-10') - np.datetime64(f"2023-0{m}-10")).astype(int) / 30)
+                   for m in range(1, 7) if m != 5]
+        self.assertAlmostEqual(summary['overall']['xg_for'], sum(xg_for) / 5)
+        self.assertAlmostEqual(summary['overall']['weighted_xg_for'],
+                               sum(x * w for x, w in zip(xg_for, weights)) / sum(weights))
+        self.assertAlmostEqual(summary['home']['xg_for'], 2.5)
+        self.assertEqual((summary['home']['matches'], summary['away']['matches']), (4, 1))
+        self.assertAlmostEqual(summary['overall']['rolling_xg_for'], sum(xg_for) / 5)
+        ewma = [0.7 ** k for k in range(5)]
+        self.assertAlmostEqual(summary['overall']['ewma_xg_for'],
+                               sum(x * w for x, w in zip(xg_for[::-1], ewma)) / sum(ewma))
+
+    def test_league_summary_and_processor_format(self):
+        """Un calcolo produce le statistiche di tutte le squadre; lo storico è letto una volta."""
+        summaries = self.history.league_summary('serie_a')
+        self.assertEqual(sorted(summaries), ['inter', 'juventus', 'milan'])
+        self.assertAlmostEqual(summaries['inter']['overall']['xg_for'], 1.75)
+        self.assertAlmostEqual(summaries['milan']['away']['xg_against'], 2.0)
+
+        self.history.add_match('m5', xg_match('napoli', 'inter', '2023-09-24', 0.5, 1.0, 0, 2))
+        processor = XGProcessor.__new__(XGProcessor)
+        stats = processor._format_team_xg_stats(self.history.team('inter'), 2)
+
+        self.assertEqual((stats['matches_analyzed'], stats['away_matches']), (2, 2))
+        self.assertEqual(stats['overall'], {'xg_for': 1.25, 'xg_against': 0.75, 'xg_difference': 0.5})
+        self.assertEqual([d['match_id'] for d in stats['match_details']], ['m5', 'm3'])
+        self.assertEqual(stats['match_details'][0]['xg_overperformance'], 1.0)
+        self.assertEqual(self.db.reads, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()